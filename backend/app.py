@@ -1,11 +1,12 @@
 """Flask application entrypoint."""
 
+import atexit
 import os
 import sys
 from pathlib import Path
 
 from dotenv import load_dotenv
-from flask import Flask, render_template
+from flask import Flask, g, render_template
 from flask_cors import CORS
 
 ROOT_DIR = Path(__file__).resolve().parent.parent
@@ -18,6 +19,9 @@ if __package__ in (None, ""):
         sys.path.insert(0, str(ROOT_DIR))
 
     from core.constants import MAX_PROSPECT_SESSIONS, PROSPECT_IDLE_MINUTES, UNDETERMINED_STAGE
+    from core.analytics.session_analytics import SessionAnalytics
+    from core.services.opening_pool import configured_opening_keys, get_opening_pool
+    from core.services.provider_status import get_provider_status_monitor
     from backend.messages import (
         INTERNAL_SERVER_ERROR,
         MESSAGE_REQUIRED,
@@ -30,9 +34,19 @@ if __package__ in (None, ""):
         SessionSecurityManager,
         initialize_security,
     )
-    from backend.routes import analytics, chat, prospect, session
+    from backend.http_cache import (
+        IMMUTABLE,
+        PayloadCache,
+        precompute,
+        send_precomputed,
+        static_fingerprint,
+    )
+    from backend.routes import analytics, chat, prospect, session, voice
 else:
     from core.constants import MAX_PROSPECT_SESSIONS, PROSPECT_IDLE_MINUTES, UNDETERMINED_STAGE
+    from core.analytics.session_analytics import SessionAnalytics
+    from core.services.opening_pool import configured_opening_keys, get_opening_pool
+    from core.services.provider_status import get_provider_status_monitor
     from .messages import (
         INTERNAL_SERVER_ERROR,
         MESSAGE_REQUIRED,
@@ -45,7 +59,14 @@ else:
         SessionSecurityManager,
         initialize_security,
     )
-    from .routes import analytics, chat, prospect, session
+    from .http_cache import (
+        IMMUTABLE,
+        PayloadCache,
+        precompute,
+        send_precomputed,
+        static_fingerprint,
+    )
+    from .routes import analytics, chat, prospect, session, voice
 
 app = Flask(
     __name__,
@@ -80,6 +101,10 @@ prospect_session_manager = SessionSecurityManager(
     manager_name="prospect sessions",
 )
 
+# Seller sessions own analytics ring buffers; free (and spill) them when the session goes
+session_manager.add_expiry_hook(SessionAnalytics.release_session)
+atexit.register(SessionAnalytics.flush_spill)
+
 
 def _should_start_background_cleanup() -> bool:
     """Only start cleanup threads in the serving process."""
@@ -93,9 +118,22 @@ def _should_start_background_cleanup() -> bool:
     return os.environ.get("WERKZEUG_RUN_MAIN") == "true"
 
 
+def _opening_keys_to_warm_on_boot() -> list:
+    """Every configured opening key if PROSPECT_OPENING_WARM_ON_BOOT is set, else none.
+
+    Warming all keys costs pool-size LLM calls per key in every worker; by
+    default each key is warmed by its first take() instead.
+    """
+    if os.environ.get("PROSPECT_OPENING_WARM_ON_BOOT", "").strip().lower() in {"1", "true", "yes", "on"}:
+        return configured_opening_keys()
+    return []
+
+
 if _should_start_background_cleanup():
     session_manager.start_background_cleanup()
     prospect_session_manager.start_background_cleanup()
+    get_provider_status_monitor().start_background_refresh()
+    get_opening_pool().start(_opening_keys_to_warm_on_boot())
 
 
 def _require_session():
@@ -150,11 +188,13 @@ session.init_routes(
 chat.init_routes(app, session_manager.get, _require_session, _validate_message, _bot_state)
 prospect.init_routes(app, prospect_session_manager, _validate_message)
 analytics.init_routes(app, _require_session, _bot_state)
+voice.init_routes(app, _require_session, _validate_message, _bot_state)
 
 app.register_blueprint(session.bp)
 app.register_blueprint(chat.bp)
 app.register_blueprint(prospect.bp)
 app.register_blueprint(analytics.bp)
+app.register_blueprint(voice.bp)
 
 # Note: Rate limiting is applied via @require_rate_limit decorators in blueprint files
 
@@ -233,21 +273,83 @@ def _prospect_product_groups():
         return {"transactional": [], "consultative": []}
 
 
+_index_pages = PayloadCache()
+# Static files each index mode links to, recorded while rendering it
+_index_static_refs: dict[str, tuple[str, ...]] = {}
+
+
+def _index_static_version(mode: str) -> tuple:
+    """Current fingerprints of the static files the cached page embeds as ?v=."""
+    return tuple(
+        (filename, static_fingerprint(app.static_folder, filename))
+        for filename in _index_static_refs.get(mode, ())
+    )
+
+
 def _render_index(mode: str):
-    """Render the chat page; product dropdown is populated server-side."""
+    """Render the chat page; product dropdown is populated server-side.
+
+    The HTML is rendered once per (mode, config version, static fingerprints)
+    and revalidated by ETag.
+    """
     # Keep UI flow-controls consistent with the privileged-mutation guard in `backend/security.py`.
     require_admin = app.config.get(
         "REQUIRE_ADMIN_FOR_STAGE_MUTATION",
         os.environ.get("REQUIRE_ADMIN_FOR_STAGE_MUTATION", "").strip().lower()
         in {"1", "true", "yes", "on"},
     )
-    return render_template(
-        "index.html",
-        mode=mode,
-        prospect_products=_prospect_product_options(),
-        prospect_product_groups=_prospect_product_groups(),
-        flow_controls_enabled=not require_admin,
-    )
+
+    def build():
+        g.index_static_refs = []
+        html = render_template(
+            "index.html",
+            mode=mode,
+            prospect_products=_prospect_product_options(),
+            prospect_product_groups=_prospect_product_groups(),
+            flow_controls_enabled=not require_admin,
+        )
+        _index_static_refs[mode] = tuple(dict.fromkeys(g.pop("index_static_refs")))
+        return precompute(html, "text/html")
+
+    try:
+        from core.loader import load_product_config, load_prospect_config
+
+        config_version = (bool(require_admin), load_product_config(), load_prospect_config())
+    except Exception:
+        config_version = None
+    if config_version is None or app.debug:
+        # Unreadable config is not cached; debug mode picks up template edits
+        return send_precomputed(build())
+    # The first render is what tells us which static files the page references
+    first = build() if mode not in _index_static_refs else None
+    version = config_version + (_index_static_version(mode),)
+    return send_precomputed(_index_pages.get(mode, version, (lambda: first) if first else build))
+
+
+@app.url_defaults
+def _fingerprint_static_urls(endpoint, values):
+    """Append ?v=<content hash> to static URLs so they can be cached as immutable."""
+    if endpoint == "static" and "filename" in values and "v" not in values:
+        refs = g.get("index_static_refs")
+        if refs is not None:
+            refs.append(values["filename"])
+        fingerprint = static_fingerprint(app.static_folder, values["filename"])
+        if fingerprint:
+            values["v"] = fingerprint
+
+
+@app.after_request
+def _cache_fingerprinted_static(response):
+    """Long-cache static files requested under their current fingerprint."""
+    from flask import request
+
+    if request.endpoint != "static" or response.status_code not in (200, 304):
+        return response
+    filename = (request.view_args or {}).get("filename")
+    version = request.args.get("v")
+    if filename and version and version == static_fingerprint(app.static_folder, filename):
+        response.headers["Cache-Control"] = IMMUTABLE
+    return response
 
 
 @app.route("/")
@@ -0,0 +1,113 @@
+"""Precomputed response bodies, ETags and fingerprinted static URLs.
+
+Payloads that only change with config (the /api/config JSON, the
+server-rendered index page) are built and serialized once per config version
+and then served as bytes. Clients revalidating with If-None-Match get a 304.
+Static assets get a content fingerprint in their URL so browsers can keep
+them for a year and still pick up a new deploy straight away.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Hashable
+
+from flask import Response, request
+
+REVALIDATE = "no-cache"  # may be stored, but always checked against the ETag
+IMMUTABLE = "public, max-age=31536000, immutable"
+_SCALARS = (str, int, float, bool, type(None))
+
+
+@dataclass(frozen=True)
+class PrecomputedBody:
+    body: bytes
+    etag: str
+    mimetype: str
+
+
+def precompute(body: str | bytes, mimetype: str) -> PrecomputedBody:
+    """Encode a body once and derive its strong ETag from the bytes."""
+    data = body.encode("utf-8") if isinstance(body, str) else bytes(body)
+    return PrecomputedBody(data, hashlib.sha256(data).hexdigest()[:32], mimetype)
+
+
+def _same_version(cached: tuple, current: tuple) -> bool:
+    # Config objects come from lru_cached loaders, so identity means "unchanged"
+    # and avoids a deep comparison on every request
+    if len(cached) != len(current):
+        return False
+    for a, b in zip(cached, current):
+        if a is b:
+            continue
+        if isinstance(a, tuple) and isinstance(b, tuple):
+            if not _same_version(a, b):
+                return False
+        elif not (isinstance(a, _SCALARS) and isinstance(b, _SCALARS) and a == b):
+            return False
+    return True
+
+
+class PayloadCache:
+    """One precomputed body per key, rebuilt only when its config version changes."""
+
+    def __init__(self):
+        self._entries: dict[Hashable, tuple[tuple, PrecomputedBody]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, version: tuple, build: Callable[[], PrecomputedBody]) -> PrecomputedBody:
+        entry = self._entries.get(key)
+        if entry is not None and _same_version(entry[0], version):
+            return entry[1]
+        built = build()
+        with self._lock:
+            self._entries[key] = (version, built)
+        return built
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+def send_precomputed(payload: PrecomputedBody, cache_control: str = REVALIDATE) -> Response:
+    """Serve a precomputed body, or an empty 304 when the client already has it."""
+    if request.if_none_match.contains(payload.etag):
+        response = Response(status=304)
+    else:
+        response = Response(payload.body, mimetype=payload.mimetype)
+    response.set_etag(payload.etag)
+    response.headers["Cache-Control"] = cache_control
+    return response
+
+
+_fingerprints: dict[str, tuple[tuple[int, int], str]] = {}
+
+
+def static_fingerprint(static_folder: str | os.PathLike[str] | None, filename: str) -> str | None:
+    """Short content hash of a static file, recomputed only when its mtime or size changes."""
+    if not static_folder:
+        return None
+    path = os.path.join(static_folder, filename)
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    cached = _fingerprints.get(path)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(64 * 1024), b""):
+            digest.update(block)
+    fingerprint = digest.hexdigest()[:12]
+    _fingerprints[path] = (stamp, fingerprint)
+    return fingerprint
+
+
+def json_body(app: Any, payload: Any) -> PrecomputedBody:
+    """Serialize with the app's JSON provider, as jsonify() would."""
+    return precompute(app.json.dumps(payload), "application/json")
@@ -12,6 +12,7 @@ SERVER_FULL = "Server is currently full - please check back in a moment"
 SESSION_ID_REQUIRED = "Session ID required"
 SESSION_NOT_FOUND = "Session not found"
 SESSION_RESTORE_FAILED = "Couldn't restore that session - you can start a new one or try again."
+TURN_IN_PROGRESS = "Still working on your last message - give it a moment and try again."
 
 # Message validation
 MESSAGE_REQUIRED = "Message required"
@@ -36,6 +37,22 @@ STRATEGY_SWITCH_FAILED = "Failed to switch strategy"
 BOT_INIT_FAILED = "Setup didn't complete - please try initializing again."
 SCORE_CALCULATION_FAILED = "Failed to calculate score"
 
+# Admin
+ADMIN_TOKEN_REQUIRED = "Admin token required"
+ANALYTICS_TABLE_NOT_FOUND = "Analytics table not found - convert an export or set the table directory first"
+INVALID_TIME_WINDOW = "since/until must be ISO dates or epoch seconds"
+BATCH_EVALUATION_EMPTY = "Provide session_ids or transcripts to evaluate"
+INVALID_JOB_ID = "job_id may only contain letters, digits, '-' and '_' (max 64)"
+
+
+def invalid_report_grouping(allowed_columns: set) -> str:
+    return f"Invalid grouping. Available: {sorted(allowed_columns)}"
+
+
+def batch_evaluation_too_large(max_items: int) -> str:
+    return f"Too many items - evaluate at most {max_items} per request"
+
+
 # Voice module
 VOICE_ERROR = "Voice mode ran into trouble - try that again."
 VOICE_TTS_ERROR = "Speech generation didn't work - try that again."
@@ -6,8 +6,10 @@ from datetime import datetime
 from flask import Blueprint, jsonify, request
 
 from core.analytics.session_analytics import SessionAnalytics
+from ..messages import ANALYTICS_TABLE_NOT_FOUND, INVALID_TIME_WINDOW, invalid_report_grouping
 from ..security import (
     InputValidator,
+    require_admin,
     require_rate_limit,
 )
 from core.knowledge import (
@@ -164,6 +166,85 @@ def get_analytics_summary():
     return jsonify({"success": True, **summary})
 
 
+def _columnar_table(directory):
+    """Open a columnar table, or None when it has not been created yet"""
+    from core.analytics.columnar import ColumnarTable
+
+    if not directory:
+        return None
+    try:
+        return ColumnarTable(directory)
+    except FileNotFoundError:
+        return None
+
+
+def _report_response(build, *, events=False, metrics=False):
+    """Run a report over the configured tables with ?since=&until= applied"""
+    from core.analytics import reports
+
+    events_table = _columnar_table(reports.events_table_dir()) if events else None
+    metrics_table = _columnar_table(reports.metrics_table_dir()) if metrics else None
+    requested = [table for wanted, table in ((events, events_table), (metrics, metrics_table)) if wanted]
+    if all(table is None for table in requested):
+        return jsonify({"error": ANALYTICS_TABLE_NOT_FOUND}), 404
+    since = request.args.get("since") or None
+    until = request.args.get("until") or None
+    try:
+        reports.to_timestamp(since), reports.to_timestamp(until)
+    except ValueError:
+        return jsonify({"error": INVALID_TIME_WINDOW}), 400
+    result = build(reports, events_table, metrics_table, since, until)
+    return jsonify({"success": True, "since": since, "until": until, "result": result})
+
+
+@bp.route("/admin/analytics/latency", methods=["GET"])
+@require_admin
+def admin_latency_report():
+    """Latency percentiles per provider (or ?by=provider,stage) from the metrics table"""
+    from core.analytics.reports import METRIC_COLUMNS
+
+    by = tuple(col for col in (request.args.get("by") or "provider").split(",") if col)
+    allowed = {name for name, kind in METRIC_COLUMNS if kind == "str"}
+    if not by or not set(by) <= allowed:
+        return jsonify({"error": invalid_report_grouping(allowed)}), 400
+    return _report_response(
+        lambda r, _events, metrics, since, until: r.latency_percentiles(metrics, by, since=since, until=until),
+        metrics=True,
+    )
+
+
+@bp.route("/admin/analytics/funnel", methods=["GET"])
+@require_admin
+def admin_funnel_report():
+    """Distinct sessions reaching each stage, from the events table"""
+    stages = [s for s in (request.args.get("stages") or "").split(",") if s] or None
+    return _report_response(
+        lambda r, events, _metrics, since, until: r.stage_funnel(events, stages, since=since, until=until),
+        events=True,
+    )
+
+
+@bp.route("/admin/analytics/switches", methods=["GET"])
+@require_admin
+def admin_switch_report():
+    """Strategy-switch rates, transitions and reasons, from the events table"""
+    return _report_response(
+        lambda r, events, _metrics, since, until: r.strategy_switch_rates(events, since=since, until=until),
+        events=True,
+    )
+
+
+@bp.route("/admin/analytics/report", methods=["GET"])
+@require_admin
+def admin_cohort_report():
+    """Full cohort report over whichever tables exist"""
+    return _report_response(
+        lambda r, events, metrics, since, until: r.cohort_report(events, metrics, since=since, until=until),
+        events=True,
+        metrics=True,
+    )
+
+
 @bp.route("/feedback", methods=["POST"])
 @require_rate_limit("feedback")
 def submit_feedback():
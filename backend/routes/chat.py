@@ -3,8 +3,8 @@
 from flask import Blueprint, jsonify, request
 
 from ._utils import safe_latency_ms
-from ..messages import GENERIC_ERROR
-from ..security import require_rate_limit
+from ..messages import GENERIC_ERROR, TURN_IN_PROGRESS
+from ..security import TurnGateTimeout, get_turn_gate, require_rate_limit
 
 bp = Blueprint("chat", __name__, url_prefix="/api")
 
@@ -20,6 +20,10 @@ def init_routes(
     bp.bot_state = bot_state_func  # type: ignore[attr-defined]
 
 
+def _turn_busy_response():
+    return jsonify({"error": TURN_IN_PROGRESS, "code": "TURN_IN_PROGRESS"}), 409
+
+
 @bp.route("/chat", methods=["POST"])
 @require_rate_limit("chat")
 def chat():
@@ -34,27 +38,33 @@ def chat():
     if error:
         return error
 
-    try:
+    def _run_turn():
         response = session_bot.chat(user_message)
         training = session_bot.generate_training(user_message, response.content)
 
         # Extract content and metrics from ChatResponse
-        return jsonify(
-            {
-                "success": True,
-                "message": response.content,
-                **bp.bot_state(session_bot),  # type: ignore
-                "latency_ms": safe_latency_ms(response.latency_ms),
-                "provider": response.provider,
-                "model": response.model,
-                "metrics": {
-                    "input_length": response.input_len,
-                    "output_length": response.output_len,
-                },
-                "training": training,
-            }
-        )
+        return {
+            "success": True,
+            "message": response.content,
+            **bp.bot_state(session_bot),  # type: ignore
+            "latency_ms": safe_latency_ms(response.latency_ms),
+            "provider": response.provider,
+            "model": response.model,
+            "metrics": {
+                "input_length": response.input_len,
+                "output_length": response.output_len,
+            },
+            "training": training,
+        }
 
+    try:
+        # Same session + same message while a turn is running => share its result
+        payload, _coalesced = get_turn_gate("chat").run(
+            request.headers.get("X-Session-ID"), ("chat", user_message), _run_turn
+        )
+        return jsonify(payload)
+    except TurnGateTimeout:
+        return _turn_busy_response()
     except Exception as e:
         bp.app.logger.exception(f"Chat error: {e}")  # type: ignore
         return jsonify({"error": GENERIC_ERROR}), 500
@@ -83,38 +93,46 @@ def edit_message():
     except (TypeError, ValueError):
         return jsonify({"error": "Invalid index format"}), 400
 
-    # Validate index is within bounds
-    max_index = len(session_bot.flow_engine.conversation_history) - 1
-    if message_index < 0 or message_index > max_index:
-        return jsonify({"error": f"Invalid index. Valid range: 0-{max_index}"}), 400
+    def _apply_edit():
+        # Validate index is within bounds
+        max_index = len(session_bot.flow_engine.conversation_history) - 1
+        if message_index < 0 or message_index > max_index:
+            return {"error": f"Invalid index. Valid range: 0-{max_index}"}, 400
 
-    if session_bot.flow_engine.conversation_history[message_index].get("role") != "user":
-        return jsonify({"error": "Can only edit user messages"}), 400
+        if session_bot.flow_engine.conversation_history[message_index].get("role") != "user":
+            return {"error": "Can only edit user messages"}, 400
 
-    try:
         # Rewind to turn BEFORE the edit, then replay with new message
         turn_index = message_index // 2  # Convert message index to turn index
         if not session_bot.rewind_to_turn(turn_index):
-            return jsonify({"error": "Rewind failed"}), 500
+            return {"error": "Rewind failed"}, 500
 
         response = session_bot.chat(new_message)
         training = session_bot.generate_training(new_message, response.content)
 
-        return jsonify(
-            {
-                "success": True,
-                "message": response.content,
-                "history": [
-                    {"role": message["role"], "content": message["content"]}
-                    for message in session_bot.flow_engine.conversation_history
-                ],
-                **bp.bot_state(session_bot),  # type: ignore
-                "latency_ms": safe_latency_ms(response.latency_ms),
-                "provider": response.provider,
-                "model": response.model,
-                "training": training,
-            }
+        return {
+            "success": True,
+            "message": response.content,
+            "history": [
+                {"role": message["role"], "content": message["content"]}
+                for message in session_bot.flow_engine.conversation_history
+            ],
+            **bp.bot_state(session_bot),  # type: ignore
+            "latency_ms": safe_latency_ms(response.latency_ms),
+            "provider": response.provider,
+            "model": response.model,
+            "training": training,
+        }, 200
+
+    try:
+        (payload, status), _coalesced = get_turn_gate("chat").run(
+            request.headers.get("X-Session-ID"),
+            ("edit", message_index, new_message),
+            _apply_edit,
         )
+        return jsonify(payload), status
+    except TurnGateTimeout:
+        return _turn_busy_response()
     except Exception as e:
         bp.app.logger.exception(f"Edit error: {e}")  # type: ignore
         return jsonify({"error": "Couldn't apply that edit -- try again in a sec"}), 500
@@ -1,16 +1,28 @@
 """Prospect mode endpoints - role-reversal where user plays salesperson"""
 
+import json
 import secrets
 from typing import Any, cast
 
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, Response, jsonify, request
 
 from ..messages import (
+    BATCH_EVALUATION_EMPTY,
+    INVALID_JOB_ID,
     PROSPECT_ERROR,
     PROSPECT_SCORING_ERROR,
     PROSPECT_SESSION_NOT_FOUND,
+    TURN_IN_PROGRESS,
+    batch_evaluation_too_large,
 )
-from ..security import InputValidator, require_rate_limit
+from ..security import (
+    InputValidator,
+    TurnGateTimeout,
+    get_turn_gate,
+    require_admin,
+    require_rate_limit,
+)
+from core.constants import BATCH_EVALUATION_MAX_ITEMS, PROSPECT_HINT_MAX_WAIT_SECONDS
 from core.prospect_session_persistence import ProspectSessionPersistence
 from core.providers.factory import supported_provider_names
 
@@ -113,15 +125,23 @@ def prospect_init():
     session_id = secrets.token_hex(16)
 
     try:
-        from core.prospect_session import ProspectSession
+        from core.prospect_session import ProspectSession, select_persona
+        from core.services.opening_pool import get_opening_pool
+
+        persona = select_persona(product_type)
+        pooled = None
+        if provider is None:
+            # Openings are pooled for the default provider order only
+            pooled = get_opening_pool().take((product_type, persona.get("name", "Alex"), difficulty))
 
         ps = ProspectSession(
             provider_type=provider,
             product_type=product_type,
             difficulty=difficulty,
+            persona=persona,
             session_id=session_id,
         )
-        opening = ps.get_opening_message()
+        opening = ps.get_opening_message(pregenerated=pooled.content if pooled else None)
         state.prospect_session_manager.set(session_id, ps)
         ps.save_session()
         state.app.logger.info(
@@ -169,12 +189,12 @@ def prospect_chat():
     if err:
         return err
 
-    if ps.state.has_committed or ps.state.has_walked:
-        return jsonify({"error": "Session has ended. Get evaluation or reset."}), 400
-
     show_hints = data.get("show_hints", False)
 
-    try:
+    def _run_turn():
+        if ps.state.has_committed or ps.state.has_walked:
+            return {"error": "Session has ended. Get evaluation or reset."}, 400
+
         response = ps.process_turn(user_message, show_hints=show_hints)
         result = {
             "success": True,
@@ -188,12 +208,42 @@ def prospect_chat():
         }
         if response.coaching:
             result["coaching"] = response.coaching
-        return jsonify(result)
+        elif response.coaching_pending:
+            # The reply doesn't wait for the hint; the client polls /hint for it
+            result["coaching_pending"] = True
+            result["hint_turn"] = ps.state.turn_count
+        return result, 200
+
+    try:
+        (result, status), _coalesced = get_turn_gate("prospect").run(
+            request.headers.get("X-Session-ID"),
+            ("chat", user_message, bool(show_hints)),
+            _run_turn,
+        )
+        return jsonify(result), status
+    except TurnGateTimeout:
+        return jsonify({"error": TURN_IN_PROGRESS, "code": "TURN_IN_PROGRESS"}), 409
     except Exception as e:
         _bp_state().app.logger.exception(f"Prospect chat error: {e}")
         return jsonify({"error": PROSPECT_ERROR}), 500
 
 
+@bp.route("/hint", methods=["GET"])
+def prospect_hint():
+    """Coaching hint for the latest turn; ?wait=N blocks up to N seconds for it"""
+    ps, err = _require_prospect_session()
+    if err:
+        return err
+    assert ps is not None
+
+    try:
+        wait = float(request.args.get("wait", 0))
+    except ValueError:
+        wait = 0.0
+    wait = min(max(wait, 0.0), PROSPECT_HINT_MAX_WAIT_SECONDS)
+    return jsonify({"success": True, **ps.get_coaching_hint(timeout=wait)})
+
+
 @bp.route("/state", methods=["GET"])
 def prospect_state():
     """Get current prospect session state"""
@@ -226,13 +276,87 @@ def prospect_evaluate():
     assert ps is not None
 
     try:
-        evaluation = ps.get_evaluation()
+        data = request.get_json(silent=True) or {}
+        evaluation = ps.get_evaluation(use_cache=not data.get("fresh"))
         return jsonify({"success": True, **evaluation})
     except Exception as e:
         _bp_state().app.logger.exception(f"Prospect evaluation error: {e}")
         return jsonify({"error": PROSPECT_SCORING_ERROR}), 500
 
 
+@bp.route("/evaluate/batch", methods=["POST"])
+@require_admin
+def prospect_evaluate_batch():
+    """Grade a cohort of sessions and/or exported transcripts, streaming NDJSON progress.
+
+    Body: {"session_ids": [...], "transcripts": [...], "job_id": "...",
+    "narratives": true, "provider": "..."}. Re-posting with the same job_id
+    replays complete results and only re-runs the rest.
+    """
+    from core.services.batch_evaluation import (
+        JOB_ID_PATTERN,
+        item_from_record,
+        item_from_session,
+        run_batch,
+    )
+
+    data = request.get_json(silent=True) or {}
+    session_ids = [str(s) for s in data.get("session_ids") or [] if s]
+    transcripts = [t for t in data.get("transcripts") or [] if isinstance(t, dict)]
+    if not session_ids and not transcripts:
+        return jsonify({"error": BATCH_EVALUATION_EMPTY}), 400
+    if len(session_ids) + len(transcripts) > BATCH_EVALUATION_MAX_ITEMS:
+        return jsonify({"error": batch_evaluation_too_large(BATCH_EVALUATION_MAX_ITEMS)}), 400
+    job_id = data.get("job_id")
+    if job_id is not None and not JOB_ID_PATTERN.match(str(job_id)):
+        return jsonify({"error": INVALID_JOB_ID}), 400
+    provider_name = InputValidator.normalize_provider(data.get("provider"))
+    if provider_name is not None and provider_name not in supported_provider_names(include_non_production=False):
+        return jsonify({"error": "Unsupported provider", "code": "UNSUPPORTED_PROVIDER"}), 400
+
+    items, missing = [], []
+    manager = _bp_state().prospect_session_manager
+    for session_id in session_ids:
+        ps = manager.get(session_id)
+        if ps is None:
+            missing.append(session_id)
+        else:
+            items.append(item_from_session(session_id, ps))
+    items.extend(item_from_record(record, index) for index, record in enumerate(transcripts))
+
+    narratives = bool(data.get("narratives", True))
+    default_provider = None
+    if narratives:
+        try:
+            from core.providers.factory import create_provider
+
+            default_provider = create_provider(provider_name)
+        except Exception as e:
+            # Live sessions still use their own provider; transcripts fall back to deterministic
+            _bp_state().app.logger.warning(f"Batch evaluation provider unavailable: {e}")
+
+    events = run_batch(
+        items,
+        job_id=str(job_id) if job_id else None,
+        missing=missing,
+        narratives=narratives,
+        default_provider=default_provider,
+    )
+
+    def _body():
+        try:
+            for event in events:
+                yield json.dumps(event, ensure_ascii=False, default=str) + "\n"
+        finally:
+            events.close()
+
+    return Response(
+        _body(),
+        mimetype="application/x-ndjson",
+        headers={"Cache-Control": "no-store", "X-Accel-Buffering": "no"},
+    )
+
+
 @bp.route("/reset", methods=["POST"])
 @require_rate_limit("prospect")
 def prospect_reset():
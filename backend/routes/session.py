@@ -13,8 +13,10 @@ from core.chatbot import SalesChatbot
 from core.constants import UNDETERMINED_STAGE
 from core.content import generate_init_greeting
 from core.loader import QuickMatcher
-from core.providers import get_available_providers
 from core.providers.factory import supported_provider_names
+from core.providers.stt.deepgram import DeepgramSTTProvider
+from core.services.provider_status import get_provider_status_monitor
+from ..http_cache import PayloadCache, json_body, send_precomputed
 from ..messages import (
     SERVER_FULL,
     BOT_INIT_FAILED,
@@ -35,6 +37,7 @@ from ..security import (
 logger = logging.getLogger(__name__)
 
 bp: Any = Blueprint("session", __name__, url_prefix="/api")
+_config_payloads = PayloadCache()
 
 
 def init_routes(
@@ -203,8 +206,12 @@ def api_health():
             active_provider = bot.provider_name
             active_model = bot.model_name
 
-    # Get available providers
-    provider_status = get_available_providers()
+    # Availability comes from the cached snapshot; outcome state is live
+    status = get_provider_status_monitor().snapshot()
+    provider_health = {
+        **PerformanceTracker.get_provider_health(),
+        "deepgram": {"cooldown_seconds": DeepgramSTTProvider.cooldown_remaining()},
+    }
 
     # Get aggregate performance stats
     perf_stats = PerformanceTracker.get_provider_stats()
@@ -213,20 +220,26 @@ def api_health():
         {
             "ok": True,
             "active": {"provider": active_provider, "model": active_model},
-            "available_providers": provider_status,
+            "available_providers": status.get("llm", []),
+            "audio_providers": {"stt": status.get("stt", []), "tts": status.get("tts", [])},
+            "provider_health": provider_health,
+            "status_age_seconds": status["age_seconds"],
             "performance_stats": perf_stats,
         }
     )
 
 
-@bp.route("/config", methods=["GET"])
-def api_config():
-    """Expose config metadata (products, limits, strategies) for the frontend"""
-    from core.loader import load_product_config
-    from ..security import SecurityConfig
+def _flow_controls_enabled() -> bool:
+    return not bool(
+        bp.app.config.get(  # type: ignore[attr-defined]
+            "REQUIRE_ADMIN_FOR_STAGE_MUTATION",
+            os.environ.get("REQUIRE_ADMIN_FOR_STAGE_MUTATION", False),
+        )
+    )
 
-    config = load_product_config()
-    products = config.get("products", {})
+
+def _build_config_payload(products: dict, flow_controls_enabled: bool) -> dict:
+    from ..security import SecurityConfig
 
     # Expose product options for frontend use
     product_strategies = {k: v.get("strategy", "intent") for k, v in products.items()}
@@ -239,36 +252,55 @@ def api_config():
         for k, v in products.items()
     ]
 
-    return jsonify(
-        {
-            "ok": True,
-            "limits": {
-                "max_message_length": SecurityConfig.MAX_MESSAGE_LENGTH,
-                "max_field_length": SecurityConfig.MAX_FIELD_LENGTH,
-                "max_sessions": SecurityConfig.MAX_SESSIONS,
+    return {
+        "ok": True,
+        "limits": {
+            "max_message_length": SecurityConfig.MAX_MESSAGE_LENGTH,
+            "max_field_length": SecurityConfig.MAX_FIELD_LENGTH,
+            "max_sessions": SecurityConfig.MAX_SESSIONS,
+        },
+        "rate_limits": {
+            "init": {
+                "requests": SecurityConfig.RATE_LIMITS["init"][0],
+                "window_seconds": SecurityConfig.RATE_LIMITS["init"][1],
             },
-            "rate_limits": {
-                "init": {
-                    "requests": SecurityConfig.RATE_LIMITS["init"][0],
-                    "window_seconds": SecurityConfig.RATE_LIMITS["init"][1],
-                },
-                "chat": {
-                    "requests": SecurityConfig.RATE_LIMITS["chat"][0],
-                    "window_seconds": SecurityConfig.RATE_LIMITS["chat"][1],
-                },
+            "chat": {
+                "requests": SecurityConfig.RATE_LIMITS["chat"][0],
+                "window_seconds": SecurityConfig.RATE_LIMITS["chat"][1],
             },
-            "product_options": product_options,
-            "strategies": ["consultative", "transactional"],
-            "features": {
-                "flow_controls_enabled": not bool(
-                    bp.app.config.get(  # type: ignore[attr-defined]
-                        "REQUIRE_ADMIN_FOR_STAGE_MUTATION",
-                        os.environ.get("REQUIRE_ADMIN_FOR_STAGE_MUTATION", False),
-                    )
-                ),
-            },
-        }
+        },
+        "product_options": product_options,
+        "strategies": ["consultative", "transactional"],
+        "features": {"flow_controls_enabled": flow_controls_enabled},
+    }
+
+
+@bp.route("/config", methods=["GET"])
+def api_config():
+    """Expose config metadata (products, limits, strategies) for the frontend.
+
+    Serialized once per config version and served with a strong ETag.
+    """
+    from core.loader import load_product_config
+    from ..security import SecurityConfig
+
+    products = load_product_config().get("products", {})
+    flow_controls_enabled = _flow_controls_enabled()
+    version = (
+        products,
+        flow_controls_enabled,
+        SecurityConfig.MAX_MESSAGE_LENGTH,
+        SecurityConfig.MAX_FIELD_LENGTH,
+        SecurityConfig.MAX_SESSIONS,
+        SecurityConfig.RATE_LIMITS["init"],
+        SecurityConfig.RATE_LIMITS["chat"],
+    )
+    payload = _config_payloads.get(
+        "config",
+        version,
+        lambda: json_body(bp.app, _build_config_payload(products, flow_controls_enabled)),  # type: ignore[attr-defined]
     )
+    return send_precomputed(payload)
 
 
 @bp.route("/stages", methods=["GET"])
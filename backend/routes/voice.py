@@ -0,0 +1,377 @@
+"""Voice mode endpoints - spoken chat turns and streamed speech synthesis"""
+
+import base64
+import json
+import threading
+import time
+
+from flask import Blueprint, Response, jsonify, request, send_file, stream_with_context
+
+from core.constants import MAX_AUDIO_SIZE_BYTES, MAX_TTS_TEXT_LENGTH
+from core.providers import create_cached_tts_provider, create_stt_provider
+from core.providers.base import AudioStreamError
+from core.providers.tts.edge import DEFAULT_VOICE_MAP
+from core.providers.tts.streaming import split_sentences, stream_sentences
+from ._utils import safe_latency_ms
+from ..messages import GENERIC_ERROR, TURN_IN_PROGRESS, VOICE_ERROR, VOICE_TTS_ERROR
+from ..security import TurnGateTimeout, get_turn_gate, require_rate_limit
+
+bp = Blueprint("voice", __name__, url_prefix="/api")
+
+MAX_TTS_RATE = 50  # Edge accepts +-100%, beyond +-50% speech stops sounding natural
+AUDIO_READ_CHUNK_BYTES = 64 * 1024
+_AUDIO_EXTENSIONS = {
+    "audio/webm": ".webm",
+    "audio/wav": ".wav",
+    "audio/x-wav": ".wav",
+    "audio/mpeg": ".mp3",
+    "audio/mp4": ".m4a",
+    "audio/ogg": ".ogg",
+}
+_STREAM_HEADERS = {"Cache-Control": "no-store", "X-Accel-Buffering": "no"}
+
+# Providers are reused across requests: Edge keeps its event-loop thread per instance
+_providers: dict = {}
+_providers_lock = threading.Lock()
+
+
+def init_routes(app, require_session_func, validate_message_func, bot_state_func):
+    """Initialize voice routes with Flask app and callback functions"""
+    bp.app = app  # type: ignore[attr-defined]
+    bp.require_session = require_session_func  # type: ignore[attr-defined]
+    bp.validate_message = validate_message_func  # type: ignore[attr-defined]
+    bp.bot_state = bot_state_func  # type: ignore[attr-defined]
+
+
+def _cached_provider(kind, factory):
+    with _providers_lock:
+        provider = _providers.get(kind)
+        if provider is None or not provider.is_available():
+            provider = factory()
+            _providers[kind] = provider
+        return provider
+
+
+def _tts_provider():
+    return _cached_provider("tts", create_cached_tts_provider)
+
+
+def _stt_provider():
+    return _cached_provider("stt", create_stt_provider)
+
+
+def _voice_options(source) -> tuple[str, int]:
+    """Pick voice and speaking rate from JSON or form data, clamped to supported values."""
+    voice = str(source.get("voice") or "male_us")
+    if voice not in DEFAULT_VOICE_MAP:
+        voice = "male_us"
+    try:
+        rate = int(source.get("rate") or 0)
+    except (TypeError, ValueError):
+        rate = 0
+    return voice, max(-MAX_TTS_RATE, min(MAX_TTS_RATE, rate))
+
+
+def _ndjson(record: dict) -> bytes:
+    return (json.dumps(record) + "\n").encode("utf-8")
+
+
+class _BoundedAudioReader:
+    """Iterate a request body in chunks without buffering it; stops past MAX_AUDIO_SIZE_BYTES."""
+
+    def __init__(self, stream, limit: int = MAX_AUDIO_SIZE_BYTES):
+        self.stream = stream
+        self.limit = limit
+        self.total = 0
+        self.exceeded = False
+
+    def __iter__(self):
+        while True:
+            chunk = self.stream.read(AUDIO_READ_CHUNK_BYTES)
+            if not chunk:
+                return
+            self.total += len(chunk)
+            if self.total > self.limit:
+                self.exceeded = True
+                return
+            yield chunk
+
+
+def _is_raw_audio() -> bool:
+    return request.mimetype.startswith("audio/")
+
+
+def _raw_audio_filename() -> str:
+    return "audio" + _AUDIO_EXTENSIONS.get(request.mimetype, ".webm")
+
+
+def _transcription_error(result):
+    """Map a failed or empty transcription to an error response, else None."""
+    if result.error or not (result.text or "").strip():
+        if result.error:
+            bp.app.logger.warning(f"Voice transcription failed: {result.error}")  # type: ignore
+        return jsonify({"error": VOICE_ERROR, "code": "STT_FAILED"}), 422
+    return None
+
+
+def _available_stt_provider():
+    """Return (provider, error_response)."""
+    provider = _stt_provider()
+    if not provider.is_available():
+        return None, (jsonify({"error": VOICE_ERROR, "code": "STT_UNAVAILABLE"}), 503)
+    return provider, None
+
+
+def _transcribe_upload(upload):
+    """Run an uploaded recording through STT. Returns (text, error_response)."""
+    audio_bytes = upload.read(MAX_AUDIO_SIZE_BYTES + 1)
+    if not audio_bytes:
+        return None, (jsonify({"error": "Audio required"}), 400)
+    if len(audio_bytes) > MAX_AUDIO_SIZE_BYTES:
+        return None, (jsonify({"error": "Audio too large"}), 413)
+
+    provider, error = _available_stt_provider()
+    if error:
+        return None, error
+    result = provider.transcribe(audio_bytes, filename=upload.filename or "audio.webm")
+    error = _transcription_error(result)
+    return (None, error) if error else (result.text.strip(), None)
+
+
+def _transcribe_body():
+    """Stream a raw audio request body through STT as it uploads. Returns (text, error_response)."""
+    if (request.content_length or 0) > MAX_AUDIO_SIZE_BYTES:
+        return None, (jsonify({"error": "Audio too large"}), 413)
+    provider, error = _available_stt_provider()
+    if error:
+        return None, error
+
+    reader = _BoundedAudioReader(request.stream)
+    result = provider.transcribe_stream(reader, filename=_raw_audio_filename())
+    if reader.exceeded:
+        return None, (jsonify({"error": "Audio too large"}), 413)
+    if reader.total == 0:
+        return None, (jsonify({"error": "Audio required"}), 400)
+    error = _transcription_error(result)
+    return (None, error) if error else (result.text.strip(), None)
+
+
+@bp.route("/tts/stream", methods=["POST"])
+@require_rate_limit("voice")
+def tts_stream():
+    """Stream synthesized speech for text as raw audio, chunk by chunk"""
+    data = request.get_json(silent=True) or {}
+    text = str(data.get("text") or "").strip()
+    if not text:
+        return jsonify({"error": "Text required"}), 400
+    if len(text) > MAX_TTS_TEXT_LENGTH:
+        return jsonify({"error": f"Text too long (max {MAX_TTS_TEXT_LENGTH} characters)"}), 400
+    voice, rate = _voice_options(data)
+
+    provider = _tts_provider()
+    if not provider.is_available():
+        return jsonify({"error": VOICE_TTS_ERROR, "code": "TTS_UNAVAILABLE"}), 503
+
+    sentences = split_sentences(text)
+    lookup = getattr(provider, "lookup", None)
+    cached = lookup(sentences[0], voice=voice, rate=rate) if callable(lookup) and len(sentences) == 1 else None
+    if cached is not None and cached.path is not None:
+        # Whole clip already on disk: let the WSGI server sendfile() it
+        response = send_file(cached.path, mimetype=cached.content_type, conditional=True)
+        response.headers.update(_STREAM_HEADERS)
+        return response
+
+    audio = stream_sentences(provider, sentences, voice=voice, rate=rate)
+    # Pull the first chunk before committing to a 200 so early failures get a real status
+    try:
+        first_chunk = next(audio, b"")
+    except AudioStreamError as e:
+        bp.app.logger.warning(f"TTS stream failed: {e}")  # type: ignore
+        return jsonify({"error": VOICE_TTS_ERROR, "code": "TTS_FAILED"}), 502
+
+    def _body():
+        # WSGI wants bytes; cache hits stream memoryviews, copied here (a no-op for bytes)
+        try:
+            if first_chunk:
+                yield bytes(first_chunk)
+            yield from map(bytes, audio)
+        except AudioStreamError as e:
+            # Headers are gone; the client sees a truncated clip
+            bp.app.logger.warning(f"TTS stream interrupted: {e}")  # type: ignore
+        finally:
+            audio.close()
+
+    return Response(_body(), mimetype=provider.stream_content_type, headers=_STREAM_HEADERS)
+
+
+@bp.route("/voice/chat", methods=["POST"])
+@require_rate_limit("voice")
+def voice_chat():
+    """Run one spoken turn: audio (or text) in, NDJSON reply metadata + audio chunks out.
+
+    Stream records, one JSON object per line:
+        {"type": "reply", ...}   bot text and state, same fields as /api/chat
+        {"type": "audio", ...}   base64 audio chunk, in playback order
+        {"type": "error", ...}   speech failed; the text reply still stands
+        {"type": "done", ...}    timings, including time-to-first-audio
+    """
+    started = time.perf_counter()
+    session_bot, error = bp.require_session()  # type: ignore
+    if error:
+        return error
+
+    upload = request.files.get("audio")
+    if upload is not None or request.form:
+        source = request.form
+    elif _is_raw_audio():
+        source = request.args
+    else:
+        source = request.get_json(silent=True) or {}
+    voice, rate = _voice_options(source)
+
+    transcript = None
+    if upload is not None:
+        transcript, error = _transcribe_upload(upload)
+    elif _is_raw_audio():
+        # Raw audio body: forwarded to STT while it is still uploading
+        transcript, error = _transcribe_body()
+    if error:
+        return error
+    user_message, error = bp.validate_message(transcript or source.get("message", ""))  # type: ignore
+    if error:
+        return error
+
+    def _run_turn():
+        # No training pass here: voice mode optimises for time-to-first-audio
+        response = session_bot.chat(user_message)
+        return {
+            "success": True,
+            "message": response.content,
+            **bp.bot_state(session_bot),  # type: ignore
+            "latency_ms": safe_latency_ms(response.latency_ms),
+            "provider": response.provider,
+            "model": response.model,
+        }
+
+    try:
+        payload, _coalesced = get_turn_gate("chat").run(
+            request.headers.get("X-Session-ID"), ("voice", user_message), _run_turn
+        )
+    except TurnGateTimeout:
+        return jsonify({"error": TURN_IN_PROGRESS, "code": "TURN_IN_PROGRESS"}), 409
+    except Exception as e:
+        bp.app.logger.exception(f"Voice chat error: {e}")  # type: ignore
+        return jsonify({"error": GENERIC_ERROR}), 500
+
+    provider = _tts_provider()
+    logger = bp.app.logger  # type: ignore
+
+    def _body():
+        reply = {"type": "reply", **payload}
+        if transcript is not None:
+            reply["transcript"] = transcript
+        yield _ndjson(reply)
+
+        first_audio_ms = None
+        audio_bytes = 0
+        if not provider.is_available():
+            yield _ndjson({"type": "error", "error": VOICE_TTS_ERROR, "code": "TTS_UNAVAILABLE"})
+        else:
+            audio = stream_sentences(provider, split_sentences(payload["message"]), voice=voice, rate=rate)
+            try:
+                for seq, chunk in enumerate(audio):
+                    if first_audio_ms is None:
+                        first_audio_ms = (time.perf_counter() - started) * 1000
+                    audio_bytes += len(chunk)
+                    yield _ndjson({"type": "audio", "seq": seq, "data": base64.b64encode(chunk).decode("ascii")})
+            except AudioStreamError as e:
+                logger.warning(f"Voice TTS failed: {e}")
+                yield _ndjson({"type": "error", "error": VOICE_TTS_ERROR, "code": "TTS_FAILED"})
+            finally:
+                audio.close()
+
+        yield _ndjson(
+            {
+                "type": "done",
+                "audio_content_type": provider.stream_content_type,
+                "audio_bytes": audio_bytes,
+                "first_audio_ms": safe_latency_ms(first_audio_ms),
+                "total_ms": safe_latency_ms((time.perf_counter() - started) * 1000),
+            }
+        )
+
+    return Response(_body(), mimetype="application/x-ndjson", headers=_STREAM_HEADERS)
+
+
+@bp.route("/voice/transcribe", methods=["POST"])
+@require_rate_limit("voice")
+def voice_transcribe():
+    """Transcribe a raw audio body (Content-Type: audio/*) while it uploads.
+
+    Default: one JSON result. With ?partials=1 the response is NDJSON:
+        {"type": "transcript", "text", "is_final", "speech_final"}   as results arrive
+        {"type": "error", ...}                                       transcription failed
+        {"type": "done", "text", "latency_ms"}                       joined final segments
+    """
+    _session_bot, error = bp.require_session()  # type: ignore
+    if error:
+        return error
+    if not _is_raw_audio():
+        return jsonify({"error": "Send audio as the request body with an audio/* Content-Type"}), 415
+    if (request.content_length or 0) > MAX_AUDIO_SIZE_BYTES:
+        return jsonify({"error": "Audio too large"}), 413
+
+    if request.args.get("partials") not in ("1", "true"):
+        started = time.perf_counter()
+        text, error = _transcribe_body()
+        if error:
+            return error
+        return jsonify(
+            {
+                "success": True,
+                "text": text,
+                "latency_ms": safe_latency_ms((time.perf_counter() - started) * 1000),
+            }
+        )
+
+    provider, error = _available_stt_provider()
+    if error:
+        return error
+    reader = _BoundedAudioReader(request.stream)
+    events = provider.stream_transcribe(reader, filename=_raw_audio_filename())
+    logger = bp.app.logger  # type: ignore
+
+    def _body():
+        started = time.perf_counter()
+        finals = []
+        try:
+            for event in events:
+                if event.is_final and event.text:
+                    finals.append(event.text)
+                yield _ndjson(
+                    {
+                        "type": "transcript",
+                        "text": event.text,
+                        "is_final": event.is_final,
+                        "speech_final": event.speech_final,
+                    }
+                )
+        except AudioStreamError as e:
+            logger.warning(f"Live transcription failed: {e}")
+            yield _ndjson({"type": "error", "error": VOICE_ERROR, "code": "STT_FAILED"})
+            return
+        finally:
+            events.close()
+        if reader.exceeded:
+            yield _ndjson({"type": "error", "error": "Audio too large", "code": "AUDIO_TOO_LARGE"})
+            return
+        yield _ndjson(
+            {
+                "type": "done",
+                "text": " ".join(finals),
+                "latency_ms": safe_latency_ms((time.perf_counter() - started) * 1000),
+            }
+        )
+
+    # The upload is read while the response streams; keep the request open until then
+    return Response(stream_with_context(_body()), mimetype="application/x-ndjson", headers=_STREAM_HEADERS)
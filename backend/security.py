@@ -7,9 +7,11 @@ import re
 import threading
 import time
 from collections import defaultdict, deque
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
 from datetime import datetime, timedelta
 from functools import wraps
-from typing import Any, Callable, Dict, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from core.constants import MAX_FIELD_LENGTH as CHATBOT_MAX_FIELD_LENGTH
 from .messages import RATE_LIMIT_ERROR
@@ -26,6 +28,7 @@ class SecurityConfig:
     MAX_SESSIONS = 200
     SESSION_IDLE_MINUTES = 60
     CLEANUP_INTERVAL_SECONDS = 900  # 15 minutes
+    TURN_WAIT_TIMEOUT_SECONDS = 45  # Max wait for an earlier turn on the same session
     TRUST_PROXY_HEADERS = False
 
     # Message validation
@@ -40,6 +43,7 @@ class SecurityConfig:
         "knowledge": (10, 60),
         "prospect": (30, 60),
         "feedback": (5, 300),
+        "voice": (30, 60),
     }
 
     # Security headers
@@ -159,6 +163,31 @@ def require_privileged_mutation(f: Callable) -> Callable:
     return wrapper
 
 
+def require_admin(f: Callable) -> Callable:
+    """Guard admin-only routes (reports, batch jobs) behind the admin token.
+
+    Unlike require_privileged_mutation this is always on: without ADMIN_TOKEN
+    configured the route is closed. Bypassed when Flask TESTING is true.
+    """
+
+    @wraps(f)
+    def wrapper(*args, **kwargs):
+        from flask import current_app, jsonify, request
+
+        from .messages import ADMIN_TOKEN_REQUIRED
+
+        if current_app.config.get("TESTING"):
+            return f(*args, **kwargs)
+
+        if not has_valid_admin_token(request, current_app.config):
+            logger.warning("Blocked admin path=%s", request.path)
+            return jsonify({"error": ADMIN_TOKEN_REQUIRED}), 403
+
+        return f(*args, **kwargs)
+
+    return wrapper
+
+
 def has_valid_admin_token(request_obj, config_obj) -> bool:
     admin_token = os.environ.get("ADMIN_TOKEN") or config_obj.get("ADMIN_TOKEN")
     token = request_obj.headers.get("X-Admin-Token") or request_obj.headers.get("Authorization", "")
@@ -208,7 +237,8 @@ class SecurityHeadersMiddleware:
         if response.direct_passthrough:
             return response
         from flask import request
-        if request.path.startswith("/api/"):
+        # Routes that set their own policy (ETag-revalidated payloads) keep it
+        if request.path.startswith("/api/") and "Cache-Control" not in response.headers:
             response.headers["Cache-Control"] = "no-store, max-age=0"
             response.headers["Pragma"] = "no-cache"
         return response
@@ -334,6 +364,19 @@ class SessionSecurityManager:
         self.cleanup_interval = cleanup_interval
         self.manager_name = manager_name
         self._cleanup_started = False
+        self._expiry_hooks: List[Callable[[str], None]] = []
+
+    def add_expiry_hook(self, hook: Callable[[str], None]) -> None:
+        """Call hook(session_id) whenever a session is expired or deleted"""
+        self._expiry_hooks.append(hook)
+
+    def _notify_expired(self, session_ids) -> None:
+        for session_id in session_ids:
+            for hook in self._expiry_hooks:
+                try:
+                    hook(session_id)
+                except Exception as e:
+                    logger.error("Expiry hook failed for %s: %s", self.manager_name, e)
 
     def get(self, session_id: str) -> Optional[Any]:
         with self._lock:
@@ -349,7 +392,9 @@ class SessionSecurityManager:
 
     def delete(self, session_id: str) -> None:
         with self._lock:
-            self._sessions.pop(session_id, None)
+            removed = self._sessions.pop(session_id, None)
+        if removed is not None:
+            self._notify_expired([session_id])
 
     def can_create(self) -> bool:
         with self._lock:
@@ -370,7 +415,9 @@ class SessionSecurityManager:
                 del self._sessions[sid]
             if expired_ids:
                 logger.info("Cleaned up %d idle %s", len(expired_ids), self.manager_name)
-            return len(expired_ids)
+        # Hooks run outside the lock so they can take their own
+        self._notify_expired(expired_ids)
+        return len(expired_ids)
 
     def start_background_cleanup(self) -> None:
         with self._lock:
@@ -391,6 +438,133 @@ class SessionSecurityManager:
         logger.info("Started cleanup thread for %s (interval: %ss)", self.manager_name, self.cleanup_interval)
 
 
+class TurnGateTimeout(Exception):
+    """Raised when a turn waits longer than the gate allows for its session"""
+
+
+class _SessionTurnQueue:
+    """Ticket queue plus in-flight submissions for one session"""
+
+    __slots__ = ("cond", "next_ticket", "serving", "abandoned", "inflight", "users")
+
+    def __init__(self):
+        self.cond = threading.Condition()
+        self.next_ticket = 0
+        self.serving = 0
+        self.abandoned: set = set()
+        self.inflight: Dict[Any, Future] = {}
+        self.users = 0
+
+
+class SessionTurnGate:
+    """Serialize state-mutating turns per session and coalesce duplicate submits.
+
+    A submission whose key matches one already in flight for the same session
+    shares that result instead of running the turn again (double-click, client
+    retry after a timeout). Different submissions run one at a time in arrival
+    order; a waiter gives up with TurnGateTimeout after `wait_timeout` seconds.
+    """
+
+    def __init__(self, wait_timeout: float = SecurityConfig.TURN_WAIT_TIMEOUT_SECONDS):
+        self.wait_timeout = wait_timeout
+        self._queues: Dict[Any, _SessionTurnQueue] = {}
+        self._lock = threading.Lock()
+        self.coalesced_count = 0
+        self.timeout_count = 0
+
+    def run(self, session_id: Any, key: Any, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """Run fn() as the next turn for session_id. Returns (result, coalesced)."""
+        with self._lock:
+            queue = self._queues.get(session_id)
+            if queue is None:
+                queue = _SessionTurnQueue()
+                self._queues[session_id] = queue
+            queue.users += 1
+            future = queue.inflight.get(key)
+            is_leader = future is None
+            if future is None:
+                future = Future()
+                queue.inflight[key] = future
+                ticket = queue.next_ticket
+                queue.next_ticket += 1
+            else:
+                self.coalesced_count += 1
+
+        try:
+            if not is_leader:
+                try:
+                    return future.result(timeout=self.wait_timeout), True
+                except FutureTimeoutError:
+                    self._count_timeout()
+                    raise TurnGateTimeout(f"Duplicate turn timed out for session {session_id}")
+
+            try:
+                self._wait_for_turn(queue, ticket)
+            except TurnGateTimeout as exc:
+                future.set_exception(exc)
+                raise
+
+            try:
+                result = fn()
+            except BaseException as exc:
+                future.set_exception(exc)
+                raise
+            finally:
+                self._release_turn(queue)
+            future.set_result(result)
+            return result, False
+        finally:
+            with self._lock:
+                if is_leader and queue.inflight.get(key) is future:
+                    del queue.inflight[key]
+                queue.users -= 1
+                if queue.users == 0 and self._queues.get(session_id) is queue:
+                    del self._queues[session_id]
+
+    def _wait_for_turn(self, queue: _SessionTurnQueue, ticket: int) -> None:
+        deadline = time.monotonic() + self.wait_timeout
+        with queue.cond:
+            while queue.serving != ticket:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    # Leave the ticket behind so later turns skip straight past it
+                    queue.abandoned.add(ticket)
+                    self._count_timeout()
+                    raise TurnGateTimeout(f"Turn queue timed out at ticket {ticket}")
+                queue.cond.wait(remaining)
+
+    @staticmethod
+    def _release_turn(queue: _SessionTurnQueue) -> None:
+        with queue.cond:
+            queue.serving += 1
+            while queue.serving in queue.abandoned:
+                queue.abandoned.discard(queue.serving)
+                queue.serving += 1
+            queue.cond.notify_all()
+
+    def _count_timeout(self) -> None:
+        with self._lock:
+            self.timeout_count += 1
+
+    def active_sessions(self) -> int:
+        with self._lock:
+            return len(self._queues)
+
+
+_turn_gates: Dict[str, SessionTurnGate] = {}
+_turn_gates_lock = threading.Lock()
+
+
+def get_turn_gate(scope: str = "chat") -> SessionTurnGate:
+    """Process-wide turn gate for a session scope (chat, prospect)"""
+    with _turn_gates_lock:
+        gate = _turn_gates.get(scope)
+        if gate is None:
+            gate = SessionTurnGate()
+            _turn_gates[scope] = gate
+        return gate
+
+
 def initialize_security(
     app_logger=None,
 ) -> Tuple[RateLimiter, SessionSecurityManager, PromptInjectionValidator]:
@@ -41,6 +41,18 @@ class ConversationState:
         return getattr(self, key, default)
 
 
+@dataclass
+class HistorySignals:
+    """Turn-analysis inputs that depend only on history, not on the next user message"""
+
+    goal_stated: bool  # intent lock from a recent user goal
+    recent_user_text: str  # last two user messages, lowercased, for intent keywords
+    question_fatigue: bool
+    recent_emotional_context: bool  # emotional disclosure in the last 4 messages
+    agreement_context: bool  # substantive user answer + bot question in the last 4 messages
+    last_bot_words: int  # word count of the latest assistant message
+
+
 ANALYSIS_CONFIG = load_analysis_config()
 THRESHOLDS = ANALYSIS_CONFIG["thresholds"]
 SIGNALS = load_signals()
@@ -190,17 +202,24 @@ def flatten_keywords(keywords):
     return []
 
 
-def classify_intent_level(history, user_message="", signal_keywords=None) -> str:
+def classify_intent_level(history, user_message="", signal_keywords=None, history_signals=None) -> str:
     if signal_keywords is None:
         signal_keywords = SIGNALS
 
-    if has_user_stated_clear_goal(history):
+    if history_signals is not None:
+        goal_stated = history_signals.goal_stated
+        recent_user_text = history_signals.recent_user_text
+    else:
+        goal_stated = has_user_stated_clear_goal(history)
+        recent_user_text = extract_recent_user_text(history, 2)
+
+    if goal_stated:
         return "high"
 
     if not (user_message or history):
         return "medium"
 
-    recent_text = (user_message + " " + extract_recent_user_text(history, 2)).lower()
+    recent_text = (user_message + " " + recent_user_text).lower()
 
     # check categories in configured priority order
     priority = signal_keywords.get(
@@ -241,7 +260,39 @@ def classify_intent_level(history, user_message="", signal_keywords=None) -> str
     return "medium"
 
 
-def detect_guardedness(user_message: str, history: list[dict[str, str]]) -> float:
+def _agreement_context(history: list[dict[str, str]]) -> bool:
+    """True when a substantive user answer and a bot question sit in the last 4 messages"""
+    if len(history) < 2:
+        return False
+    recent_msgs = history[-4:]
+    has_substantive_user = any(
+        m.get("role") == "user" and len(m.get("content", "").split()) >= 8
+        for m in recent_msgs
+    )
+    has_bot_question = any(
+        m.get("role") == "assistant" and "?" in m.get("content", "")
+        for m in recent_msgs
+    )
+    return has_substantive_user and has_bot_question
+
+
+def _last_bot_word_count(history: list[dict[str, str]]) -> int:
+    last_bot = next(
+        (
+            m.get("content", "")
+            for m in reversed(history)
+            if m.get("role") == "assistant"
+        ),
+        "",
+    )
+    return len(last_bot.split())
+
+
+def detect_guardedness(
+    user_message: str,
+    history: list[dict[str, str]],
+    history_signals: HistorySignals | None = None,
+) -> float:
     """Guardedness score 0.0–1.0; agreement-after-answer treated as not guarded"""
     if not user_message:
         return 0.0
@@ -250,17 +301,13 @@ def detect_guardedness(user_message: str, history: list[dict[str, str]]) -> floa
     msg_length = len(user_message.split())
 
     # substantive reply → bot question → "ok" = agreement, not guarded
-    if msg_lower in _AGREEMENT_WORDS and len(history) >= 2:
-        recent_msgs = history[-4:]
-        has_substantive_user = any(
-            m.get("role") == "user" and len(m.get("content", "").split()) >= 8
-            for m in recent_msgs
-        )
-        has_bot_question = any(
-            m.get("role") == "assistant" and "?" in m.get("content", "")
-            for m in recent_msgs
+    if msg_lower in _AGREEMENT_WORDS:
+        agreement_context = (
+            history_signals.agreement_context
+            if history_signals is not None
+            else _agreement_context(history)
         )
-        if has_substantive_user and has_bot_question:
+        if agreement_context:
             return 0.0
 
     # single-word dismissals
@@ -282,37 +329,71 @@ def detect_guardedness(user_message: str, history: list[dict[str, str]]) -> floa
 
     # short reply to a long question bumps the score
     if history:
-        last_bot = next(
-            (
-                m.get("content", "")
-                for m in reversed(history)
-                if m.get("role") == "assistant"
-            ),
-            "",
+        last_bot_words = (
+            history_signals.last_bot_words
+            if history_signals is not None
+            else _last_bot_word_count(history)
         )
-        if len(last_bot.split()) > 50 and msg_length < 8:
+        if last_bot_words > 50 and msg_length < 8:
             score *= 1.4
 
     return min(score, 1.0)
 
 
+def _question_fatigue(history: list[dict[str, str]]) -> bool:
+    if not history:
+        return False
+    recent_bot = [m["content"] for m in history[-4:] if m["role"] == "assistant"]
+    return (
+        sum(1 for msg in recent_bot if "?" in msg)
+        >= THRESHOLDS["question_fatigue_threshold"]
+    )
+
+
+def _recent_emotional_context(history: list[dict[str, str]]) -> bool:
+    emotional_keywords = SIGNALS.get("emotional_disclosure", [])
+    recent_user = [
+        m["content"].lower() for m in history[-4:] if m["role"] == "user"
+    ] if history else []
+    return any(
+        contains_nonnegated_keyword(m, emotional_keywords) for m in recent_user
+    )
+
+
+def analyse_history(history: list[dict[str, str]]) -> HistorySignals:
+    """Precompute the history-only half of analyse_state and detect_ack_context.
+
+    Everything here is known once a reply has been sent, so it can be built
+    before the next user message arrives.
+    """
+    return HistorySignals(
+        goal_stated=has_user_stated_clear_goal(history),
+        recent_user_text=extract_recent_user_text(history, 2),
+        question_fatigue=_question_fatigue(history),
+        recent_emotional_context=_recent_emotional_context(history),
+        agreement_context=_agreement_context(history),
+        last_bot_words=_last_bot_word_count(history) if history else 0,
+    )
+
+
 def analyse_state(
     history: list[dict[str, str]],
     user_message: str = "",
     signal_keywords: dict[str, Any] | None = None,
+    history_signals: HistorySignals | None = None,
 ) -> ConversationState:
     """Build conversation state from the current turn"""
     if signal_keywords is None:
         signal_keywords = SIGNALS
 
     intent = classify_intent_level(
-        history, user_message, signal_keywords=signal_keywords
+        history, user_message, signal_keywords=signal_keywords, history_signals=history_signals
     )
 
     # guardedness
     guardedness_level = 0.0
     if user_message:
-        guardedness_level = detect_guardedness(user_message, history)
+        guardedness_level = detect_guardedness(user_message, history, history_signals)
     guarded = guardedness_level > 0.4
 
     # decisiveness
@@ -327,13 +408,11 @@ def analyse_state(
         decisive = (has_commitment or has_high_intent) and not guarded
 
     # question fatigue
-    question_fatigue = False
-    if history:
-        recent_bot = [m["content"] for m in history[-4:] if m["role"] == "assistant"]
-        question_fatigue = (
-            sum(1 for msg in recent_bot if "?" in msg)
-            >= THRESHOLDS["question_fatigue_threshold"]
-        )
+    question_fatigue = (
+        history_signals.question_fatigue
+        if history_signals is not None
+        else _question_fatigue(history)
+    )
 
     advancement_config = ANALYSIS_CONFIG.get("advancement", {})
     user_lower = (user_message or "").lower()
@@ -476,6 +555,7 @@ def detect_ack_context(
     user_message: str,
     history: list[dict[str, str]],
     state: ConversationState,
+    history_signals: HistorySignals | None = None,
 ) -> str:
     """Choose ack level: 'full' | 'light' | 'none'"""
     if not user_message:
@@ -484,11 +564,10 @@ def detect_ack_context(
     msg_lower = user_message.lower()
     word_count = len(user_message.split())
     emotional_keywords = SIGNALS.get("emotional_disclosure", [])
-    recent_user = [
-        m["content"].lower() for m in history[-4:] if m["role"] == "user"
-    ] if history else []
-    recent_emotional_context = any(
-        contains_nonnegated_keyword(m, emotional_keywords) for m in recent_user
+    recent_emotional_context = (
+        history_signals.recent_emotional_context
+        if history_signals is not None
+        else _recent_emotional_context(history)
     )
 
     if msg_lower in _TERSE_FOLLOW_UPS:
@@ -0,0 +1,232 @@
+"""Append-only columnar store for analytics rows.
+
+A table is a directory holding one raw little-endian file per column plus a
+small schema file. Column kinds:
+
+- "f8": float64, NaN when missing (timestamps are epoch seconds)
+- "i8": int64, INT_MISSING when missing
+- "str": int32 dictionary codes, -1 when missing; the dictionary is a
+  JSON-lines file of values in code order
+
+Appends only ever add bytes to the ends of files, so readers can memory-map
+columns while a writer is active. Appends from several processes are
+serialized with an advisory lock where the platform has one. A crash part
+way through an append leaves some columns longer than others (possibly
+ending in a partial value); readers use the shortest column length, so a
+torn row is simply not visible, and the next append truncates every column
+back to that length before writing so later rows stay aligned.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Iterable, Mapping, Sequence
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows dev machines
+    fcntl = None
+
+SCHEMA_FILE = "_schema.json"
+LOCK_FILE = "_lock"
+INT_MISSING = np.iinfo(np.int64).min
+STR_MISSING = -1
+
+_DTYPES = {"f8": np.dtype("<f8"), "i8": np.dtype("<i8"), "str": np.dtype("<i4")}
+
+
+def _to_float(value: Any) -> float:
+    if value is None or isinstance(value, bool):
+        return math.nan
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value).timestamp()
+        except ValueError:
+            pass
+        try:
+            return float(value)
+        except ValueError:
+            return math.nan
+    return math.nan
+
+
+def _to_int(value: Any) -> int:
+    if value is None or isinstance(value, bool):
+        return INT_MISSING
+    if isinstance(value, int):
+        return value
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, str) and value.strip().lstrip("-").isdigit():
+        return int(value)
+    return INT_MISSING
+
+
+class _Dictionary:
+    """Value <-> code mapping backed by an append-only JSON-lines file."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.values: list[str] = []
+        self.codes: dict[str, int] = {}
+        self._offset = 0
+
+    def sync(self) -> None:
+        """Pick up values appended by other writers since the last sync."""
+        if not self.path.exists():
+            return
+        with open(self.path, "rb") as f:
+            f.seek(self._offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # torn write; ignore until completed
+                self._offset += len(line)
+                value = json.loads(line)
+                self.codes.setdefault(value, len(self.values))
+                self.values.append(value)
+
+    def discard_torn_tail(self) -> None:
+        """Drop a partial last line; call after sync() with the writer lock held."""
+        if self.path.exists() and self.path.stat().st_size > self._offset:
+            os.truncate(self.path, self._offset)
+
+    def encode(self, value: str, new_values: list[str]) -> int:
+        code = self.codes.get(value)
+        if code is None:
+            code = len(self.values)
+            self.codes[value] = code
+            self.values.append(value)
+            new_values.append(value)
+        return code
+
+
+class ColumnarWriter:
+    """Appends rows (dicts) to a columnar table, creating it on first use."""
+
+    def __init__(self, path: str | os.PathLike[str], columns: Sequence[tuple[str, str]]):
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        schema_path = self.path / SCHEMA_FILE
+        if schema_path.exists():
+            # The stored schema wins so every row in a table has the same columns
+            columns = [tuple(column) for column in json.loads(schema_path.read_text("utf-8"))["columns"]]
+        else:
+            tmp_path = schema_path.with_suffix(".tmp")
+            tmp_path.write_text(json.dumps({"version": 1, "columns": [list(c) for c in columns]}), "utf-8")
+            os.replace(tmp_path, schema_path)
+        for name, kind in columns:
+            if kind not in _DTYPES:
+                raise ValueError(f"Unknown column kind {kind!r} for {name}")
+        self.columns = list(columns)
+        self._dictionaries = {
+            name: _Dictionary(self.path / f"{name}.dict") for name, kind in self.columns if kind == "str"
+        }
+        self._lock = threading.Lock()
+
+    def _encode(self, rows: Sequence[Mapping[str, Any]], name: str, kind: str, new_values: list[str]) -> np.ndarray:
+        if kind == "f8":
+            return np.fromiter((_to_float(row.get(name)) for row in rows), dtype=_DTYPES[kind], count=len(rows))
+        if kind == "i8":
+            return np.fromiter((_to_int(row.get(name)) for row in rows), dtype=_DTYPES[kind], count=len(rows))
+        dictionary = self._dictionaries[name]
+        return np.fromiter(
+            (
+                STR_MISSING if row.get(name) is None else dictionary.encode(str(row.get(name)), new_values)
+                for row in rows
+            ),
+            dtype=_DTYPES[kind],
+            count=len(rows),
+        )
+
+    def _truncate_torn_rows(self) -> None:
+        """Cut every column back to the shortest one; call with the lock held."""
+        paths = [(self.path / f"{name}.col", _DTYPES[kind].itemsize) for name, kind in self.columns]
+        sizes = [path.stat().st_size if path.exists() else 0 for path, _itemsize in paths]
+        rows = min(size // itemsize for size, (_path, itemsize) in zip(sizes, paths))
+        for size, (path, itemsize) in zip(sizes, paths):
+            if size != rows * itemsize:
+                os.truncate(path, rows * itemsize)
+
+    def append(self, rows: Iterable[Mapping[str, Any]]) -> int:
+        """Append rows; fields outside the schema are dropped. Returns rows written."""
+        rows = list(rows)
+        if not rows:
+            return 0
+        with self._lock, open(self.path / LOCK_FILE, "a") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            for dictionary in self._dictionaries.values():
+                dictionary.sync()
+                dictionary.discard_torn_tail()
+            self._truncate_torn_rows()
+            encoded = {}
+            for name, kind in self.columns:
+                new_values: list[str] = []
+                encoded[name] = self._encode(rows, name, kind, new_values)
+                if new_values:
+                    dictionary = self._dictionaries[name]
+                    data = "".join(json.dumps(value, ensure_ascii=False) + "\n" for value in new_values)
+                    with open(dictionary.path, "ab") as f:
+                        written = f.write(data.encode("utf-8"))
+                    dictionary._offset += written
+            # Dictionaries first, so a reader never sees a code without its value
+            for name, _kind in self.columns:
+                with open(self.path / f"{name}.col", "ab") as f:
+                    f.write(encoded[name].tobytes())
+        return len(rows)
+
+
+class ColumnarTable:
+    """Read-only view of a columnar table; numeric columns are memory-mapped."""
+
+    def __init__(self, path: str | os.PathLike[str]):
+        self.path = Path(path)
+        schema = json.loads((self.path / SCHEMA_FILE).read_text("utf-8"))
+        self.columns: dict[str, str] = {name: kind for name, kind in schema["columns"]}
+        sizes = []
+        for name, kind in self.columns.items():
+            col_path = self.path / f"{name}.col"
+            size = col_path.stat().st_size if col_path.exists() else 0
+            sizes.append(size // _DTYPES[kind].itemsize)
+        self.rows = min(sizes) if sizes else 0
+        self._dictionaries: dict[str, list[str]] = {}
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def column(self, name: str) -> np.ndarray:
+        """Raw column values (codes for "str" columns)."""
+        dtype = _DTYPES[self.columns[name]]
+        if self.rows == 0:
+            return np.empty(0, dtype=dtype)
+        return np.memmap(self.path / f"{name}.col", dtype=dtype, mode="r", shape=(self.rows,))
+
+    def dictionary(self, name: str) -> list[str]:
+        """Values of a "str" column in code order."""
+        if name not in self._dictionaries:
+            dictionary = _Dictionary(self.path / f"{name}.dict")
+            dictionary.sync()
+            self._dictionaries[name] = dictionary.values
+        return self._dictionaries[name]
+
+    def code(self, name: str, value: str) -> int:
+        """Code for a value in a "str" column, or STR_MISSING if it never occurs."""
+        try:
+            return self.dictionary(name).index(value)
+        except ValueError:
+            return STR_MISSING
+
+    def decode(self, name: str) -> np.ndarray:
+        """A "str" column as an object array (None where missing)."""
+        values = np.array([*self.dictionary(name), None], dtype=object)
+        codes = np.asarray(self.column(name))
+        return values[np.where(codes == STR_MISSING, len(values) - 1, codes)]
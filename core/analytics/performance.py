@@ -1,5 +1,6 @@
 """Minimal performance tracking."""
 
+import time
 from collections import defaultdict
 from typing import TypedDict
 
@@ -12,12 +13,53 @@ class ProviderStats(TypedDict):
     model: str | None
 
 
+class ProviderHealth(TypedDict):
+    """Last-known call outcome per provider, for health probes."""
+
+    last_success_at: float | None
+    last_failure_at: float | None
+    last_error_code: str | None
+    last_rate_limited_at: float | None
+    consecutive_failures: int
+
+
 class PerformanceTracker:
     """Low-friction runtime metrics shim."""
 
     _provider_stats: defaultdict[str, ProviderStats] = defaultdict(
         lambda: {"requests": 0, "total_latency_ms": 0.0, "model": None}
     )
+    _provider_health: defaultdict[str, ProviderHealth] = defaultdict(
+        lambda: {
+            "last_success_at": None,
+            "last_failure_at": None,
+            "last_error_code": None,
+            "last_rate_limited_at": None,
+            "consecutive_failures": 0,
+        }
+    )
+
+    @classmethod
+    def record_outcome(
+        cls, provider: str, *, ok: bool, error_code: str | None = None, rate_limited: bool = False
+    ) -> None:
+        """Record whether a provider call succeeded; rate limits are also stamped separately."""
+        health = cls._provider_health[str(provider or "unknown")]
+        now = time.time()
+        if ok:
+            health["last_success_at"] = now
+            health["consecutive_failures"] = 0
+            return
+        health["last_failure_at"] = now
+        health["last_error_code"] = error_code
+        health["consecutive_failures"] += 1
+        if rate_limited:
+            health["last_rate_limited_at"] = now
+
+    @classmethod
+    def get_provider_health(cls) -> dict[str, ProviderHealth]:
+        """Return a copy of the per-provider outcome state."""
+        return {provider: dict(health) for provider, health in cls._provider_health.items()}  # type: ignore[misc]
 
     @classmethod
     def log_stage_latency(cls, **kwargs) -> None:
@@ -0,0 +1,365 @@
+"""Cohort reports over columnar analytics tables.
+
+analytics.jsonl / metrics.jsonl exports are converted once (and then
+incrementally, picking up where the last run stopped) into columnar tables
+(see columnar.py). Reports then run as NumPy group-bys over memory-mapped
+columns instead of re-parsing JSON:
+
+- latency percentiles per provider / stage
+- stage-reach funnel across sessions
+- strategy-switch rates, transitions and reasons
+
+CLI:
+    python -m core.analytics.reports convert analytics.jsonl data/events --kind events
+    python -m core.analytics.reports convert metrics.jsonl data/metrics --kind metrics
+    python -m core.analytics.reports report --events data/events --metrics data/metrics --since 2026-04-01
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Sequence
+
+import numpy as np
+
+from ..utils import normalize_enum_name
+from .columnar import STR_MISSING, ColumnarTable, ColumnarWriter
+from .session_analytics import EVENT_COLUMNS
+
+METRIC_COLUMNS = (
+    ("timestamp", "f8"),
+    ("session_id", "str"),
+    ("stage", "str"),
+    ("strategy", "str"),
+    ("provider", "str"),
+    ("model", "str"),
+    ("latency_ms", "f8"),
+    ("user_msg_len", "i8"),
+    ("bot_resp_len", "i8"),
+    ("environment", "str"),
+)
+SCHEMAS = {"events": EVENT_COLUMNS, "metrics": METRIC_COLUMNS}
+DEFAULT_PERCENTILES = (50, 90, 95, 99)
+SOURCES_FILE = "_sources.json"
+CONVERT_BATCH_ROWS = 5000
+
+
+def to_timestamp(value: Any) -> float | None:
+    """Epoch seconds from a number or an ISO date/datetime string (None passes through)."""
+    if value is None or value == "":
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return datetime.fromisoformat(str(value)).timestamp()
+
+
+def events_table_dir() -> str | None:
+    """Events table the app spills into (ANALYTICS_SPILL_DIR); historical exports can be converted into it too."""
+    return (os.environ.get("ANALYTICS_SPILL_DIR") or "").strip() or None
+
+
+def metrics_table_dir() -> str | None:
+    return (os.environ.get("METRICS_COLUMNAR_DIR") or "").strip() or None
+
+
+# ---------------------------------------------------------------------------
+# Conversion
+# ---------------------------------------------------------------------------
+
+
+def _normalize_row(row: dict, kind: str) -> dict:
+    if kind == "events" and "event_type" not in row:
+        row["event_type"] = row.get("type") or row.get("event")
+    if kind == "metrics":
+        row.setdefault("user_msg_len", row.get("user_message_length"))
+        row.setdefault("bot_resp_len", row.get("bot_response_length"))
+    return row
+
+
+def convert_jsonl(source: str | os.PathLike[str], dest: str | os.PathLike[str], kind: str = "events") -> int:
+    """Append the lines of `source` not yet converted into the table at `dest`.
+
+    The byte offset reached in each source is kept in the table, so repeated
+    runs over a growing export only convert new lines. A source that shrank
+    (rotated) is read again from the start.
+    """
+    writer = ColumnarWriter(dest, SCHEMAS[kind])
+    sources_path = Path(dest) / SOURCES_FILE
+    sources = json.loads(sources_path.read_text("utf-8")) if sources_path.exists() else {}
+    key = str(Path(source).resolve())
+    offset = int(sources.get(key, 0))
+    if offset > os.path.getsize(source):
+        offset = 0
+
+    def _save_offset(value: int) -> None:
+        sources[key] = value
+        tmp = sources_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(sources), "utf-8")
+        os.replace(tmp, sources_path)
+
+    converted = 0
+    batch: list[dict] = []
+    with open(source, "rb") as f:
+        f.seek(offset)
+        for line in f:
+            if not line.endswith(b"\n"):
+                break  # partial last line; pick it up next run
+            offset += len(line)
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(row, dict):
+                batch.append(_normalize_row(row, kind))
+            if len(batch) >= CONVERT_BATCH_ROWS:
+                converted += writer.append(batch)
+                _save_offset(offset)
+                batch = []
+    converted += writer.append(batch)
+    _save_offset(offset)
+    return converted
+
+
+# ---------------------------------------------------------------------------
+# Queries
+# ---------------------------------------------------------------------------
+
+
+def _window(table: ColumnarTable, since: Any = None, until: Any = None) -> np.ndarray:
+    mask = np.ones(len(table), dtype=bool)
+    since, until = to_timestamp(since), to_timestamp(until)
+    if since is not None or until is not None:
+        timestamps = np.asarray(table.column("timestamp"))
+        if since is not None:
+            mask &= timestamps >= since
+        if until is not None:
+            mask &= timestamps < until
+    return mask
+
+
+def _decode(table: ColumnarTable, name: str, code: int) -> str | None:
+    return table.dictionary(name)[code] if code != STR_MISSING else None
+
+
+def _event_mask(table: ColumnarTable, event_type: str) -> np.ndarray:
+    code = table.code("event_type", event_type)
+    if code == STR_MISSING:
+        return np.zeros(len(table), dtype=bool)
+    return np.asarray(table.column("event_type")) == code
+
+
+def latency_percentiles(
+    metrics: ColumnarTable,
+    by: Sequence[str] = ("provider",),
+    percentiles: Sequence[float] = DEFAULT_PERCENTILES,
+    since: Any = None,
+    until: Any = None,
+) -> list[dict]:
+    """Latency count/mean/percentiles per group, largest groups first."""
+    latency = np.asarray(metrics.column("latency_ms"))
+    mask = _window(metrics, since, until) & ~np.isnan(latency)
+    if not mask.any():
+        return []
+    values = latency[mask]
+    keys = np.stack([np.asarray(metrics.column(name))[mask] for name in by], axis=1)
+    groups, inverse = np.unique(keys, axis=0, return_inverse=True)
+    inverse = inverse.reshape(-1)
+    # Sort once by group, then every group is a contiguous slice
+    order = np.argsort(inverse, kind="stable")
+    bounds = np.cumsum(np.bincount(inverse, minlength=len(groups)))[:-1]
+    rows = []
+    for group, chunk in zip(groups, np.split(values[order], bounds)):
+        row: dict[str, Any] = {name: _decode(metrics, name, int(code)) for name, code in zip(by, group)}
+        row["count"] = int(chunk.size)
+        row["mean_ms"] = round(float(chunk.mean()), 1)
+        for pct, value in zip(percentiles, np.percentile(chunk, percentiles)):
+            row[f"p{pct:g}_ms"] = round(float(value), 1)
+        rows.append(row)
+    rows.sort(key=lambda row: -row["count"])
+    return rows
+
+
+def _stage_vocabulary(events: ColumnarTable, columns: Sequence[str]) -> tuple[list[str], dict[str, np.ndarray]]:
+    """One stage id space across columns whose dictionaries differ (Stage.X and x are the same)."""
+    stages: dict[str, int] = {}
+    lookups = {}
+    for name in columns:
+        ids = [stages.setdefault(normalize_enum_name(value), len(stages)) for value in events.dictionary(name)]
+        lookups[name] = np.array(ids + [-1], dtype=np.int64)  # code -1 (missing) maps to the trailing -1
+    return list(stages), lookups
+
+
+def stage_funnel(
+    events: ColumnarTable,
+    stages: Sequence[str] | None = None,
+    since: Any = None,
+    until: Any = None,
+) -> dict:
+    """Distinct sessions that reached each stage (entered, left, or ended in it)."""
+    window = _window(events, since, until)
+    sessions = np.asarray(events.column("session_id"))
+    total = int(np.unique(sessions[window]).size)
+
+    vocabulary, lookups = _stage_vocabulary(events, ("from_stage", "to_stage", "final_stage"))
+    pairs_session, pairs_stage = [], []
+    transitions = window & _event_mask(events, "stage_transition")
+    ends = window & _event_mask(events, "session_end")
+    for name, mask in (("from_stage", transitions), ("to_stage", transitions), ("final_stage", ends)):
+        stage_ids = lookups[name][np.asarray(events.column(name))[mask]]
+        keep = stage_ids >= 0
+        pairs_session.append(sessions[mask][keep].astype(np.int64))
+        pairs_stage.append(stage_ids[keep])
+
+    reached = np.zeros(len(vocabulary), dtype=np.int64)
+    if vocabulary:
+        keys = np.unique(np.concatenate(pairs_session) * len(vocabulary) + np.concatenate(pairs_stage))
+        reached = np.bincount(keys % len(vocabulary), minlength=len(vocabulary))
+    counts = {stage: int(count) for stage, count in zip(vocabulary, reached) if stage}
+    order = list(stages) if stages else sorted(counts, key=lambda stage: (-counts[stage], stage))
+
+    rows, previous = [], None
+    for stage in order:
+        count = counts.get(stage, 0)
+        rows.append(
+            {
+                "stage": stage,
+                "sessions": count,
+                "rate": round(count / total, 4) if total else 0.0,
+                "from_previous": round(count / previous, 4) if previous else None,
+            }
+        )
+        previous = count
+    return {"sessions": total, "stages": rows}
+
+
+def _code_counts(table: ColumnarTable, names: Sequence[str], mask: np.ndarray) -> list[dict]:
+    """Counts per distinct value combination; enum spellings (Strategy.X / x) are merged."""
+    if not mask.any():
+        return []
+    keys = np.stack([np.asarray(table.column(name))[mask] for name in names], axis=1)
+    groups, counts = np.unique(keys, axis=0, return_counts=True)
+    merged: dict[tuple, int] = {}
+    for group, count in zip(groups, counts):
+        key = tuple(
+            normalize_enum_name(value) if value is not None else None
+            for value in (_decode(table, name, int(code)) for name, code in zip(names, group))
+        )
+        merged[key] = merged.get(key, 0) + int(count)
+    rows = [{**dict(zip(names, key)), "count": count} for key, count in merged.items()]
+    rows.sort(key=lambda row: -row["count"])
+    return rows
+
+
+def strategy_switch_rates(events: ColumnarTable, since: Any = None, until: Any = None) -> dict:
+    """Share of sessions that switched strategy, and which switches and reasons occurred."""
+    window = _window(events, since, until)
+    sessions = np.asarray(events.column("session_id"))
+    total = int(np.unique(sessions[window]).size)
+    switches = window & _event_mask(events, "strategy_switch")
+    switched = int(np.unique(sessions[switches]).size)
+    return {
+        "sessions": total,
+        "sessions_switched": switched,
+        "switch_rate": round(switched / total, 4) if total else 0.0,
+        "switches": int(switches.sum()),
+        "transitions": _code_counts(events, ("from_strategy", "to_strategy"), switches),
+        "reasons": _code_counts(events, ("reason",), switches),
+    }
+
+
+def cohort_report(
+    events: ColumnarTable | None = None,
+    metrics: ColumnarTable | None = None,
+    since: Any = None,
+    until: Any = None,
+) -> dict:
+    """Everything the weekly cohort review needs, for whichever tables exist."""
+    report: dict[str, Any] = {"since": since, "until": until}
+    if metrics is not None:
+        report["latency_by_provider"] = latency_percentiles(metrics, ("provider",), since=since, until=until)
+        report["latency_by_stage"] = latency_percentiles(metrics, ("provider", "stage"), since=since, until=until)
+    if events is not None:
+        report["funnel"] = stage_funnel(events, since=since, until=until)
+        report["strategy_switches"] = strategy_switch_rates(events, since=since, until=until)
+    return report
+
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Convert analytics exports to columnar tables and report on them.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    convert = commands.add_parser("convert", help="append new JSONL lines to a columnar table")
+    convert.add_argument("source")
+    convert.add_argument("dest")
+    convert.add_argument("--kind", choices=sorted(SCHEMAS), default="events")
+
+    def _window_args(sub):
+        sub.add_argument("--since", help="ISO date/time or epoch seconds (inclusive)")
+        sub.add_argument("--until", help="ISO date/time or epoch seconds (exclusive)")
+
+    latency = commands.add_parser("latency", help="latency percentiles from a metrics table")
+    latency.add_argument("table")
+    latency.add_argument("--by", default="provider", help="comma-separated columns (default: provider)")
+    _window_args(latency)
+
+    funnel = commands.add_parser("funnel", help="stage-reach funnel from an events table")
+    funnel.add_argument("table")
+    funnel.add_argument("--stages", help="comma-separated stage order")
+    _window_args(funnel)
+
+    switches = commands.add_parser("switches", help="strategy-switch rates from an events table")
+    switches.add_argument("table")
+    _window_args(switches)
+
+    report = commands.add_parser("report", help="full cohort report")
+    report.add_argument("--events", default=events_table_dir())
+    report.add_argument("--metrics", default=metrics_table_dir())
+    _window_args(report)
+
+    args = parser.parse_args(argv)
+    if args.command == "convert":
+        rows = convert_jsonl(args.source, args.dest, kind=args.kind)
+        print(f"{rows} rows appended; table has {len(ColumnarTable(args.dest))} rows", file=sys.stderr)
+        return 0
+
+    if args.command == "latency":
+        result: Any = latency_percentiles(
+            ColumnarTable(args.table), tuple(args.by.split(",")), since=args.since, until=args.until
+        )
+    elif args.command == "funnel":
+        stages = args.stages.split(",") if args.stages else None
+        result = stage_funnel(ColumnarTable(args.table), stages, since=args.since, until=args.until)
+    elif args.command == "switches":
+        result = strategy_switch_rates(ColumnarTable(args.table), since=args.since, until=args.until)
+    else:
+        if not args.events and not args.metrics:
+            print("--events and/or --metrics is required", file=sys.stderr)
+            return 2
+        result = cohort_report(
+            ColumnarTable(args.events) if args.events else None,
+            ColumnarTable(args.metrics) if args.metrics else None,
+            since=args.since,
+            until=args.until,
+        )
+    print(json.dumps(result, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
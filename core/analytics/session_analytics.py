@@ -4,26 +4,230 @@ Design goals:
 - Keep the runtime behavior simple: events live in memory for this process.
 - Always mirror events into application logs (Render-friendly durability).
 - Optionally (local/dev) mirror events into a JSONL file for quick inspection.
+- Maintain running aggregates at record time so summaries and scoring are
+  O(1) reads instead of deep-copying every event list.
+- Bound memory: each session keeps a ring buffer of slotted EventRecords,
+  sessions are released when the session manager expires them, and events
+  that fall out of memory can spill to an append-only columnar table
+  (ANALYTICS_SPILL_DIR) for later analysis.
 """
 
 from __future__ import annotations
 
-from collections import Counter, defaultdict
+from collections import Counter, OrderedDict, deque
 from copy import deepcopy
 import json
 import logging
 import os
+import time
 from threading import Lock
 
+from ..constants import (
+    ANALYTICS_SPILL_BATCH_EVENTS,
+    MAX_ANALYTICS_EVENTS_PER_SESSION,
+    MAX_ANALYTICS_SESSIONS,
+    STAGE_TIMEOUTTHRESHOLDS,
+)
+from ..utils import normalize_enum_name
+
 logger = logging.getLogger(__name__)
 
 _LOCK = Lock()
+_SPILL_LOCK = Lock()
+
+# Columns of the spill table. EventRecord keeps one slot per payload column.
+EVENT_COLUMNS = (
+    ("timestamp", "f8"),
+    ("session_id", "str"),
+    ("event_type", "str"),
+    ("product_type", "str"),
+    ("initial_strategy", "str"),
+    ("ab_variant", "str"),
+    ("intent_level", "str"),
+    ("strategy", "str"),
+    ("from_strategy", "str"),
+    ("to_strategy", "str"),
+    ("reason", "str"),
+    ("from_stage", "str"),
+    ("to_stage", "str"),
+    ("final_stage", "str"),
+    ("final_strategy", "str"),
+    ("objection_type", "str"),
+    ("user_turn", "i8"),
+    ("user_turn_count", "i8"),
+    ("user_turns_in_stage", "i8"),
+    ("bot_turn_count", "i8"),
+)
+_PAYLOAD_FIELDS = tuple(name for name, _kind in EVENT_COLUMNS[3:])
+_PAYLOAD_FIELD_SET = frozenset(_PAYLOAD_FIELDS)
+_UNSET = object()
+
+
+class EventRecord:
+    """One analytics event. Known payload keys live in slots; anything else in `extra`."""
+
+    __slots__ = ("event_type", "timestamp", "extra", *_PAYLOAD_FIELDS)
+
+    def __init__(self, event_type: str, payload: dict, timestamp: float | None = None):
+        self.event_type = event_type
+        self.timestamp = time.time() if timestamp is None else timestamp
+        extra = None
+        for key, value in payload.items():
+            if key in _PAYLOAD_FIELD_SET:
+                setattr(self, key, value)
+            else:
+                if extra is None:
+                    extra = {}
+                extra[key] = value
+        self.extra = extra
+
+    def payload(self) -> dict:
+        """The keyword payload the event was recorded with."""
+        payload = {}
+        for name in _PAYLOAD_FIELDS:
+            value = getattr(self, name, _UNSET)  # unset slots raise AttributeError
+            if value is not _UNSET:
+                payload[name] = value
+        if self.extra:
+            payload.update(self.extra)
+        return payload
+
+    def as_dict(self) -> dict:
+        """Event in the dict shape callers have always received."""
+        # Keep both keys for backward compatibility with any log parsers.
+        return {"event_type": self.event_type, "type": self.event_type, **self.payload()}
+
+    def as_row(self, session_id: str) -> dict:
+        """Flat row for the spill table."""
+        return {"timestamp": self.timestamp, "session_id": session_id, "event_type": self.event_type, **self.payload()}
+
+
+class SessionAggregate:
+    """Running per-session totals that score_session() reads without re-walking events."""
+
+    __slots__ = (
+        "event_counts",
+        "stages_reached",
+        "total_transitions",
+        "signal_transitions",
+        "intent_medium_high_count",
+        "objection_handled",
+        "max_turn",
+    )
+
+    def __init__(self):
+        self.event_counts: Counter = Counter()
+        self.stages_reached: set[str] = set()
+        self.total_transitions = 0
+        self.signal_transitions = 0
+        self.intent_medium_high_count = 0
+        self.objection_handled = False
+        self.max_turn = 0
+
+    def add(self, event_type: str, payload: dict) -> None:
+        """Fold one event into the totals."""
+        self.event_counts[event_type] += 1
+        turn = max(payload.get("user_turn") or 0, payload.get("user_turn_count") or 0)
+        self.max_turn = max(self.max_turn, turn)
+
+        if event_type == "stage_transition":
+            to_stage = normalize_enum_name(payload.get("to_stage"))
+            from_stage = normalize_enum_name(payload.get("from_stage", ""))
+            turns_in_stage = payload.get("user_turns_in_stage")
+            if to_stage:
+                self.stages_reached.add(to_stage)
+            self.total_transitions += 1
+            # Signal-gated transition (didn't timeout in stage)
+            if isinstance(turns_in_stage, int) and 0 <= turns_in_stage < STAGE_TIMEOUTTHRESHOLDS.get(from_stage, 99):
+                self.signal_transitions += 1
+        elif event_type == "objection_classified":
+            self.objection_handled = True
+        elif event_type == "intent_classification" and payload.get("intent_level") in ["medium", "high"]:
+            self.intent_medium_high_count += 1
+        elif event_type == "session_end":
+            final_stage = normalize_enum_name(payload.get("final_stage"))
+            if final_stage:
+                self.stages_reached.add(final_stage)
+
+    def snapshot(self) -> dict:
+        """Plain-dict copy safe to hand out of the lock."""
+        return {
+            "event_counts": dict(self.event_counts),
+            "stages_reached": set(self.stages_reached),
+            "total_transitions": self.total_transitions,
+            "signal_transitions": self.signal_transitions,
+            "intent_medium_high_count": self.intent_medium_high_count,
+            "objection_handled": self.objection_handled,
+            "max_turn": self.max_turn,
+        }
 
 
 class SessionAnalytics:
     """In-memory analytics cache that mirrors events into application logs."""
 
-    _events = defaultdict(list)
+    # Least recently active session first; each holds a ring buffer of its newest events
+    _events: OrderedDict[str, deque[EventRecord]] = OrderedDict()
+    _aggregates: dict[str, SessionAggregate] = {}
+    _event_counts: Counter = Counter()
+    _sessions_seen = 0
+    _pending_spill: list[tuple[str, EventRecord]] = []
+    _spill_writers: dict[str, object] = {}
+    max_events_per_session = MAX_ANALYTICS_EVENTS_PER_SESSION
+    max_sessions = MAX_ANALYTICS_SESSIONS
+
+    @classmethod
+    def reset(cls) -> None:
+        """Drop all events and aggregates (tests, or an operator clearing the process)."""
+        with _LOCK:
+            cls._events.clear()
+            cls._aggregates.clear()
+            cls._event_counts.clear()
+            cls._sessions_seen = 0
+            cls._pending_spill = []
+
+    @classmethod
+    def _spill_dir(cls) -> str | None:
+        """Read the optional spill table directory from the environment."""
+        path = (os.environ.get("ANALYTICS_SPILL_DIR") or "").strip()
+        return path or None
+
+    @classmethod
+    def _queue_spill(cls, session_id: str, records) -> None:
+        """Queue events leaving memory for the spill table. Caller holds _LOCK."""
+        if cls._spill_dir():
+            cls._pending_spill.extend((session_id, record) for record in records)
+
+    @classmethod
+    def flush_spill(cls) -> int:
+        """Write queued events to the spill table. Returns the number of rows written."""
+        with _LOCK:
+            pending, cls._pending_spill = cls._pending_spill, []
+        path = cls._spill_dir()
+        if not pending or not path:
+            return 0
+        try:
+            with _SPILL_LOCK:
+                writer = cls._spill_writers.get(path)
+                if writer is None:
+                    from .columnar import ColumnarWriter
+
+                    writer = cls._spill_writers[path] = ColumnarWriter(path, EVENT_COLUMNS)
+                return writer.append(record.as_row(session_id) for session_id, record in pending)  # type: ignore[attr-defined]
+        except Exception:
+            # Best-effort like the JSONL sink: analytics must never break a request
+            logger.warning("analytics_spill_failed path=%s rows=%d", path, len(pending), exc_info=True)
+            return 0
+
+    @classmethod
+    def release_session(cls, session_id: str) -> None:
+        """Free a session's events and aggregate, spilling the events. Used as an expiry hook."""
+        with _LOCK:
+            events = cls._events.pop(session_id, None)
+            cls._aggregates.pop(session_id, None)
+            if events:
+                cls._queue_spill(session_id, events)
+        if events:
+            cls.flush_spill()
 
     @classmethod
     def _jsonl_path(cls) -> str | None:
@@ -61,11 +265,30 @@ class SessionAnalytics:
         if not session_id:
             return
 
-        # Keep both keys for backward compatibility with any log parsers.
-        event = {"event_type": event_type, "type": event_type, **payload}
+        record = EventRecord(event_type, payload)
+        event = record.as_dict()
 
         with _LOCK:
-            cls._events[session_id].append(event)
+            events = cls._events.get(session_id)
+            if events is None:
+                events = cls._events[session_id] = deque(maxlen=cls.max_events_per_session)
+                cls._aggregates[session_id] = SessionAggregate()
+                cls._sessions_seen += 1
+                while len(cls._events) > cls.max_sessions:
+                    evicted_id, evicted = cls._events.popitem(last=False)
+                    cls._aggregates.pop(evicted_id, None)
+                    cls._queue_spill(evicted_id, evicted)
+            else:
+                cls._events.move_to_end(session_id)
+            if len(events) == events.maxlen:
+                cls._queue_spill(session_id, (events[0],))
+            events.append(record)
+            cls._aggregates[session_id].add(event_type, payload)
+            cls._event_counts[event_type] += 1
+            spill_due = len(cls._pending_spill) >= ANALYTICS_SPILL_BATCH_EVENTS
+
+        if spill_due:
+            cls.flush_spill()
 
         cls._write_jsonl({"session_id": session_id, **event})
 
@@ -105,26 +328,27 @@ class SessionAnalytics:
 
     @classmethod
     def get_session_analytics(cls, session_id: str):
-        """Return a safe copy of all analytics events for one session."""
+        """Return a safe copy of the retained analytics events for one session."""
         with _LOCK:
-            return deepcopy(cls._events.get(session_id, []))
+            records = list(cls._events.get(session_id, ()))
+        return deepcopy([record.as_dict() for record in records])
+
+    @classmethod
+    def get_session_aggregate(cls, session_id: str) -> dict | None:
+        """Return the running totals for one session, or None if it has no events."""
+        with _LOCK:
+            aggregate = cls._aggregates.get(session_id)
+            return aggregate.snapshot() if aggregate else None
 
     @classmethod
     def get_evaluation_summary(cls):
         """Return aggregate stats for the current process only."""
-
-        event_counts = Counter()
         with _LOCK:
-            session_ids = list(cls._events.keys())
-
-        for session_id in sorted(session_ids):
-            for event in cls.get_session_analytics(session_id):
-                event_name = event.get("event_type") or event.get("type")
-                if event_name:
-                    event_counts[event_name] += 1
+            event_counts = dict(cls._event_counts)
+            total_sessions = cls._sessions_seen
 
         return {
-            "total_sessions": len(session_ids),
+            "total_sessions": total_sessions,
             "total_events": sum(event_counts.values()),
-            "event_counts": dict(event_counts),
+            "event_counts": event_counts,
         }
@@ -2,7 +2,9 @@
 
 import json
 import logging
+import threading
 import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import asdict, dataclass
 
 from typing import Any, Optional
@@ -15,12 +17,13 @@ from .analysis import (
     ConversationState,
     analyse_state,
 )
-from .objection import _get_objection_pathway_safe
 from .constants import (
     RECENT_HISTORY_WINDOW,
     DEFAULT_TEMPERATURE,
     DEFAULT_MAX_TOKENS,
+    PROMPT_PRECOMPUTE_MAX_CONCURRENCY,
 )
+from .content import PromptContext
 from .flow import SalesFlowEngine
 from .services.analytics_recorder import AnalyticsRecorder
 from .services.provider_router import ProviderRouter
@@ -28,7 +31,7 @@ from .providers import create_provider
 from .providers import list_fallback_providers  # re-export for tests/patching
 from .providers.base import ACCESS_DENIED, RATE_LIMIT, LLMResponse
 from .response_guardrails import Layer3CheckResult, apply_layer3_output_checks
-from .utils import Strategy, Stage
+from .utils import Strategy, Stage, normalize_enum_name
 from . import trainer, quiz
 
 _base_logger = logging.getLogger(__name__)
@@ -44,6 +47,28 @@ class ChatResponse:
     output_len: int = 0
 
 
+def _lap(timings: dict, key: str, since: float) -> float:
+    """Record ms elapsed since `since` under key; returns now for the next lap."""
+    now = time.perf_counter()
+    timings[key] = round((now - since) * 1000, 3)
+    return now
+
+
+_precompute_executor: ThreadPoolExecutor | None = None
+_precompute_executor_lock = threading.Lock()
+
+
+def _precompute_pool() -> ThreadPoolExecutor:
+    """Process-wide pool that builds next-turn prompt contexts between turns."""
+    global _precompute_executor
+    with _precompute_executor_lock:
+        if _precompute_executor is None:
+            _precompute_executor = ThreadPoolExecutor(
+                max_workers=PROMPT_PRECOMPUTE_MAX_CONCURRENCY, thread_name_prefix="prompt-precompute"
+            )
+        return _precompute_executor
+
+
 class SalesChatbot:
     """Ties the LLM provider to the FSM flow engine and logs each turn."""
 
@@ -99,6 +124,10 @@ class SalesChatbot:
 
         self._ab_variant = assign_ab_variant(session_id) if session_id else None
         self._turn_snapshots = []
+        # Wall time per layer for the most recent chat() call, in ms
+        self.last_turn_timings: dict[str, float] = {}
+        # Next turn's message-independent prompt parts, built after each reply
+        self._prompt_precompute: Future | None = None
 
         if session_id and record_session_start:
             self._analytics.record_session_start(
@@ -140,10 +169,18 @@ class SalesChatbot:
 
     def chat(self, user_message: str) -> ChatResponse:
         """Run one turn - returns reply content plus latency/provider metrics."""
+        timings = self.last_turn_timings = {}
+        mark = time.perf_counter()
         recent_history = self.flow_engine.conversation_history[-RECENT_HISTORY_WINDOW:]
+        prompt_context = self._take_prompt_context()
 
         # Signal Detection (prerequisite): Analyze user state for all downstream layers.
-        turn_state = analyse_state(self.flow_engine.conversation_history, user_message)
+        turn_state = analyse_state(
+            self.flow_engine.conversation_history,
+            user_message,
+            history_signals=prompt_context.signals if prompt_context else None,
+        )
+        mark = _lap(timings, "signals_ms", mark)
 
         # LAYER 1 (Stage-Gating): Check advancement conditions via FSM.
         # Prevents skipping stages and enforces conversation pacing.
@@ -162,10 +199,11 @@ class SalesChatbot:
                         strategy=str(self.flow_engine.flow_type),
                         user_turns_in_stage=self.flow_engine.stage_turn_count,
                     )
+        mark = _lap(timings, "layer1_ms", mark)
 
         objection_data = None
         if str(self.flow_engine.current_stage).lower() == "objection" and user_message:
-            objection_data = _get_objection_pathway_safe(
+            objection_data = self.flow_engine.objections.pathway(
                 user_message, self.flow_engine.conversation_history
             )
 
@@ -176,6 +214,7 @@ class SalesChatbot:
             objection_data=objection_data,
             turn_state=turn_state,
             include_history=False,
+            prompt_context=prompt_context,
         )
         llm_messages = (
             [{"role": "system", "content": system_prompt}]
@@ -190,6 +229,7 @@ class SalesChatbot:
                 intent_level=turn_state.intent,
                 user_turn_count=self.flow_engine.user_turn_count + 1,
             )
+        mark = _lap(timings, "layer2_ms", mark)
 
         request_start = time.time()
         try:
@@ -199,6 +239,7 @@ class SalesChatbot:
                 max_tokens=DEFAULT_MAX_TOKENS,
                 stage=self.flow_engine.current_stage,
             )
+            _lap(timings, "llm_ms", mark)
 
             if llm_response.error or not llm_response.content:
                 return self._handle_provider_error(
@@ -222,6 +263,36 @@ class SalesChatbot:
                 user_message,
             )
 
+    def _schedule_prompt_precompute(self) -> None:
+        """Build the next turn's history-only prompt parts while the user is typing."""
+        precompute = getattr(self.flow_engine, "precompute_prompt_context", None)
+        if precompute is None:
+            return
+        try:
+            self._prompt_precompute = _precompute_pool().submit(precompute)
+        except RuntimeError:
+            # pool already shut down (interpreter exit); the next turn builds inline
+            self._prompt_precompute = None
+
+    def _take_prompt_context(self) -> PromptContext | None:
+        """Claim the precomputed prompt context if it still matches the history.
+
+        A job that has not started is cancelled and the turn builds inline; one
+        already running is awaited, since it is further along than a fresh build.
+        """
+        future = getattr(self, "_prompt_precompute", None)
+        self._prompt_precompute = None
+        if future is None or future.cancel():
+            return None
+        try:
+            context = future.result()
+        except Exception:
+            self.logger.exception("prompt precompute failed; building inline")
+            return None
+        if not context.is_current(self.flow_engine.conversation_history):
+            return None
+        return context
+
     def _build_response(
         self, content: str, latency_ms: float | None, user_message: str
     ) -> ChatResponse:
@@ -412,8 +483,12 @@ class SalesChatbot:
         user_message: str,
         bot_reply: str,
         turn_state: dict[str, Any] | None = None,
-    ) -> None:
-        """Reconstruct one completed turn using the same advancement order as live chat."""
+    ) -> tuple[str, str]:
+        """Reconstruct one completed turn using the same advancement order as live chat.
+
+        Returns (stage, strategy) as they stood when the live path logged the
+        turn: after add_turn, before any intent strategy switch.
+        """
         if turn_state is None:
             state = analyse_state(self.flow_engine.conversation_history, user_message)
         else:
@@ -428,9 +503,14 @@ class SalesChatbot:
                 advanced_this_turn = True
 
         self.flow_engine.add_turn(user_message, bot_reply)
+        logged_state = (
+            normalize_enum_name(self.flow_engine.current_stage),
+            normalize_enum_name(self.flow_engine.flow_type),
+        )
 
         if not advanced_this_turn:
             self._apply_advancement(user_message)
+        return logged_state
 
     def _complete_successful_turn(
         self,
@@ -442,9 +522,14 @@ class SalesChatbot:
         turn_state=None,
     ) -> ChatResponse:
         """Finalize a successful reply so normal and fallback paths stay consistent."""
+        timings = getattr(self, "last_turn_timings", None)
+        if timings is None:
+            timings = self.last_turn_timings = {}
+        mark = time.perf_counter()
         # LAYER 3 (Response Validation): Final guardrail check before sending to user.
         guardrail_result = self._apply_layer3_checks(bot_reply, user_message)
         bot_reply = guardrail_result.content
+        mark = _lap(timings, "layer3_ms", mark)
 
         self.flow_engine.add_turn(user_message, bot_reply)
         self._log_turn_event(user_message, bot_reply)
@@ -470,8 +555,11 @@ class SalesChatbot:
 
         if self.session_id and self.flow_engine.current_stage == Stage.OBJECTION:
             if objection_data is None:
-                objection_data = _get_objection_pathway_safe(
-                    user_message, self.flow_engine.conversation_history
+                # Already classified for the prompt when the turn started in OBJECTION
+                objection_data = self.flow_engine.objections.pathway(
+                    user_message,
+                    self.flow_engine.conversation_history,
+                    turn=self.flow_engine.user_turn_count,
                 )
             objection_type = (
                 objection_data.get("type", "unknown")
@@ -485,6 +573,9 @@ class SalesChatbot:
                 user_turn_count=self.flow_engine.user_turn_count,
             )
 
+        _lap(timings, "finalize_ms", mark)
+        timings["total_ms"] = round(sum(timings.values()), 3)
+        self._schedule_prompt_precompute()
         return self._build_response(bot_reply, latency_ms, user_message)
 
     def generate_training(self, user_msg: str, bot_reply: str) -> dict[str, Any]:
@@ -498,7 +589,7 @@ class SalesChatbot:
     ) -> dict[str, Any]:
         """Answer a trainee's question about the current conversation and sales techniques."""
         return trainer.answer_training_question(
-            self.provider, self.flow_engine, question, style
+            self.provider, self.flow_engine, question, style, product_type=self.product_type
         )
 
     def run_quiz_stage_answer(self, answer: str) -> dict:
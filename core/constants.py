@@ -10,21 +10,50 @@ MAX_RESPONSE_CHARS = 1500
 # conversation context
 RECENT_HISTORY_WINDOW = 10
 PERSONA_CHECKPOINT_TURNS = 6
+PROMPT_PRECOMPUTE_MAX_CONCURRENCY = 4  # next-turn prompt contexts built while users type
+# prospect mode history sent per turn (approximate tokens); older turns are summarized
+PROSPECT_CONTEXT_TOKEN_BUDGETS = {
+    "llama-3.3-70b-versatile": 1500,
+    "Meta-Llama-3.3-70B-Instruct": 1500,
+}
+PROSPECT_CONTEXT_DEFAULT_BUDGET = 1200
+PROSPECT_CONTEXT_MIN_VERBATIM_MESSAGES = 4  # always keep the last two exchanges
+PROSPECT_SUMMARY_MAX_OBJECTIONS = 5
 MAX_USER_KEYWORDS = 6
 
 # voice mode
 MAX_AUDIO_SIZE_BYTES = 25 * 1024 * 1024  # 25MB
 MAX_TTS_TEXT_LENGTH = 5000
+TTS_CACHE_MAX_MEMORY_BYTES = 32 * 1024 * 1024  # 32MB of recent clips
+TTS_CACHE_MAX_DISK_BYTES = 512 * 1024 * 1024  # 512MB under TTS_CACHE_DIR
+TTS_CACHE_MAX_OPEN_MAPS = 128  # mmapped disk entries kept open for reuse
+TTS_MAX_CONCURRENCY = 8  # in-flight syntheses per process; the rest queue
+TTS_REQUEST_TIMEOUT_SECONDS = 30
 
 # session & performance
 MAX_METRICS_LINES = 5000
 METRICS_KEEP_AFTER_ROTATION = 2500
 MAX_ANALYTICS_LINES = 10000
 ANALYTICS_KEEP_AFTER_ROTATION = 5000
+MAX_ANALYTICS_EVENTS_PER_SESSION = 500  # oldest events drop first; aggregates keep counting
+MAX_ANALYTICS_SESSIONS = 2000  # least recently active sessions are released first
+ANALYTICS_SPILL_BATCH_EVENTS = 256  # events queued before one columnar append
 MAX_PROSPECT_SESSIONS = 100
 PROSPECT_IDLE_MINUTES = 30
+PROSPECT_OPENING_POOL_SIZE = 2  # ready openings per (product, persona, difficulty); 0 disables
+PROSPECT_OPENING_TTL_SECONDS = 30 * 60
+PROSPECT_OPENING_REFILL_DELAY_SECONDS = 2.0  # spacing between pool generations (rate limits)
+PROSPECT_HINT_MAX_CONCURRENCY = 8  # coaching hints generated alongside prospect replies
+PROSPECT_HINT_MAX_WAIT_SECONDS = 10  # longest a /api/prospect/hint poll blocks
+PROVIDER_STATUS_TTL_SECONDS = 30  # /api/health serves availability at most this stale
 # Note: SESSION_IDLE_MINUTES and MAX_SESSIONS are defined in web/security.py (SSoT)
 
+# prospect readiness dynamics (difficulty profiles supply gain, loss and patience)
+PROSPECT_COMMIT_READINESS = 0.85
+PROSPECT_COMMIT_MIN_TURNS = 3
+PROSPECT_PATIENCE_WALK_READINESS = 0.4  # below this once patience runs out, the prospect walks
+PROSPECT_NEUTRAL_TURN_GAIN = 0.01
+
 # input validation
 MAX_FIELD_LENGTH = 5000
 TERSE_INPUT_THRESHOLD = 3
@@ -37,6 +66,24 @@ MIN_TURNS_BEFORE_ADVANCE = 3
 DEFAULT_TEMPERATURE = 0.8
 DEFAULT_MAX_TOKENS = 200
 
+# LLM response cache (quiz grading, prospect evaluation)
+LLM_CACHE_MAX_ENTRIES = 512
+LLM_CACHE_TTL_SECONDS = 6 * 60 * 60
+LLM_CACHE_MAX_CACHEABLE_TEMPERATURE = 0.5  # hotter calls are meant to vary
+
+# admin batch evaluation of prospect sessions
+BATCH_EVALUATION_MAX_ITEMS = 500
+BATCH_EVALUATION_MAX_WORKERS = 8
+BATCH_EVALUATION_PROVIDER_CONCURRENCY = {"groq": 4, "sambanova": 2}  # narrative calls in flight
+BATCH_EVALUATION_DEFAULT_CONCURRENCY = 2
+BATCH_EVALUATION_RETRY_DELAYS = (2.0, 5.0, 15.0)  # back-off after each rate-limited attempt
+MAX_BATCH_EVALUATION_JOBS = 32  # jobs kept in memory for resume
+
+# training Q&A near-duplicate cache
+TRAINING_ANSWER_CACHE_SIMILARITY = 0.8  # cosine over hashed n-grams
+TRAINING_ANSWER_CACHE_MAX_PER_BUCKET = 64
+TRAINING_ANSWER_CACHE_TTL_SECONDS = 24 * 60 * 60
+
 # scoring and evaluation
 SCORING_RUBRIC = {
     "stage_points": {
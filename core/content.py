@@ -14,6 +14,7 @@ See three_layer_architecture.puml for full defense-in-depth diagram.
 """
 
 import random
+from dataclasses import dataclass
 from typing import Any
 
 from .loader import (
@@ -30,6 +31,8 @@ from .prompts import (
     format_conversation_context,
 )
 from .analysis import (
+    HistorySignals,
+    analyse_history,
     analyse_state,
     extract_preferences,
     detect_ack_context,
@@ -92,6 +95,8 @@ SOP_FLOWS = _OBJECTION_FLOWS_RAW.get("sop_flows", {})
 
 # Export public symbols
 __all__ = [
+    "PromptContext",
+    "precompute_prompt_context",
     "generate_stage_prompt",
     "generate_init_greeting",
     "get_prompt",
@@ -138,7 +143,7 @@ def _get_recent_assistant_question(history) -> str:
 
 
 def _get_stage_specific_prompt(
-    strategy, stage, state, user_message, history, objection_data=None
+    strategy, stage, state, user_message, history, objection_data=None, objection_tracker=None
 ):
     """Select the stage prompt and, for objections, build the separate context block.
 
@@ -162,12 +167,59 @@ def _get_stage_specific_prompt(
             user_message=user_message,
             history=history,
             objection_data=objection_data,
+            tracker=objection_tracker,
         )
         return get_prompt(strategy, stage), objection_context
 
     return get_prompt(strategy, stage), ""
 
 
+@dataclass
+class PromptContext:
+    """Prompt inputs that depend only on strategy, product and history.
+
+    Built once a reply is sent so the next turn only does message-dependent work.
+    Holds a reference to the history list it was built from; any append, rewind
+    or reload makes it stale (see is_current).
+    """
+
+    strategy: str
+    product_context: str
+    history: list[dict[str, str]]
+    history_length: int
+    base: str
+    preferences: str
+    preference_keyword_context: str
+    recent_assistant_question: str
+    turn_count: int
+    signals: HistorySignals
+
+    def is_current(self, history, strategy=None, product_context=None) -> bool:
+        """Return True when built from this exact history (and strategy/product, if given)."""
+        if history is not self.history or len(history) != self.history_length:
+            return False
+        if strategy is not None and strategy != self.strategy:
+            return False
+        return product_context is None or product_context == self.product_context
+
+
+def precompute_prompt_context(strategy: str, product_context: str, history: list[dict[str, str]]) -> PromptContext:
+    """Build every message-independent part of the next turn's prompt."""
+    preferences = extract_preferences(history)
+    return PromptContext(
+        strategy=strategy,
+        product_context=product_context,
+        history=history,
+        history_length=len(history),
+        base=get_base_prompt(product_context, strategy),
+        preferences=preferences,
+        preference_keyword_context=_get_preference_and_keyword_context(history, preferences),
+        recent_assistant_question=_get_recent_assistant_question(history),
+        turn_count=len(history) // 2,
+        signals=analyse_history(history),
+    )
+
+
 def generate_stage_prompt(
     strategy: str,
     stage: str,
@@ -177,9 +229,14 @@ def generate_stage_prompt(
     objection_data: dict | None = None,
     turn_state=None,
     include_history: bool = True,
+    objection_tracker=None,
+    prompt_context: PromptContext | None = None,
 ) -> str:
     """Build the full system prompt for this turn.
 
+    Pass a PromptContext from precompute_prompt_context to skip the
+    history-only work; a stale one is ignored and rebuilt.
+
     Assembly order and rationale:
         1. base+rules - anchor factual constraints first for primacy
         2. ack - keep acknowledgement guidance before stage instructions
@@ -193,13 +250,20 @@ def generate_stage_prompt(
         10. checkpoint - periodic persona reinforcement
         11. state_block - session metadata appended last
     """
-    base = get_base_prompt(product_context, strategy)
+    if prompt_context is None or not prompt_context.is_current(history, strategy, product_context):
+        prompt_context = precompute_prompt_context(strategy, product_context, history)
+    base = prompt_context.base
     state = (
         turn_state
         if turn_state is not None
-        else analyse_state(history, user_message, signal_keywords=SIGNALS)
+        else analyse_state(
+            history,
+            user_message,
+            signal_keywords=SIGNALS,
+            history_signals=prompt_context.signals,
+        )
     )
-    preferences = extract_preferences(history)
+    preferences = prompt_context.preferences
 
     # Tier 1: Override (early exit)
     override = check_override_condition(
@@ -209,22 +273,22 @@ def generate_stage_prompt(
         return override
 
     # ack level - must appear before the stage prompt
-    ack_guidance = get_ack_guidance(detect_ack_context(user_message, history, state))
+    ack_guidance = get_ack_guidance(
+        detect_ack_context(user_message, history, state, prompt_context.signals)
+    )
 
     # tactic guidance (adaptation for low-intent / guarded / decisive users)
     tactic_guidance = _build_tactic_guidance(strategy, state, user_message)
 
     # stage-specific prompt and optional context block (e.g. objection SOP)
     stage_prompt, stage_context = _get_stage_specific_prompt(
-        strategy, stage, state, user_message, history, objection_data
+        strategy, stage, state, user_message, history, objection_data, objection_tracker
     )
 
     # assemble final prompt blocks
     drift_note = detect_topic_drift(user_message, stage)
-    preference_keyword_context = _get_preference_and_keyword_context(
-        history, preferences
-    )
-    recent_assistant_question = _get_recent_assistant_question(history)
+    preference_keyword_context = prompt_context.preference_keyword_context
+    recent_assistant_question = prompt_context.recent_assistant_question
     repetition_guard = ""
     budget_only_guard = ""
     if stage == Stage.INTENT and recent_assistant_question:
@@ -255,7 +319,7 @@ def generate_stage_prompt(
             )
 
     # tier 6: compute turn metadata (used later when injecting final state block)
-    turn_count = len(history) // 2
+    turn_count = prompt_context.turn_count
 
     # Terse response handling: prevent over-probing short answers.
     # Keep terse guidance close to generation.
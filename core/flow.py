@@ -20,8 +20,9 @@ from .analysis import (
     commitment_or_walkaway,
     user_demands_directness,
 )
-from .content import generate_stage_prompt
+from .content import PromptContext, generate_stage_prompt, precompute_prompt_context
 from .loader import QuickMatcher, load_analysis_config, load_signals
+from .objection import ObjectionTracker
 from .utils import Stage, Strategy, contains_nonnegated_keyword
 
 SIGNALS = load_signals()
@@ -401,6 +402,7 @@ class SalesFlowEngine:
         self.current_stage = self.flow_config["stages"][0]
         self.stage_turn_count = 0
         self.conversation_history = []
+        self.objections = ObjectionTracker()
 
     @property
     def user_turn_count(self) -> int:
@@ -419,6 +421,7 @@ class SalesFlowEngine:
         objection_data: dict | None = None,
         turn_state=None,
         include_history: bool = True,
+        prompt_context: PromptContext | None = None,
     ) -> str:
         """Generate the system prompt for the current stage."""
         return generate_stage_prompt(
@@ -430,6 +433,14 @@ class SalesFlowEngine:
             objection_data=objection_data,
             turn_state=turn_state,
             include_history=include_history,
+            objection_tracker=self.objections,
+            prompt_context=prompt_context,
+        )
+
+    def precompute_prompt_context(self) -> PromptContext:
+        """Build the message-independent prompt parts for the next turn."""
+        return precompute_prompt_context(
+            self._strategy_for_prompts, self.product_context, self.conversation_history
         )
 
     def should_advance(self, user_message: str, turn_state=None) -> Optional[str]:
@@ -486,6 +497,7 @@ class SalesFlowEngine:
         self.conversation_history.append({"role": "user", "content": user_message})
         self.conversation_history.append({"role": "assistant", "content": bot_response})
         self.stage_turn_count += 1
+        self.objections.sync(self.conversation_history)
 
     def switch_strategy(self, new_strategy: str) -> bool:
         """Switch to a new strategy and restart the new flow at INTENT."""
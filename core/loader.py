@@ -11,6 +11,8 @@ from pathlib import Path
 import yaml
 
 CONFIG_DIR = Path(__file__).parent.parent / "config"
+# libyaml parses the config set ~10x faster than the pure-Python loader; same safe subset
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
 
 # Signal keys that must exist in signals.yaml. Typo here → runtime error.
 _REQUIRED_SIGNAL_KEYS = {
@@ -339,7 +341,7 @@ def _load_yaml_cached(filename):
     if not filepath.exists():
         raise FileNotFoundError(f"Config file not found: {filepath}")
     with open(filepath, "r", encoding="utf-8") as f:
-        return yaml.safe_load(f)
+        return yaml.load(f, Loader=_YAML_LOADER)
 
 
 def load_yaml(filename):
@@ -401,6 +403,12 @@ def load_prospect_config():
     return _deep_merge(_DEFAULT_PROSPECT_CONFIG, load_yaml("prospect_config.yaml"))
 
 
+@lru_cache(maxsize=1)
+def load_guardrail_rules():
+    """Load the Layer 3 rule set (keyword sets, patterns, removals, rules)."""
+    return load_yaml("guardrails.yaml")
+
+
 def get_product_settings(product_type):
     """Return product config for the given type, alias, or default. Raises ValueError if none found."""
     config = load_product_config()
@@ -135,6 +135,7 @@ def _load_pathway_config() -> dict[str, Any]:
         except Exception as e:
             warnings.warn(f"Failed to load objection_pathway_map.yaml: {e}")
             _PATHWAY_CONFIG = {"category_mapping": {}, "reframe_descriptions": {}}
+        _warn_if_invalid()
     return _PATHWAY_CONFIG
 
 
@@ -184,8 +185,11 @@ def validate_pathway_config() -> tuple[bool, list[str]]:
     return len(errors) == 0, errors
 
 
-def _validate_on_import():
-    """Warn early if the objection pathway config is incomplete or malformed."""
+def _warn_if_invalid():
+    """Warn once, when the pathway map is first loaded, if it is incomplete or malformed.
+
+    Deferred from import time so workers boot without parsing the map.
+    """
     is_valid, errors = validate_pathway_config()
     if not is_valid:
         warnings.warn(
@@ -194,9 +198,6 @@ def _validate_on_import():
         )
 
 
-_validate_on_import()
-
-
 def _detect_subtype(category: str, user_message: str, objection_type: str) -> str:
     """Pick the best subtype match inside an objection category."""
     pathway_config = _load_pathway_config()
@@ -288,16 +289,20 @@ def analyse_objection_pathway(
 def _count_reframe_usages(
     reframes: list[str],
     history: Optional[list[dict]] = None,
+    tracker: Optional["ObjectionTracker"] = None,
 ) -> dict[str, int]:
     """Count how many times each reframe has been used in conversation.
 
     Args:
         reframes: List of reframe IDs to track
         history: Conversation history
+        tracker: The flow engine's ObjectionTracker; answers without a rescan
 
     Returns:
         Dictionary mapping reframe_id to usage count
     """
+    if tracker is not None:
+        return tracker.reframe_usages(reframes, history)
     attempts = {reframe_id: 0 for reframe_id in reframes}
 
     if not history:
@@ -338,6 +343,7 @@ def get_reframe_sequence(
     pathway: ObjectionPathway,
     current_turn_in_stage: int,
     history: Optional[list[dict]] = None,
+    tracker: Optional["ObjectionTracker"] = None,
 ) -> dict[str, Any]:
     """Get the current reframe to use and tracking metadata.
 
@@ -345,6 +351,7 @@ def get_reframe_sequence(
         pathway: Objection pathway with reframe sequence
         current_turn_in_stage: Current turn number (for context)
         history: Conversation history
+        tracker: The flow engine's ObjectionTracker, if any
 
     Returns:
         Dictionary with current reframe, index, attempts and guidance
@@ -361,7 +368,7 @@ def get_reframe_sequence(
             "is_final_reframe": False,
         }
 
-    reframe_usages = _count_reframe_usages(reframes, history)
+    reframe_usages = _count_reframe_usages(reframes, history, tracker)
     current_index = _find_next_reframe_index(reframes, reframe_usages)
     current_reframe = reframes[current_index] if current_index < len(reframes) else None
 
@@ -394,7 +401,9 @@ def _get_objection_pathway_safe(
         return classify_objection(user_message, history)
 
 
-def _count_objection_attempts(history: list[dict] | None, obj_type: str) -> int:
+def _count_objection_attempts(
+    history: list[dict] | None, obj_type: str, tracker: Optional["ObjectionTracker"] = None
+) -> int:
     """Count how many times the assistant has already responded to this objection.
 
     Finds the most recent user message with matching objection keywords, then counts
@@ -402,6 +411,8 @@ def _count_objection_attempts(history: list[dict] | None, obj_type: str) -> int:
     """
     if not history:
         return 0
+    if tracker is not None:
+        return tracker.objection_attempts(history, obj_type)
     keywords = OBJECTION_FLOWS_CONFIG.get("keywords", {}).get(obj_type, [])
     if not keywords:
         return 0
@@ -419,6 +430,108 @@ def _count_objection_attempts(history: list[dict] | None, obj_type: str) -> int:
     )
 
 
+class ObjectionTracker:
+    """Objection state for one conversation, folded in as messages are added.
+
+    Answers the same questions as _count_reframe_usages,
+    _count_objection_attempts and _get_objection_pathway_safe without
+    rescanning the history each turn. Each message is read once. History
+    that was replaced or shortened (rewind, restore) is re-read from the
+    start. The pathway is memoised per user turn, so the prompt and the
+    post-reply analytics share one classification.
+    """
+
+    def __init__(self) -> None:
+        self._keywords = {
+            obj_type: list(keywords)
+            for obj_type, keywords in OBJECTION_FLOWS_CONFIG.get("keywords", {}).items()
+        }
+        self._reframe_ids = {
+            str(reframe_id)
+            for category in _load_pathway_config().get("category_mapping", {}).values()
+            for reframe_id in (category or {}).get("reframes", [])
+        }
+        self.last_objection_type: Optional[str] = None
+        self._reset()
+
+    def _reset(self) -> None:
+        self._history: Optional[list[dict]] = None
+        self._seen = 0
+        self._user_turns = 0
+        self._assistant_turns = 0
+        self._reframe_usages: dict[str, int] = dict.fromkeys(self._reframe_ids, 0)
+        # objection type -> (history index, assistant messages before it) of its latest user mention
+        self._last_objection: dict[str, tuple[int, int]] = {}
+        self._memo: Optional[tuple[str, int, dict[str, Any]]] = None
+
+    def _observe(self, index: int, message: dict) -> None:
+        role = message.get("role")
+        content = (message.get("content") or "").lower()
+        if role == MessageRole.ASSISTANT:
+            self._assistant_turns += 1
+            for reframe_id in self._reframe_ids:
+                if f"reframe_{reframe_id}" in content:
+                    self._reframe_usages[reframe_id] += 1
+        elif role == MessageRole.USER:
+            self._user_turns += 1
+            for obj_type, keywords in self._keywords.items():
+                if any(kw in content for kw in keywords):
+                    self._last_objection[obj_type] = (index, self._assistant_turns)
+
+    def sync(self, history: Optional[list[dict]]) -> None:
+        """Fold in messages appended to history since the last call."""
+        history = history if history is not None else []
+        if history is not self._history or len(history) < self._seen:
+            self._reset()
+            self._history = history
+        for index in range(self._seen, len(history)):
+            self._observe(index, history[index])
+        self._seen = len(history)
+
+    @property
+    def user_turns(self) -> int:
+        return self._user_turns
+
+    def last_objection_index(self, obj_type: str) -> Optional[int]:
+        """History index of the latest user message naming this objection type."""
+        entry = self._last_objection.get(obj_type)
+        return entry[0] if entry else None
+
+    def reframe_usages(self, reframes: list[str], history: Optional[list[dict]]) -> dict[str, int]:
+        """Same result as _count_reframe_usages(reframes, history)."""
+        self.sync(history)
+        unknown = [reframe_id for reframe_id in reframes if reframe_id not in self._reframe_ids]
+        if unknown:
+            # Not in the pathway config: count it from here on, starting with what is already there
+            counts = _count_reframe_usages(unknown, self._history)
+            self._reframe_ids.update(unknown)
+            self._reframe_usages.update(counts)
+        return {reframe_id: self._reframe_usages[reframe_id] for reframe_id in reframes}
+
+    def objection_attempts(self, history: Optional[list[dict]], obj_type: str) -> int:
+        """Same result as _count_objection_attempts(history, obj_type)."""
+        self.sync(history)
+        entry = self._last_objection.get(obj_type)
+        return self._assistant_turns - entry[1] if entry else 0
+
+    def pathway(self, user_message: str, history: Optional[list[dict]], turn: Optional[int] = None) -> dict[str, Any]:
+        """Objection pathway for a user turn, classified at most once per turn.
+
+        turn is the 1-based number of this user message. It defaults to the
+        next turn, which is right while the message is not yet in history.
+        """
+        self.sync(history)
+        if turn is None:
+            turn = self._user_turns + 1
+        memo = self._memo
+        if memo is not None and memo[0] == user_message and memo[1] == turn:
+            return memo[2]
+        pathway = _get_objection_pathway_safe(user_message, history or [])
+        self._memo = (user_message, turn, pathway)
+        self.last_objection_type = str(pathway.get("type", ObjectionType.UNKNOWN))
+        return pathway
+
+
 def _build_resource_block(pathway: dict) -> str:
     """Build the extra instruction block for resource and funding objections."""
     block = "\n=== RESOURCE PATHWAY ===\n"
@@ -516,7 +629,7 @@ def _build_transactional_reframe_block(pathway: dict, attempt: int) -> str:
 
 
 def _build_objection_context(
-    strategy, stage, user_message, history, objection_data=None
+    strategy, stage, user_message, history, objection_data=None, tracker=None
 ):
     """Build the objection SOP block that sits below the stage prompt."""
     from .analysis import commitment_or_walkaway
@@ -530,6 +643,8 @@ def _build_objection_context(
     # Use full pathway so category/reframes/entry_question are always available.
     if isinstance(objection_data, dict) and "category" in objection_data:
         pathway = objection_data
+    elif tracker is not None:
+        pathway = tracker.pathway(user_message, history)
     else:
         pathway = _get_objection_pathway_safe(user_message, history)
 
@@ -542,7 +657,7 @@ def _build_objection_context(
 
     flows = OBJECTION_FLOWS_TRANSACTIONAL if strategy == Strategy.TRANSACTIONAL else OBJECTION_FLOWS
     sop_steps = flows.get(obj_type, OBJECTION_FLOW_FALLBACK)
-    attempt = _count_objection_attempts(history, obj_type)
+    attempt = _count_objection_attempts(history, obj_type, tracker)
 
     context = (
         f"OBJECTION: {obj_type.upper()}\n"
@@ -0,0 +1,280 @@
+"""Vectorised deterministic scoring for cohorts of prospect-mode transcripts.
+
+evaluate_prospect_session() scores one transcript at a time, re-scanning every
+turn once per hint list. Re-scoring a cohort after a weight change, or for an
+A/B comparison, does the same work N times over. This module flattens all N
+transcripts into one corpus and scans it once per hint phrase. The result is
+a turn x term hit matrix that one matrix product folds into per-criterion
+hits, with per-session counts summed by np.bincount.
+
+Outputs are identical to evaluate_prospect_session(provider=None, ...) and to
+_build_deterministic_criteria_scores(); tests pin that equivalence.
+
+    python -m core.prospect_batch_evaluator transcripts.jsonl [--out scored.jsonl]
+"""
+
+import argparse
+import json
+import re
+import sys
+from typing import Iterable, Sequence
+
+import numpy as np
+
+from .loader import load_prospect_config
+from .prospect_evaluator import (
+    _OBJECTION_HINTS,
+    _OBJECTION_RESPONSE_HINTS,
+    _OPEN_QUESTION_HINTS,
+    _RAPPORT_HINTS,
+    _SOLUTION_HINTS,
+    _build_deterministic_pack,
+    _fallback_evaluation,
+)
+from .utils import clamp_score
+
+_HINT_GROUPS = {
+    "open_question": _OPEN_QUESTION_HINTS,
+    "rapport": _RAPPORT_HINTS,
+    "objection": _OBJECTION_HINTS,
+    "objection_response": _OBJECTION_RESPONSE_HINTS,
+    "solution": _SOLUTION_HINTS,
+}
+_GROUP_INDEX = {name: i for i, name in enumerate(_HINT_GROUPS)}
+_QUESTION_MARK = "?"
+_VOCABULARY = sorted({hint for hints in _HINT_GROUPS.values() for hint in hints} | {_QUESTION_MARK})
+_TERM_INDEX = {term: i for i, term in enumerate(_VOCABULARY)}
+_TERM_PATTERNS = [re.compile(re.escape(term)) for term in _VOCABULARY]
+
+# vocabulary x group membership; hits @ membership > 0 => turn matched the group
+_GROUP_MEMBERSHIP = np.zeros((len(_VOCABULARY), len(_HINT_GROUPS)), dtype=np.int32)
+for _group, _hints in _HINT_GROUPS.items():
+    for _hint in _hints:
+        _GROUP_MEMBERSHIP[_TERM_INDEX[_hint], _GROUP_INDEX[_group]] = 1
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9']+")
+_TURN_SEPARATOR = "\x00"  # never part of a hint or token, so no match spans two turns
+_DEFAULT_FEEDBACK = "Not enough evidence to score this criterion yet."
+_NEUTRAL_CRITERION = {"score": 60, "feedback": "Measured with a neutral heuristic baseline."}
+
+
+def _flatten(histories: Sequence[Sequence[dict]]) -> tuple[str, np.ndarray, np.ndarray, np.ndarray]:
+    """Join every turn into one lowered corpus. Returns corpus, turn starts, session index, user mask."""
+    texts, session_index, is_user = [], [], []
+    for session_no, history in enumerate(histories):
+        for message in history:
+            texts.append(str(message.get("content") or "").lower())
+            session_index.append(session_no)
+            is_user.append(message.get("role") == "user")
+
+    lengths = np.fromiter((len(text) + 1 for text in texts), dtype=np.int64, count=len(texts))
+    starts = np.zeros(len(texts), dtype=np.int64)
+    if len(texts) > 1:
+        np.cumsum(lengths[:-1], out=starts[1:])
+    return (
+        _TURN_SEPARATOR.join(texts),
+        starts,
+        np.asarray(session_index, dtype=np.int64),
+        np.asarray(is_user, dtype=bool),
+    )
+
+
+def _term_hits(corpus: str, starts: np.ndarray) -> np.ndarray:
+    """turn x vocabulary boolean matrix: did the (lowered) turn contain the term."""
+    hits = np.zeros((len(starts), len(_VOCABULARY)), dtype=bool)
+    for term_no, pattern in enumerate(_TERM_PATTERNS):
+        positions = np.fromiter((m.start() for m in pattern.finditer(corpus)), dtype=np.int64)
+        if positions.size:
+            hits[np.searchsorted(starts, positions, side="right") - 1, term_no] = True
+    return hits
+
+
+def _token_counts(corpus: str, starts: np.ndarray) -> np.ndarray:
+    positions = np.fromiter((m.start() for m in _TOKEN_PATTERN.finditer(corpus)), dtype=np.int64)
+    owners = np.searchsorted(starts, positions, side="right") - 1
+    return np.bincount(owners, minlength=len(starts)).astype(np.float64)
+
+
+def score_transcripts(histories: Sequence[Sequence[dict]], criteria: dict) -> list[dict]:
+    """Deterministic criterion scores for each transcript, same shape as the single-session scorer."""
+    n_sessions = len(histories)
+    if n_sessions == 0:
+        return []
+
+    corpus, starts, session_index, is_user = _flatten(histories)
+    if len(starts):
+        term_hits = _term_hits(corpus, starts)
+        group_hits = (term_hits.astype(np.int32) @ _GROUP_MEMBERSHIP) > 0
+        has_question = term_hits[:, _TERM_INDEX[_QUESTION_MARK]]
+        tokens = _token_counts(corpus, starts)
+    else:
+        group_hits = np.zeros((0, len(_HINT_GROUPS)), dtype=bool)
+        has_question = np.zeros(0, dtype=bool)
+        tokens = np.zeros(0, dtype=np.float64)
+
+    is_prospect = ~is_user
+
+    def per_session(mask: np.ndarray, weights: np.ndarray | None = None) -> np.ndarray:
+        values = mask.astype(np.float64) if weights is None else np.where(mask, weights, 0.0)
+        return np.bincount(session_index, weights=values, minlength=n_sessions)
+
+    def group(name: str) -> np.ndarray:
+        return group_hits[:, _GROUP_INDEX[name]]
+
+    sales_count = per_session(is_user)
+    prospect_count = per_session(is_prospect)
+    word_total = per_session(is_user, tokens)
+    question_turns = per_session(is_user & has_question)
+    open_question_turns = per_session(is_user & has_question & group("open_question"))
+    rapport_turns = per_session(is_user & group("rapport"))
+    objection_turns = per_session(is_prospect & group("objection"))
+    objection_response_turns = per_session(is_user & group("objection_response"))
+    solution_turns = per_session(is_user & group("solution"))
+
+    # Same operation order as _build_deterministic_criteria_scores so floats round identically
+    sales_floor = np.maximum(1.0, sales_count)
+    avg_words = word_total / sales_floor
+    question_ratio = np.minimum(1.0, question_turns / sales_floor)
+    open_ratio = open_question_turns / np.maximum(1.0, question_turns)
+    rapport_ratio = np.minimum(1.0, rapport_turns / sales_floor)
+    solution_ratio = np.minimum(1.0, solution_turns / sales_floor)
+    objection_ratio = np.minimum(1.0, objection_response_turns / np.maximum(1.0, objection_turns))
+    length_fit = np.select(
+        [(avg_words >= 8) & (avg_words <= 35), (avg_words >= 5) & (avg_words <= 45)],
+        [1.0, 0.7],
+        default=0.4,
+    )
+    turn_balance = np.minimum(1.0, prospect_count / sales_floor)
+
+    scores = {
+        "needs_discovery": np.rint(35 + 35 * question_ratio + 30 * open_ratio),
+        "rapport_building": np.rint(45 + 55 * rapport_ratio),
+        "objection_handling": np.where(objection_turns == 0, 60.0, np.rint(35 + 65 * objection_ratio)),
+        "solution_presentation": np.rint(40 + 60 * solution_ratio),
+        "conversation_flow": np.rint(40 + 35 * length_fit + 25 * turn_balance),
+    }
+    feedback = {
+        "needs_discovery": np.where(
+            open_ratio >= 0.5,
+            "Strong question quality and discovery depth.",
+            "Ask more open discovery questions to uncover needs clearly.",
+        ),
+        "rapport_building": np.where(
+            rapport_ratio >= 0.4,
+            "Good empathy and trust-building language.",
+            "Add brief empathy statements before moving to the next question.",
+        ),
+        "objection_handling": np.where(
+            objection_turns == 0,
+            "No major objections surfaced; neutral handling score.",
+            "Acknowledge concerns directly, then reframe toward value and next step.",
+        ),
+        "solution_presentation": np.where(
+            solution_ratio >= 0.35,
+            "Solution language was tied to customer context.",
+            "Link your recommendation more explicitly to what the prospect said.",
+        ),
+        "conversation_flow": np.where(
+            (length_fit >= 0.7) & (turn_balance >= 0.6),
+            "Flow was clear and balanced.",
+            "Keep turns concise and balanced so the prospect speaks more.",
+        ),
+    }
+
+    results = []
+    for session_no in range(n_sessions):
+        if sales_count[session_no] == 0:
+            results.append({name: {"score": 40, "feedback": _DEFAULT_FEEDBACK} for name in criteria})
+            continue
+        results.append(
+            {
+                name: (
+                    {
+                        "score": clamp_score(int(scores[name][session_no])),
+                        "feedback": str(feedback[name][session_no]),
+                    }
+                    if name in scores
+                    else dict(_NEUTRAL_CRITERION)
+                )
+                for name in criteria
+            }
+        )
+    return results
+
+
+def deterministic_packs(
+    histories: Sequence[Sequence[dict]],
+    outcomes: Sequence[str],
+    config: dict | None = None,
+) -> tuple[dict, list[dict]]:
+    """Criteria and one deterministic pack per transcript (what LLM narratives merge into)."""
+    if len(histories) != len(outcomes):
+        raise ValueError("histories and outcomes must be the same length")
+    config = config if config is not None else load_prospect_config()
+    criteria = config.get("evaluation", {}).get("criteria", {})
+    mode_cfg = config.get("prospect_mode", {}) if isinstance(config, dict) else {}
+    feedback_style = str(mode_cfg.get("feedback_style", "coaching") or "coaching").lower()
+
+    packs = [
+        _build_deterministic_pack(scores, criteria, outcome, feedback_style)
+        for scores, outcome in zip(score_transcripts(histories, criteria), outcomes)
+    ]
+    return criteria, packs
+
+
+def evaluate_transcripts(
+    histories: Sequence[Sequence[dict]],
+    outcomes: Sequence[str],
+    config: dict | None = None,
+) -> list[dict]:
+    """Deterministic evaluations for a cohort, equal to evaluate_prospect_session(provider=None, ...)."""
+    criteria, packs = deterministic_packs(histories, outcomes, config)
+    return [
+        _fallback_evaluation(outcome, criteria=criteria, deterministic=pack)
+        for pack, outcome in zip(packs, outcomes)
+    ]
+
+
+def _read_jsonl(lines: Iterable[str]) -> tuple[list[list[dict]], list[str], list]:
+    histories, outcomes, ids = [], [], []
+    for line_no, line in enumerate(lines, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        record = json.loads(line)
+        histories.append(record.get("conversation_history") or [])
+        outcomes.append(str(record.get("outcome") or record.get("status") or "active"))
+        ids.append(record.get("session_id", line_no))
+    return histories, outcomes, ids
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Re-score prospect transcripts deterministically.")
+    parser.add_argument("input", help="JSONL: one {session_id, conversation_history, outcome} per line")
+    parser.add_argument("--out", help="write per-session evaluations as JSONL (default: stdout)")
+    args = parser.parse_args(argv)
+
+    with open(args.input, encoding="utf-8") as handle:
+        histories, outcomes, ids = _read_jsonl(handle)
+    evaluations = evaluate_transcripts(histories, outcomes)
+
+    out = open(args.out, "w", encoding="utf-8") if args.out else sys.stdout
+    try:
+        for session_id, evaluation in zip(ids, evaluations):
+            out.write(json.dumps({"session_id": session_id, **evaluation}) + "\n")
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    if evaluations:
+        overall = np.array([e["overall_score"] for e in evaluations], dtype=np.float64)
+        print(
+            f"scored {len(evaluations)} sessions: mean={overall.mean():.1f} "
+            f"p50={np.percentile(overall, 50):.0f} p90={np.percentile(overall, 90):.0f}",
+            file=sys.stderr,
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
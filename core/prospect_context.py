@@ -0,0 +1,143 @@
+"""Token-budgeted conversation context for prospect mode.
+
+Sending the whole transcript every turn makes prompt size (and latency) grow
+with role-play length. The window keeps the newest messages verbatim up to a
+per-model token budget and folds everything older into a short deterministic
+summary: objections the prospect raised, needs they revealed and how their
+readiness moved. Folding only ever moves forward, so each message is
+summarized once and the rendered summary is reused until more turns fold.
+"""
+
+from __future__ import annotations
+
+import re
+
+from .constants import (
+    PROSPECT_CONTEXT_DEFAULT_BUDGET,
+    PROSPECT_CONTEXT_MIN_VERBATIM_MESSAGES,
+    PROSPECT_CONTEXT_TOKEN_BUDGETS,
+    PROSPECT_SUMMARY_MAX_OBJECTIONS,
+)
+from .utils import contains_nonnegated_keyword
+
+_TOKEN_RE = re.compile(r"\w+|[^\w\s]")
+_SENTENCE_RE = re.compile(r"[^.!?]+[.!?]?")
+_MESSAGE_OVERHEAD_TOKENS = 4  # role and separators in chat formats
+_MAX_SNIPPET_CHARS = 120
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate BPE token count: one per short word or symbol, more for long words."""
+    if not text:
+        return 0
+    return sum(1 + (len(piece) - 1) // 6 for piece in _TOKEN_RE.findall(text))
+
+
+def history_budget(model_name: str | None) -> int:
+    """Token budget for conversation history sent to the given model."""
+    return PROSPECT_CONTEXT_TOKEN_BUDGETS.get(model_name or "", PROSPECT_CONTEXT_DEFAULT_BUDGET)
+
+
+def _need_terms(need: str) -> list[str]:
+    return [w for w in re.findall(r"\w+", need.lower()) if len(w) > 3]
+
+
+class ProspectContextWindow:
+    """Recent messages verbatim plus a rolling summary of older ones."""
+
+    def __init__(self, persona: dict | None = None, objection_keywords=None):
+        persona = persona or {}
+        self._needs = [
+            (need, _need_terms(need))
+            for need in [*persona.get("needs", []), *persona.get("pain_points", [])]
+            if isinstance(need, str) and _need_terms(need)
+        ]
+        self._objection_keywords = list(objection_keywords or [])
+        self._readiness: list[float] = []
+        self._reset_fold()
+
+    def _reset_fold(self) -> None:
+        self._token_counts: list[int] = []
+        self.folded = 0  # messages at the head of history covered by the summary
+        self._folded_user_turns = 0
+        self._objections: list[str] = []
+        self._needs_revealed: list[str] = []
+        self._summary: str | None = None
+
+    def record_readiness(self, readiness: float) -> None:
+        """Note readiness after a salesperson turn (one entry per user turn)."""
+        self._readiness.append(round(readiness, 2))
+
+    def _count(self, history: list[dict]) -> None:
+        # History is append-only, so only count messages added since last time
+        for message in history[len(self._token_counts):]:
+            self._token_counts.append(
+                estimate_tokens(message.get("content") or "") + _MESSAGE_OVERHEAD_TOKENS
+            )
+
+    def _fold(self, message: dict) -> None:
+        content = message.get("content") or ""
+        if message.get("role") == "user":
+            self._folded_user_turns += 1
+            return
+        lowered = content.lower()
+        for need, terms in self._needs:
+            if need not in self._needs_revealed and any(t in lowered for t in terms):
+                self._needs_revealed.append(need)
+        for sentence in _SENTENCE_RE.findall(content):
+            sentence = sentence.strip()
+            if sentence and contains_nonnegated_keyword(sentence.lower(), self._objection_keywords):
+                self._objections.append(sentence[:_MAX_SNIPPET_CHARS])
+        del self._objections[:-PROSPECT_SUMMARY_MAX_OBJECTIONS]
+
+    def summary(self) -> str:
+        """Rendered summary of folded messages ('' while nothing is folded)."""
+        if self._summary is None:
+            self._summary = self._render() if self.folded else ""
+        return self._summary
+
+    def _render(self) -> str:
+        lines = [
+            f"EARLIER IN THIS CONVERSATION ({self._folded_user_turns} salesperson turns, summarized):"
+        ]
+        if self._objections:
+            lines.append("- Objections you raised: " + "; ".join(f'"{o}"' for o in self._objections))
+        if self._needs_revealed:
+            lines.append("- Needs you revealed: " + ", ".join(self._needs_revealed))
+        trajectory = self._readiness[: self._folded_user_turns]
+        if trajectory:
+            lines.append(
+                f"- Your readiness went from {trajectory[0]:.2f} to {trajectory[-1]:.2f}"
+                f" (low {min(trajectory):.2f}, high {max(trajectory):.2f})"
+            )
+        return "\n".join(lines)
+
+    def build(self, system_prompt: str, history: list[dict], model_name: str | None = None) -> list[dict]:
+        """Messages for the next call: system prompt (+ summary) and the newest turns."""
+        if len(history) < len(self._token_counts) or len(history) < self.folded:
+            # History was replaced rather than extended; start over
+            self._reset_fold()
+        self._count(history)
+
+        budget = history_budget(model_name)
+        keep_from = len(history)
+        used = 0
+        while keep_from > self.folded:
+            cost = self._token_counts[keep_from - 1]
+            kept = len(history) - keep_from
+            if kept >= PROSPECT_CONTEXT_MIN_VERBATIM_MESSAGES and used + cost > budget:
+                break
+            used += cost
+            keep_from -= 1
+        # Start the verbatim part on a salesperson message so roles still alternate
+        while self.folded < keep_from < len(history) and history[keep_from].get("role") != "user":
+            keep_from -= 1
+        if keep_from > self.folded:
+            for message in history[self.folded:keep_from]:
+                self._fold(message)
+            self.folded = keep_from
+            self._summary = None
+
+        summary = self.summary()
+        system = f"{system_prompt}\n\n{summary}" if summary else system_prompt
+        return [{"role": "system", "content": system}, *history[self.folded:]]
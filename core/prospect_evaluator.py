@@ -3,6 +3,7 @@
 import re
 
 from .loader import load_prospect_config
+from .services.llm_cache import cached_chat
 from .utils import clamp_score, extract_json_from_llm, range_label
 
 _GRADE_THRESHOLDS = [60, 70, 80, 90]
@@ -238,13 +239,44 @@ def _build_deterministic_summary(overall_score: int, outcome: str) -> str:
     return f"Foundational attempt; focus on core questioning and structure. Outcome: {outcome}."
 
 
+def _build_deterministic_pack(
+    criteria_scores: dict, criteria: dict, outcome: str, feedback_style: str = "coaching"
+) -> dict:
+    """Coaching, summary and style adjustments around deterministic criterion scores."""
+    strengths, improvements, coach_tip = _build_deterministic_coaching(criteria_scores)
+    overall = _weighted_overall(criteria_scores, criteria)
+    pack = {
+        "criteria_scores": criteria_scores,
+        "strengths": strengths,
+        "improvements": improvements,
+        "summary": _build_deterministic_summary(overall, outcome),
+        "coach_tip": coach_tip,
+    }
+
+    if feedback_style in ("strict", "tough", "hard"):
+        # Tighten feedback wording when strict coaching mode is active.
+        def _apply_style(text: str) -> str:
+            return text.replace("Try to", "Do").replace("Add", "Add").strip()
+
+        pack["strengths"] = [f"{s}".replace("Strong ", "Good ").strip() for s in pack["strengths"]]
+        pack["improvements"] = [_apply_style(s) for s in pack["improvements"]]
+        pack["coach_tip"] = _apply_style(pack.get("coach_tip", ""))
+    return pack
+
+
 def _grade_from_score(score: int) -> str:
     """Convert numeric score (0-100) to letter grade (F-A)."""
     return range_label(score, _GRADE_THRESHOLDS, _GRADE_LABELS)
 
 
-def evaluate_prospect_session(provider, conversation_history, prospect_state, product_context) -> dict:
-    """Evaluate salesperson's prospect-mode session across 5 criteria using LLM."""
+def evaluate_prospect_session(
+    provider, conversation_history, prospect_state, product_context, use_cache: bool = True
+) -> dict:
+    """Evaluate salesperson's prospect-mode session across 5 criteria using LLM.
+
+    Identical transcripts are served from the LLM response cache unless
+    use_cache is False.
+    """
     config = load_prospect_config()
     criteria = config.get("evaluation", {}).get("criteria", {})
     mode_cfg = config.get("prospect_mode", {}) if isinstance(config, dict) else {}
@@ -252,31 +284,32 @@ def evaluate_prospect_session(provider, conversation_history, prospect_state, pr
     feedback_style = str(mode_cfg.get("feedback_style", "coaching") or "coaching").lower()
 
     deterministic_scores = _build_deterministic_criteria_scores(conversation_history, criteria)
-    deterministic_strengths, deterministic_improvements, deterministic_tip = _build_deterministic_coaching(
-        deterministic_scores
+    deterministic_pack = _build_deterministic_pack(
+        deterministic_scores, criteria, prospect_state.status, feedback_style
     )
-    deterministic_overall = _weighted_overall(deterministic_scores, criteria)
-    deterministic_pack = {
-        "criteria_scores": deterministic_scores,
-        "strengths": deterministic_strengths,
-        "improvements": deterministic_improvements,
-        "summary": _build_deterministic_summary(deterministic_overall, prospect_state.status),
-        "coach_tip": deterministic_tip,
-    }
 
-    def _apply_style(text: str) -> str:
-        """Tighten feedback wording when strict coaching mode is active."""
-        if feedback_style in ("strict", "tough", "hard"):
-            return text.replace("Try to", "Do").replace("Add", "Add").strip()
-        return text
+    prompt = _build_evaluation_prompt(conversation_history, prospect_state, product_context, criteria)
+
+    if scoring_enabled and provider is not None:
+        try:
+            response = request_narrative(provider, prompt, use_cache=use_cache)
+            evaluation = evaluation_from_response(
+                response, criteria, prospect_state.status, deterministic_pack
+            )
+            if evaluation:
+                return evaluation
+        except Exception:
+            pass
+
+    return _fallback_evaluation(
+        prospect_state.status,
+        criteria=criteria,
+        deterministic=deterministic_pack,
+    )
 
-    if feedback_style in ("strict", "tough", "hard"):
-        deterministic_pack["strengths"] = [
-            f"{s}".replace("Strong ", "Good ").strip() for s in deterministic_pack["strengths"]
-        ]
-        deterministic_pack["improvements"] = [_apply_style(s) for s in deterministic_pack["improvements"]]
-        deterministic_pack["coach_tip"] = _apply_style(deterministic_pack.get("coach_tip", ""))
 
+def _build_evaluation_prompt(conversation_history, prospect_state, product_context, criteria: dict) -> str:
+    """Coach prompt asking the LLM for per-criterion scores and narrative feedback."""
     # Build conversation transcript and metadata
     transcript = "\n".join(
         f"{'SALESPERSON' if message['role'] == 'user' else 'PROSPECT'}: {message['content']}"
@@ -287,7 +320,7 @@ def evaluate_prospect_session(provider, conversation_history, prospect_state, pr
         for name, info in criteria.items()
     )
 
-    prompt = f"""You are a sales coach. Evaluate this trainee's performance.
+    return f"""You are a sales coach. Evaluate this trainee's performance.
 
 TRANSCRIPT:
 {transcript}
@@ -313,31 +346,26 @@ Return JSON:
     "summary": "<2-3 sentence overall assessment>"
 }}"""
 
-    if scoring_enabled and provider is not None:
-        try:
-            response = provider.chat(
-                [{"role": "system", "content": prompt}],
-                temperature=0.3,
-                max_tokens=800,
-            )
-            result = extract_json_from_llm(response.content)
-            if result:
-                return _build_evaluation(
-                    result,
-                    criteria,
-                    prospect_state.status,
-                    deterministic=deterministic_pack,
-                )
-        except Exception:
-            pass
 
-    return _fallback_evaluation(
-        prospect_state.status,
-        criteria=criteria,
-        deterministic=deterministic_pack,
+def request_narrative(provider, prompt: str, use_cache: bool = True):
+    """Send the evaluation prompt through the LLM response cache."""
+    return cached_chat(
+        provider,
+        [{"role": "system", "content": prompt}],
+        temperature=0.3,
+        max_tokens=800,
+        use_cache=use_cache,
     )
 
 
+def evaluation_from_response(response, criteria: dict, outcome: str, deterministic: dict) -> dict | None:
+    """Merge an LLM evaluation with the deterministic pack, or None if it didn't parse."""
+    result = extract_json_from_llm(response.content)
+    if not result:
+        return None
+    return _build_evaluation(result, criteria, outcome, deterministic=deterministic)
+
+
 def _build_evaluation(
     result: dict,
     criteria: dict,
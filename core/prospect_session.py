@@ -3,14 +3,26 @@
 import json
 import logging
 import random
+import sys
+import threading
 import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass, field
-
+from functools import lru_cache
+
+from .constants import (
+    PROSPECT_COMMIT_MIN_TURNS,
+    PROSPECT_COMMIT_READINESS,
+    PROSPECT_HINT_MAX_CONCURRENCY,
+    PROSPECT_NEUTRAL_TURN_GAIN,
+    PROSPECT_PATIENCE_WALK_READINESS,
+)
 from .loader import load_prospect_config, load_signals
 from .analysis import classify_intent_level
+from .prospect_context import ProspectContextWindow
 from .prospect_session_persistence import ProspectSessionPersistence
 from .providers.factory import create_provider, list_fallback_providers
-from .utils import clamp, range_label
+from .utils import CompiledTemplate, clamp, contains_nonnegated_keyword, range_label
 
 logger = logging.getLogger(__name__)
 
@@ -25,6 +37,38 @@ READINESS_LABELS = [
     "Almost there - just needs one more good reason",
 ]
 
+# Fixed closing lines, spoken verbatim in voice mode (prewarmed into the TTS cache)
+TERMINAL_OUTCOME_MESSAGES = {
+    "committed": "You've addressed what I needed. I'm ready to move forward.",
+    "timed_out": "Time's up for this roleplay. Let's stop here.",
+    "walked": "I don't think this is the right fit for me right now.",
+    "ended": "This roleplay session has ended.",
+}
+
+
+# Per-turn values in the system prompt; everything else is rendered once per session
+_PROMPT_SLOTS = ("readiness_description", "objections_raised", "turn_count")
+
+_hint_executor: ThreadPoolExecutor | None = None
+_hint_executor_lock = threading.Lock()
+
+
+def _hint_pool() -> ThreadPoolExecutor:
+    """Process-wide pool that runs coaching-hint calls alongside prospect replies."""
+    global _hint_executor
+    with _hint_executor_lock:
+        if _hint_executor is None:
+            _hint_executor = ThreadPoolExecutor(
+                max_workers=PROSPECT_HINT_MAX_CONCURRENCY, thread_name_prefix="prospect-hint"
+            )
+        return _hint_executor
+
+
+@lru_cache(maxsize=256)
+def _shared_system_prompt(template: str, static_items: tuple) -> CompiledTemplate:
+    """One compiled prompt per (template, persona, product, difficulty) across sessions."""
+    return CompiledTemplate(template, dict(static_items), _PROMPT_SLOTS)
+
 
 @dataclass
 class ProspectState:
@@ -74,6 +118,7 @@ class ProspectResponse:
     model: str
     state_snapshot: dict
     coaching: dict | None = None
+    coaching_pending: bool = False
 
 
 def select_persona(product_type: str) -> dict:
@@ -107,6 +152,112 @@ def select_persona(product_type: str) -> dict:
     }
 
 
+def find_persona(product_type: str, name: str) -> dict | None:
+    """Look up a configured persona by name (product personas, then general)."""
+    personas = load_prospect_config().get("personas", {})
+    for persona in [*(personas.get(product_type) or []), *(personas.get("general") or [])]:
+        if persona.get("name") == name:
+            return persona
+    return None
+
+
+def score_sales_message(user_msg: str, conversation_history: list[dict], turn_count: int) -> int:
+    """Score a salesperson message from 1 to 5 using deterministic signals.
+
+    The score is keyword-based on purpose so readiness changes stay predictable
+    and fast without needing an extra LLM call. conversation_history already
+    ends with user_msg and turn_count includes it, as in process_turn().
+    """
+    msg_lower = user_msg.lower()
+    msg_length = len(user_msg.split())
+    intent_level = classify_intent_level(
+        conversation_history, user_msg, signal_keywords=SIGNALS
+    )
+
+    # Base score starts at 3 (neutral)
+    score = 3.0
+
+    # Walking away or shutting down ends the session quickly.
+    if contains_nonnegated_keyword(msg_lower, SIGNALS.get("walking", [])):
+        return 1
+
+    # Pushy/urgent language reduces quality.
+    if contains_nonnegated_keyword(msg_lower, SIGNALS.get("impatience", [])):
+        score -= 1.0
+
+    # Demand for directness (pressure without rapport)
+    if contains_nonnegated_keyword(msg_lower, SIGNALS.get("demand_directness", [])):
+        score -= 1.0
+
+    if contains_nonnegated_keyword(msg_lower, SIGNALS.get("commitment", [])):
+        score += 2.0
+    elif intent_level == "high":
+        score += 1.0
+    elif intent_level == "low":
+        score -= 0.5
+
+    # Message quality factors
+    # Very short messages (< 5 words) are likely low-effort
+    if msg_length < 5:
+        score -= 0.5
+
+    # Questions are good (discovery)
+    if "?" in user_msg:
+        score += 0.3
+
+    # Discovery/consultative language indicates better probing quality.
+    if any(
+        phrase in msg_lower
+        for phrase in (
+            "help me understand",
+            "what matters most",
+            "what are you hoping",
+            "what's most important",
+            "tell me more",
+        )
+    ):
+        score += 0.7
+
+    # Early turns should focus on discovery, not pitching
+    if turn_count <= 2:
+        # Penalize price/feature mentions too early
+        if any(
+            word in msg_lower
+            for word in ["price", "cost", "payment", "buy", "purchase"]
+        ):
+            score -= 0.5
+
+    return max(1, min(5, round(score)))
+
+
+def readiness_change(rating: int, behaviour: dict) -> float:
+    """Readiness delta for one rated salesperson turn under a difficulty profile."""
+    if rating >= 4:
+        return behaviour["readiness_gain_per_good_turn"] * (rating - 3)  # 4→gain, 5→2*gain
+    if rating <= 2:
+        return -behaviour["readiness_loss_per_bad_turn"] * (3 - rating)  # 2→-loss, 1→-2*loss
+    return PROSPECT_NEUTRAL_TURN_GAIN  # Slight gain for neutral
+
+
+def end_condition(readiness: float, turn_count: int, behaviour: dict, max_turns: int | None = None) -> str | None:
+    """'sold', 'walked' or None for a prospect at this readiness after turn_count turns."""
+    # Prospect commits
+    if readiness >= PROSPECT_COMMIT_READINESS and turn_count >= PROSPECT_COMMIT_MIN_TURNS:
+        return "sold"
+
+    # Prospect walks - out of patience
+    if max_turns is not None and turn_count >= max_turns:
+        return "walked"
+    if turn_count >= behaviour["patience_turns"] and readiness < PROSPECT_PATIENCE_WALK_READINESS:
+        return "walked"
+
+    # Prospect walks - readiness dropped to zero
+    if readiness <= 0.0:
+        return "walked"
+
+    return None
+
+
 class ProspectSession:
     """Manages a prospect-mode conversation for sales roleplay training.
 
@@ -165,9 +316,13 @@ class ProspectSession:
         )
 
         self.conversation_history: list[dict] = []
+        self._pending_hint: tuple[int, Future] | None = None
+        self.context_window = ProspectContextWindow(persona, SIGNALS.get("objection", []))
 
         behaviour_rules = config.get("behaviour_rules", {})
-        self.behaviour_rules = behaviour_rules.get(difficulty, "")
+        # Interned: every session at this difficulty shares one copy of the block
+        self.behaviour_rules = sys.intern(str(behaviour_rules.get(difficulty) or ""))
+        self._system_prompt = self._compile_system_prompt()
 
     def public_config(self) -> dict:
         """Return the frontend-facing prospect mode settings for this session."""
@@ -177,8 +332,13 @@ class ProspectSession:
             "feedback_style": self.feedback_style,
         }
 
-    def _get_chat_with_fallback(self, messages, temperature=0.8, max_tokens=200):
-        """Get chat response with automatic fallback to other providers on error."""
+    def _get_chat_with_fallback(self, messages, temperature=0.8, max_tokens=200, adopt=True):
+        """Get chat response with automatic fallback to other providers on error.
+
+        With adopt=False a working fallback answers this call only; side calls
+        running next to the reply (coaching hints) must not switch the
+        session's provider underneath it.
+        """
         response = self.provider.chat(messages, temperature=temperature, max_tokens=max_tokens)
         if response.error or not (response.content or "").strip():
             for provider_name in list_fallback_providers(self.provider_name):
@@ -189,10 +349,11 @@ class ProspectSession:
                     messages, temperature=temperature, max_tokens=max_tokens
                 )
                 if not response.error and (response.content or "").strip():
-                    self.provider = fallback
-                    self.provider_type = provider_name
-                    self.provider_name = provider_name
-                    self.model_name = fallback.get_model_name()
+                    if adopt:
+                        self.provider = fallback
+                        self.provider_type = provider_name
+                        self.provider_name = provider_name
+                        self.model_name = fallback.get_model_name()
                     break
         return response
 
@@ -288,11 +449,11 @@ class ProspectSession:
             parts.append(f"BUYER'S BUDGET: {budget}")
         return "\n".join(parts)
 
-    def _build_system_prompt(self) -> str:
-        """Build the system prompt for the prospect LLM.
+    def _compile_system_prompt(self) -> CompiledTemplate:
+        """Render the static persona/product part of the system prompt once.
 
         Returns:
-            Formatted system prompt with current state and persona details.
+            Compiled template whose only slots are readiness, objections and turn.
         """
         config = load_prospect_config()
         template = config.get("system_prompt_template", "")
@@ -300,10 +461,6 @@ class ProspectSession:
         behaviour = self.difficulty_profile["behaviour"]
         persona = self.persona
 
-        readiness_desc = range_label(
-            self.state.readiness, READINESS_THRESHOLDS, READINESS_LABELS
-        )
-
         needs = persona.get("needs", [])
         pain_points = persona.get("pain_points", [])
         needs_formatted = "\n".join(f"  - {n}" for n in needs)
@@ -316,29 +473,40 @@ class ProspectSession:
                 f"{self.product_context}"
             )
 
-        prompt = template.format(
-            name=persona.get("name", "Alex"),
-            background=persona.get("background", ""),
-            personality=persona.get("personality", ""),
-            needs_formatted=needs_formatted,
-            pain_points_formatted=pain_points_formatted,
-            budget=persona.get("budget", "mid-range"),
-            product_context=self.product_type.replace("_", " "),
-            product_knowledge=product_knowledge,
-            readiness_description=readiness_desc,
-            objections_raised=self.state.objections_raised,
-            max_objections=behaviour["max_objections"],
-            turn_count=self.state.turn_count,
-            behaviour_rules=self.behaviour_rules,
-        )
-        return prompt
+        static = {
+            "name": persona.get("name", "Alex"),
+            "background": persona.get("background", ""),
+            "personality": persona.get("personality", ""),
+            "needs_formatted": needs_formatted,
+            "pain_points_formatted": pain_points_formatted,
+            "budget": persona.get("budget", "mid-range"),
+            "product_context": self.product_type.replace("_", " "),
+            "product_knowledge": product_knowledge,
+            "max_objections": behaviour["max_objections"],
+            "behaviour_rules": self.behaviour_rules,
+        }
+        try:
+            return _shared_system_prompt(template, tuple(static.items()))
+        except TypeError:
+            # Unhashable persona field (e.g. a list budget): compile for this session only
+            return CompiledTemplate(template, static, _PROMPT_SLOTS)
 
-    def get_opening_message(self) -> ProspectResponse:
-        """Generate the prospect's opening message to start the conversation.
+    def _build_system_prompt(self) -> str:
+        """Build the system prompt for the prospect LLM.
 
         Returns:
-            ProspectResponse with the opening message and state snapshot.
+            Formatted system prompt with current state and persona details.
         """
+        return self._system_prompt.render(
+            readiness_description=range_label(
+                self.state.readiness, READINESS_THRESHOLDS, READINESS_LABELS
+            ),
+            objections_raised=self.state.objections_raised,
+            turn_count=self.state.turn_count,
+        )
+
+    def _generate_opening(self):
+        """Ask the LLM for an opening line. Returns (response, latency_ms)."""
         system_prompt = self._build_system_prompt()
         persona_name = self.persona.get("name", "Alex")
 
@@ -356,19 +524,42 @@ class ProspectSession:
 
         start = time.time()
         response = self._get_chat_with_fallback(messages, temperature=0.7, max_tokens=150)
-        latency = (time.time() - start) * 1000
+        return response, (time.time() - start) * 1000
+
+    def generate_opening_text(self) -> str | None:
+        """Generate an opening without starting the conversation (for the opening pool)."""
+        response, _latency = self._generate_opening()
+        if response.error or not (response.content or "").strip():
+            return None
+        return response.content
+
+    def get_opening_message(self, pregenerated: str | None = None) -> ProspectResponse:
+        """Generate the prospect's opening message to start the conversation.
+
+        Args:
+            pregenerated: An opening generated earlier for this persona and
+                difficulty; used verbatim instead of calling the LLM.
+
+        Returns:
+            ProspectResponse with the opening message and state snapshot.
+        """
+        if pregenerated is not None:
+            content, latency = pregenerated, 0.0
+        else:
+            response, latency = self._generate_opening()
+            content = response.content
 
         self.conversation_history.append(
             {
                 "role": "assistant",
-                "content": response.content,
+                "content": content,
             }
         )
-        self._log_turn_event(None, response.content, turn_index=0)
+        self._log_turn_event(None, content, turn_index=0)
         self.save_session()
 
         return ProspectResponse(
-            content=response.content,
+            content=content,
             latency_ms=round(latency, 1),
             provider=self.provider_name,
             model=self.model_name,
@@ -445,9 +636,17 @@ class ProspectSession:
                 state_snapshot=self.state.to_dict(),
             )
 
+        # The hint only needs the message, readiness and turn count, all known
+        # now, so it runs alongside the reply instead of after it
+        hint_future = None
+        if show_hints:
+            hint_future = _hint_pool().submit(self._generate_coaching_hint, user_message)
+            self._pending_hint = (self.state.turn_count, hint_future)
+
         system_prompt = self._build_system_prompt()
-        messages = [{"role": "system", "content": system_prompt}]
-        messages.extend(self.conversation_history)
+        messages = self.context_window.build(
+            system_prompt, self.conversation_history, self.model_name
+        )
 
         start = time.time()
         response = self._get_chat_with_fallback(messages, temperature=0.7, max_tokens=250)
@@ -462,10 +661,10 @@ class ProspectSession:
         self._log_turn_event(user_message, response.content, turn_index=self.state.turn_count)
         self.save_session()
 
-        # Optional coaching hint
+        # A hint that is not ready yet is fetched later via get_coaching_hint()
         coaching = None
-        if show_hints and not self.state.has_committed and not self.state.has_walked:
-            coaching = self._generate_coaching_hint(user_message)
+        if hint_future is not None and hint_future.done():
+            coaching = hint_future.result()
 
         return ProspectResponse(
             content=response.content,
@@ -474,17 +673,34 @@ class ProspectSession:
             model=self.model_name,
             state_snapshot=self.state.to_dict(),
             coaching=coaching,
+            coaching_pending=hint_future is not None and coaching is None,
         )
 
+    def get_coaching_hint(self, timeout: float = 0.0) -> dict:
+        """Coaching hint for the latest hinted turn, waiting up to `timeout` seconds.
+
+        Returns:
+            Dict with 'turn' and 'pending', plus 'coaching' once the hint is ready.
+        """
+        pending = self._pending_hint
+        if pending is None:
+            return {"turn": None, "pending": False}
+        turn, future = pending
+        try:
+            coaching = future.result(timeout=timeout)
+        except TimeoutError:
+            return {"turn": turn, "pending": True}
+        return {"turn": turn, "pending": False, "coaching": coaching}
+
     def _terminal_outcome_message(self) -> str:
         """Return stable terminal message that matches the current session outcome."""
         if self.state.has_committed:
-            return "You've addressed what I needed. I'm ready to move forward."
+            return TERMINAL_OUTCOME_MESSAGES["committed"]
         if self.state.has_walked:
             if self.max_turns is not None and self.state.turn_count >= self.max_turns:
-                return "Time's up for this roleplay. Let's stop here."
-            return "I don't think this is the right fit for me right now."
-        return "This roleplay session has ended."
+                return TERMINAL_OUTCOME_MESSAGES["timed_out"]
+            return TERMINAL_OUTCOME_MESSAGES["walked"]
+        return TERMINAL_OUTCOME_MESSAGES["ended"]
 
     def _update_readiness(self, user_msg: str) -> None:
         """Update prospect readiness score based on the salesperson's message.
@@ -492,91 +708,14 @@ class ProspectSession:
         Args:
             user_msg: The salesperson's message to evaluate.
         """
-        behaviour = self.difficulty_profile["behaviour"]
-
-        # Deterministic scoring using only the user message
         rating = self._score_sales_message(user_msg)
-
-        gain = behaviour["readiness_gain_per_good_turn"]
-        loss = behaviour["readiness_loss_per_bad_turn"]
-
-        if rating >= 4:
-            readiness_change = gain * (rating - 3)  # 4→gain, 5→2*gain
-        elif rating <= 2:
-            readiness_change = -loss * (3 - rating)  # 2→-loss, 1→-2*loss
-        else:
-            readiness_change = 0.01  # Slight gain for neutral
-
-        self.state.readiness = clamp(self.state.readiness + readiness_change)
+        change = readiness_change(rating, self.difficulty_profile["behaviour"])
+        self.state.readiness = clamp(self.state.readiness + change)
+        self.context_window.record_readiness(self.state.readiness)
 
     def _score_sales_message(self, user_msg: str) -> int:
-        """Score a salesperson message from 1 to 5 using deterministic signals.
-
-        The score is keyword-based on purpose so readiness changes stay predictable
-        and fast without needing an extra LLM call.
-        """
-        from .utils import contains_nonnegated_keyword
-
-        msg_lower = user_msg.lower()
-        msg_length = len(user_msg.split())
-        intent_level = classify_intent_level(
-            self.conversation_history, user_msg, signal_keywords=SIGNALS
-        )
-
-        # Base score starts at 3 (neutral)
-        score = 3.0
-
-        # Walking away or shutting down ends the session quickly.
-        if contains_nonnegated_keyword(msg_lower, SIGNALS.get("walking", [])):
-            return 1
-
-        # Pushy/urgent language reduces quality.
-        if contains_nonnegated_keyword(msg_lower, SIGNALS.get("impatience", [])):
-            score -= 1.0
-
-        # Demand for directness (pressure without rapport)
-        if contains_nonnegated_keyword(msg_lower, SIGNALS.get("demand_directness", [])):
-            score -= 1.0
-
-        if contains_nonnegated_keyword(msg_lower, SIGNALS.get("commitment", [])):
-            score += 2.0
-        elif intent_level == "high":
-            score += 1.0
-        elif intent_level == "low":
-            score -= 0.5
-
-        # Message quality factors
-        # Very short messages (< 5 words) are likely low-effort
-        if msg_length < 5:
-            score -= 0.5
-
-        # Questions are good (discovery)
-        if "?" in user_msg:
-            score += 0.3
-
-        # Discovery/consultative language indicates better probing quality.
-        if any(
-            phrase in msg_lower
-            for phrase in (
-                "help me understand",
-                "what matters most",
-                "what are you hoping",
-                "what's most important",
-                "tell me more",
-            )
-        ):
-            score += 0.7
-
-        # Early turns should focus on discovery, not pitching
-        if self.state.turn_count <= 2:
-            # Penalize price/feature mentions too early
-            if any(
-                word in msg_lower
-                for word in ["price", "cost", "payment", "buy", "purchase"]
-            ):
-                score -= 0.5
-
-        return max(1, min(5, round(score)))
+        """Score a salesperson message from 1 to 5 (see score_sales_message)."""
+        return score_sales_message(user_msg, self.conversation_history, self.state.turn_count)
 
     def _check_end_conditions(self) -> str | None:
         """Check if the session should end and determine the outcome.
@@ -584,26 +723,12 @@ class ProspectSession:
         Returns:
             'sold' if prospect commits, 'walked' if prospect leaves, None otherwise.
         """
-        behaviour = self.difficulty_profile["behaviour"]
-
-        # Prospect commits
-        if self.state.readiness >= 0.85 and self.state.turn_count >= 3:
-            return "sold"
-
-        # Prospect walks - out of patience
-        if self.max_turns is not None and self.state.turn_count >= self.max_turns:
-            return "walked"
-        if (
-            self.state.turn_count >= behaviour["patience_turns"]
-            and self.state.readiness < 0.4
-        ):
-            return "walked"
-
-        # Prospect walks - readiness dropped to zero
-        if self.state.readiness <= 0.0:
-            return "walked"
-
-        return None
+        return end_condition(
+            self.state.readiness,
+            self.state.turn_count,
+            self.difficulty_profile["behaviour"],
+            self.max_turns,
+        )
 
     def _generate_coaching_hint(self, user_message: str) -> dict:
         """Generate a one-sentence coaching hint for the salesperson.
@@ -638,7 +763,9 @@ Don't give away what the prospect actually wants."""
                 {"role": "system", "content": hint_prompt},
                 {"role": "user", "content": "Give a coaching tip."},
             ]
-            resp = self._get_chat_with_fallback(messages, temperature=0.5, max_tokens=80)
+            resp = self._get_chat_with_fallback(
+                messages, temperature=0.5, max_tokens=80, adopt=False
+            )
             return {"hint": resp.content.strip()}
         except Exception:
             return {"hint": "Find out more before pitching anything."}
@@ -663,9 +790,12 @@ Don't give away what the prospect actually wants."""
         }
         logger.info("prospect_conversation_turn %s", json.dumps(payload, ensure_ascii=False))
 
-    def get_evaluation(self) -> dict:
+    def get_evaluation(self, use_cache: bool = True) -> dict:
         """Generate a final evaluation of the salesperson's performance.
 
+        Args:
+            use_cache: Serve an identical earlier evaluation from the LLM response cache.
+
         Returns:
             Dictionary containing scores, grades, feedback and assessment.
         """
@@ -685,4 +815,5 @@ Don't give away what the prospect actually wants."""
             conversation_history=self.conversation_history,
             prospect_state=self.state,
             product_context=self.product_context,
+            use_cache=use_cache,
         )
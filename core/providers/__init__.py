@@ -20,6 +20,7 @@ from .stt import (
 )
 from .tts import (
     EdgeTTSProvider,
+    create_cached_tts_provider,
     create_tts_provider,
     get_available_tts_providers,
     list_tts_fallback_providers,
@@ -32,6 +33,7 @@ __all__ = [
     "EdgeTTSProvider",
     "create_provider",
     "create_provider_with_trace",
+    "create_cached_tts_provider",
     "create_stt_provider",
     "create_tts_provider",
     "get_available_providers",
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
+from collections.abc import Iterable, Iterator
 from dataclasses import dataclass
 
 RATE_LIMIT = "rate_limit"
@@ -27,9 +28,16 @@ class TranscriptionResult:
     fallback_recommended: str | None = None
 
 
+@dataclass
+class TranscriptEvent:
+    text: str = ""
+    is_final: bool = False  # the provider will not revise this segment again
+    speech_final: bool = False  # the speaker paused: end of an utterance
+
+
 @dataclass
 class SynthesisResult:
-    audio_bytes: bytes = b""
+    audio_bytes: bytes | memoryview = b""  # cache hits may be a view over a mapped file
     content_type: str = "audio/wav"
     latency_ms: float = 0.0
     provider: str = ""
@@ -38,6 +46,10 @@ class SynthesisResult:
     fallback_recommended: str | None = None
 
 
+class AudioStreamError(RuntimeError):
+    """Raised by streaming audio methods, which cannot report errors in a result object."""
+
+
 class BaseLLMProvider(ABC):
     provider_name = "base"
 
@@ -65,6 +77,17 @@ class BaseSTTProvider(ABC):
         """Turn input audio into text using the concrete provider."""
         raise NotImplementedError
 
+    def transcribe_stream(self, chunks: Iterable[bytes], filename: str = "audio.webm") -> TranscriptionResult:
+        """Transcribe audio arriving as chunks. Default: join them and call transcribe()."""
+        return self.transcribe(b"".join(chunks), filename=filename)
+
+    def stream_transcribe(self, chunks: Iterable[bytes], filename: str = "audio.webm") -> Iterator[TranscriptEvent]:
+        """Yield transcript events while audio is still arriving. Default: one final event."""
+        result = self.transcribe_stream(chunks, filename=filename)
+        if result.error:
+            raise AudioStreamError(result.error)
+        yield TranscriptEvent(text=result.text, is_final=True, speech_final=True)
+
     @abstractmethod
     def is_available(self) -> bool:
         """Return True when the provider is configured and ready to use."""
@@ -78,12 +101,21 @@ class BaseSTTProvider(ABC):
 
 class BaseTTSProvider(ABC):
     provider_name = "base"
+    stream_content_type = "application/octet-stream"
 
     @abstractmethod
     def synthesize(self, text: str, voice: str = "male_us", rate: int = 0) -> SynthesisResult:
         """Turn text into audio using the concrete provider."""
         raise NotImplementedError
 
+    def synthesize_stream(self, text: str, voice: str = "male_us", rate: int = 0) -> Iterator[bytes]:
+        """Yield audio chunks as they are produced. Default: one chunk from synthesize()."""
+        result = self.synthesize(text, voice=voice, rate=rate)
+        if result.error:
+            raise AudioStreamError(result.error)
+        if result.audio_bytes:
+            yield result.audio_bytes
+
     @abstractmethod
     def is_available(self) -> bool:
         """Return True when the provider is configured and ready to use."""
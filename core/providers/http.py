@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import json
 import uuid
+from typing import Iterable
 from urllib import error as urlerror
 from urllib import request as urlrequest
 
@@ -64,6 +65,30 @@ def post_bytes(
         raise ProviderHTTPError(exc.code, _read_http_error(exc), exc.reason) from exc
 
 
+def post_stream(
+    url: str,
+    chunks: Iterable[bytes],
+    headers: dict[str, str],
+    timeout: int = 30,
+):
+    """POST an iterable of byte chunks with chunked transfer encoding.
+
+    Chunks are sent as they are produced, so the caller never holds the full
+    body. Returns response bytes plus response headers.
+    """
+    request = urlrequest.Request(
+        url,
+        data=(bytes(chunk) for chunk in chunks if chunk),
+        method="POST",
+        headers={**headers, "Transfer-Encoding": "chunked"},
+    )
+    try:
+        with urlrequest.urlopen(request, timeout=timeout) as response:
+            return response.read(), dict(response.info())
+    except urlerror.HTTPError as exc:
+        raise ProviderHTTPError(exc.code, _read_http_error(exc), exc.reason) from exc
+
+
 def _build_multipart_body(
     fields: dict[str, str],
     file_field: str,
@@ -6,14 +6,18 @@ import logging
 import time
 from typing import Any, cast
 
-from groq import Groq, APIConnectionError, RateLimitError, AuthenticationError
-
 from ..base import ACCESS_DENIED, BaseLLMProvider, LLMResponse, RATE_LIMIT
 from ..config import get_groq_api_keys, get_groq_llm_model
 
 logger = logging.getLogger(__name__)
 
 
+def _groq_sdk():
+    import groq
+
+    return groq
+
+
 class GroqProvider(BaseLLMProvider):
     provider_name = "groq"
 
@@ -21,7 +25,8 @@ class GroqProvider(BaseLLMProvider):
         """Initialise the Groq client pool and chosen model name."""
         self.model = model or get_groq_llm_model()
         self.api_keys = get_groq_api_keys()
-        groq_client = cast(Any, Groq)
+        # The SDK (pydantic + httpx) is the slowest import in the app; only pay for it when Groq is configured
+        groq_client = cast(Any, _groq_sdk().Groq) if self.api_keys else None
         self.clients = [groq_client(api_key=key) for key in self.api_keys]
 
     def is_available(self) -> bool:
@@ -41,6 +46,7 @@ class GroqProvider(BaseLLMProvider):
                 latency_ms=(time.time() - start) * 1000,
             )
 
+        groq = _groq_sdk()
         last_error = "Groq request failed."
         last_error_code = None
         for client in self.clients:
@@ -57,18 +63,18 @@ class GroqProvider(BaseLLMProvider):
                     content=content,
                     latency_ms=(time.time() - start) * 1000,
                 )
-            except RateLimitError as exc:
+            except groq.RateLimitError as exc:
                 last_error = str(exc)
                 last_error_code = RATE_LIMIT
                 continue
-            except AuthenticationError as exc:
+            except groq.AuthenticationError as exc:
                 last_error = str(exc)
                 return LLMResponse(
                     error=f"Groq authentication failed: {last_error}",
                     error_code=ACCESS_DENIED,
                     latency_ms=(time.time() - start) * 1000,
                 )
-            except APIConnectionError as exc:
+            except groq.APIConnectionError as exc:
                 last_error = str(exc)
                 return LLMResponse(
                     error=f"Groq connection error: {last_error}",
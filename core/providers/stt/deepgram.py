@@ -4,15 +4,20 @@ from __future__ import annotations
 
 import json
 import os
+import threading
 import time
+from typing import Callable, Iterable, Iterator
 
-from ..base import BaseSTTProvider, TranscriptionResult
+from ..base import AudioStreamError, BaseSTTProvider, TranscriptEvent, TranscriptionResult
 from ..config import (
     DEFAULT_DEEPGRAM_BASE_URL,
     DEFAULT_DEEPGRAM_STT_MODEL,
     get_deepgram_api_key,
 )
-from ..http import ProviderHTTPError, post_bytes
+from ..http import ProviderHTTPError, post_bytes, post_stream
+from ..ws import WebSocket, WebSocketError
+
+LIVE_RECEIVE_TIMEOUT_SECONDS = 30
 
 
 class DeepgramSTTProvider(BaseSTTProvider):
@@ -35,6 +40,11 @@ class DeepgramSTTProvider(BaseSTTProvider):
         """Return True while the temporary rate-limit cooldown is active."""
         return time.time() < cls._rate_limit_until
 
+    @classmethod
+    def cooldown_remaining(cls) -> float:
+        """Seconds left on the rate-limit cooldown (0.0 when not cooling down)."""
+        return max(0.0, round(cls._rate_limit_until - time.time(), 1))
+
     def is_available(self) -> bool:
         """Return True when Deepgram is configured and not cooling down."""
         return bool(self.api_key) and not self._is_rate_limited()
@@ -72,6 +82,20 @@ class DeepgramSTTProvider(BaseSTTProvider):
 
     def transcribe(self, audio_bytes: bytes, filename: str = "audio.webm") -> TranscriptionResult:
         """Send audio bytes to Deepgram and return the transcript result."""
+        return self._transcribe_request(
+            lambda url, headers: post_bytes(url, body=audio_bytes, headers=headers),
+            filename,
+        )
+
+    def transcribe_stream(self, chunks: Iterable[bytes], filename: str = "audio.webm") -> TranscriptionResult:
+        """Forward audio chunks to Deepgram as they arrive (chunked upload) and return the transcript."""
+        return self._transcribe_request(
+            lambda url, headers: post_stream(url, chunks=chunks, headers=headers),
+            filename,
+        )
+
+    def _transcribe_request(self, send: Callable, filename: str) -> TranscriptionResult:
+        """Run one prerecorded /listen request through `send(url, headers)`."""
         start = time.time()
         if not self.api_key:
             return TranscriptionResult(
@@ -91,10 +115,9 @@ class DeepgramSTTProvider(BaseSTTProvider):
         query = f"model={self.model}&smart_format=true"
         content_type = self.infer_content_type(filename)
         try:
-            raw_body, _headers = post_bytes(
+            raw_body, _headers = send(
                 f"{self.base_url}/listen?{query}",
-                body=audio_bytes,
-                headers={
+                {
                     "Authorization": f"Token {self.api_key}",
                     "Content-Type": content_type,
                 },
@@ -126,3 +149,80 @@ class DeepgramSTTProvider(BaseSTTProvider):
                 error=f"Deepgram request failed: {exc}",
                 latency_ms=(time.time() - start) * 1000,
             )
+
+    def _live_url(self) -> str:
+        """Streaming endpoint: same base URL over ws(s)://, with interim results on."""
+        base = self.base_url
+        if base.startswith("https://"):
+            base = "wss://" + base[len("https://"):]
+        elif base.startswith("http://"):
+            base = "ws://" + base[len("http://"):]
+        return f"{base}/listen?model={self.model}&smart_format=true&interim_results=true"
+
+    @staticmethod
+    def _live_event(message: str) -> TranscriptEvent | None:
+        """Turn one live `Results` message into an event; other message types are skipped."""
+        try:
+            body = json.loads(message)
+        except ValueError:
+            return None
+        if not isinstance(body, dict) or body.get("type") != "Results":
+            return None
+        alternatives = (body.get("channel") or {}).get("alternatives") or []
+        text = (alternatives[0].get("transcript") or "").strip() if alternatives else ""
+        return TranscriptEvent(
+            text=text,
+            is_final=bool(body.get("is_final")),
+            speech_final=bool(body.get("speech_final")),
+        )
+
+    def stream_transcribe(self, chunks: Iterable[bytes], filename: str = "audio.webm") -> Iterator[TranscriptEvent]:
+        """Stream audio over Deepgram's live WebSocket and yield partial and final transcripts.
+
+        Audio is sent from a helper thread while this generator reads results,
+        so partials arrive while the caller is still uploading.
+        """
+        if not self.api_key:
+            raise AudioStreamError("Deepgram API key is not configured.")
+        if self._is_rate_limited():
+            raise AudioStreamError("Deepgram rate limit cooldown active.")
+
+        try:
+            live = WebSocket.connect(self._live_url(), headers={"Authorization": f"Token {self.api_key}"})
+        except (OSError, WebSocketError) as exc:
+            if getattr(exc, "status_code", None) == 429:
+                self._apply_rate_limit_cooldown()
+            raise AudioStreamError(f"Deepgram live connection failed: {exc}") from exc
+        live.settimeout(LIVE_RECEIVE_TIMEOUT_SECONDS)
+
+        send_errors: list[Exception] = []
+
+        def _send_audio():
+            try:
+                for chunk in chunks:
+                    if chunk:
+                        live.send_binary(chunk)
+                live.send_text(json.dumps({"type": "CloseStream"}))
+            except Exception as exc:
+                send_errors.append(exc)
+                live.close()
+
+        sender = threading.Thread(target=_send_audio, name="deepgram-live-send", daemon=True)
+        sender.start()
+        try:
+            while True:
+                try:
+                    message = live.recv()
+                except (OSError, WebSocketError) as exc:
+                    raise AudioStreamError(f"Deepgram live stream failed: {exc}") from exc
+                if message is None:
+                    break
+                if isinstance(message, str):
+                    event = self._live_event(message)
+                    if event is not None and (event.text or event.is_final):
+                        yield event
+        finally:
+            live.close()
+            sender.join(timeout=1)
+        if send_errors:
+            raise AudioStreamError(f"Deepgram live upload failed: {send_errors[0]}") from send_errors[0]
@@ -1,19 +1,32 @@
 """TTS provider implementations."""
 
+from .cache import CachedTTSProvider, TTSAudioCache, get_tts_audio_cache
 from .edge import EdgeTTSProvider
+from .executor import AsyncTTSExecutor, get_tts_executor
 from .factory import (
+    create_cached_tts_provider,
     create_tts_provider,
     get_available_tts_providers,
     list_tts_fallback_providers,
     list_tts_providers,
     supported_tts_provider_names,
 )
+from .streaming import split_sentences, stream_sentences, stream_text
 
 __all__ = [
+    "AsyncTTSExecutor",
+    "CachedTTSProvider",
     "EdgeTTSProvider",
+    "TTSAudioCache",
+    "create_cached_tts_provider",
     "create_tts_provider",
     "get_available_tts_providers",
+    "get_tts_audio_cache",
+    "get_tts_executor",
     "list_tts_fallback_providers",
     "list_tts_providers",
+    "split_sentences",
+    "stream_sentences",
+    "stream_text",
     "supported_tts_provider_names",
 ]
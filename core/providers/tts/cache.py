@@ -0,0 +1,368 @@
+"""Content-addressed cache for synthesized speech.
+
+Fallback questions, terminal outcome lines and objection check questions are
+spoken verbatim over and over. Audio is cached by a hash of (text, voice,
+rate, provider, model) in two tiers:
+
+- memory: recent clips as bytes, LRU-bounded by total size
+- disk (TTS_CACHE_DIR): one file per clip, written through on store and
+  shared by every worker. Hits are mmapped read-only and handed out as
+  memoryviews over the mapping, so nothing is copied into the heap. Routes can
+  pass `CachedAudio.path` to send_file(), which lets the WSGI server sendfile()
+  it straight from the page cache.
+
+CachedTTSProvider hands hits out the same way: synthesize() returns the cached
+buffer as audio_bytes and start_stream() yields memoryview slices of it. WSGI
+bodies must be bytes, so a route streaming a hit copies each chunk as it is
+written; base64-encoding consumers read the slices directly.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import mmap
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator
+
+from ...constants import (
+    TTS_CACHE_MAX_DISK_BYTES,
+    TTS_CACHE_MAX_MEMORY_BYTES,
+    TTS_CACHE_MAX_OPEN_MAPS,
+)
+from ..base import BaseTTSProvider, SynthesisResult
+from .streaming import start_stream
+
+logger = logging.getLogger(__name__)
+
+_EXTENSIONS = {
+    "audio/mpeg": ".mp3",
+    "audio/wav": ".wav",
+    "audio/ogg": ".ogg",
+    "audio/webm": ".webm",
+}
+_CONTENT_TYPES = {extension: content_type for content_type, extension in _EXTENSIONS.items()}
+_DEFAULT_EXTENSION = ".bin"
+STREAM_CHUNK_BYTES = 16 * 1024
+
+
+def tts_cache_key(text: str, voice: str, rate: int, provider_name: str, model: str) -> str:
+    """Hash of whitespace-normalized text plus everything that changes the audio."""
+    material = "\x1f".join([" ".join(str(text or "").split()), str(voice), str(int(rate)), provider_name, model])
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class CachedAudio:
+    data: bytes | memoryview
+    content_type: str
+    path: Path | None = None  # set when the clip is on disk
+
+
+class TTSAudioCache:
+    """Byte-bounded memory LRU with an optional mmap-backed disk tier."""
+
+    def __init__(
+        self,
+        max_memory_bytes: int = TTS_CACHE_MAX_MEMORY_BYTES,
+        cache_dir: str | Path | None = None,
+        max_disk_bytes: int = TTS_CACHE_MAX_DISK_BYTES,
+        max_open_maps: int = TTS_CACHE_MAX_OPEN_MAPS,
+    ):
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self.max_open_maps = max_open_maps
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self._memory: OrderedDict[str, tuple[str, bytes]] = OrderedDict()
+        self._memory_bytes = 0
+        self._maps: OrderedDict[str, tuple[memoryview, str, Path]] = OrderedDict()
+        self._disk: OrderedDict[str, tuple[Path, int]] = OrderedDict()  # oldest first
+        self._disk_bytes = 0
+        self._lock = threading.Lock()
+        self._stats = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "stores": 0,
+            "memory_evictions": 0,
+            "disk_evictions": 0,
+        }
+        if self.cache_dir is not None:
+            self._scan_disk()
+
+    def get(self, key: str) -> CachedAudio | None:
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                self._stats["memory_hits"] += 1
+                disk_entry = self._disk.get(key)
+                return CachedAudio(entry[1], entry[0], disk_entry[0] if disk_entry else None)
+
+            mapped = self._map_disk_entry(key)
+            if mapped is not None:
+                self._stats["disk_hits"] += 1
+                view, content_type, path = mapped
+                return CachedAudio(view, content_type, path)
+
+            self._stats["misses"] += 1
+            return None
+
+    def put(self, key: str, audio: bytes, content_type: str) -> None:
+        if not audio:
+            return
+        audio = bytes(audio)
+        with self._lock:
+            self._stats["stores"] += 1
+            # A clip bigger than a quarter of the budget would flush everything else
+            if len(audio) <= self.max_memory_bytes // 4:
+                self._remember(key, content_type, audio)
+            if self.cache_dir is not None and key not in self._disk:
+                self._write_disk(key, audio, content_type)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+            self._maps.clear()
+            for path, _size in self._disk.values():
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+            self._disk.clear()
+            self._disk_bytes = 0
+            for stat in self._stats:
+                self._stats[stat] = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                **self._stats,
+                "memory_entries": len(self._memory),
+                "memory_bytes": self._memory_bytes,
+                "disk_entries": len(self._disk),
+                "disk_bytes": self._disk_bytes,
+                "open_maps": len(self._maps),
+                "disk_enabled": self.cache_dir is not None,
+            }
+
+    def _remember(self, key: str, content_type: str, audio: bytes) -> None:
+        previous = self._memory.pop(key, None)
+        if previous is not None:
+            self._memory_bytes -= len(previous[1])
+        self._memory[key] = (content_type, audio)
+        self._memory_bytes += len(audio)
+        while self._memory_bytes > self.max_memory_bytes and self._memory:
+            _key, (_type, evicted) = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+            self._stats["memory_evictions"] += 1
+
+    def _path_for(self, key: str, content_type: str) -> Path:
+        assert self.cache_dir is not None
+        return self.cache_dir / key[:2] / f"{key}{_EXTENSIONS.get(content_type, _DEFAULT_EXTENSION)}"
+
+    def _scan_disk(self) -> None:
+        assert self.cache_dir is not None
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            files = []
+            for path in self.cache_dir.glob("??/*"):
+                if path.suffix == ".tmp" or not path.is_file():
+                    continue
+                stat = path.stat()
+                files.append((stat.st_mtime, path.stem, path, stat.st_size))
+        except OSError as e:
+            logger.warning("TTS cache disk tier disabled: %s", e)
+            self.cache_dir = None
+            return
+        for _mtime, key, path, size in sorted(files):
+            self._disk[key] = (path, size)
+            self._disk_bytes += size
+
+    def _find_on_disk(self, key: str) -> tuple[Path, int] | None:
+        entry = self._disk.get(key)
+        if entry is not None:
+            return entry
+        if self.cache_dir is None:
+            return None
+        # Another worker may have written it since our scan
+        for extension in (*_CONTENT_TYPES, _DEFAULT_EXTENSION):
+            path = self.cache_dir / key[:2] / f"{key}{extension}"
+            try:
+                size = path.stat().st_size
+            except OSError:
+                continue
+            self._disk[key] = (path, size)
+            self._disk_bytes += size
+            return self._disk[key]
+        return None
+
+    def _map_disk_entry(self, key: str) -> tuple[memoryview, str, Path] | None:
+        mapped = self._maps.get(key)
+        if mapped is not None:
+            self._maps.move_to_end(key)
+            return mapped
+
+        entry = self._find_on_disk(key)
+        if entry is None:
+            return None
+        path, size = entry
+        try:
+            with open(path, "rb") as handle:
+                mapping = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            # Deleted by another worker, or truncated to zero bytes
+            self._disk.pop(key, None)
+            self._disk_bytes -= size
+            return None
+
+        mapped = (memoryview(mapping), _CONTENT_TYPES.get(path.suffix, "application/octet-stream"), path)
+        self._maps[key] = mapped
+        # Dropped views keep their mapping alive until the last reader releases it
+        while len(self._maps) > self.max_open_maps:
+            self._maps.popitem(last=False)
+        return mapped
+
+    def _write_disk(self, key: str, audio: bytes, content_type: str) -> None:
+        path = self._path_for(key, content_type)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            with os.fdopen(fd, "wb") as handle:
+                handle.write(audio)
+            os.replace(tmp_name, path)
+        except OSError as e:
+            logger.warning("TTS cache disk write failed: %s", e)
+            return
+        self._disk[key] = (path, len(audio))
+        self._disk_bytes += len(audio)
+        while self._disk_bytes > self.max_disk_bytes and len(self._disk) > 1:
+            old_key, (old_path, old_size) = self._disk.popitem(last=False)
+            self._maps.pop(old_key, None)
+            self._disk_bytes -= old_size
+            self._stats["disk_evictions"] += 1
+            try:
+                old_path.unlink()
+            except OSError:
+                pass
+
+
+_cache: TTSAudioCache | None = None
+_cache_lock = threading.Lock()
+
+
+def get_tts_audio_cache() -> TTSAudioCache:
+    """Process-wide audio cache, configured from TTS_CACHE_DIR on first use."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = TTSAudioCache(cache_dir=os.environ.get("TTS_CACHE_DIR") or None)
+        return _cache
+
+
+def tts_cache_enabled() -> bool:
+    return os.environ.get("TTS_AUDIO_CACHE", "true").strip().lower() not in {"0", "false", "no", "off"}
+
+
+class CachedTTSProvider(BaseTTSProvider):
+    """Wrap a TTS provider so repeated (text, voice, rate) requests skip synthesis."""
+
+    def __init__(self, provider: BaseTTSProvider, cache: TTSAudioCache | None = None):
+        self.provider = provider
+        self.cache = cache if cache is not None else get_tts_audio_cache()
+        self.provider_name = provider.provider_name
+        self.stream_content_type = provider.stream_content_type
+
+    def is_available(self) -> bool:
+        return self.provider.is_available()
+
+    def get_model_name(self) -> str:
+        return self.provider.get_model_name()
+
+    def cache_key(self, text: str, voice: str = "male_us", rate: int = 0) -> str:
+        return tts_cache_key(text, voice, rate, self.provider_name, str(self.get_model_name() or ""))
+
+    def lookup(self, text: str, voice: str = "male_us", rate: int = 0) -> CachedAudio | None:
+        return self.cache.get(self.cache_key(text, voice, rate))
+
+    def synthesize(self, text: str, voice: str = "male_us", rate: int = 0) -> SynthesisResult:
+        start = time.time()
+        key = self.cache_key(text, voice, rate)
+        hit = self.cache.get(key)
+        if hit is not None:
+            # The clip itself, not a copy: a memoryview over the mapping for disk hits
+            return SynthesisResult(
+                audio_bytes=hit.data,
+                content_type=hit.content_type,
+                latency_ms=(time.time() - start) * 1000,
+                provider=self.provider_name,
+                voice=voice,
+            )
+        result = self.provider.synthesize(text, voice=voice, rate=rate)
+        if not result.error and result.audio_bytes:
+            self.cache.put(key, result.audio_bytes, result.content_type)
+        return result
+
+    def start_stream(self, text: str, voice: str = "male_us", rate: int = 0):
+        """Serve a hit from the cache, or start the wrapped provider and record what it streams.
+
+        Hits are replayed as memoryview slices of the cached clip. Consumers that
+        need real bytes (a WSGI body) must copy each chunk themselves.
+        """
+        key = self.cache_key(text, voice, rate)
+        hit = self.cache.get(key)
+        if hit is not None:
+            return _replay(hit.data)
+        return _RecordingStream(self, key, start_stream(self.provider, text, voice=voice, rate=rate))
+
+    def synthesize_stream(self, text: str, voice: str = "male_us", rate: int = 0) -> Iterator[bytes]:
+        stream = self.start_stream(text, voice=voice, rate=rate)
+        try:
+            yield from stream
+        finally:
+            close = getattr(stream, "close", None)
+            if callable(close):
+                close()
+
+
+def _replay(data: bytes | memoryview) -> Iterator[memoryview]:
+    """Serve a cached clip as a stream; a generator, so callers can close() it like a live one."""
+    view = memoryview(data)
+    for offset in range(0, len(view), STREAM_CHUNK_BYTES):
+        yield view[offset:offset + STREAM_CHUNK_BYTES]
+
+
+class _RecordingStream:
+    """Pass chunks through and store the clip once the stream completes."""
+
+    def __init__(self, owner: CachedTTSProvider, key: str, inner):
+        self._owner = owner
+        self._key = key
+        self._inner = inner
+        self._collected: list[bytes] = []
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> bytes:
+        try:
+            chunk = next(self._inner)
+        except StopIteration:
+            # Only reached when the stream completed; an abandoned stream is never cached
+            if self._collected:
+                self._owner.cache.put(self._key, b"".join(self._collected), self._owner.stream_content_type)
+                self._collected = []
+            raise
+        self._collected.append(chunk)
+        return chunk
+
+    def close(self) -> None:
+        self._collected = []
+        self._inner.close()
@@ -2,13 +2,14 @@
 
 from __future__ import annotations
 
-import asyncio
 import importlib
-import threading
 import time
+from concurrent.futures import CancelledError
 from io import BytesIO
+from typing import Iterator
 
-from ..base import BaseTTSProvider, SynthesisResult
+from ..base import AudioStreamError, BaseTTSProvider, SynthesisResult
+from .executor import AudioStreamHandle, get_tts_executor
 
 DEFAULT_VOICE_MAP = {
     "male_us": "en-US-GuyNeural",
@@ -16,46 +17,17 @@ DEFAULT_VOICE_MAP = {
 }
 
 
-class _AsyncWorker:
-    def __init__(self):
-        """Start a dedicated asyncio loop for background Edge TTS work."""
-        self._loop = asyncio.new_event_loop()
-        self._thread = threading.Thread(
-            target=self._run_loop,
-            name="edge-tts-worker",
-            daemon=True,
-        )
-        self._thread.start()
-
-    def _run_loop(self):
-        """Run the worker event loop forever on the background thread."""
-        asyncio.set_event_loop(self._loop)
-        self._loop.run_forever()
-
-    def run(self, coro):
-        """Execute one coroutine on the worker loop and wait for the result."""
-        future = asyncio.run_coroutine_threadsafe(coro, self._loop)
-        return future.result()
-
-
 class EdgeTTSProvider(BaseTTSProvider):
     provider_name = "edge"
+    stream_content_type = "audio/mpeg"
 
     def __init__(self, model: str | None = None):
-        """Initialise the Edge TTS provider and lazy worker state."""
-        self._worker: _AsyncWorker | None = None
+        """Initialise the Edge TTS provider; network work runs on the shared TTS executor."""
         self.model = model or "edge-tts"
 
-    def _ensure_worker(self) -> _AsyncWorker:
-        """Create the background async worker on first use."""
-        if self._worker is None:
-            self._worker = _AsyncWorker()
-        return self._worker
-
-    async def _synthesize_async(self, text: str, voice_name: str, rate: int):
-        """Run the Edge TTS streaming API and collect audio bytes."""
+    async def _stream_async(self, text: str, voice_name: str, rate: int):
+        """Yield MP3 chunks from the Edge TTS streaming API as they arrive."""
         edge_tts = importlib.import_module("edge_tts")
-        audio_buffer = BytesIO()
         communicate = edge_tts.Communicate(
             text=text,
             voice=voice_name,
@@ -63,7 +35,13 @@ class EdgeTTSProvider(BaseTTSProvider):
         )
         async for chunk in communicate.stream():
             if chunk["type"] == "audio":
-                audio_buffer.write(chunk["data"])
+                yield chunk["data"]
+
+    async def _synthesize_async(self, text: str, voice_name: str, rate: int):
+        """Run the Edge TTS streaming API and collect audio bytes."""
+        audio_buffer = BytesIO()
+        async for data in self._stream_async(text, voice_name, rate):
+            audio_buffer.write(data)
         return audio_buffer.getvalue()
 
     def is_available(self) -> bool:
@@ -90,7 +68,7 @@ class EdgeTTSProvider(BaseTTSProvider):
                 latency_ms=(time.time() - start) * 1000,
             )
         try:
-            audio_bytes = self._ensure_worker().run(
+            audio_bytes = get_tts_executor().run(
                 self._synthesize_async(text=text, voice_name=voice_name, rate=rate)
             )
             return SynthesisResult(
@@ -100,6 +78,13 @@ class EdgeTTSProvider(BaseTTSProvider):
                 content_type="audio/mpeg",
                 latency_ms=(time.time() - start) * 1000,
             )
+        except TimeoutError:
+            return SynthesisResult(
+                provider=self.provider_name,
+                voice=voice_name,
+                error="Edge TTS synthesis timed out.",
+                latency_ms=(time.time() - start) * 1000,
+            )
         except Exception as exc:
             return SynthesisResult(
                 provider=self.provider_name,
@@ -107,3 +92,23 @@ class EdgeTTSProvider(BaseTTSProvider):
                 error=f"Edge TTS synthesis failed: {exc}",
                 latency_ms=(time.time() - start) * 1000,
             )
+
+    def start_stream(self, text: str, voice: str = "male_us", rate: int = 0) -> AudioStreamHandle:
+        """Begin synthesis on the shared executor now; iterate the handle for MP3 chunks."""
+        voice_name = DEFAULT_VOICE_MAP.get(voice, DEFAULT_VOICE_MAP["male_us"])
+        if not self.is_available():
+            raise AudioStreamError("Edge TTS is unavailable.")
+        return get_tts_executor().stream(self._stream_async(text, voice_name, rate))
+
+    def synthesize_stream(self, text: str, voice: str = "male_us", rate: int = 0) -> Iterator[bytes]:
+        """Yield MP3 chunks while Edge is still synthesizing, instead of buffering the clip."""
+        handle = self.start_stream(text, voice=voice, rate=rate)
+        try:
+            yield from handle
+        except (AudioStreamError, CancelledError):
+            raise
+        except Exception as exc:
+            raise AudioStreamError(f"Edge TTS synthesis failed: {exc}") from exc
+        finally:
+            # Consumer stopped early (client disconnected): stop pulling from Edge
+            handle.close()
@@ -0,0 +1,220 @@
+"""Process-wide async executor for TTS network calls.
+
+Every Edge TTS request shares one event loop thread. At most
+TTS_MAX_CONCURRENCY syntheses are in flight at once; the rest wait on a
+semaphore. Each request has a timeout and can be cancelled from the calling
+thread. Streams hand their chunks to the caller through a queue, so a voice
+session costs a coroutine, not a thread.
+
+stats() reports queue depth, in-flight count, outcome counters and p50/p95
+wait and run latency over a recent window.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import CancelledError, Future
+from typing import AsyncIterator, Awaitable, Iterable
+
+from ...constants import TTS_MAX_CONCURRENCY, TTS_REQUEST_TIMEOUT_SECONDS
+
+_LATENCY_WINDOW = 512
+_STREAM_END = object()
+
+
+def _percentile(samples: list[float], fraction: float) -> float | None:
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    return round(ordered[min(len(ordered) - 1, int(fraction * len(ordered)))], 1)
+
+
+class AudioStreamHandle:
+    """Iterator over a stream that is already running on the executor. close() cancels it."""
+
+    def __init__(self, future: Future, chunks: queue.Queue):
+        self._future = future
+        self._chunks = chunks
+        self._finished = False
+        future.add_done_callback(lambda _f: chunks.put(_STREAM_END))
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> bytes:
+        if self._finished:
+            raise StopIteration
+        item = self._chunks.get()
+        if item is not _STREAM_END:
+            return item
+        self._finished = True
+        if self._future.cancelled():
+            raise CancelledError()
+        error = self._future.exception()
+        if error is not None:
+            raise error
+        raise StopIteration
+
+    def close(self) -> None:
+        self._finished = True
+        self._future.cancel()
+
+
+class AsyncTTSExecutor:
+    """One shared event loop with bounded concurrency, timeouts and metrics."""
+
+    def __init__(
+        self,
+        max_concurrency: int = TTS_MAX_CONCURRENCY,
+        default_timeout: float | None = TTS_REQUEST_TIMEOUT_SECONDS,
+    ):
+        self.max_concurrency = max_concurrency
+        self.default_timeout = default_timeout
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._semaphore: asyncio.Semaphore | None = None
+        self._pid: int | None = None
+        self._start_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._wait_ms: deque = deque(maxlen=_LATENCY_WINDOW)
+        self._run_ms: deque = deque(maxlen=_LATENCY_WINDOW)
+        self._counts = {
+            "queued": 0,
+            "running": 0,
+            "submitted": 0,
+            "completed": 0,
+            "failed": 0,
+            "timed_out": 0,
+            "cancelled": 0,
+        }
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._start_lock:
+            # A forked worker inherits the object but not the loop thread
+            if self._loop is None or self._pid != os.getpid():
+                ready = threading.Event()
+                self._loop = asyncio.new_event_loop()
+                self._pid = os.getpid()
+                thread = threading.Thread(
+                    target=self._run_loop,
+                    args=(self._loop, ready),
+                    name="tts-executor",
+                    daemon=True,
+                )
+                thread.start()
+                ready.wait()
+            return self._loop
+
+    def _run_loop(self, loop: asyncio.AbstractEventLoop, ready: threading.Event) -> None:
+        asyncio.set_event_loop(loop)
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        ready.set()
+        loop.run_forever()
+
+    def _count(self, **deltas: int) -> None:
+        with self._stats_lock:
+            for name, delta in deltas.items():
+                self._counts[name] += delta
+
+    async def _guarded(self, coro: Awaitable, timeout: float | None, submitted_at: float):
+        admitted = False
+        self._count(queued=1)
+        try:
+            assert self._semaphore is not None
+            async with self._semaphore:
+                admitted = True
+                started = time.perf_counter()
+                with self._stats_lock:
+                    self._counts["queued"] -= 1
+                    self._counts["running"] += 1
+                    self._wait_ms.append((started - submitted_at) * 1000)
+                try:
+                    result = await asyncio.wait_for(coro, timeout)
+                except asyncio.TimeoutError:
+                    self._count(timed_out=1)
+                    raise
+                except asyncio.CancelledError:
+                    self._count(cancelled=1)
+                    raise
+                except Exception:
+                    self._count(failed=1)
+                    raise
+                finally:
+                    with self._stats_lock:
+                        self._counts["running"] -= 1
+                        self._run_ms.append((time.perf_counter() - started) * 1000)
+                self._count(completed=1)
+                return result
+        finally:
+            if not admitted:
+                # Cancelled while waiting for a slot: the coroutine never started
+                self._count(queued=-1, cancelled=1)
+                close = getattr(coro, "close", None)
+                if callable(close):
+                    close()
+
+    def submit(self, coro: Awaitable, timeout: float | None = -1) -> Future:
+        """Schedule a coroutine; returns a concurrent Future (cancel() cancels the task)."""
+        loop = self._ensure_loop()
+        self._count(submitted=1)
+        effective = self.default_timeout if timeout == -1 else timeout
+        return asyncio.run_coroutine_threadsafe(self._guarded(coro, effective, time.perf_counter()), loop)
+
+    def run(self, coro: Awaitable, timeout: float | None = -1):
+        """submit() and wait. Raises TimeoutError when the request exceeds its timeout."""
+        future = self.submit(coro, timeout=timeout)
+        try:
+            return future.result()
+        except BaseException:
+            future.cancel()
+            raise
+
+    def submit_batch(self, coros: Iterable[Awaitable], timeout: float | None = -1) -> list[Future]:
+        """Schedule several coroutines at once (e.g. every sentence of a reply), in order."""
+        return [self.submit(coro, timeout=timeout) for coro in coros]
+
+    def stream(self, agen: AsyncIterator[bytes], timeout: float | None = -1) -> AudioStreamHandle:
+        """Start pumping an async generator now; iterate the handle to receive its chunks.
+
+        The slot is held and the timeout covers the whole stream. Closing the
+        handle cancels the pump, which closes the generator.
+        """
+        chunks: queue.Queue = queue.Queue()
+
+        async def _pump():
+            try:
+                async for chunk in agen:
+                    chunks.put(chunk)
+            finally:
+                await agen.aclose()
+
+        return AudioStreamHandle(self.submit(_pump(), timeout=timeout), chunks)
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            wait_ms, run_ms = list(self._wait_ms), list(self._run_ms)
+            return {
+                **self._counts,
+                "max_concurrency": self.max_concurrency,
+                "wait_ms_p50": _percentile(wait_ms, 0.5),
+                "wait_ms_p95": _percentile(wait_ms, 0.95),
+                "run_ms_p50": _percentile(run_ms, 0.5),
+                "run_ms_p95": _percentile(run_ms, 0.95),
+            }
+
+
+_executor: AsyncTTSExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+def get_tts_executor() -> AsyncTTSExecutor:
+    """Process-wide executor shared by every async TTS provider instance."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = AsyncTTSExecutor()
+        return _executor
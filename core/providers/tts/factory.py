@@ -70,6 +70,14 @@ def create_tts_provider(provider_type: str | None = None, model: str | None = No
     )
 
 
+def create_cached_tts_provider(provider_type: str | None = None, model: str | None = None):
+    """Create a TTS provider behind the process-wide audio cache (unless TTS_AUDIO_CACHE=0)."""
+    from .cache import CachedTTSProvider, tts_cache_enabled
+
+    provider = create_tts_provider(provider_type=provider_type, model=model)
+    return CachedTTSProvider(provider) if tts_cache_enabled() else provider
+
+
 def get_available_tts_providers() -> list[dict[str, object]]:
     """Return simple availability metadata for each TTS provider."""
     return available_provider_metadata(_provider_registry(), list_tts_providers())
@@ -0,0 +1,163 @@
+"""Sentence-pipelined TTS streaming.
+
+A bot reply is split into sentences and each sentence's synthesis is started
+ahead of playback. The consumer drains sentence 1 live while the next
+`lookahead` sentences are already synthesizing. Time-to-first-audio is then
+the synthesis latency of the first sentence rather than the whole reply.
+
+Providers with start_stream() (Edge, and the cache wrapper) run on the shared
+async TTS executor and cost no thread per sentence. Plain synchronous
+providers are pumped on one bounded process-wide thread pool.
+"""
+
+from __future__ import annotations
+
+import queue
+import re
+import threading
+from concurrent.futures import CancelledError, ThreadPoolExecutor
+from typing import Iterator
+
+from ...constants import TTS_MAX_CONCURRENCY
+from ..base import AudioStreamError, BaseTTSProvider
+
+_SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?])[\"')\]]*\s+")
+MIN_SENTENCE_CHARS = 24  # shorter fragments ("Sure." / "Got it!") ride with the next sentence
+_CHUNK_END = object()
+
+_pool: ThreadPoolExecutor | None = None
+_pool_lock = threading.Lock()
+
+
+def split_sentences(text: str, min_chars: int = MIN_SENTENCE_CHARS) -> list[str]:
+    """Split text on sentence punctuation, merging fragments too short to synthesize alone."""
+    parts = [part.strip() for part in _SENTENCE_BOUNDARY.split(str(text or "").strip()) if part.strip()]
+    sentences: list[str] = []
+    pending = ""
+    for part in parts:
+        pending = f"{pending} {part}".strip()
+        if len(pending) >= min_chars:
+            sentences.append(pending)
+            pending = ""
+    if pending:
+        if sentences and len(pending) < min_chars:
+            sentences[-1] = f"{sentences[-1]} {pending}"
+        else:
+            sentences.append(pending)
+    return sentences
+
+
+def _thread_pool() -> ThreadPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(max_workers=TTS_MAX_CONCURRENCY, thread_name_prefix="tts-stream")
+        return _pool
+
+
+class _PooledStream:
+    """A synchronous provider's stream pumped on the shared pool into a chunk queue."""
+
+    def __init__(self, provider: BaseTTSProvider, text: str, voice: str, rate: int):
+        self._chunks: queue.Queue = queue.Queue()
+        self._cancelled = threading.Event()
+        self._finished = False
+        _thread_pool().submit(self._run, provider, text, voice, rate)
+
+    def _run(self, provider, text, voice, rate):
+        if self._cancelled.is_set():
+            self._chunks.put(_CHUNK_END)
+            return
+        stream = provider.synthesize_stream(text, voice=voice, rate=rate)
+        try:
+            for data in stream:
+                if self._cancelled.is_set():
+                    break
+                self._chunks.put(data)
+        except Exception as exc:
+            self._chunks.put(exc)
+        finally:
+            close = getattr(stream, "close", None)
+            if callable(close):
+                close()
+            self._chunks.put(_CHUNK_END)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> bytes:
+        if self._finished:
+            raise StopIteration
+        item = self._chunks.get()
+        if item is _CHUNK_END:
+            self._finished = True
+            raise StopIteration
+        if isinstance(item, Exception):
+            self._finished = True
+            raise item
+        return item
+
+    def close(self) -> None:
+        self._finished = True
+        self._cancelled.set()
+
+
+def start_stream(provider: BaseTTSProvider, text: str, voice: str = "male_us", rate: int = 0):
+    """Begin synthesizing `text` now and return an iterator over its chunks (close() cancels)."""
+    start = getattr(provider, "start_stream", None)
+    if callable(start):
+        return start(text, voice=voice, rate=rate)
+    return _PooledStream(provider, text, voice, rate)
+
+
+def _drain(stream) -> Iterator[bytes]:
+    try:
+        yield from stream
+    except AudioStreamError:
+        raise
+    except CancelledError as exc:
+        raise AudioStreamError("Speech synthesis was cancelled.") from exc
+    except TimeoutError as exc:
+        raise AudioStreamError("Speech synthesis timed out.") from exc
+    except Exception as exc:
+        raise AudioStreamError(str(exc) or type(exc).__name__) from exc
+
+
+def stream_sentences(
+    provider: BaseTTSProvider,
+    sentences: list[str],
+    voice: str = "male_us",
+    rate: int = 0,
+    lookahead: int = 1,
+) -> Iterator[bytes]:
+    """Yield audio for each sentence in order, synthesizing up to `lookahead` sentences ahead.
+
+    Raises AudioStreamError from the failing sentence. Closing the generator
+    early cancels every sentence still synthesizing.
+    """
+    streams: list = []
+
+    def _start_until(index: int) -> None:
+        while len(streams) <= min(index, len(sentences) - 1):
+            streams.append(start_stream(provider, sentences[len(streams)], voice=voice, rate=rate))
+
+    try:
+        for index in range(len(sentences)):
+            _start_until(index + max(0, lookahead))
+            yield from _drain(streams[index])
+    finally:
+        for stream in streams:
+            close = getattr(stream, "close", None)
+            if callable(close):
+                close()
+
+
+def stream_text(
+    provider: BaseTTSProvider,
+    text: str,
+    voice: str = "male_us",
+    rate: int = 0,
+    lookahead: int = 1,
+) -> Iterator[bytes]:
+    """split_sentences() + stream_sentences() for one reply."""
+    return stream_sentences(provider, split_sentences(text), voice=voice, rate=rate, lookahead=lookahead)
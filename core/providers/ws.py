@@ -0,0 +1,217 @@
+"""Minimal WebSocket client (RFC 6455) for provider streaming APIs.
+
+Just enough for live transcription: client handshake over ws:// or wss://,
+masked text/binary frames out, text/binary frames in, ping/pong and close.
+No extensions, no compression. Frame helpers are public so tests can stand
+up a local fake server with the same framing code.
+"""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import os
+import socket
+import ssl
+import struct
+import threading
+from urllib.parse import urlsplit
+
+OP_CONTINUATION = 0x0
+OP_TEXT = 0x1
+OP_BINARY = 0x2
+OP_CLOSE = 0x8
+OP_PING = 0x9
+OP_PONG = 0xA
+
+_HANDSHAKE_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+_MAX_HEADER_LINES = 100
+
+
+class WebSocketError(Exception):
+    def __init__(self, message: str, status_code: int | None = None):
+        """Handshake or framing failure; status_code is set when the server refused the upgrade."""
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def accept_key(key: str) -> str:
+    """Sec-WebSocket-Accept value the server must return for a Sec-WebSocket-Key."""
+    digest = hashlib.sha1((key + _HANDSHAKE_GUID).encode("ascii")).digest()
+    return base64.b64encode(digest).decode("ascii")
+
+
+def _apply_mask(payload: bytes, masking_key: bytes) -> bytes:
+    # One big-int XOR instead of a Python loop per byte; audio frames can be large
+    if not payload:
+        return payload
+    repeated = (masking_key * (len(payload) // 4 + 1))[: len(payload)]
+    return (int.from_bytes(payload, "big") ^ int.from_bytes(repeated, "big")).to_bytes(len(payload), "big")
+
+
+def encode_frame(opcode: int, payload: bytes, mask: bool = True) -> bytes:
+    """One FIN frame. Clients must mask, servers must not."""
+    header = bytearray([0x80 | opcode])
+    length = len(payload)
+    mask_bit = 0x80 if mask else 0
+    if length < 126:
+        header.append(mask_bit | length)
+    elif length < 1 << 16:
+        header.append(mask_bit | 126)
+        header += struct.pack("!H", length)
+    else:
+        header.append(mask_bit | 127)
+        header += struct.pack("!Q", length)
+    if not mask:
+        return bytes(header) + payload
+    masking_key = os.urandom(4)
+    return bytes(header) + masking_key + _apply_mask(payload, masking_key)
+
+
+def _read_exact(reader, size: int) -> bytes:
+    data = reader.read(size)
+    if data is None or len(data) < size:
+        raise WebSocketError("Connection closed mid-frame")
+    return data
+
+
+def read_frame(reader) -> tuple[bool, int, bytes]:
+    """Read one frame from a buffered binary reader. Returns (fin, opcode, payload)."""
+    first, second = _read_exact(reader, 2)
+    fin = bool(first & 0x80)
+    opcode = first & 0x0F
+    length = second & 0x7F
+    if length == 126:
+        (length,) = struct.unpack("!H", _read_exact(reader, 2))
+    elif length == 127:
+        (length,) = struct.unpack("!Q", _read_exact(reader, 8))
+    masking_key = _read_exact(reader, 4) if second & 0x80 else None
+    payload = _read_exact(reader, length) if length else b""
+    if masking_key:
+        payload = _apply_mask(payload, masking_key)
+    return fin, opcode, payload
+
+
+class WebSocket:
+    """A connected client socket. send_* may be called from another thread than recv()."""
+
+    def __init__(self, sock: socket.socket, reader):
+        self._sock = sock
+        self._reader = reader
+        self._send_lock = threading.Lock()
+        self.closed = False
+
+    @classmethod
+    def connect(cls, url: str, headers: dict[str, str] | None = None, timeout: float = 10) -> "WebSocket":
+        """Open a connection and complete the upgrade handshake."""
+        parts = urlsplit(url)
+        if parts.scheme not in ("ws", "wss"):
+            raise WebSocketError(f"Unsupported WebSocket scheme: {parts.scheme}")
+        secure = parts.scheme == "wss"
+        host = parts.hostname or ""
+        port = parts.port or (443 if secure else 80)
+        path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+
+        sock = socket.create_connection((host, port), timeout=timeout)
+        if secure:
+            sock = ssl.create_default_context().wrap_socket(sock, server_hostname=host)
+        reader = sock.makefile("rb")
+
+        key = base64.b64encode(os.urandom(16)).decode("ascii")
+        host_header = host if parts.port is None else f"{host}:{port}"
+        lines = [
+            f"GET {path} HTTP/1.1",
+            f"Host: {host_header}",
+            "Upgrade: websocket",
+            "Connection: Upgrade",
+            f"Sec-WebSocket-Key: {key}",
+            "Sec-WebSocket-Version: 13",
+            *(f"{name}: {value}" for name, value in (headers or {}).items()),
+        ]
+        try:
+            sock.sendall(("\r\n".join(lines) + "\r\n\r\n").encode("utf-8"))
+            status_line = reader.readline().decode("latin-1").strip()
+            response_headers = {}
+            for _ in range(_MAX_HEADER_LINES):
+                line = reader.readline().decode("latin-1").strip()
+                if not line:
+                    break
+                name, _, value = line.partition(":")
+                response_headers[name.strip().lower()] = value.strip()
+        except OSError as exc:
+            sock.close()
+            raise WebSocketError(f"WebSocket handshake failed: {exc}") from exc
+
+        status_parts = status_line.split(" ", 2)
+        status_code = int(status_parts[1]) if len(status_parts) > 1 and status_parts[1].isdigit() else None
+        if status_code != 101:
+            sock.close()
+            raise WebSocketError(f"WebSocket upgrade refused: {status_line or 'no response'}", status_code)
+        if response_headers.get("sec-websocket-accept") != accept_key(key):
+            sock.close()
+            raise WebSocketError("WebSocket upgrade returned a bad accept key", status_code)
+        return cls(sock, reader)
+
+    def settimeout(self, timeout: float | None) -> None:
+        self._sock.settimeout(timeout)
+
+    def _send(self, opcode: int, payload: bytes) -> None:
+        with self._send_lock:
+            if self.closed:
+                raise WebSocketError("WebSocket is closed")
+            self._sock.sendall(encode_frame(opcode, payload))
+
+    def send_text(self, text: str) -> None:
+        self._send(OP_TEXT, text.encode("utf-8"))
+
+    def send_binary(self, data: bytes) -> None:
+        self._send(OP_BINARY, bytes(data))
+
+    def recv(self) -> str | bytes | None:
+        """Next text (str) or binary (bytes) message; None once the connection is closed cleanly.
+
+        A close frame, or close() from this side (e.g. by a sending thread),
+        is a clean close. A connection that drops without a close frame, or
+        mid-frame, raises WebSocketError instead.
+        """
+        fragments: list[bytes] = []
+        message_opcode = None
+        while True:
+            try:
+                fin, opcode, payload = read_frame(self._reader)
+            except WebSocketError:
+                if self.closed:
+                    return None
+                self.closed = True
+                raise
+            if opcode == OP_PING:
+                try:
+                    self._send(OP_PONG, payload)
+                except (OSError, WebSocketError):
+                    pass
+                continue
+            if opcode == OP_PONG:
+                continue
+            if opcode == OP_CLOSE:
+                self.close()
+                return None
+            if opcode != OP_CONTINUATION:
+                message_opcode = opcode
+            fragments.append(payload)
+            if fin:
+                data = b"".join(fragments)
+                return data.decode("utf-8") if message_opcode == OP_TEXT else data
+
+    def close(self, code: int = 1000) -> None:
+        with self._send_lock:
+            if not self.closed:
+                self.closed = True
+                try:
+                    self._sock.sendall(encode_frame(OP_CLOSE, struct.pack("!H", code)))
+                except OSError:
+                    pass
+        try:
+            self._reader.close()
+            self._sock.close()
+        except OSError:
+            pass
@@ -6,6 +6,7 @@ import re
 from typing import Any
 
 from .loader import load_yaml
+from .services.llm_cache import cached_chat
 from .utils import clamp_score, contains_nonnegated_keyword, extract_json_from_llm
 
 logger = logging.getLogger(__name__)
@@ -380,7 +381,12 @@ def test_quiz_stage_answer(user_answer: str, current_stage: str, flow_type: str)
 
 
 def test_quiz_next_move(
-    user_response: str, provider: Any, current_stage: str, flow_type: str, last_user_message: str = ""
+    user_response: str,
+    provider: Any,
+    current_stage: str,
+    flow_type: str,
+    last_user_message: str = "",
+    use_cache: bool = True,
 ) -> dict:
     """Hybrid-scored: deterministic rubric fit blended with LLM judgment."""
     stage, strategy = current_stage, flow_type
@@ -404,12 +410,14 @@ JSON: {{"score": <0-100>, "alignment": "strong|partial|weak", "feedback": "<brie
         "feedback": "Unable to evaluate.",
         "strengths": [],
         "improvements": [],
-    })
+    }, use_cache=use_cache)
 
     return _merge_open_ended_result("next_move", deterministic, llm_result)
 
 
-def test_quiz_direction(user_explanation: str, provider: Any, current_stage: str, flow_type: str) -> dict:
+def test_quiz_direction(
+    user_explanation: str, provider: Any, current_stage: str, flow_type: str, use_cache: bool = True
+) -> dict:
     """Hybrid-scored: deterministic strategy clarity blended with LLM judgment."""
     stage, strategy = current_stage, flow_type
     rubric = get_stage_rubric(stage, strategy)
@@ -431,15 +439,21 @@ JSON: {{"score": <0-100>, "understanding": "excellent|good|partial|needs_work",
         "feedback": "Unable to evaluate.",
         "key_concepts_got": [],
         "key_concepts_missed": [],
-    })
+    }, use_cache=use_cache)
 
     return _merge_open_ended_result("direction", deterministic, llm_result)
 
 
-def _score_with_llm(provider: Any, prompt: str, defaults: dict) -> dict:
+def _score_with_llm(provider: Any, prompt: str, defaults: dict, use_cache: bool = True) -> dict:
     """Unified LLM scoring: validates enums, clamps scores, handles fallbacks."""
     try:
-        response = provider.chat([{"role": "system", "content": prompt}], temperature=0.3, max_tokens=300)
+        response = cached_chat(
+            provider,
+            [{"role": "system", "content": prompt}],
+            temperature=0.3,
+            max_tokens=300,
+            use_cache=use_cache,
+        )
         parsed = extract_json_from_llm(response.content) if response.content else None
         result = parsed if isinstance(parsed, dict) else {}
 
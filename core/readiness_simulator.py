@@ -0,0 +1,347 @@
+"""Monte Carlo simulation and calibration of prospect readiness dynamics.
+
+A prospect session is a small dynamical system: every salesperson turn is
+rated 1-5 by score_sales_message(), the rating moves readiness by the
+difficulty profile's gain or loss, and end_condition() decides when the
+prospect buys or walks. This module replays that system for many simulated
+trajectories at once. Ratings are drawn per turn from the empirical
+distribution of recorded transcripts, so the result shows how often each
+difficulty is sold or walked away from, and after how many turns.
+
+All trajectories advance together as NumPy arrays, one turn per step, so a
+million trajectories take seconds. calibrate() searches profile parameters
+(gain, loss, initial readiness, patience) for target outcome rates on a
+refining grid. Every candidate runs on the same drawn ratings, so
+differences between candidates come from the parameters, not the noise.
+
+    python -m core.readiness_simulator transcripts.jsonl
+    python -m core.readiness_simulator transcripts.jsonl --difficulty hard --target-sold 0.25 --tune gain,loss
+    python -m core.readiness_simulator --ratings 0.1,0.2,0.3,0.3,0.1 --trajectories 2000000
+"""
+
+import argparse
+import itertools
+import json
+import sys
+from typing import Sequence
+
+import numpy as np
+
+from .constants import (
+    PROSPECT_COMMIT_MIN_TURNS,
+    PROSPECT_COMMIT_READINESS,
+    PROSPECT_PATIENCE_WALK_READINESS,
+)
+from .loader import load_prospect_config
+from .prospect_session import readiness_change, score_sales_message
+
+ACTIVE, SOLD, WALKED = 0, 1, 2
+DEFAULT_HORIZON = 30  # turns simulated when the config sets no max_turns
+MIN_TURN_SAMPLES = 30  # fewer ratings than this at a turn position -> use the pooled distribution
+
+# Searchable behaviour parameters: short name -> (profile key, low, high, integer)
+TUNABLE_PARAMS = {
+    "gain": ("readiness_gain_per_good_turn", 0.01, 0.3, False),
+    "loss": ("readiness_loss_per_bad_turn", 0.01, 0.3, False),
+    "initial": ("initial_readiness", 0.0, 0.8, False),
+    "patience": ("patience_turns", 2, 20, True),
+}
+
+
+def transcript_ratings(history: Sequence[dict]) -> list[int]:
+    """Rating of every salesperson turn in a transcript, as the live session scored it."""
+    ratings = []
+    for index, message in enumerate(history):
+        if message.get("role") == "user":
+            ratings.append(
+                score_sales_message(str(message.get("content") or ""), list(history[: index + 1]), len(ratings) + 1)
+            )
+    return ratings
+
+
+def rating_distribution(
+    ratings: Sequence[Sequence[int]],
+    horizon: int = DEFAULT_HORIZON,
+    min_samples: int = MIN_TURN_SAMPLES,
+) -> np.ndarray:
+    """horizon x 5 matrix: P(rating = r + 1) at each turn position.
+
+    Early turns are rated differently (premature pitching is penalised), so
+    each turn position gets its own distribution when enough transcripts
+    reach it, and the pooled distribution otherwise.
+    """
+    counts = np.zeros((horizon, 5), dtype=np.float64)
+    for transcript in ratings:
+        for turn, rating in enumerate(transcript[:horizon]):
+            counts[turn, int(rating) - 1] += 1
+    pooled = np.zeros(5, dtype=np.float64)
+    for transcript in ratings:
+        for rating in transcript:
+            pooled[int(rating) - 1] += 1
+    if not pooled.sum():
+        raise ValueError("no rated salesperson turns to build a distribution from")
+    pooled /= pooled.sum()
+    totals = counts.sum(axis=1, keepdims=True)
+    return np.where(totals >= min_samples, counts / np.maximum(totals, 1), pooled)
+
+
+def _delta_table(behaviour: dict) -> np.ndarray:
+    """Readiness change indexed by rating (index 0 unused)."""
+    return np.array([0.0] + [readiness_change(rating, behaviour) for rating in range(1, 6)])
+
+
+def _percentiles(turns: np.ndarray) -> dict:
+    if not turns.size:
+        return {"mean": None, "p50": None, "p90": None}
+    return {
+        "mean": round(float(turns.mean()), 2),
+        "p50": float(np.percentile(turns, 50)),
+        "p90": float(np.percentile(turns, 90)),
+    }
+
+
+def draw_ratings(probs: np.ndarray, trajectories: int, horizon: int, seed: int = 0) -> np.ndarray:
+    """horizon x trajectories matrix of ratings 1-5 sampled from a rating distribution.
+
+    probs is a (turns x 5) distribution; turns past its last row reuse the
+    last row. Ratings do not depend on the profile, so one draw serves every
+    candidate that calibrate() compares.
+    """
+    cdf = np.cumsum(np.atleast_2d(np.asarray(probs, dtype=np.float64)), axis=1)
+    cdf /= cdf[:, -1:]
+    rng = np.random.default_rng(seed)
+    ratings = np.empty((horizon, trajectories), dtype=np.int8)
+    for turn in range(horizon):
+        row = cdf[min(turn, len(cdf) - 1)]
+        ratings[turn] = np.minimum(np.searchsorted(row, rng.random(trajectories), side="right"), 4) + 1
+    return ratings
+
+
+def run_trajectories(behaviour: dict, ratings: np.ndarray, max_turns: int | None = None) -> tuple[np.ndarray, np.ndarray]:
+    """Outcome (ACTIVE/SOLD/WALKED) and end turn per trajectory for pre-drawn ratings.
+
+    Mirrors ProspectSession._update_readiness and end_condition() turn by turn.
+    """
+    horizon, trajectories = ratings.shape
+    deltas = _delta_table(behaviour)
+    patience = behaviour["patience_turns"]
+    readiness = np.full(trajectories, float(behaviour["initial_readiness"]))
+    outcome = np.zeros(trajectories, dtype=np.int8)
+    end_turn = np.zeros(trajectories, dtype=np.int16)
+    active = np.ones(trajectories, dtype=bool)
+    for turn in range(1, horizon + 1):
+        readiness = np.where(active, np.clip(readiness + deltas[ratings[turn - 1]], 0.0, 1.0), readiness)
+
+        sold = active & (readiness >= PROSPECT_COMMIT_READINESS) & (turn >= PROSPECT_COMMIT_MIN_TURNS)
+        still_active = active & ~sold
+        walked = still_active & (readiness <= 0.0)
+        if turn >= patience:
+            walked |= still_active & (readiness < PROSPECT_PATIENCE_WALK_READINESS)
+        if max_turns is not None and turn >= max_turns:
+            walked = still_active
+        outcome[sold] = SOLD
+        outcome[walked] = WALKED
+        end_turn[sold | walked] = turn
+        active = still_active & ~walked
+        if not active.any():
+            break
+    return outcome, end_turn
+
+
+def summarize(outcome: np.ndarray, end_turn: np.ndarray, histogram: bool = True) -> dict:
+    """Outcome rates and turn-count distribution. Undecided trajectories count as active."""
+    ended = end_turn[outcome != ACTIVE]
+    report = {
+        "trajectories": int(outcome.size),
+        "sold_rate": round(float(np.mean(outcome == SOLD)), 4),
+        "walked_rate": round(float(np.mean(outcome == WALKED)), 4),
+        "active_rate": round(float(np.mean(outcome == ACTIVE)), 4),
+        "mean_turns": round(float(ended.mean()), 2) if ended.size else None,
+        "turns": _percentiles(ended),
+        "sold_turns": _percentiles(end_turn[outcome == SOLD]),
+        "walked_turns": _percentiles(end_turn[outcome == WALKED]),
+    }
+    if histogram:
+        counts = np.bincount(ended)
+        report["turn_histogram"] = {str(t): int(c) for t, c in enumerate(counts) if c}
+    return report
+
+
+def simulate(
+    behaviour: dict,
+    probs: np.ndarray,
+    trajectories: int = 1_000_000,
+    max_turns: int | None = None,
+    horizon: int | None = None,
+    seed: int = 0,
+) -> dict:
+    """Outcome rates and turn counts for one difficulty profile."""
+    horizon = horizon or max_turns or DEFAULT_HORIZON
+    return summarize(*run_trajectories(behaviour, draw_ratings(probs, trajectories, horizon, seed), max_turns))
+
+
+def simulate_profiles(
+    probs: np.ndarray,
+    config: dict | None = None,
+    trajectories: int = 1_000_000,
+    horizon: int | None = None,
+    seed: int = 0,
+) -> dict[str, dict]:
+    """simulate() for every difficulty profile in prospect_config.yaml."""
+    config = config if config is not None else load_prospect_config()
+    mode_cfg = config.get("prospect_mode", {}) if isinstance(config, dict) else {}
+    max_turns = int(mode_cfg.get("max_turns", 0) or 0) or None
+    ratings = draw_ratings(probs, trajectories, horizon or max_turns or DEFAULT_HORIZON, seed)
+    return {
+        difficulty: summarize(*run_trajectories(profile["behaviour"], ratings, max_turns))
+        for difficulty, profile in (config.get("difficulty_profiles") or {}).items()
+    }
+
+
+def _loss(report: dict, targets: dict[str, float]) -> float:
+    total = 0.0
+    for key, target in targets.items():
+        value = report.get(key)
+        if value is None:
+            return float("inf")
+        scale = target if key == "mean_turns" and target else 1.0  # turns compared relatively
+        total += ((value - target) / scale) ** 2
+    return total
+
+
+def calibrate(
+    behaviour: dict,
+    probs: np.ndarray,
+    targets: dict[str, float],
+    params: Sequence[str] = ("gain", "loss"),
+    trajectories: int = 50_000,
+    max_turns: int | None = None,
+    horizon: int | None = None,
+    seed: int = 0,
+    steps: int = 9,
+    rounds: int = 3,
+) -> dict:
+    """Search the named TUNABLE_PARAMS for values whose outcomes best match targets.
+
+    targets maps report keys (sold_rate, walked_rate, active_rate, mean_turns)
+    to desired values. Each round scores a steps^len(params) grid and narrows
+    the bounds to one grid step around the best point.
+    """
+    unknown = [name for name in params if name not in TUNABLE_PARAMS]
+    if unknown:
+        raise ValueError(f"unknown parameters: {', '.join(unknown)}")
+    bounds = {name: TUNABLE_PARAMS[name][1:3] for name in params}
+    ratings = draw_ratings(probs, trajectories, horizon or max_turns or DEFAULT_HORIZON, seed)
+    best_loss, best_values, best_report = float("inf"), {}, {}
+
+    for _round in range(rounds):
+        axes = {}
+        for name in params:
+            _key, _low, _high, integer = TUNABLE_PARAMS[name]
+            low, high = bounds[name]
+            values = np.linspace(low, high, steps)
+            axes[name] = sorted({int(round(v)) for v in values}) if integer else [round(float(v), 4) for v in values]
+        for point in itertools.product(*axes.values()):
+            candidate = dict(behaviour)
+            values = dict(zip(params, point))
+            candidate.update({TUNABLE_PARAMS[name][0]: value for name, value in values.items()})
+            report = summarize(*run_trajectories(candidate, ratings, max_turns), histogram=False)
+            loss = _loss(report, targets)
+            if loss < best_loss:
+                best_loss, best_values, best_report = loss, values, report
+        for name in params:
+            _key, low, high, _integer = TUNABLE_PARAMS[name]
+            step = (bounds[name][1] - bounds[name][0]) / max(steps - 1, 1)
+            bounds[name] = (max(low, best_values[name] - step), min(high, best_values[name] + step))
+
+    return {
+        "behaviour": {TUNABLE_PARAMS[name][0]: value for name, value in best_values.items()},
+        "achieved": best_report,
+        "targets": dict(targets),
+        "loss": round(best_loss, 6),
+    }
+
+
+def _read_ratings(path: str) -> list[list[int]]:
+    from .prospect_batch_evaluator import _read_jsonl
+
+    with open(path, encoding="utf-8") as handle:
+        histories, _outcomes, _ids = _read_jsonl(handle)
+    return [transcript_ratings(history) for history in histories]
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Simulate and calibrate prospect readiness dynamics.")
+    parser.add_argument("input", nargs="?", help="JSONL: one {conversation_history, ...} per line")
+    parser.add_argument("--ratings", help="comma-separated P(rating=1..5) instead of transcripts")
+    parser.add_argument("--trajectories", type=int, default=1_000_000)
+    parser.add_argument("--horizon", type=int, default=0, help="turns to simulate (default: max_turns or 30)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--difficulty", help="calibrate this difficulty profile")
+    parser.add_argument("--tune", default="gain,loss", help=f"parameters to search: {', '.join(TUNABLE_PARAMS)}")
+    parser.add_argument("--target-sold", type=float)
+    parser.add_argument("--target-walked", type=float)
+    parser.add_argument("--target-turns", type=float, help="target mean turns to an outcome")
+    parser.add_argument("--out", help="write the JSON report here (default: stdout)")
+    args = parser.parse_args(argv)
+
+    if args.ratings:
+        probs = np.array([[float(p) for p in args.ratings.split(",")]])
+        if probs.shape != (1, 5) or probs.sum() <= 0:
+            parser.error("--ratings needs five non-negative probabilities")
+    elif args.input:
+        probs = rating_distribution(_read_ratings(args.input), args.horizon or DEFAULT_HORIZON)
+    else:
+        parser.error("give a transcripts file or --ratings")
+    config = load_prospect_config()
+    horizon = args.horizon or None
+
+    if args.difficulty:
+        profile = (config.get("difficulty_profiles") or {}).get(args.difficulty)
+        if profile is None:
+            parser.error(f"unknown difficulty: {args.difficulty}")
+        targets = {
+            key: value
+            for key, value in (
+                ("sold_rate", args.target_sold),
+                ("walked_rate", args.target_walked),
+                ("mean_turns", args.target_turns),
+            )
+            if value is not None
+        }
+        if not targets:
+            parser.error("calibration needs at least one --target-*")
+        mode_cfg = config.get("prospect_mode", {}) if isinstance(config, dict) else {}
+        report = calibrate(
+            profile["behaviour"],
+            probs,
+            targets,
+            params=[p.strip() for p in args.tune.split(",") if p.strip()],
+            trajectories=min(args.trajectories, 100_000),
+            max_turns=int(mode_cfg.get("max_turns", 0) or 0) or None,
+            horizon=horizon,
+            seed=args.seed,
+        )
+        achieved = report["achieved"]
+        summary = (
+            f"{args.difficulty}: {report['behaviour']} -> "
+            f"sold {achieved['sold_rate']:.1%}, walked {achieved['walked_rate']:.1%}"
+        )
+    else:
+        report = simulate_profiles(probs, config, args.trajectories, horizon, args.seed)
+        summary = "; ".join(
+            f"{name}: sold {r['sold_rate']:.1%} walked {r['walked_rate']:.1%}" for name, r in report.items()
+        )
+
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as handle:
+            handle.write(text)
+    else:
+        print(text)
+    print(summary, file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
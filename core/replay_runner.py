@@ -0,0 +1,276 @@
+"""Offline replay of logged conversations against one or two config versions.
+
+Streams `conversation_turn` records from app logs or JSONL exports, rebuilds
+each session, and pushes every recorded turn back through the live advancement
+path (analyse_state -> should_advance -> add_turn -> evaluate_strategy_switch)
+with the recorded assistant replies. No provider is called: the bot runs on
+the dummy provider and only the FSM is exercised.
+
+Config is read at import time by flow/analysis/prompts, so each config version
+replays in its own spawned worker processes with loader.CONFIG_DIR pointed at
+that version before anything else is imported.
+
+    python -m core.replay_runner logs/app.log --config-b /tmp/config_candidate --workers 4
+    python -m core.replay_runner turns.jsonl --config-a config_v1 --config-b config_v2 --out diff.json
+
+Without --config-a the baseline is the trajectory recorded in the logs.
+"""
+
+import argparse
+import json
+import logging
+import multiprocessing
+import sys
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable, Iterator
+
+logger = logging.getLogger(__name__)
+
+_TURN_MARKER = "conversation_turn "
+_SNAPSHOT_MARKER = "session_snapshot "
+_DECODER = json.JSONDecoder()
+
+
+@dataclass
+class ReplayTranscript:
+    """One logged session: greeting, completed turns, and what the live bot recorded."""
+
+    session_id: str
+    product_type: str | None = None
+    initial_flow_type: str | None = None
+    greeting: str | None = None
+    turns: list[tuple[str, str]] = field(default_factory=list)
+    recorded: list[tuple[str, str]] = field(default_factory=list)
+
+
+def _decode_after(line: str, marker: str) -> dict | None:
+    start = line.find(marker)
+    if start < 0:
+        return None
+    try:
+        record, _end = _DECODER.raw_decode(line, start + len(marker))
+    except ValueError:
+        return None
+    return record if isinstance(record, dict) else None
+
+
+def iter_log_records(paths: Iterable[str | Path]) -> Iterator[tuple[str, dict]]:
+    """Yield ("turn" | "snapshot", payload) from log lines or bare JSONL, one line at a time."""
+    for path in paths:
+        with open(path, encoding="utf-8", errors="replace") as handle:
+            for line in handle:
+                if _TURN_MARKER in line:
+                    record = _decode_after(line, _TURN_MARKER)
+                    if record is not None:
+                        yield "turn", record
+                    continue
+                if _SNAPSHOT_MARKER in line:
+                    record = _decode_after(line, _SNAPSHOT_MARKER)
+                    if record is not None:
+                        yield "snapshot", record
+                    continue
+                stripped = line.strip()
+                if stripped.startswith("{"):
+                    try:
+                        record = json.loads(stripped)
+                    except ValueError:
+                        continue
+                    if isinstance(record, dict) and "session_id" in record and "turn_index" in record:
+                        yield "turn", record
+
+
+def collect_transcripts(records: Iterable[tuple[str, dict]]) -> list[ReplayTranscript]:
+    """Group streamed records by session; the latest record per turn index wins (edits, retries)."""
+    turns_by_session: dict[str, dict[int, dict]] = {}
+    products: dict[str, str] = {}
+    for kind, record in records:
+        session_id = str(record.get("session_id") or "")
+        if not session_id:
+            continue
+        if kind == "snapshot":
+            if record.get("product_type"):
+                products.setdefault(session_id, record["product_type"])
+            continue
+        try:
+            turn_index = int(record.get("turn_index"))
+        except (TypeError, ValueError):
+            continue
+        turns_by_session.setdefault(session_id, {})[turn_index] = record
+
+    transcripts = []
+    for session_id, by_index in turns_by_session.items():
+        transcript = ReplayTranscript(session_id=session_id, product_type=products.get(session_id))
+        for turn_index in sorted(by_index):
+            record = by_index[turn_index]
+            if record.get("user_message") is None:
+                transcript.greeting = record.get("assistant_message")
+                transcript.initial_flow_type = record.get("flow_type")
+                continue
+            if transcript.initial_flow_type is None:
+                transcript.initial_flow_type = record.get("flow_type")
+            transcript.turns.append((str(record["user_message"]), str(record.get("assistant_message") or "")))
+            transcript.recorded.append((
+                str(record.get("current_stage") or "").lower(),
+                str(record.get("strategy") or record.get("flow_type") or "").lower(),
+            ))
+        if transcript.turns:
+            transcripts.append(transcript)
+    return transcripts
+
+
+def replay_transcript(transcript: ReplayTranscript) -> list[tuple[str, str]]:
+    """Run one transcript through the FSM and return its (stage, strategy) per turn."""
+    from .chatbot import SalesChatbot
+
+    bot = SalesChatbot(provider_type="dummy", product_type=transcript.product_type)
+    flow_engine = bot.flow_engine
+    initial = transcript.initial_flow_type
+    if initial and initial != flow_engine.flow_type and initial in ("consultative", "transactional"):
+        # Mirrors the /api/init force_strategy override that produced this log
+        flow_engine.initial_flow_type = initial
+        flow_engine.switch_strategy(initial)
+    if transcript.greeting:
+        flow_engine.conversation_history.append({"role": "assistant", "content": transcript.greeting})
+
+    return [bot._replay_turn(user_message, bot_reply) for user_message, bot_reply in transcript.turns]
+
+
+def _init_worker(config_dir: str | None) -> None:
+    logging.getLogger().setLevel(logging.WARNING)
+    if config_dir:
+        from . import loader
+
+        loader.CONFIG_DIR = Path(config_dir)
+
+
+def _replay_chunk(transcripts: list[ReplayTranscript]) -> list[tuple[str, list[tuple[str, str]]]]:
+    results = []
+    for transcript in transcripts:
+        try:
+            results.append((transcript.session_id, replay_transcript(transcript)))
+        except Exception as e:  # one bad log must not sink the run
+            logger.warning("Replay failed for %s: %s", transcript.session_id, e)
+            results.append((transcript.session_id, []))
+    return results
+
+
+def run_replay(
+    transcripts: list[ReplayTranscript],
+    config_dir: str | None = None,
+    workers: int = 0,
+    chunk_size: int = 25,
+) -> dict[str, list[tuple[str, str]]]:
+    """Replay all transcripts. workers=0 runs inline with the already-loaded config."""
+    if workers <= 0 and config_dir is None:
+        return dict(_replay_chunk(transcripts))
+
+    chunks = [transcripts[i:i + chunk_size] for i in range(0, len(transcripts), chunk_size)]
+    trajectories: dict[str, list[tuple[str, str]]] = {}
+    with ProcessPoolExecutor(
+        max_workers=max(1, workers),
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(config_dir,),
+    ) as pool:
+        for chunk_result in pool.map(_replay_chunk, chunks):
+            trajectories.update(chunk_result)
+    return trajectories
+
+
+def diff_trajectories(
+    transcripts: list[ReplayTranscript],
+    baseline: dict[str, list[tuple[str, str]]],
+    candidate: dict[str, list[tuple[str, str]]],
+    max_examples: int = 20,
+) -> dict:
+    """Summarise where stage/strategy trajectories diverge between two runs."""
+    changed_sessions = changed_turns = compared_turns = 0
+    final_baseline, final_candidate = Counter(), Counter()
+    transitions = Counter()
+    examples = []
+
+    for transcript in transcripts:
+        before = [tuple(step) for step in baseline.get(transcript.session_id, [])]
+        after = [tuple(step) for step in candidate.get(transcript.session_id, [])]
+        if before:
+            final_baseline["/".join(before[-1])] += 1
+        if after:
+            final_candidate["/".join(after[-1])] += 1
+
+        first_divergence = None
+        for turn_no in range(max(len(before), len(after))):
+            left = before[turn_no] if turn_no < len(before) else None
+            right = after[turn_no] if turn_no < len(after) else None
+            compared_turns += 1
+            if left != right:
+                changed_turns += 1
+                if first_divergence is None:
+                    first_divergence = turn_no
+                transitions[f"{'/'.join(left or ('-',))} -> {'/'.join(right or ('-',))}"] += 1
+
+        if first_divergence is not None:
+            changed_sessions += 1
+            if len(examples) < max_examples:
+                examples.append(
+                    {
+                        "session_id": transcript.session_id,
+                        "first_divergent_turn": first_divergence + 1,
+                        "user_message": transcript.turns[first_divergence][0]
+                        if first_divergence < len(transcript.turns)
+                        else None,
+                        "baseline": ["/".join(step) for step in before],
+                        "candidate": ["/".join(step) for step in after],
+                    }
+                )
+
+    return {
+        "sessions": len(transcripts),
+        "changed_sessions": changed_sessions,
+        "turns_compared": compared_turns,
+        "changed_turns": changed_turns,
+        "final_state_baseline": dict(final_baseline.most_common()),
+        "final_state_candidate": dict(final_candidate.most_common()),
+        "divergences": dict(transitions.most_common()),
+        "examples": examples,
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Replay logged conversations and diff FSM trajectories.")
+    parser.add_argument("inputs", nargs="+", help="log files or JSONL exports with conversation_turn records")
+    parser.add_argument("--config-a", help="baseline config dir (default: trajectory recorded in the logs)")
+    parser.add_argument("--config-b", help="candidate config dir (default: the repo's config/)")
+    parser.add_argument("--workers", type=int, default=max(1, (multiprocessing.cpu_count() or 2) - 1))
+    parser.add_argument("--limit", type=int, default=0, help="replay at most N sessions")
+    parser.add_argument("--out", help="write the JSON report here (default: stdout)")
+    args = parser.parse_args(argv)
+
+    transcripts = collect_transcripts(iter_log_records(args.inputs))
+    if args.limit:
+        transcripts = transcripts[: args.limit]
+
+    if args.config_a:
+        baseline = run_replay(transcripts, config_dir=args.config_a, workers=args.workers)
+    else:
+        baseline = {t.session_id: t.recorded for t in transcripts}
+    candidate = run_replay(transcripts, config_dir=args.config_b, workers=args.workers)
+
+    report = diff_trajectories(transcripts, baseline, candidate)
+    text = json.dumps(report, indent=2)
+    if args.out:
+        Path(args.out).write_text(text, encoding="utf-8")
+    else:
+        print(text)
+    print(
+        f"replayed {report['sessions']} sessions: {report['changed_sessions']} changed, "
+        f"{report['changed_turns']}/{report['turns_compared']} turns differ",
+        file=sys.stderr,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
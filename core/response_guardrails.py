@@ -4,56 +4,38 @@ Catches violations that bypass Layer 1 (FSM gating) and Layer 2 (prompt constrai
 - Pricing leakage in intent/logical/emotional stages
 - Empty, degenerate, or oversized responses
 
-Strips offending sentences first; uses a stage-specific fallback only when stripping
-leaves fewer than MIN_RESPONSE_CHARS characters.
+The rules live in config/guardrails.yaml and are compiled once into a
+GuardrailEngine: every keyword set is found by one combined scanner, the reply is
+split into sentences once, and each hit is tagged with its sentence and negation
+state so rules never rescan the text. Offending sentences are stripped first; a
+stage-specific fallback is used only when stripping leaves fewer than
+MIN_RESPONSE_CHARS characters. Rules are resolved once per (stage, strategy), so
+a reply in a stage with no keyword rules is never scanned. Per-rule timings in
+ms are collected only when asked for (timed=True).
 """
 
 import logging
 import random
 import re
+import time
 from dataclasses import dataclass, field
+from functools import lru_cache
 
 from .constants import MIN_RESPONSE_CHARS, MAX_RESPONSE_CHARS
+from .loader import load_guardrail_rules
 from .prompts import INTENT_FALLBACKS
-from .utils import Stage, Strategy, contains_nonnegated_keyword
+from .utils import DEFAULT_NEGATIONS, Stage, _build_union_pattern_for_keywords
 
 logger = logging.getLogger(__name__)
 
-# Stage-level guardrail keywords for pricing leakage during discovery.
-PRICING_KEYWORDS = [
-    "price",
-    "pricing",
-    "cost",
-    "budget",
-    "payment",
-    "fee",
-    "investment",
-    "per month",
-    "per year",
-    "per week",
-    "per annum",
-    "annually",
-    "monthly",
-    "$",
-]
-
-# If the user asks for pricing directly, pricing mention is allowed.
-DIRECT_PRICING_REQUEST_KEYWORDS = [
-    "price",
-    "pricing",
-    "cost",
-    "how much",
-    "budget",
-    "payment",
-    "fee",
-    "quote",
-]
-
 _SENTENCE_SPLIT = re.compile(r"(?<=[.!?])\s+|\n+")
-_EXPLICIT_PRICE_REFERENCE = re.compile(
-    r"(?:[$£€]\s*\d|\b\d+(?:[.,]\d+)?\s*(?:per\s+(?:month|week|year)|monthly|annually|annual|per\s+annum|fee|cost|price|pricing))",
-    re.IGNORECASE,
-)
+_WORD = re.compile(r"\w+")
+_BLANK_LINES = re.compile(r"\n\s*\n\s*\n+")
+_NEGATION_WINDOW = 3
+_NEGATION_LOOKBACK = 64
+
+_LENGTH_CONDITIONS = ("too_short", "too_long")
+_ACTIONS = ("block", "truncate", "strip")
 
 _LOGICAL_FALLBACKS = [
     "What part of the current approach is not working?",
@@ -67,16 +49,6 @@ _EMOTIONAL_FALLBACKS = [
     "What is this costing you day to day?",
 ]
 
-_EMOTIONAL_COI_PHRASES = [
-    "staying the same",
-    "stay the same",
-    "what would happen if you don't change",
-    "what would happen if nothing changed",
-    "day to day",
-    "continue down the current path",
-    "costing you day to day",
-]
-
 _GENERIC_FALLBACKS = [
     "What should we focus on next?",
     "What would help most right now?",
@@ -91,6 +63,30 @@ class Layer3CheckResult:
     was_corrected: bool = False
     was_blocked: bool = False
     applied_rules: list[str] = field(default_factory=list)
+    rule_timings_ms: dict[str, float] = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class GuardrailRule:
+    """One compiled entry from the `rules` list in guardrails.yaml."""
+
+    id: str
+    when: str
+    action: str
+    label: str
+    block_label: str
+    stages: frozenset | None = None
+    flows: frozenset | None = None
+    unless_user: str | None = None
+    exempt_stages: frozenset = frozenset()
+    exempt_match: str | None = None
+    exempt_unless: str | None = None
+
+    def applies_to(self, stage_name: str, flow_name: str) -> bool:
+        """Return True when the rule is scoped to this stage and strategy."""
+        if self.stages is not None and stage_name not in self.stages:
+            return False
+        return self.flows is None or flow_name in self.flows
 
 
 def _normalize_stage_name(stage: str | Stage) -> str:
@@ -111,72 +107,6 @@ def _normalize_flow_type(flow_type: str | Stage | None) -> str:
     return flow_text.lower()
 
 
-def _user_requested_pricing(user_message: str) -> bool:
-    """Return True when the user's message explicitly asks about price or terms."""
-    return contains_nonnegated_keyword(
-        (user_message or "").lower(), DIRECT_PRICING_REQUEST_KEYWORDS
-    )
-
-
-def _contains_pricing_language(reply_text: str) -> bool:
-    """Return True when a reply contains pricing language or money terms."""
-    return contains_nonnegated_keyword((reply_text or "").lower(), PRICING_KEYWORDS)
-
-
-def _contains_consequence_of_inaction(text: str) -> bool:
-    """Return True when the text talks about the cost of staying the same."""
-    return contains_nonnegated_keyword((text or "").lower(), _EMOTIONAL_COI_PHRASES)
-
-
-def _contains_explicit_price_reference(text: str) -> bool:
-    """Return True when the text contains a concrete price reference."""
-    return bool(_EXPLICIT_PRICE_REFERENCE.search(text or ""))
-
-
-def _strip_prompt_markers(text: str) -> str:
-    """Remove BEGIN/END CUSTOM PRODUCT DATA markers from response text.
-
-    These markers are for internal system prompt context only and should never
-    leak into the user-facing response.
-    """
-    # Remove marker blocks and their content
-    text = re.sub(
-        r"---\s*BEGIN\s+CUSTOM\s+PRODUCT\s+DATA\s*---.*?---\s*END\s+CUSTOM\s+PRODUCT\s+DATA\s*---",
-        "",
-        text,
-        flags=re.DOTALL | re.IGNORECASE
-    )
-    # Remove standalone marker lines
-    text = re.sub(
-        r"---\s*(BEGIN|END)\s+CUSTOM\s+PRODUCT\s+DATA\s*---",
-        "",
-        text,
-        flags=re.IGNORECASE
-    )
-    # Clean up excessive whitespace left behind
-    text = re.sub(r"\n\s*\n\s*\n+", "\n\n", text)
-    return text.strip()
-
-
-def _strip_pricing_sentences(text: str, stage_name: str = "") -> str:
-    """Remove sentences containing pricing language; return remaining text."""
-    sentences = _SENTENCE_SPLIT.split(text)
-    clean = []
-    for sentence in sentences:
-        if not sentence:
-            continue
-        if (
-            stage_name == Stage.EMOTIONAL.value
-            and _contains_consequence_of_inaction(sentence)
-            and not _contains_explicit_price_reference(sentence)
-        ):
-            clean.append(sentence)
-            continue
-        if not _contains_pricing_language(sentence):
-            clean.append(sentence)
-    return " ".join(clean).strip()
-
-
 def _pick_varied_fallback(candidates: list[str], history: list[dict[str, str]] | None) -> str:
     """Pick a random fallback from the candidate list."""
     if not candidates:
@@ -195,91 +125,319 @@ def _fallback_for_stage(stage_name: str, history: list[dict[str, str]] | None =
     return _pick_varied_fallback(_GENERIC_FALLBACKS, history)
 
 
+def _truncate(text: str) -> str:
+    """Cut text to MAX_RESPONSE_CHARS, backing off to the last sentence end."""
+    truncated = text[:MAX_RESPONSE_CHARS]
+    last_boundary = max(
+        truncated.rfind(". "),
+        truncated.rfind("? "),
+        truncated.rfind("! "),
+    )
+    if last_boundary > 0:
+        truncated = truncated[:last_boundary + 1]
+    return truncated.strip()
+
+
+def _elapsed_ms(since: float) -> float:
+    return round((time.perf_counter() - since) * 1000, 3)
+
+
+def _negated(text: str, pos: int, floor: int = 0) -> bool:
+    """True when one of the three words before pos (and after floor) is a negation."""
+    start = max(floor, pos - _NEGATION_LOOKBACK)
+    words = _WORD.findall(text, start, pos)
+    if start > floor and len(words) <= _NEGATION_WINDOW:
+        # The window may have cut the earliest word short; re-read from the floor
+        words = _WORD.findall(text, floor, pos)
+    return any(word.lower() in DEFAULT_NEGATIONS for word in words[-_NEGATION_WINDOW:])
+
+
+class ScannedText:
+    """A reply scanned once: keyword hits per set, plus sentence spans on demand.
+
+    Hits follow contains_nonnegated_keyword exactly: the non-overlapping
+    left-to-right matches of each set, ignored when one of the three preceding
+    words is a negation. Sentence-level checks only look at words inside the
+    sentence, as if it had been checked on its own.
+    """
+
+    def __init__(self, text: str, engine: "GuardrailEngine"):
+        self.text = text
+        self._engine = engine
+        self._positions = (
+            [m.start() for m in engine.scanner.finditer(text)] if text and engine.scanner is not None else []
+        )
+        self._hits: dict[str, list[int]] = {}
+        self._sentences: list[tuple[int, int]] | None = None
+
+    def hits(self, set_name: str) -> list[int]:
+        """Start positions of the set's non-overlapping matches, as finditer reports them."""
+        found = self._hits.get(set_name)
+        if found is None:
+            found, last_end = [], -1
+            pattern = self._engine.set_patterns.get(set_name)
+            for pos in self._positions if pattern is not None else ():
+                if pos < last_end:
+                    continue
+                match = pattern.match(self.text, pos)
+                if match:
+                    found.append(pos)
+                    last_end = match.end()
+            self._hits[set_name] = found
+        return found
+
+    @property
+    def sentences(self) -> list[tuple[int, int]]:
+        """Spans of the non-empty pieces _SENTENCE_SPLIT would produce."""
+        if self._sentences is None:
+            spans, start = [], 0
+            for sep in _SENTENCE_SPLIT.finditer(self.text):
+                if sep.start() > start:
+                    spans.append((start, sep.start()))
+                start = sep.end()
+            if start < len(self.text):
+                spans.append((start, len(self.text)))
+            self._sentences = spans
+        return self._sentences
+
+    def has(self, set_name: str, span: tuple[int, int] | None = None) -> bool:
+        """Return True when the keyword set has a non-negated hit (optionally within a sentence)."""
+        floor, ceiling = span if span else (0, len(self.text))
+        for pos in self.hits(set_name):
+            if floor <= pos < ceiling and not _negated(self.text, pos, floor):
+                return True
+        return False
+
+    def matches(self, pattern_name: str, span: tuple[int, int] | None = None) -> bool:
+        """Return True when the named regex matches the text (optionally within a sentence)."""
+        pattern = self._engine.patterns[pattern_name]
+        if span is None:
+            return bool(pattern.search(self.text))
+        return bool(pattern.search(self.text[span[0]:span[1]]))
+
+
+class GuardrailEngine:
+    """Layer 3 rules compiled from a guardrails.yaml-shaped dict."""
+
+    def __init__(self, config: dict):
+        keyword_sets = {
+            name: tuple(str(k).lower() for k in keywords or ())
+            for name, keywords in (config.get("keyword_sets") or {}).items()
+        }
+        self.set_patterns = {
+            name: _build_union_pattern_for_keywords(keywords)
+            for name, keywords in keyword_sets.items()
+            if keywords
+        }
+        every_keyword = sorted({k for keywords in keyword_sets.values() for k in keywords}, key=len, reverse=True)
+        # Zero-width, so overlapping candidates from different sets are all kept;
+        # the boundary and first-character checks let the scan skip most positions.
+        first_chars = "".join(sorted({re.escape(k[0]) for k in every_keyword}))
+        self.scanner = (
+            re.compile(
+                rf"\b(?=[{first_chars}])(?=(?:" + "|".join(rf"{re.escape(k)}\b" for k in every_keyword) + "))",
+                re.IGNORECASE,
+            )
+            if every_keyword
+            else None
+        )
+        self.patterns = {
+            name: re.compile(pattern, re.IGNORECASE)
+            for name, pattern in (config.get("patterns") or {}).items()
+        }
+        self.removals = [
+            (
+                entry["id"],
+                tuple(entry.get("trigger") or ()),
+                re.compile("|".join(f"(?:{p})" for p in entry["patterns"]), re.DOTALL | re.IGNORECASE),
+            )
+            for entry in config.get("remove") or ()
+        ]
+        self.rules = [self._compile_rule(raw, keyword_sets) for raw in config.get("rules") or ()]
+        self._scopes: dict[tuple, tuple[str, tuple[GuardrailRule, ...]]] = {}
+
+    def _compile_rule(self, raw: dict, keyword_sets: dict) -> GuardrailRule:
+        rule_id = raw.get("id") or "unnamed"
+        when, action = raw.get("when"), raw.get("action")
+        if when not in _LENGTH_CONDITIONS and when not in keyword_sets:
+            raise ValueError(f"guardrail rule {rule_id!r}: unknown condition {when!r}")
+        if action not in _ACTIONS:
+            raise ValueError(f"guardrail rule {rule_id!r}: unknown action {action!r}")
+        if action == "strip" and when in _LENGTH_CONDITIONS:
+            raise ValueError(f"guardrail rule {rule_id!r}: strip needs a keyword set, not {when!r}")
+
+        exempt = raw.get("exempt") or {}
+        for ref, known in (
+            (raw.get("unless_user"), keyword_sets),
+            (exempt.get("match"), keyword_sets),
+            (exempt.get("unless"), self.patterns),
+        ):
+            if ref is not None and ref not in known:
+                raise ValueError(f"guardrail rule {rule_id!r}: unknown reference {ref!r}")
+
+        label = raw.get("label") or rule_id
+        return GuardrailRule(
+            id=rule_id,
+            when=when,
+            action=action,
+            label=label,
+            block_label=raw.get("block_label") or label,
+            stages=frozenset(raw["stages"]) if raw.get("stages") else None,
+            flows=frozenset(raw["flows"]) if raw.get("flows") else None,
+            unless_user=raw.get("unless_user"),
+            exempt_stages=frozenset(exempt.get("stages") or ()),
+            exempt_match=exempt.get("match"),
+            exempt_unless=exempt.get("unless"),
+        )
+
+    def scan(self, text: str) -> ScannedText:
+        """Scan text once for every keyword set."""
+        return ScannedText(text, self)
+
+    def _remove(self, text: str, timings: dict[str, float] | None) -> str:
+        for removal_id, triggers, pattern in self.removals:
+            for trigger in triggers:
+                if trigger in text:
+                    break
+            else:
+                if triggers:
+                    continue
+            started = time.perf_counter()
+            text = _BLANK_LINES.sub("\n\n", pattern.sub("", text)).strip()
+            if timings is not None:
+                timings[removal_id] = _elapsed_ms(started)
+        return text
+
+    def mentions(self, text: str, set_name: str) -> bool:
+        """contains_nonnegated_keyword for one keyword set, without a full scan."""
+        pattern = self.set_patterns.get(set_name)
+        if pattern is None or not text:
+            return False
+        return any(not _negated(text, match.start()) for match in pattern.finditer(text))
+
+    @staticmethod
+    def _exempt(rule: GuardrailRule, scanned: ScannedText, span: tuple[int, int] | None = None) -> bool:
+        if not scanned.has(rule.exempt_match, span):
+            return False
+        return rule.exempt_unless is None or not scanned.matches(rule.exempt_unless, span)
+
+    def _scope(self, stage: str | Stage, flow_type: str | Stage | None) -> tuple[str, tuple[GuardrailRule, ...]]:
+        """Stage name and the rules scoped to it, resolved once per (stage, strategy)."""
+        scope = self._scopes.get((stage, flow_type))
+        if scope is None:
+            stage_name, flow_name = _normalize_stage_name(stage), _normalize_flow_type(flow_type)
+            scope = (stage_name, tuple(rule for rule in self.rules if rule.applies_to(stage_name, flow_name)))
+            self._scopes[(stage, flow_type)] = scope
+        return scope
+
+    def check(
+        self,
+        reply_text: str,
+        stage: str | Stage,
+        user_message: str,
+        flow_type: str | Stage | None = None,
+        history: list[dict[str, str]] | None = None,
+        timed: bool = False,
+    ) -> Layer3CheckResult:
+        """Run the rules in order; the first one that fires decides the reply.
+
+        With timed=True the result carries per-rule timings in ms.
+        """
+        stage_name, rules = self._scope(stage, flow_type)
+        timings: dict[str, float] | None = {} if timed else None
+        text = self._remove((reply_text or "").strip(), timings)
+        scanned = None
+
+        for rule in rules:
+            if rule.when not in _LENGTH_CONDITIONS and scanned is None:
+                started = time.perf_counter() if timed else 0.0
+                scanned = ScannedText(text, self)
+                if timed:
+                    timings["scan"] = _elapsed_ms(started)
+
+            if timed:
+                started = time.perf_counter()
+                result = self._apply(rule, text, scanned, stage_name, user_message, history)
+                timings[rule.id] = _elapsed_ms(started)
+            else:
+                result = self._apply(rule, text, scanned, stage_name, user_message, history)
+            if result is not None:
+                if timed:
+                    result.rule_timings_ms = timings
+                return result
+
+        return Layer3CheckResult(content=text, rule_timings_ms=timings or {})
+
+    def _apply(
+        self,
+        rule: GuardrailRule,
+        text: str,
+        scanned: ScannedText | None,
+        stage_name: str,
+        user_message: str,
+        history: list[dict[str, str]] | None,
+    ) -> Layer3CheckResult | None:
+        """Return the rule's result, or None when it does not fire."""
+        if rule.when == "too_short":
+            if text and len(text) >= MIN_RESPONSE_CHARS:
+                return None
+        elif rule.when == "too_long":
+            if len(text) <= MAX_RESPONSE_CHARS:
+                return None
+        else:
+            exempt = rule.exempt_match is not None and stage_name in rule.exempt_stages
+            if exempt and self._exempt(rule, scanned):
+                return Layer3CheckResult(content=text)
+            if not scanned.has(rule.when):
+                return None
+            if rule.unless_user and self.mentions((user_message or "").lower(), rule.unless_user):
+                return None
+
+        if rule.action == "truncate":
+            truncated = _truncate(text)
+            logger.debug("layer3: %s (%d → %d chars)", rule.label, len(text), len(truncated))
+            return Layer3CheckResult(content=truncated, was_corrected=True, applied_rules=[rule.label])
+
+        if rule.action == "strip":
+            kept = [
+                text[start:end]
+                for start, end in scanned.sentences
+                if not scanned.has(rule.when, (start, end)) or (exempt and self._exempt(rule, scanned, (start, end)))
+            ]
+            corrected = " ".join(kept).strip()
+            if len(corrected) >= MIN_RESPONSE_CHARS:
+                logger.debug("layer3: %s in %s stage", rule.label, stage_name)
+                return Layer3CheckResult(content=corrected, was_corrected=True, applied_rules=[rule.label])
+
+        logger.debug("layer3: %s in %s stage", rule.block_label, stage_name)
+        return Layer3CheckResult(
+            content=_fallback_for_stage(stage_name, history),
+            was_blocked=True,
+            applied_rules=[rule.block_label],
+        )
+
+
+@lru_cache(maxsize=1)
+def get_guardrail_engine() -> GuardrailEngine:
+    """Return the engine compiled from config/guardrails.yaml."""
+    return GuardrailEngine(load_guardrail_rules())
+
+
 def apply_layer3_output_checks(
     reply_text: str,
     stage: str | Stage,
     user_message: str,
     flow_type: str | Stage | None = None,
     history: list[dict[str, str]] | None = None,
+    timed: bool = False,
 ) -> Layer3CheckResult:
     """Run LAYER 3 (Response Validation) checks and return corrected or blocked content.
 
-    Checks (in order):
+    Checks (in order, see config/guardrails.yaml):
     0) Strip internal system prompt markers (BEGIN/END CUSTOM PRODUCT DATA).
     1) Degenerate output — empty, too short, or oversized.
     2) Pricing leakage in intent/logical/emotional stages, plus transactional pitch:
        a) Attempt sentence-level stripping first (was_corrected).
        b) Full fallback only when stripping leaves too little (was_blocked).
     """
-    stage_name = _normalize_stage_name(stage)
-    flow_name = _normalize_flow_type(flow_type)
-    text = (reply_text or "").strip()
-
-    # CRITICAL: Always strip marker leakage first
-    if "--- BEGIN CUSTOM PRODUCT DATA ---" in text or "--- END CUSTOM PRODUCT DATA ---" in text:
-        text = _strip_prompt_markers(text)
-
-    if not text or len(text) < MIN_RESPONSE_CHARS:
-        return Layer3CheckResult(
-            content=_fallback_for_stage(stage_name, history),
-            was_blocked=True,
-            applied_rules=["empty_output_fallback"],
-        )
-
-    if len(text) > MAX_RESPONSE_CHARS:
-        truncated = text[:MAX_RESPONSE_CHARS]
-        last_boundary = max(
-            truncated.rfind(". "),
-            truncated.rfind("? "),
-            truncated.rfind("! "),
-        )
-        if last_boundary > 0:
-            truncated = truncated[:last_boundary + 1]
-        logger.debug("layer3: oversized response truncated (%d → %d chars)", len(text), len(truncated))
-        return Layer3CheckResult(
-            content=truncated.strip(),
-            was_corrected=True,
-            applied_rules=["oversized_output_truncated"],
-        )
-
-    if stage_name in (Stage.INTENT.value, Stage.LOGICAL.value, Stage.EMOTIONAL.value):
-        if (
-            stage_name == Stage.EMOTIONAL.value
-            and _contains_consequence_of_inaction(text)
-            and not _contains_explicit_price_reference(text)
-        ):
-            return Layer3CheckResult(content=text)
-        if _contains_pricing_language(text) and not _user_requested_pricing(user_message):
-            corrected = _strip_pricing_sentences(text, stage_name=stage_name)
-            if len(corrected) >= MIN_RESPONSE_CHARS:
-                logger.debug("layer3: corrected pricing leak in %s stage", stage_name)
-                return Layer3CheckResult(
-                    content=corrected,
-                    was_corrected=True,
-                    applied_rules=["corrected_pricing_in_discovery"],
-                )
-            logger.debug("layer3: blocked pricing leak in %s stage (nothing left after strip)", stage_name)
-            return Layer3CheckResult(
-                content=_fallback_for_stage(stage_name, history),
-                was_blocked=True,
-                applied_rules=["blocked_pricing_in_discovery"],
-            )
-
-    if flow_name == Strategy.TRANSACTIONAL.value and stage_name == Stage.PITCH.value:
-        if _contains_pricing_language(text):
-            corrected = _strip_pricing_sentences(text)
-            if len(corrected) >= MIN_RESPONSE_CHARS:
-                logger.debug("layer3: corrected pricing in transactional pitch")
-                return Layer3CheckResult(
-                    content=corrected,
-                    was_corrected=True,
-                    applied_rules=["corrected_pricing_in_transactional_pitch"],
-                )
-            logger.debug("layer3: blocked pricing in transactional pitch (nothing left after strip)")
-            return Layer3CheckResult(
-                content=_fallback_for_stage(stage_name, history),
-                was_blocked=True,
-                applied_rules=["blocked_pricing_in_transactional_pitch"],
-            )
-
-    return Layer3CheckResult(content=text)
+    return get_guardrail_engine().check(reply_text, stage, user_message, flow_type, history, timed)
@@ -0,0 +1,344 @@
+"""Headless self-play: the sales bot sells to a simulated prospect, many times at once.
+
+Each dialogue pairs a SalesChatbot (the seller, every layer live) with a
+ProspectSession (the buyer, readiness scoring live). Both talk through a
+deterministic fake LLM, or replay recorded replies, so a run costs no API
+calls and the same seed gives the same trajectories. Per dialogue it keeps
+the seller's per-layer timings, the (stage, strategy) trajectory, the
+prospect outcome and both evaluator scores.
+
+The same loop is a throughput benchmark and, with --rounds, a soak test:
+after every round it reports traced memory and how many sessions the
+analytics store and any session managers passed in still hold, which should
+stay flat.
+
+    python -m core.self_play --dialogues 200 --workers 8
+    python -m core.self_play --products default,cars --difficulties easy,hard --rounds 5
+    python -m core.self_play --replies recorded.json --out report.json
+
+A replies file is {"seller": [...], "prospect": [...]}, served in order.
+"""
+
+import argparse
+import gc
+import hashlib
+import itertools
+import json
+import logging
+import statistics
+import sys
+import time
+import tracemalloc
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Sequence
+
+from .providers.base import BaseLLMProvider, LLMResponse
+from .utils import normalize_enum_name
+
+logger = logging.getLogger(__name__)
+
+SELLER_LINES = (
+    "Thanks for coming in. What are you hoping this will help you with?",
+    "Help me understand what matters most to you here?",
+    "That makes sense. Tell me more about how you handle that today?",
+    "A lot of people in your position found it saved them hours every week.",
+    "What's most important to you when you compare options?",
+    "Based on what you said, the standard plan covers all of that.",
+    "Would you like to go ahead and get started today?",
+    "Honestly this offer ends soon so you should decide now.",
+)
+PROSPECT_LINES = (
+    "I'm not sure yet, I'm just looking around.",
+    "Mostly I want something reliable that doesn't take much time.",
+    "That sounds too expensive for what we need.",
+    "We tried something similar before and it didn't work out.",
+    "Okay, that's actually helpful to know.",
+    "How long would it take to set up?",
+    "I'd need to talk to my partner first.",
+    "That sounds good, I think we could go ahead.",
+)
+
+
+class FakeLLM(BaseLLMProvider):
+    """Deterministic stand-in provider: seeded line choice, or recorded replies in order."""
+
+    provider_name = "self_play"
+
+    def __init__(self, lines: Sequence[str], seed: str = "", ordered: bool = False, latency_ms: float = 0.0):
+        self.lines = list(lines) or ["Okay."]
+        self.seed = seed
+        self.ordered = ordered
+        self.latency_ms = latency_ms
+        self.calls = 0
+
+    def chat(self, messages, temperature=0.8, max_tokens=200, stage=None) -> LLMResponse:
+        if self.ordered:
+            index = self.calls % len(self.lines)
+        else:
+            digest = hashlib.blake2b(f"{self.seed}:{self.calls}".encode(), digest_size=4).digest()
+            index = int.from_bytes(digest, "big") % len(self.lines)
+        self.calls += 1
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+        return LLMResponse(content=self.lines[index], latency_ms=self.latency_ms)
+
+    def is_available(self) -> bool:
+        return True
+
+    def get_model_name(self) -> str:
+        return "self-play-fake"
+
+
+@dataclass
+class DialogueSpec:
+    """One seller-versus-prospect role-play to simulate."""
+
+    dialogue_id: str
+    product_type: str = "default"
+    difficulty: str = "medium"
+    seed: str = ""
+    max_turns: int = 12
+    latency_ms: float = 0.0
+    seller_lines: Sequence[str] = SELLER_LINES
+    prospect_lines: Sequence[str] = PROSPECT_LINES
+    ordered: bool = False  # serve lines in order (recorded replies) instead of by seed
+
+
+@dataclass
+class DialogueResult:
+    dialogue_id: str
+    product_type: str
+    difficulty: str
+    turns: int = 0
+    outcome: str = "active"
+    readiness: float = 0.0
+    trajectory: list[tuple[str, str]] = field(default_factory=list)
+    timings: list[dict[str, float]] = field(default_factory=list)
+    prospect_score: int | None = None
+    seller_score: int | None = None
+    elapsed_ms: float = 0.0
+    error: str | None = None
+
+
+def simulate_dialogue(spec: DialogueSpec, session_store: Any = None, prospect_store: Any = None) -> DialogueResult:
+    """Run one dialogue to an outcome or max_turns.
+
+    Stores, when given, get the sessions registered for the dialogue's life and
+    deleted at the end, as the app would on expiry; anything they hook on
+    deletion (analytics release) runs then. Without a session store the seller's
+    analytics are released directly.
+    """
+    from .analytics.session_analytics import SessionAnalytics
+    from .chatbot import SalesChatbot
+    from .prospect_evaluator import evaluate_prospect_session
+    from .prospect_session import ProspectSession
+    from .trainer import score_session
+
+    result = DialogueResult(spec.dialogue_id, spec.product_type, spec.difficulty)
+    seller_id = f"selfplay-{spec.dialogue_id}"
+    prospect_id = f"{seller_id}-prospect"
+    start = time.perf_counter()
+    try:
+        seller = SalesChatbot(provider_type="dummy", product_type=spec.product_type, session_id=seller_id)
+        seller._sync_provider_from_router(
+            FakeLLM(spec.seller_lines, f"{spec.seed}:seller", spec.ordered, spec.latency_ms), FakeLLM.provider_name
+        )
+        prospect = ProspectSession(provider_type="dummy", product_type=spec.product_type, difficulty=spec.difficulty)
+        prospect.provider = FakeLLM(spec.prospect_lines, f"{spec.seed}:prospect", spec.ordered, spec.latency_ms)
+        prospect.provider_name = prospect.provider_type = FakeLLM.provider_name
+        if session_store is not None:
+            session_store.set(seller_id, seller)
+        if prospect_store is not None:
+            prospect_store.set(prospect_id, prospect)
+
+        buyer_says = prospect.get_opening_message().content
+        for _ in range(spec.max_turns):
+            seller_says = seller.chat(buyer_says).content
+            engine = seller.flow_engine
+            result.trajectory.append((normalize_enum_name(engine.current_stage), normalize_enum_name(engine.flow_type)))
+            result.timings.append(dict(seller.last_turn_timings))
+            buyer_says = prospect.process_turn(seller_says).content
+            if prospect.state.status != "active":
+                break
+
+        result.turns = prospect.state.turn_count
+        result.outcome = prospect.state.status
+        result.readiness = round(prospect.state.readiness, 3)
+        evaluation = evaluate_prospect_session(
+            None, prospect.conversation_history, prospect.state, prospect.product_context
+        )
+        result.prospect_score = evaluation.get("overall_score")
+        result.seller_score = score_session(seller_id).get("total_score")
+    except Exception as e:  # one broken dialogue must not sink the run
+        logger.warning("Self-play dialogue %s failed: %s", spec.dialogue_id, e)
+        result.error = str(e)
+    finally:
+        if session_store is not None:
+            session_store.delete(seller_id)
+        else:
+            SessionAnalytics.release_session(seller_id)
+        if prospect_store is not None:
+            prospect_store.delete(prospect_id)
+    result.elapsed_ms = round((time.perf_counter() - start) * 1000, 3)
+    return result
+
+
+def build_specs(
+    dialogues: int,
+    products: Sequence[str] = ("default",),
+    difficulties: Sequence[str] = ("easy", "medium", "hard"),
+    seed: str = "0",
+    **spec_fields,
+) -> list[DialogueSpec]:
+    """Spread `dialogues` round-robin across every (product, difficulty) pair."""
+    pairs = itertools.cycle(itertools.product(products, difficulties))
+    return [
+        DialogueSpec(f"{seed}-{i}", product, difficulty, seed=f"{seed}:{i}", **spec_fields)
+        for i, (product, difficulty) in zip(range(dialogues), pairs)
+    ]
+
+
+def _percentiles(values: list[float]) -> dict[str, float]:
+    if not values:
+        return {}
+    ordered = sorted(values)
+    pick = lambda q: ordered[min(len(ordered) - 1, int(q * len(ordered)))]  # noqa: E731
+    return {"p50": round(pick(0.5), 3), "p95": round(pick(0.95), 3), "max": round(ordered[-1], 3)}
+
+
+def summarize(results: list[DialogueResult], wall_seconds: float) -> dict:
+    """Throughput, per-layer timing percentiles, outcomes and score spread for a run."""
+    turns = sum(r.turns for r in results)
+    layers: dict[str, list[float]] = {}
+    for r in results:
+        for timing in r.timings:
+            for layer, ms in timing.items():
+                layers.setdefault(layer, []).append(ms)
+    scores = [r.prospect_score for r in results if r.prospect_score is not None]
+    seller_scores = [r.seller_score for r in results if r.seller_score is not None]
+    by_cell: dict[str, Counter] = {}
+    for r in results:
+        by_cell.setdefault(f"{r.product_type}/{r.difficulty}", Counter())[r.outcome] += 1
+    return {
+        "dialogues": len(results),
+        "errors": sum(r.error is not None for r in results),
+        "turns": turns,
+        "wall_seconds": round(wall_seconds, 3),
+        "dialogues_per_second": round(len(results) / wall_seconds, 2) if wall_seconds else None,
+        "turns_per_second": round(turns / wall_seconds, 2) if wall_seconds else None,
+        "layer_ms": {layer: _percentiles(values) for layer, values in sorted(layers.items())},
+        "outcomes": dict(Counter(r.outcome for r in results).most_common()),
+        "outcomes_by_cell": {cell: dict(counts) for cell, counts in sorted(by_cell.items())},
+        "final_states": dict(Counter("/".join(r.trajectory[-1]) for r in results if r.trajectory).most_common()),
+        "prospect_score_mean": round(statistics.fmean(scores), 2) if scores else None,
+        "seller_score_mean": round(statistics.fmean(seller_scores), 2) if seller_scores else None,
+    }
+
+
+def run_simulation(
+    specs: Sequence[DialogueSpec],
+    workers: int = 4,
+    session_store: Any = None,
+    prospect_store: Any = None,
+) -> tuple[list[DialogueResult], dict]:
+    """Run dialogues on a thread pool; returns results (in spec order) and the summary."""
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="self-play") as pool:
+        results = list(pool.map(lambda spec: simulate_dialogue(spec, session_store, prospect_store), specs))
+    return results, summarize(results, time.perf_counter() - start)
+
+
+def retained_state(session_store: Any = None, prospect_store: Any = None) -> dict:
+    """What the in-process stores still hold; flat across soak rounds means no leak."""
+    from .analytics.session_analytics import SessionAnalytics
+
+    gc.collect()
+    state = {
+        "analytics_sessions": len(SessionAnalytics._events),
+        "analytics_aggregates": len(SessionAnalytics._aggregates),
+    }
+    if session_store is not None:
+        state["chat_sessions"] = session_store.count()
+    if prospect_store is not None:
+        state["prospect_sessions"] = prospect_store.count()
+    if tracemalloc.is_tracing():
+        state["traced_kib"] = round(tracemalloc.get_traced_memory()[0] / 1024, 1)
+    return state
+
+
+def run_soak(
+    rounds: int,
+    build,
+    workers: int = 4,
+    session_store: Any = None,
+    prospect_store: Any = None,
+) -> list[dict]:
+    """Run `rounds` simulations of build(round) specs, recording retained state after each."""
+    started_tracing = not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    try:
+        report = []
+        for round_no in range(rounds):
+            _results, summary = run_simulation(build(round_no), workers, session_store, prospect_store)
+            report.append({"round": round_no + 1, **summary, "retained": retained_state(session_store, prospect_store)})
+        return report
+    finally:
+        if started_tracing:
+            tracemalloc.stop()
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Simulate seller-versus-prospect dialogues offline.")
+    parser.add_argument("--dialogues", type=int, default=60)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--products", default="default", help="comma-separated product types")
+    parser.add_argument("--difficulties", default="easy,medium,hard")
+    parser.add_argument("--max-turns", type=int, default=12)
+    parser.add_argument("--seed", default="0")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="simulated LLM latency per call")
+    parser.add_argument("--replies", help='JSON file of recorded replies: {"seller": [...], "prospect": [...]}')
+    parser.add_argument("--rounds", type=int, default=1, help="repeat the run and report retained state (soak)")
+    parser.add_argument("--out", help="write the JSON report here (default: stdout)")
+    args = parser.parse_args(argv)
+
+    logging.getLogger().setLevel(logging.WARNING)
+    spec_fields: dict[str, Any] = {"max_turns": args.max_turns, "latency_ms": args.latency_ms}
+    if args.replies:
+        recorded = json.loads(Path(args.replies).read_text(encoding="utf-8"))
+        spec_fields.update(
+            seller_lines=recorded.get("seller") or SELLER_LINES,
+            prospect_lines=recorded.get("prospect") or PROSPECT_LINES,
+            ordered=True,
+        )
+    products = [p.strip() for p in args.products.split(",") if p.strip()]
+    difficulties = [d.strip() for d in args.difficulties.split(",") if d.strip()]
+
+    def build(round_no: int) -> list[DialogueSpec]:
+        return build_specs(args.dialogues, products, difficulties, f"{args.seed}.{round_no}", **spec_fields)
+
+    if args.rounds > 1:
+        report: Any = run_soak(args.rounds, build, args.workers)
+        headline = report[-1]
+    else:
+        _results, report = run_simulation(build(0), args.workers)
+        headline = report
+
+    text = json.dumps(report, indent=2)
+    if args.out:
+        Path(args.out).write_text(text, encoding="utf-8")
+    else:
+        print(text)
+    print(
+        f"simulated {headline['dialogues']} dialogues ({headline['turns']} turns) "
+        f"at {headline['turns_per_second']} turns/s, {headline['errors']} errors",
+        file=sys.stderr,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,307 @@
+"""Cohort evaluation jobs: deterministic scores in one pass, LLM narratives in parallel.
+
+Grading a class means evaluating dozens of finished role-plays. Deterministic
+criterion scores for the whole cohort come from one vectorised pass
+(prospect_batch_evaluator). The LLM narratives then run on a small thread
+pool, with a concurrency cap per provider and a shared back-off whenever a
+provider answers with a rate limit. Results stream out as they finish and
+are recorded per job, so re-running a job only redoes items that lack a
+complete result. Jobs are kept in memory. When BATCH_EVALUATION_DIR is set
+they are also written there as JSON lines, so a resume survives a restart.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import re
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Iterable, Iterator, Sequence
+
+from ..constants import (
+    BATCH_EVALUATION_DEFAULT_CONCURRENCY,
+    BATCH_EVALUATION_MAX_WORKERS,
+    BATCH_EVALUATION_PROVIDER_CONCURRENCY,
+    BATCH_EVALUATION_RETRY_DELAYS,
+    MAX_BATCH_EVALUATION_JOBS,
+)
+from ..loader import load_prospect_config
+from ..prospect_batch_evaluator import deterministic_packs
+from ..prospect_evaluator import (
+    _build_evaluation_prompt,
+    _fallback_evaluation,
+    evaluation_from_response,
+    request_narrative,
+)
+from ..prospect_session import ProspectState
+from ..providers.base import RATE_LIMIT
+
+logger = logging.getLogger(__name__)
+
+JOB_ID_PATTERN = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+COMPLETE = "complete"  # final evaluation (narrative merged, or narratives not requested)
+PARTIAL = "partial"  # deterministic only because the narrative failed; redone on resume
+NOT_FOUND = "not_found"
+
+
+@dataclass
+class BatchItem:
+    """One transcript to grade, from a live session or an export."""
+
+    id: str
+    conversation_history: list
+    state: ProspectState
+    product_context: str = ""
+    provider: Any = None  # live session's provider; None uses the job default
+
+
+def item_from_session(session_id: str, session: Any) -> BatchItem:
+    """Snapshot a live ProspectSession."""
+    return BatchItem(
+        id=session_id,
+        conversation_history=list(session.conversation_history),
+        state=session.state,
+        product_context=session.product_context,
+        provider=session.provider,
+    )
+
+
+def item_from_record(record: dict, index: int) -> BatchItem:
+    """Build an item from an exported transcript (ProspectSession.to_dict() shape or a flat record)."""
+    state_data = record.get("state") if isinstance(record.get("state"), dict) else {}
+    history = [m for m in record.get("conversation_history") or [] if isinstance(m, dict)]
+    outcome = str(record.get("outcome") or record.get("status") or "")
+    turn_count = state_data.get("turn_count")
+    state = ProspectState(
+        readiness=float(state_data.get("readiness") or 0.0),
+        turn_count=int(turn_count) if turn_count is not None else sum(m.get("role") == "user" for m in history),
+        has_committed=bool(state_data.get("has_committed")) or outcome == "sold",
+        has_walked=bool(state_data.get("has_walked")) or outcome == "walked",
+        difficulty=str(record.get("difficulty") or state_data.get("difficulty") or "medium"),
+        product_type=str(record.get("product_type") or "default"),
+    )
+    return BatchItem(
+        id=str(record.get("session_id") or record.get("id") or index),
+        conversation_history=history,
+        state=state,
+        product_context=str(record.get("product_context") or ""),
+    )
+
+
+class BatchJobStore:
+    """Latest result per item for recent jobs, optionally mirrored to JSON lines on disk."""
+
+    def __init__(self, directory: str | None = None, max_jobs: int = MAX_BATCH_EVALUATION_JOBS):
+        self.directory = directory
+        self.max_jobs = max_jobs
+        self._jobs: OrderedDict[str, dict[str, dict]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _path(self, job_id: str) -> str | None:
+        return os.path.join(self.directory, f"{job_id}.jsonl") if self.directory else None
+
+    def _load(self, job_id: str) -> dict[str, dict]:
+        results: dict[str, dict] = {}
+        path = self._path(job_id)
+        if path and os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        result = json.loads(line)
+                    except ValueError:
+                        continue  # torn last line from a crash
+                    results[str(result.get("id"))] = result
+        return results
+
+    def results(self, job_id: str) -> dict[str, dict]:
+        """Copy of the recorded results for a job, keyed by item id."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                job = self._jobs[job_id] = self._load(job_id)
+                while len(self._jobs) > self.max_jobs:
+                    self._jobs.popitem(last=False)
+            self._jobs.move_to_end(job_id)
+            return dict(job)
+
+    def record(self, job_id: str, result: dict) -> None:
+        """Store an item's latest result."""
+        with self._lock:
+            self._jobs.setdefault(job_id, {})[str(result["id"])] = result
+            path = self._path(job_id)
+            if path:
+                try:
+                    os.makedirs(self.directory, exist_ok=True)  # type: ignore[arg-type]
+                    with open(path, "a", encoding="utf-8") as f:
+                        f.write(json.dumps(result, ensure_ascii=False, default=str) + "\n")
+                except OSError:
+                    logger.warning("batch_evaluation_write_failed path=%s", path, exc_info=True)
+
+
+class ProviderLimiter:
+    """Per-provider concurrency caps plus a shared cool-down after rate limits."""
+
+    def __init__(
+        self,
+        limits: dict[str, int] | None = None,
+        default: int = BATCH_EVALUATION_DEFAULT_CONCURRENCY,
+    ):
+        self._limits = BATCH_EVALUATION_PROVIDER_CONCURRENCY if limits is None else limits
+        self._default = default
+        self._semaphores: dict[str, threading.BoundedSemaphore] = {}
+        self._resume_at: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def _semaphore(self, name: str) -> threading.BoundedSemaphore:
+        with self._lock:
+            semaphore = self._semaphores.get(name)
+            if semaphore is None:
+                semaphore = self._semaphores[name] = threading.BoundedSemaphore(
+                    max(1, self._limits.get(name, self._default))
+                )
+            return semaphore
+
+    @contextmanager
+    def slot(self, name: str):
+        """Hold one of the provider's call slots, after any active cool-down."""
+        with self._semaphore(name):
+            wait = self._resume_at.get(name, 0.0) - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+            yield
+
+    def back_off(self, name: str, seconds: float) -> None:
+        """Hold every caller of this provider for `seconds`."""
+        with self._lock:
+            self._resume_at[name] = max(self._resume_at.get(name, 0.0), time.monotonic() + seconds)
+
+
+def _narrate(item: BatchItem, provider: Any, criteria: dict, pack: dict, limiter: ProviderLimiter, use_cache: bool) -> dict:
+    """LLM narrative for one item, merged with its deterministic pack."""
+    outcome = item.state.status
+    error = "No LLM provider available"
+    if provider is not None:
+        name = getattr(provider, "provider_name", "unknown")
+        prompt = _build_evaluation_prompt(item.conversation_history, item.state, item.product_context, criteria)
+        try:
+            for delay in (*BATCH_EVALUATION_RETRY_DELAYS, None):
+                with limiter.slot(name):
+                    response = request_narrative(provider, prompt, use_cache=use_cache)
+                if response.error_code != RATE_LIMIT or delay is None:
+                    break
+                limiter.back_off(name, delay)
+            if not response.error:
+                evaluation = evaluation_from_response(response, criteria, outcome, pack)
+                if evaluation:
+                    return {"id": item.id, "status": COMPLETE, "evaluation": evaluation}
+                error = "LLM evaluation could not be parsed"
+            else:
+                error = response.error
+        except Exception as e:
+            logger.warning("batch narrative failed for %s: %s", item.id, e)
+            error = str(e)
+    return {
+        "id": item.id,
+        "status": PARTIAL,
+        "evaluation": _fallback_evaluation(outcome, criteria=criteria, deterministic=pack),
+        "error": error,
+    }
+
+
+def run_batch(
+    items: Sequence[BatchItem],
+    *,
+    job_id: str | None = None,
+    missing: Iterable[str] = (),
+    narratives: bool = True,
+    default_provider: Any = None,
+    use_cache: bool = True,
+    store: BatchJobStore | None = None,
+    limiter: ProviderLimiter | None = None,
+    max_workers: int = BATCH_EVALUATION_MAX_WORKERS,
+    config: dict | None = None,
+) -> Iterator[dict]:
+    """Evaluate a cohort, yielding start / result / done events as they happen.
+
+    Items that already have a complete result under job_id are replayed
+    rather than evaluated again.
+    """
+    job_id = job_id or secrets.token_hex(8)
+    store = store or get_batch_job_store()
+    limiter = limiter or get_provider_limiter()
+    config = config if config is not None else load_prospect_config()
+    mode_cfg = config.get("prospect_mode", {}) if isinstance(config, dict) else {}
+    narratives = narratives and bool(mode_cfg.get("scoring_enabled", True))
+    missing = list(missing)
+
+    done = store.results(job_id)
+    replayed = [done[item.id] for item in items if done.get(item.id, {}).get("status") == COMPLETE]
+    pending = [item for item in items if done.get(item.id, {}).get("status") != COMPLETE]
+    counts = {COMPLETE: len(replayed), PARTIAL: 0, NOT_FOUND: len(missing)}
+
+    yield {"type": "start", "job_id": job_id, "total": len(items) + len(missing), "resumed": len(replayed)}
+    for session_id in missing:
+        yield {"type": "result", "id": session_id, "status": NOT_FOUND}
+    for result in replayed:
+        yield {"type": "result", "resumed": True, **result}
+
+    if pending:
+        criteria, packs = deterministic_packs(
+            [item.conversation_history for item in pending],
+            [item.state.status for item in pending],
+            config,
+        )
+        if narratives:
+            pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="batch-eval")
+            try:
+                futures = [
+                    pool.submit(_narrate, item, item.provider or default_provider, criteria, pack, limiter, use_cache)
+                    for item, pack in zip(pending, packs)
+                ]
+                for future in as_completed(futures):
+                    result = future.result()
+                    store.record(job_id, result)
+                    counts[result["status"]] += 1
+                    yield {"type": "result", **result}
+            finally:
+                # A disconnected client closes this generator; drop work not yet started
+                pool.shutdown(wait=False, cancel_futures=True)
+        else:
+            for item, pack in zip(pending, packs):
+                evaluation = _fallback_evaluation(item.state.status, criteria=criteria, deterministic=pack)
+                result = {"id": item.id, "status": COMPLETE, "evaluation": evaluation}
+                store.record(job_id, result)
+                counts[COMPLETE] += 1
+                yield {"type": "result", **result}
+
+    yield {"type": "done", "job_id": job_id, "counts": counts}
+
+
+_store: BatchJobStore | None = None
+_limiter: ProviderLimiter | None = None
+_singleton_lock = threading.Lock()
+
+
+def get_batch_job_store() -> BatchJobStore:
+    """Process-wide job store (BATCH_EVALUATION_DIR enables the disk copy)."""
+    global _store
+    with _singleton_lock:
+        if _store is None:
+            _store = BatchJobStore((os.environ.get("BATCH_EVALUATION_DIR") or "").strip() or None)
+        return _store
+
+
+def get_provider_limiter() -> ProviderLimiter:
+    """Process-wide limiter, so concurrent jobs share each provider's budget."""
+    global _limiter
+    with _singleton_lock:
+        if _limiter is None:
+            _limiter = ProviderLimiter()
+        return _limiter
@@ -0,0 +1,251 @@
+"""Content-addressed cache for deterministic LLM scoring calls.
+
+Quiz grading and prospect evaluation send prompts whose only variable inputs
+are the transcript and the rubric, at a low temperature. Replaying the same
+evaluation (page refresh, retry, re-scoring an unchanged quiz answer) should
+not pay for a second provider call, so responses are cached by a hash of the
+normalized prompt plus the model and sampling settings.
+
+Two tiers: an in-memory LRU with TTL, and an optional SQLite file
+(LLM_RESPONSE_CACHE_DB) that survives restarts and is shared by workers.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+from ..constants import (
+    LLM_CACHE_MAX_CACHEABLE_TEMPERATURE,
+    LLM_CACHE_MAX_ENTRIES,
+    LLM_CACHE_TTL_SECONDS,
+)
+from ..providers.base import LLMResponse
+
+logger = logging.getLogger(__name__)
+
+
+def _normalize_text(text: Any) -> str:
+    """Collapse whitespace so formatting-only prompt differences share a key."""
+    return " ".join(str(text or "").split())
+
+
+def _provider_identity(provider: Any) -> tuple[str, str]:
+    name = getattr(provider, "provider_name", None) or type(provider).__name__
+    model = ""
+    get_model_name = getattr(provider, "get_model_name", None)
+    if callable(get_model_name):
+        try:
+            model = str(get_model_name() or "")
+        except Exception:
+            model = ""
+    return str(name), model
+
+
+class LLMResponseCache:
+    """LRU + TTL response cache with an optional SQLite second tier."""
+
+    def __init__(
+        self,
+        max_entries: int = LLM_CACHE_MAX_ENTRIES,
+        ttl_seconds: float = LLM_CACHE_TTL_SECONDS,
+        sqlite_path: str | None = None,
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.sqlite_path = sqlite_path
+        self._entries: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: sqlite3.Connection | None = None
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "disk_hits": 0,
+            "stores": 0,
+            "evictions": 0,
+            "expirations": 0,
+            "bypassed": 0,
+        }
+
+    @staticmethod
+    def make_key(provider: Any, messages: list, temperature: float, max_tokens: int) -> str:
+        """Hash of normalized prompt + provider/model + sampling settings."""
+        provider_name, model = _provider_identity(provider)
+        normalized = [
+            [str(message.get("role", "")), _normalize_text(message.get("content"))]
+            for message in messages
+        ]
+        material = json.dumps(
+            {
+                "provider": provider_name,
+                "model": model,
+                "temperature": round(float(temperature), 3),
+                "max_tokens": int(max_tokens),
+                "messages": normalized,
+            },
+            sort_keys=True,
+            separators=(",", ":"),
+        )
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> str | None:
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                stored_at, content = entry
+                if now - stored_at <= self.ttl_seconds:
+                    self._entries.move_to_end(key)
+                    self._stats["hits"] += 1
+                    return content
+                del self._entries[key]
+                self._stats["expirations"] += 1
+
+            disk_entry = self._disk_get(key)
+            if disk_entry is not None and now - disk_entry[0] <= self.ttl_seconds:
+                self._remember(key, disk_entry[0], disk_entry[1])
+                self._stats["hits"] += 1
+                self._stats["disk_hits"] += 1
+                return disk_entry[1]
+
+            self._stats["misses"] += 1
+            return None
+
+    def put(self, key: str, content: str) -> None:
+        now = time.time()
+        with self._lock:
+            self._remember(key, now, content)
+            self._stats["stores"] += 1
+            self._disk_put(key, now, content)
+
+    def record_bypass(self) -> None:
+        with self._lock:
+            self._stats["bypassed"] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            for stat in self._stats:
+                self._stats[stat] = 0
+            db = self._connect()
+            if db is not None:
+                with db:
+                    db.execute("DELETE FROM llm_response_cache")
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["misses"]
+            return {
+                **self._stats,
+                "entries": len(self._entries),
+                "hit_rate": round(self._stats["hits"] / lookups, 3) if lookups else 0.0,
+                "disk_enabled": bool(self.sqlite_path),
+            }
+
+    def _remember(self, key: str, stored_at: float, content: str) -> None:
+        self._entries[key] = (stored_at, content)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    def _connect(self) -> sqlite3.Connection | None:
+        if not self.sqlite_path:
+            return None
+        if self._db is None:
+            try:
+                self._db = sqlite3.connect(self.sqlite_path, check_same_thread=False)
+                with self._db:
+                    self._db.execute(
+                        "CREATE TABLE IF NOT EXISTS llm_response_cache ("
+                        "key TEXT PRIMARY KEY, stored_at REAL NOT NULL, content TEXT NOT NULL)"
+                    )
+            except sqlite3.Error as e:
+                logger.warning("LLM cache disk tier disabled: %s", e)
+                self.sqlite_path = None
+                self._db = None
+        return self._db
+
+    def _disk_get(self, key: str) -> tuple[float, str] | None:
+        db = self._connect()
+        if db is None:
+            return None
+        try:
+            row = db.execute(
+                "SELECT stored_at, content FROM llm_response_cache WHERE key = ?", (key,)
+            ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning("LLM cache disk read failed: %s", e)
+            return None
+        return (float(row[0]), str(row[1])) if row else None
+
+    def _disk_put(self, key: str, stored_at: float, content: str) -> None:
+        db = self._connect()
+        if db is None:
+            return
+        try:
+            with db:
+                db.execute(
+                    "INSERT OR REPLACE INTO llm_response_cache (key, stored_at, content) VALUES (?, ?, ?)",
+                    (key, stored_at, content),
+                )
+                db.execute(
+                    "DELETE FROM llm_response_cache WHERE stored_at < ?",
+                    (stored_at - self.ttl_seconds,),
+                )
+        except sqlite3.Error as e:
+            logger.warning("LLM cache disk write failed: %s", e)
+
+
+_cache: LLMResponseCache | None = None
+_cache_lock = threading.Lock()
+
+
+def get_llm_response_cache() -> LLMResponseCache:
+    """Process-wide cache, configured from the environment on first use."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = LLMResponseCache(sqlite_path=os.environ.get("LLM_RESPONSE_CACHE_DB") or None)
+        return _cache
+
+
+def _cache_enabled() -> bool:
+    return os.environ.get("LLM_RESPONSE_CACHE", "true").strip().lower() not in {"0", "false", "no", "off"}
+
+
+def cached_chat(
+    provider: Any,
+    messages: list,
+    *,
+    temperature: float,
+    max_tokens: int,
+    use_cache: bool = True,
+) -> LLMResponse:
+    """provider.chat() behind the response cache.
+
+    Only successful, non-empty responses are stored. Calls above
+    LLM_CACHE_MAX_CACHEABLE_TEMPERATURE, or with use_cache=False, always go
+    to the provider.
+    """
+    cache = get_llm_response_cache()
+    if not use_cache or not _cache_enabled() or temperature > LLM_CACHE_MAX_CACHEABLE_TEMPERATURE:
+        cache.record_bypass()
+        return provider.chat(messages, temperature=temperature, max_tokens=max_tokens)
+
+    key = cache.make_key(provider, messages, temperature, max_tokens)
+    content = cache.get(key)
+    if content is not None:
+        return LLMResponse(content=content, latency_ms=0.0)
+
+    response = provider.chat(messages, temperature=temperature, max_tokens=max_tokens)
+    if not getattr(response, "error", None) and (getattr(response, "content", "") or "").strip():
+        cache.put(key, response.content)
+    return response
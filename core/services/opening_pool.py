@@ -0,0 +1,218 @@
+"""Pre-generated prospect openings so /api/prospect/init does not wait on the LLM.
+
+An opening depends only on (product_type, persona name, difficulty), so a
+background worker keeps a few ready per combination. Taking one schedules a
+refill for that key ahead of everything else; openings older than the TTL
+are discarded rather than served. An empty pool is not an error - the route
+falls back to generating the opening live.
+
+Only combinations from prospect_config.yaml are pooled: the route passes the
+client's product_type straight through, so any other key is a plain miss with
+no refill. Keys are warmed lazily: the first take() for a key misses and
+queues its refill. start() can warm keys up front (the app does so for every
+configured key only when PROSPECT_OPENING_WARM_ON_BOOT is set). The TTL sweep
+only refreshes keys taken within the last TTL, so unused combinations stop
+costing LLM calls once their openings expire.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Iterable
+
+from ..constants import (
+    PROSPECT_OPENING_POOL_SIZE,
+    PROSPECT_OPENING_REFILL_DELAY_SECONDS,
+    PROSPECT_OPENING_TTL_SECONDS,
+)
+
+logger = logging.getLogger(__name__)
+
+OpeningKey = tuple[str, str, str]  # (product_type, persona name, difficulty)
+
+
+@dataclass(frozen=True)
+class PooledOpening:
+    content: str
+    provider: str
+    model: str
+    created_at: float  # monotonic
+
+
+def _generate_opening(key: OpeningKey) -> PooledOpening | None:
+    from ..prospect_session import ProspectSession, find_persona
+
+    product_type, persona_name, difficulty = key
+    persona = find_persona(product_type, persona_name)
+    if persona is None:
+        return None
+    ps = ProspectSession(product_type=product_type, difficulty=difficulty, persona=persona)
+    content = ps.generate_opening_text()
+    if content is None:
+        return None
+    return PooledOpening(content, ps.provider_name, ps.model_name, time.monotonic())
+
+
+def configured_opening_keys() -> list[OpeningKey]:
+    """Every (product_type, persona, difficulty) combination in prospect_config.yaml."""
+    from ..loader import load_prospect_config
+
+    config = load_prospect_config()
+    difficulties = list(config.get("difficulty_profiles", {}))
+    keys = []
+    for product_type, personas in (config.get("personas") or {}).items():
+        # Sessions without a product type draw from the general personas
+        product_type = "default" if product_type == "general" else product_type
+        for persona in personas or []:
+            for difficulty in difficulties:
+                keys.append((product_type, persona.get("name", "Alex"), difficulty))
+    return keys
+
+
+class ProspectOpeningPool:
+    """Up to `size` fresh openings per key, refilled by one background worker."""
+
+    def __init__(
+        self,
+        generate: Callable[[OpeningKey], PooledOpening | None] | None = None,
+        size: int = PROSPECT_OPENING_POOL_SIZE,
+        ttl_seconds: float = PROSPECT_OPENING_TTL_SECONDS,
+        refill_delay: float = PROSPECT_OPENING_REFILL_DELAY_SECONDS,
+        keys: Iterable[OpeningKey] | None = None,
+    ):
+        self._generate = generate or _generate_opening
+        self._keys = frozenset(configured_opening_keys() if keys is None else keys)
+        self.size = size
+        self.ttl_seconds = ttl_seconds
+        self.refill_delay = refill_delay
+        self._pools: dict[OpeningKey, deque[PooledOpening]] = {}
+        self._queue: deque[OpeningKey] = deque()
+        self._queued: set[OpeningKey] = set()
+        self._last_taken: dict[OpeningKey, float] = {}  # monotonic, known keys only
+        self._cond = threading.Condition()
+        self._started = False
+        self._hits = 0
+        self._misses = 0
+
+    def _prune(self, key: OpeningKey, now: float) -> deque[PooledOpening]:
+        """Drop expired openings for a key. Caller holds the condition."""
+        pool = self._pools.setdefault(key, deque())
+        while pool and now - pool[0].created_at > self.ttl_seconds:
+            pool.popleft()
+        return pool
+
+    def _schedule(self, key: OpeningKey, urgent: bool = False) -> None:
+        """Queue a refill if the key is short. Caller holds the condition."""
+        if not self._started or key in self._queued or key not in self._keys:
+            return
+        if len(self._prune(key, time.monotonic())) >= self.size:
+            return
+        self._queued.add(key)
+        if urgent:
+            self._queue.appendleft(key)
+        else:
+            self._queue.append(key)
+        self._cond.notify()
+
+    def take(self, key: OpeningKey) -> PooledOpening | None:
+        """Pop a fresh opening for the key, or None if the pool has none (or the key is unknown)."""
+        with self._cond:
+            if key not in self._keys:
+                self._misses += 1
+                return None
+            now = time.monotonic()
+            self._last_taken[key] = now
+            pool = self._prune(key, now)
+            opening = pool.popleft() if pool else None
+            if opening is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+            self._schedule(key, urgent=True)
+        return opening
+
+    def fill(self, key: OpeningKey) -> bool:
+        """Generate one opening for the key now. Returns False if generation failed or the key is unknown."""
+        if key not in self._keys:
+            return False
+        try:
+            opening = self._generate(key)
+        except Exception as e:
+            logger.warning("Prospect opening generation failed for %s: %s", key, e)
+            return False
+        if opening is None:
+            return False
+        with self._cond:
+            pool = self._prune(key, time.monotonic())
+            if len(pool) < self.size:
+                pool.append(opening)
+        return True
+
+    def warm(self, keys: Iterable[OpeningKey]) -> None:
+        """Queue refills for keys that are below size."""
+        with self._cond:
+            for key in keys:
+                self._schedule(key)
+
+    def _worker(self) -> None:
+        while True:
+            with self._cond:
+                if not self._queue:
+                    # Idle: wake up once a TTL passes to replace expired openings,
+                    # but only for keys that are actually being taken
+                    if not self._cond.wait(timeout=self.ttl_seconds):
+                        cutoff = time.monotonic() - self.ttl_seconds
+                        for key, taken_at in list(self._last_taken.items()):
+                            if taken_at >= cutoff:
+                                self._schedule(key)
+                    continue
+                key = self._queue.popleft()
+                missing = self.size - len(self._prune(key, time.monotonic()))
+            for _ in range(max(missing, 0)):
+                # Stop on failure; the next take() for this key asks again
+                if not self.fill(key):
+                    break
+                time.sleep(self.refill_delay)
+            with self._cond:
+                self._queued.discard(key)
+
+    def start(self, keys: Iterable[OpeningKey] = ()) -> None:
+        """Start the refill worker and queue the given keys for warming; others warm on first take()."""
+        if self.size <= 0:
+            return
+        with self._cond:
+            if self._started:
+                return
+            self._started = True
+        thread = threading.Thread(target=self._worker, daemon=True)
+        thread.start()
+        keys = list(keys)
+        self.warm(keys)
+        logger.info("Started prospect opening pool (%d keys, %d per key)", len(keys), self.size)
+
+    def stats(self) -> dict:
+        """Pool size and hit counts for diagnostics."""
+        with self._cond:
+            return {
+                "ready": sum(len(pool) for pool in self._pools.values()),
+                "queued": len(self._queue),
+                "hits": self._hits,
+                "misses": self._misses,
+            }
+
+
+_pool: ProspectOpeningPool | None = None
+_pool_lock = threading.Lock()
+
+
+def get_opening_pool() -> ProspectOpeningPool:
+    """Process-wide pool used by /api/prospect/init."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProspectOpeningPool()
+        return _pool
@@ -4,9 +4,19 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 
+from ..analytics.performance import PerformanceTracker
 from ..constants import DEFAULT_MAX_TOKENS, DEFAULT_TEMPERATURE
 from ..providers import create_provider, create_provider_with_trace, list_fallback_providers
-from ..providers.base import LLMResponse
+from ..providers.base import RATE_LIMIT, LLMResponse
+
+
+def _record_outcome(provider_name: str, resp: LLMResponse) -> None:
+    PerformanceTracker.record_outcome(
+        provider_name,
+        ok=not resp.error and bool((resp.content or "").strip()),
+        error_code=resp.error_code,
+        rate_limited=resp.error_code == RATE_LIMIT,
+    )
 
 
 @dataclass(frozen=True)
@@ -33,6 +43,7 @@ class ProviderRouter:
             max_tokens=DEFAULT_MAX_TOKENS,
             stage=stage,
         )
+        _record_outcome(self.provider_name, resp)
         return ProviderChatResult(
             response=resp,
             provider_name=self.provider_name,
@@ -55,6 +66,7 @@ class ProviderRouter:
                 max_tokens=DEFAULT_MAX_TOKENS,
                 stage=stage,
             )
+            _record_outcome(next_name, resp)
             if resp.error or not (resp.content or "").strip():
                 continue
 
@@ -0,0 +1,135 @@
+"""Cached provider availability for health probes.
+
+Checking availability means instantiating every LLM, STT and TTS provider
+(reading keys, building clients). Doing that on every /api/health call made
+the probe the most expensive GET in the app. The monitor keeps one snapshot
+in memory, refreshed in the background once it is older than the TTL, so a
+probe only reads a dict. Stale data is served while a refresh is running.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from typing import Any, Callable
+
+from ..constants import PROVIDER_STATUS_TTL_SECONDS
+
+logger = logging.getLogger(__name__)
+
+Collector = Callable[[], Any]
+
+
+def _default_collectors() -> dict[str, Collector]:
+    from ..providers import (
+        get_available_providers,
+        get_available_stt_providers,
+        get_available_tts_providers,
+    )
+
+    return {
+        "llm": get_available_providers,
+        "stt": get_available_stt_providers,
+        "tts": get_available_tts_providers,
+    }
+
+
+class ProviderStatusMonitor:
+    """Availability snapshot per provider kind, refreshed off the request path."""
+
+    def __init__(
+        self,
+        collectors: dict[str, Collector] | None = None,
+        ttl_seconds: float = PROVIDER_STATUS_TTL_SECONDS,
+    ):
+        self._collectors = collectors
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._snapshot: dict[str, Any] | None = None
+        self._refreshed_at = 0.0  # monotonic
+        self._refreshed_wall = 0.0
+        self._refreshing = False
+        self._refresh_started = False
+
+    def _collect(self) -> dict[str, Any]:
+        collectors = self._collectors if self._collectors is not None else _default_collectors()
+        previous = self._snapshot or {}
+        snapshot: dict[str, Any] = {}
+        for kind, collect in collectors.items():
+            try:
+                snapshot[kind] = collect()
+            except Exception as e:
+                # Keep the last good answer rather than reporting nothing
+                logger.warning("Provider status refresh failed for %s: %s", kind, e)
+                snapshot[kind] = previous.get(kind, [])
+        return snapshot
+
+    def refresh(self) -> dict[str, Any]:
+        """Re-check every provider now and replace the snapshot."""
+        snapshot = self._collect()
+        with self._lock:
+            self._snapshot = snapshot
+            self._refreshed_at = time.monotonic()
+            self._refreshed_wall = time.time()
+            self._refreshing = False
+        return snapshot
+
+    def _refresh_quietly(self) -> None:
+        try:
+            self.refresh()
+        except Exception as e:
+            logger.error("Provider status refresh error: %s", e)
+            with self._lock:
+                self._refreshing = False
+
+    def snapshot(self) -> dict[str, Any]:
+        """Current snapshot plus its age. Only the very first call blocks on a refresh."""
+        with self._lock:
+            snapshot = self._snapshot
+            age = time.monotonic() - self._refreshed_at
+            stale = snapshot is not None and age > self.ttl_seconds and not self._refreshing
+            if stale:
+                self._refreshing = True
+        if snapshot is None:
+            snapshot = self.refresh()
+            age = 0.0
+        elif stale:
+            threading.Thread(target=self._refresh_quietly, daemon=True).start()
+        return {**snapshot, "age_seconds": round(age, 1), "refreshed_at": self._refreshed_wall}
+
+    def invalidate(self) -> None:
+        """Drop the snapshot so the next read re-checks synchronously."""
+        with self._lock:
+            self._snapshot = None
+            self._refreshing = False
+
+    def start_background_refresh(self, interval: float | None = None) -> None:
+        """Keep the snapshot warm so probes never wait on a refresh."""
+        interval = interval or self.ttl_seconds
+        with self._lock:
+            if self._refresh_started:
+                return
+            self._refresh_started = True
+
+        def refresh_loop():
+            while True:
+                self._refresh_quietly()
+                time.sleep(interval)
+
+        thread = threading.Thread(target=refresh_loop, daemon=True)
+        thread.start()
+        logger.info("Started provider status refresh thread (interval: %ss)", interval)
+
+
+_monitor: ProviderStatusMonitor | None = None
+_monitor_lock = threading.Lock()
+
+
+def get_provider_status_monitor() -> ProviderStatusMonitor:
+    """Process-wide monitor used by /api/health."""
+    global _monitor
+    with _monitor_lock:
+        if _monitor is None:
+            _monitor = ProviderStatusMonitor()
+        return _monitor
@@ -0,0 +1,170 @@
+"""Near-duplicate answer cache for trainee coaching questions.
+
+Trainees at the same stage ask the same handful of technique questions in
+slightly different words ("what is a trial close?", "explain trial closes").
+Answers are bucketed by (product, stage, strategy, coach style) and matched on
+cosine similarity of hashed word and character n-gram vectors, so a paraphrase
+reuses an earlier answer instead of a fresh LLM call. Everything is local
+and deterministic; there is no embedding model.
+
+Only answers generated without the trainee's transcript belong here; the
+caller keeps questions about the conversation itself out of the cache, so an
+answer never quotes another trainee's messages.
+"""
+
+from __future__ import annotations
+
+import math
+import re
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any
+
+from ..constants import (
+    TRAINING_ANSWER_CACHE_MAX_PER_BUCKET,
+    TRAINING_ANSWER_CACHE_SIMILARITY,
+    TRAINING_ANSWER_CACHE_TTL_SECONDS,
+)
+
+_NON_WORD = re.compile(r"[^a-z0-9\s]+")
+_FEATURE_SPACE = 1 << 18
+
+
+def normalize_question(question: str) -> str:
+    """Lowercase, drop punctuation, collapse whitespace."""
+    return " ".join(_NON_WORD.sub(" ", str(question or "").lower()).split())
+
+
+def _feature_index(token: str) -> int:
+    # crc32 rather than hash(): stable across processes and PYTHONHASHSEED
+    return zlib.crc32(token.encode("utf-8")) % _FEATURE_SPACE
+
+
+def question_vector(normalized: str) -> dict[int, float]:
+    """L2-normalised sparse vector of hashed word uni/bigrams and char trigrams."""
+    words = normalized.split()
+    counts: dict[int, float] = {}
+    features = [f"w:{w}" for w in words]
+    features += [f"b:{a}_{b}" for a, b in zip(words, words[1:])]
+    padded = f" {normalized} "
+    features += [f"c:{padded[i:i + 3]}" for i in range(len(padded) - 2)]
+    for feature in features:
+        index = _feature_index(feature)
+        counts[index] = counts.get(index, 0.0) + 1.0
+    norm = math.sqrt(sum(value * value for value in counts.values()))
+    if not norm:
+        return {}
+    return {index: value / norm for index, value in counts.items()}
+
+
+def cosine_similarity(left: dict[int, float], right: dict[int, float]) -> float:
+    if len(left) > len(right):
+        left, right = right, left
+    return sum(value * right.get(index, 0.0) for index, value in left.items())
+
+
+@dataclass
+class _CachedAnswer:
+    vector: dict[int, float]
+    answer: str
+    stored_at: float
+
+
+class TrainingAnswerCache:
+    """Bucketed LRU of answered questions with similarity lookup."""
+
+    def __init__(
+        self,
+        similarity_threshold: float = TRAINING_ANSWER_CACHE_SIMILARITY,
+        max_per_bucket: int = TRAINING_ANSWER_CACHE_MAX_PER_BUCKET,
+        ttl_seconds: float = TRAINING_ANSWER_CACHE_TTL_SECONDS,
+    ):
+        self.similarity_threshold = similarity_threshold
+        self.max_per_bucket = max_per_bucket
+        self.ttl_seconds = ttl_seconds
+        self._buckets: dict[tuple, OrderedDict[str, _CachedAnswer]] = {}
+        self._lock = threading.Lock()
+        self._stats = {"exact_hits": 0, "similar_hits": 0, "misses": 0, "stores": 0, "evictions": 0}
+
+    @staticmethod
+    def bucket_key(product_type: Any, stage: Any, strategy: Any, style: str) -> tuple:
+        """Bucket for answers generated from the same prompt context."""
+        return (str(product_type or ""), str(stage), str(strategy), str(style))
+
+    def lookup(self, bucket: tuple, question: str) -> tuple[str, float] | None:
+        """Return (answer, similarity) for the closest live match above threshold."""
+        normalized = normalize_question(question)
+        if not normalized:
+            return None
+        now = time.time()
+        with self._lock:
+            entries = self._buckets.get(bucket)
+            if not entries:
+                self._stats["misses"] += 1
+                return None
+            self._drop_expired(entries, now)
+
+            exact = entries.get(normalized)
+            if exact is not None:
+                entries.move_to_end(normalized)
+                self._stats["exact_hits"] += 1
+                return exact.answer, 1.0
+
+            vector = question_vector(normalized)
+            best_key, best_score = None, 0.0
+            for key, entry in entries.items():
+                score = cosine_similarity(vector, entry.vector)
+                if score > best_score:
+                    best_key, best_score = key, score
+            if best_key is None or best_score < self.similarity_threshold:
+                self._stats["misses"] += 1
+                return None
+            entries.move_to_end(best_key)
+            self._stats["similar_hits"] += 1
+            return entries[best_key].answer, round(best_score, 3)
+
+    def store(self, bucket: tuple, question: str, answer: str) -> None:
+        normalized = normalize_question(question)
+        if not normalized or not answer:
+            return
+        entry = _CachedAnswer(question_vector(normalized), answer, time.time())
+        with self._lock:
+            entries = self._buckets.setdefault(bucket, OrderedDict())
+            entries[normalized] = entry
+            entries.move_to_end(normalized)
+            self._stats["stores"] += 1
+            while len(entries) > self.max_per_bucket:
+                entries.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def _drop_expired(self, entries: OrderedDict[str, _CachedAnswer], now: float) -> None:
+        # Oldest-touched first; stored_at is not refreshed on hit, so scan all
+        expired = [key for key, entry in entries.items() if now - entry.stored_at > self.ttl_seconds]
+        for key in expired:
+            del entries[key]
+            self._stats["evictions"] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._buckets.clear()
+            for stat in self._stats:
+                self._stats[stat] = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                **self._stats,
+                "buckets": len(self._buckets),
+                "entries": sum(len(entries) for entries in self._buckets.values()),
+            }
+
+
+_cache = TrainingAnswerCache()
+
+
+def get_training_answer_cache() -> TrainingAnswerCache:
+    """Process-wide training answer cache."""
+    return _cache
@@ -0,0 +1,114 @@
+"""Prewarm the TTS audio cache with every phrase the bots speak verbatim.
+
+Covers the Layer 3 fallback questions, the prospect terminal outcome lines
+and the objection entry/check questions from objection_pathway_map.yaml.
+Prospect openings are LLM-generated per session and are not included.
+
+Phrases are split with the same sentence splitter the voice routes use, so
+the prewarmed keys are the ones looked up at request time.
+
+    TTS_CACHE_DIR=/var/cache/tts python -m core.services.tts_prewarm --voice male_us --voice female_us
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+from typing import Iterable
+
+from ..loader import load_yaml
+from ..providers.tts.cache import CachedTTSProvider, TTSAudioCache
+from ..providers.tts.factory import create_tts_provider
+from ..providers.tts.streaming import split_sentences
+
+
+def static_phrases() -> list[str]:
+    """Every fixed utterance, deduplicated, in a stable order."""
+    from ..prompts import INTENT_FALLBACKS
+    from ..prospect_session import TERMINAL_OUTCOME_MESSAGES
+    from ..response_guardrails import _EMOTIONAL_FALLBACKS, _GENERIC_FALLBACKS, _LOGICAL_FALLBACKS
+
+    phrases = [
+        *INTENT_FALLBACKS,
+        *_LOGICAL_FALLBACKS,
+        *_EMOTIONAL_FALLBACKS,
+        *_GENERIC_FALLBACKS,
+        *TERMINAL_OUTCOME_MESSAGES.values(),
+    ]
+    try:
+        pathway_map = load_yaml("objection_pathway_map.yaml") or {}
+    except FileNotFoundError:
+        pathway_map = {}
+    for category in (pathway_map.get("category_mapping") or {}).values():
+        if isinstance(category, dict) and category.get("entry_question"):
+            phrases.append(category["entry_question"])
+    for reframe in (pathway_map.get("reframe_descriptions") or {}).values():
+        if isinstance(reframe, dict) and reframe.get("check_question"):
+            phrases.append(reframe["check_question"])
+
+    return list(dict.fromkeys(sentence for phrase in phrases for sentence in split_sentences(phrase)))
+
+
+def prewarm(
+    provider: CachedTTSProvider,
+    phrases: Iterable[str],
+    voices: Iterable[str] = ("male_us",),
+    rates: Iterable[int] = (0,),
+) -> dict:
+    """Synthesize every (phrase, voice, rate) not already cached. Returns counts."""
+    counts = {"synthesized": 0, "already_cached": 0, "failed": 0}
+    errors = []
+    for voice in voices:
+        for rate in rates:
+            for phrase in phrases:
+                if provider.lookup(phrase, voice=voice, rate=rate) is not None:
+                    counts["already_cached"] += 1
+                    continue
+                result = provider.synthesize(phrase, voice=voice, rate=rate)
+                if result.error:
+                    counts["failed"] += 1
+                    errors.append(result.error)
+                else:
+                    counts["synthesized"] += 1
+    if errors:
+        counts["first_error"] = errors[0]
+    return counts
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Synthesize static bot phrases into the TTS cache.")
+    parser.add_argument("--cache-dir", default=os.environ.get("TTS_CACHE_DIR"), help="disk tier (default: $TTS_CACHE_DIR)")
+    parser.add_argument("--provider", help="TTS provider name (default: first available)")
+    parser.add_argument("--voice", action="append", help="voice key, repeatable (default: male_us)")
+    parser.add_argument("--rate", action="append", type=int, help="speaking rate %%, repeatable (default: 0)")
+    parser.add_argument("--list", action="store_true", help="print the phrases and exit")
+    args = parser.parse_args(argv)
+
+    phrases = static_phrases()
+    if args.list:
+        print("\n".join(phrases))
+        return 0
+    if not args.cache_dir:
+        print("--cache-dir or TTS_CACHE_DIR is required; a memory-only cache dies with this process", file=sys.stderr)
+        return 2
+
+    provider = create_tts_provider(args.provider)
+    if not provider.is_available():
+        print(f"TTS provider '{provider.provider_name}' is unavailable", file=sys.stderr)
+        return 1
+    cached = CachedTTSProvider(provider, TTSAudioCache(cache_dir=args.cache_dir))
+    counts = prewarm(cached, phrases, voices=args.voice or ["male_us"], rates=args.rate or [0])
+    stats = cached.cache.stats()
+    print(
+        f"{len(phrases)} phrases: {counts['synthesized']} synthesized, {counts['already_cached']} cached, "
+        f"{counts['failed']} failed; disk {stats['disk_entries']} clips / {stats['disk_bytes']} bytes",
+        file=sys.stderr,
+    )
+    if counts.get("first_error"):
+        print(f"first error: {counts['first_error']}", file=sys.stderr)
+    return 1 if counts["failed"] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,12 +1,14 @@
 """Training coach: generates coaching feedback and answers trainee questions"""
 
 import logging
+import re
 
 from .analytics.session_analytics import SessionAnalytics
-from .constants import SCORING_RUBRIC, STAGE_TIMEOUTTHRESHOLDS
+from .constants import SCORING_RUBRIC
 from .providers import create_provider, list_fallback_providers
 from .quiz import get_stage_rubric
-from .utils import extract_json_from_llm, normalize_enum_name
+from .services.training_answer_cache import get_training_answer_cache, normalize_question
+from .utils import extract_json_from_llm
 
 logger = logging.getLogger(__name__)
 
@@ -124,22 +126,64 @@ COACH_STYLES = {
 }
 
 
-def answer_training_question(provider, flow_engine, question, style: str = "tactical"):
-    """Answer a trainee's question about the current conversation and sales techniques"""
+# Questions about technique in general ("what is a trial close?") get the same
+# answer in every conversation; anything pointing at the exchange does not
+_TECHNIQUE_QUESTION = re.compile(
+    r"^(?:(?:can|could) you |please )?"
+    r"(?:what (?:is|are|s|does|do)|explain|define|tell me about|why (?:is|are|does|do)|how (?:does|do)(?= .+ work$))\b"
+)
+_CONVERSATION_WORDS = frozenset({
+    "i", "me", "my", "we", "us", "our", "they", "them", "their", "he", "she", "him", "her",
+    "it", "prospect", "customer", "client", "buyer", "bot", "this", "that", "these", "here", "now", "next",
+    "just", "said", "say", "saying", "reply", "response", "conversation", "chat",
+})
+
+
+def _is_technique_question(question: str) -> bool:
+    """True if the question can be answered without the conversation transcript."""
+    normalized = normalize_question(question)
+    lead = _TECHNIQUE_QUESTION.match(normalized)
+    return lead is not None and _CONVERSATION_WORDS.isdisjoint(normalized[lead.end():].split())
+
+
+def answer_training_question(
+    provider, flow_engine, question, style: str = "tactical", product_type=None, use_cache: bool = True
+):
+    """Answer a trainee's question about the current conversation and sales techniques.
+
+    General technique questions are answered without the transcript, and
+    paraphrases of one already answered for the same product, stage, strategy
+    and style are served from the near-duplicate answer cache. Questions about
+    the conversation itself always get a fresh answer.
+    """
     stage, flow_type = flow_engine.current_stage, flow_engine.flow_type
+    if style not in COACH_STYLES:
+        logger.warning("Unknown coach style %r, defaulting to tactical", style)
+        style = "tactical"
+
+    answer_cache = get_training_answer_cache()
+    bucket = None
+    if _is_technique_question(question):
+        bucket = answer_cache.bucket_key(product_type, stage, flow_type, style)
+    if use_cache and bucket is not None:
+        cached = answer_cache.lookup(bucket, question)
+        if cached is not None:
+            return {"answer": cached[0], "cached": True}
+
     rubric = get_stage_rubric(stage, flow_type)
 
-    history = getattr(flow_engine, "conversation_history", []) or []
-    recent = "\n".join(f"{message.get('role', '').upper()}: {message.get('content', '')}" for message in history[-8:])
+    if bucket is None:
+        history = getattr(flow_engine, "conversation_history", []) or []
+        recent = "\n".join(f"{message.get('role', '').upper()}: {message.get('content', '')}" for message in history[-8:])
+        context = f"Recent: {recent}"
+    else:
+        context = "The question is about technique in general; answer without referring to this conversation."
 
     methodology = (
         "NEPQ (Neuro-Emotional Persuasion Questioning)"
         if flow_type == "consultative"
         else "NEEDS -> MATCH -> CLOSE"
     )
-    if style not in COACH_STYLES:
-        logger.warning("Unknown coach style %r, defaulting to tactical", style)
-        style = "tactical"
     style_guide = COACH_STYLES[style]
     concepts = ", ".join(rubric.get("key_concepts", []))
 
@@ -147,7 +191,7 @@ def answer_training_question(provider, flow_engine, question, style: str = "tact
         f"You're a sales coach. Trainee is practising {flow_type} using {methodology}.\n"
         f"Stage: {stage} - Goal: {rubric.get('goal', '')}\n"
         f"Advance when: {rubric.get('advance_when', '')} | Concepts: {concepts}\n\n"
-        f"Recent: {recent}\n\n{style_guide}"
+        f"{context}\n\n{style_guide}"
     )
 
     try:
@@ -158,11 +202,12 @@ def answer_training_question(provider, flow_engine, question, style: str = "tact
             max_tokens=150,
             stage=stage,
         )
-        answer = (
-            response.content.strip()
-            if response.content and not response.error
-            else "Couldn't get an answer that time - try asking differently."
-        )
+        if response.content and not response.error:
+            answer = response.content.strip()
+            if bucket is not None:
+                answer_cache.store(bucket, question, answer)
+        else:
+            answer = "Couldn't get an answer that time - try asking differently."
         return {"answer": answer}
     except Exception as error:
         logger.warning(f"Training Q&A fell back to generic answer: {error}")
@@ -171,47 +216,22 @@ def answer_training_question(provider, flow_engine, question, style: str = "tact
 
 def score_session(session_id: str) -> dict:
     """Score a session based on the F1 Post-session scoring rubric"""
-    events = SessionAnalytics.get_session_analytics(session_id)
-    if not events:
+    aggregate = SessionAnalytics.get_session_aggregate(session_id)
+    if not aggregate:
         return {"total_score": 0, "breakdown": {}}
 
-    # Initialize accumulators
-    stages_reached, score_breakdown = set(), {
+    # Totals are accumulated as events are recorded
+    score_breakdown = {
         category_key: 0
         for category_key in ["stage_progression", "signal_detection", "objection_handling",
                              "questioning_depth", "conversation_length"]
     }
-    total_transitions = signal_transitions = intent_medium_high_count = max_turn = 0
-    objection_handled = False
-
-    # Single pass through events
-    for event in events:
-        event_type = event.get("event_type") or event.get("type")
-        turn = max(event.get("user_turn") or 0, event.get("user_turn_count") or 0)
-        max_turn = max(max_turn, turn)
-
-        if event_type == "stage_transition":
-            to_stage = normalize_enum_name(event.get("to_stage"))
-            from_stage = normalize_enum_name(event.get("from_stage", ""))
-            turns_in_stage = event.get("user_turns_in_stage")
-
-            if to_stage:
-                stages_reached.add(to_stage)
-
-            total_transitions += 1
-
-            # Signal-gated transition (didn't timeout in stage)
-            if isinstance(turns_in_stage, int) and 0 <= turns_in_stage < STAGE_TIMEOUTTHRESHOLDS.get(from_stage, 99):
-                signal_transitions += 1
-
-        elif event_type == "objection_classified":
-            objection_handled = True
-        elif event_type == "intent_classification" and event.get("intent_level") in ["medium", "high"]:
-            intent_medium_high_count += 1
-        elif event_type == "session_end":
-            final_stage = normalize_enum_name(event.get("final_stage"))
-            if final_stage:
-                stages_reached.add(final_stage)
+    stages_reached = aggregate["stages_reached"]
+    total_transitions = aggregate["total_transitions"]
+    signal_transitions = aggregate["signal_transitions"]
+    intent_medium_high_count = aggregate["intent_medium_high_count"]
+    objection_handled = aggregate["objection_handled"]
+    max_turn = aggregate["max_turn"]
 
     # Compute scores
     score_breakdown["stage_progression"] = max(
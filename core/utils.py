@@ -2,6 +2,7 @@
 
 import json
 import re
+import string
 from bisect import bisect
 from enum import Enum
 from functools import lru_cache
@@ -122,3 +123,48 @@ def normalize_enum_name(value) -> str:
         return ""
     text = str(value)
     return text.split(".")[-1].lower() if text else ""
+
+
+def _format_field(value, spec: str, conversion: str | None) -> str:
+    if conversion == "r":
+        value = repr(value)
+    elif conversion == "s":
+        value = str(value)
+    elif conversion == "a":
+        value = ascii(value)
+    return format(value, spec)
+
+
+class CompiledTemplate:
+    """A str.format template with its static fields rendered once.
+
+    Only the named slots are filled per render; everything else is joined
+    into literal segments at compile time. Unknown static fields raise
+    KeyError, as str.format would.
+    """
+
+    __slots__ = ("parts",)
+
+    def __init__(self, template: str, static: dict, slots):
+        slots = frozenset(slots)
+        parts: list = []
+        literal: list[str] = []
+        for text, name, spec, conversion in string.Formatter().parse(template):
+            literal.append(text)
+            if name is None:
+                continue
+            if name in slots:
+                parts.append("".join(literal))
+                literal = []
+                parts.append((name, spec or "", conversion))
+            else:
+                literal.append(_format_field(static[name], spec or "", conversion))
+        parts.append("".join(literal))
+        self.parts = tuple(part for part in parts if part != "")
+
+    def render(self, **values) -> str:
+        """Fill the slots and return the full text."""
+        return "".join(
+            part if isinstance(part, str) else _format_field(values[part[0]], part[1], part[2])
+            for part in self.parts
+        )
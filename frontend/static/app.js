@@ -2363,6 +2363,30 @@ function addProspectMessage(text, sender, metrics = null) {
   appendChatMessage(text, sender, metrics, { updateCache: false });
 }
 
+function showProspectCoachingHint(coaching) {
+  if (!coaching || !coaching.hint) return;
+  document.getElementById("prospectCoachingHint").textContent = coaching.hint;
+  document.getElementById("prospectCoachingSection").style.display = "";
+}
+
+function pollProspectCoachingHint(turn) {
+  const sessionId = _prospectSessionId;
+  fetch("/api/prospect/hint?wait=10", {
+    headers: { "X-Session-ID": sessionId },
+  })
+    .then((r) => r.json())
+    .then((data) => {
+      // Ignore hints for an older turn or a session that has since been reset
+      if (sessionId !== _prospectSessionId || data.turn !== turn) return;
+      if (data.pending) {
+        pollProspectCoachingHint(turn);
+      } else if (_prospectSettings.showHints) {
+        showProspectCoachingHint(data.coaching);
+      }
+    })
+    .catch(() => {});
+}
+
 function sendProspectMessage() {
   // Guard: ensure prospect session exists
   if (!_prospectSessionId) {
@@ -2420,9 +2444,10 @@ function sendProspectMessage() {
 
       // Show coaching hint if enabled
       if (data.coaching && _prospectSettings.showHints) {
-        document.getElementById("prospectCoachingHint").textContent =
-          data.coaching.hint;
-        document.getElementById("prospectCoachingSection").style.display = "";
+        showProspectCoachingHint(data.coaching);
+      } else if (data.coaching_pending && _prospectSettings.showHints) {
+        // Hint is generated alongside the reply; fetch it once it's ready
+        pollProspectCoachingHint(data.hint_turn);
       } else if (_prospectSettings.showHints) {
         document.getElementById("prospectCoachingHint").textContent =
           "Hints will appear after the next prospect reply.";
@@ -2,6 +2,8 @@
 import sys
 from pathlib import Path
 
+import pytest
+
 
 ROOT = Path(__file__).resolve().parent.parent
 if str(ROOT) not in sys.path:
@@ -15,3 +17,17 @@ def pytest_configure(config):
     # Keep pytest-randomly out of the way in this environment.
     if hasattr(config.option, "randomly_reset_seed"):
         config.option.randomly_reset_seed = False
+
+
+@pytest.fixture(autouse=True)
+def _isolate_llm_response_caches():
+    """Stub providers share class names across tests; never serve one test's reply to another."""
+    from core.services.llm_cache import get_llm_response_cache
+    from core.services.training_answer_cache import get_training_answer_cache
+
+    caches = (get_llm_response_cache(), get_training_answer_cache())
+    for cache in caches:
+        cache.clear()
+    yield
+    for cache in caches:
+        cache.clear()
@@ -0,0 +1,144 @@
+"""Tests for columnar analytics tables and the reports computed over them."""
+import json
+
+import numpy as np
+import pytest
+
+from core.analytics import reports
+from core.analytics.columnar import ColumnarTable, ColumnarWriter
+
+
+def _write_jsonl(path, rows):
+    with open(path, "a", encoding="utf-8") as f:
+        for row in rows:
+            f.write(json.dumps(row) + "\n")
+
+
+def _metric(provider, stage, latency, ts="2026-04-09T12:00:00"):
+    return {"timestamp": ts, "session_id": "s", "stage": stage, "strategy": "consultative",
+            "provider": provider, "model": "m", "latency_ms": latency, "user_msg_len": 5, "bot_resp_len": 10}
+
+
+def test_convert_is_incremental_and_skips_partial_lines(tmp_path):
+    source = tmp_path / "metrics.jsonl"
+    table_dir = tmp_path / "metrics"
+    _write_jsonl(source, [_metric("groq", "intent", 100.0), _metric("groq", "pitch", 300.0)])
+    with open(source, "a", encoding="utf-8") as f:
+        f.write('{"provider": "half')
+
+    assert reports.convert_jsonl(source, table_dir, kind="metrics") == 2
+    assert reports.convert_jsonl(source, table_dir, kind="metrics") == 0
+
+    with open(source, "a", encoding="utf-8") as f:
+        f.write('"}\n')
+    _write_jsonl(source, [_metric("sambanova", "intent", 50.0)])
+
+    assert reports.convert_jsonl(source, table_dir, kind="metrics") == 2
+    table = ColumnarTable(table_dir)
+    assert len(table) == 4
+    assert list(table.decode("provider")) == ["groq", "groq", "half", "sambanova"]
+    assert table.dictionary("provider") == ["groq", "half", "sambanova"]
+    assert np.isnan(table.column("latency_ms")[2])
+
+
+def test_append_after_torn_write_keeps_rows_aligned(tmp_path):
+    columns = [("name", "str"), ("count", "i8"), ("score", "f8")]
+    writer = ColumnarWriter(tmp_path / "t", columns)
+    writer.append([{"name": "a", "count": 1, "score": 0.5}])
+    # a crash mid-append: one column got a whole row, another half a value, a dictionary half a line
+    with open(tmp_path / "t" / "count.col", "ab") as f:
+        f.write(np.array([2], dtype="<i8").tobytes())
+    with open(tmp_path / "t" / "score.col", "ab") as f:
+        f.write(b"\x00\x01\x02")
+    with open(tmp_path / "t" / "name.dict", "ab") as f:
+        f.write(b'"ha')
+    assert len(ColumnarTable(tmp_path / "t")) == 1
+
+    ColumnarWriter(tmp_path / "t", columns).append([{"name": "b", "count": 3, "score": 1.5}])
+
+    table = ColumnarTable(tmp_path / "t")
+    assert len(table) == 2
+    assert list(table.decode("name")) == ["a", "b"]
+    assert list(table.column("count")) == [1, 3]
+    assert list(table.column("score")) == [0.5, 1.5]
+    assert {p.name: p.stat().st_size for p in (tmp_path / "t").glob("*.col")} == {
+        "name.col": 8, "count.col": 16, "score.col": 16,
+    }
+
+
+def test_latency_percentiles_match_a_direct_computation(tmp_path):
+    rng = np.random.default_rng(7)
+    groq = rng.gamma(2.0, 300.0, size=200)
+    samba = rng.gamma(2.0, 900.0, size=50)
+    rows = [_metric("groq", "intent" if i % 2 else "pitch", float(v)) for i, v in enumerate(groq)]
+    rows += [_metric("sambanova", "intent", float(v)) for v in samba]
+    ColumnarWriter(tmp_path / "m", reports.METRIC_COLUMNS).append(rows)
+
+    result = reports.latency_percentiles(ColumnarTable(tmp_path / "m"), ("provider",), percentiles=(50, 95))
+
+    assert [row["provider"] for row in result] == ["groq", "sambanova"]
+    assert result[0]["count"] == 200
+    assert result[0]["p95_ms"] == round(float(np.percentile(groq, 95)), 1)
+    assert result[1]["p50_ms"] == round(float(np.percentile(samba, 50)), 1)
+    by_stage = reports.latency_percentiles(ColumnarTable(tmp_path / "m"), ("provider", "stage"))
+    assert {(row["provider"], row["stage"]): row["count"] for row in by_stage} == {
+        ("groq", "intent"): 100,
+        ("groq", "pitch"): 100,
+        ("sambanova", "intent"): 50,
+    }
+
+
+@pytest.fixture
+def events_table(tmp_path):
+    def event(session, event_type, ts="2026-04-09T12:00:00", **payload):
+        return {"timestamp": ts, "session_id": session, "event_type": event_type, **payload}
+
+    rows = [
+        event("a", "session_start"),
+        event("a", "stage_transition", from_stage="intent", to_stage="logical"),
+        event("a", "stage_transition", from_stage="Stage.LOGICAL", to_stage="pitch"),
+        event("a", "strategy_switch", from_strategy="intent", to_strategy="Strategy.CONSULTATIVE",
+              reason="signal_detection"),
+        event("b", "session_start"),
+        event("b", "stage_transition", from_stage="intent", to_stage="logical"),
+        event("b", "strategy_switch", from_strategy="intent", to_strategy="consultative",
+              reason="signal_detection"),
+        event("c", "session_start", ts="2026-04-20T12:00:00"),
+        event("c", "session_end", final_stage="intent", ts="2026-04-20T12:00:00"),
+    ]
+    ColumnarWriter(tmp_path / "events", reports.EVENT_COLUMNS).append(rows)
+    return ColumnarTable(tmp_path / "events")
+
+
+def test_stage_funnel_counts_distinct_sessions_per_stage(events_table):
+    funnel = reports.stage_funnel(events_table, stages=["intent", "logical", "pitch"])
+
+    assert funnel["sessions"] == 3
+    assert [(row["stage"], row["sessions"]) for row in funnel["stages"]] == [
+        ("intent", 3),
+        ("logical", 2),
+        ("pitch", 1),
+    ]
+    assert funnel["stages"][2]["from_previous"] == 0.5
+
+
+def test_strategy_switch_rates_merge_enum_spellings_and_respect_window(events_table):
+    switches = reports.strategy_switch_rates(events_table)
+
+    assert switches["sessions"] == 3
+    assert switches["sessions_switched"] == 2
+    assert switches["transitions"] == [{"from_strategy": "intent", "to_strategy": "consultative", "count": 2}]
+    assert reports.strategy_switch_rates(events_table, since="2026-04-15")["switch_rate"] == 0.0
+    assert reports.stage_funnel(events_table, until="2026-04-15")["sessions"] == 2
+
+
+def test_cli_converts_and_reports(tmp_path, capsys):
+    source = tmp_path / "analytics.jsonl"
+    _write_jsonl(source, [{"timestamp": "2026-04-09T12:00:00", "session_id": "x", "type": "session_start"}])
+
+    assert reports.main(["convert", str(source), str(tmp_path / "ev")]) == 0
+    assert reports.main(["report", "--events", str(tmp_path / "ev")]) == 0
+
+    report = json.loads(capsys.readouterr().out)
+    assert report["funnel"]["sessions"] == 1
+    assert "latency_by_provider" not in report
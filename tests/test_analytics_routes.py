@@ -209,3 +209,38 @@ def test_analytics_summary_is_public(monkeypatch):
 
     assert response.status_code == 200
     assert response.get_json()["success"] is True
+
+
+def test_admin_reports_read_the_columnar_tables(monkeypatch, tmp_path):
+    from core.analytics import reports
+    from core.analytics.columnar import ColumnarWriter
+
+    app = _make_analytics_app(monkeypatch)
+    client = app.test_client()
+    monkeypatch.setenv("ANALYTICS_SPILL_DIR", str(tmp_path / "events"))
+    monkeypatch.setenv("METRICS_COLUMNAR_DIR", str(tmp_path / "metrics"))
+
+    assert client.get("/api/admin/analytics/switches").status_code == 404
+
+    ColumnarWriter(tmp_path / "metrics", reports.METRIC_COLUMNS).append(
+        [{"timestamp": 1000.0 + i, "provider": "groq", "stage": "intent", "latency_ms": float(i)} for i in range(10)]
+    )
+    latency = client.get("/api/admin/analytics/latency?by=provider,stage&since=1005")
+    report = client.get("/api/admin/analytics/report")
+
+    assert latency.status_code == 200
+    assert latency.get_json()["result"][0]["count"] == 5
+    assert report.get_json()["result"]["latency_by_provider"][0]["p50_ms"] == 4.5
+    assert "funnel" not in report.get_json()["result"]
+    assert client.get("/api/admin/analytics/latency?by=latency_ms").status_code == 400
+    assert client.get("/api/admin/analytics/latency?since=yesterday").status_code == 400
+
+
+def test_admin_reports_require_the_admin_token(monkeypatch):
+    app = _make_analytics_app(monkeypatch, testing=False)
+    monkeypatch.setenv("ADMIN_TOKEN", "secret-token")
+    client = app.test_client()
+
+    assert client.get("/api/admin/analytics/report").status_code == 403
+    response = client.get("/api/admin/analytics/report", headers={"X-Admin-Token": "secret-token"})
+    assert response.status_code != 403
@@ -164,3 +164,45 @@ def test_training_ask_rejects_missing_question(monkeypatch):
 
     assert response.status_code == 400
     assert response.get_json()["error"] == "Question required"
+
+
+def test_chat_route_coalesces_double_submit_for_same_session(monkeypatch):
+    import threading
+    import time
+
+    from backend.security import get_turn_gate
+
+    gate = get_turn_gate("chat")
+    coalesced_before = gate.coalesced_count
+    started = threading.Event()
+    release = threading.Event()
+
+    class _SlowBot(_DummyBot):
+        def chat(self, message):
+            started.set()
+            release.wait(5)
+            return super().chat(message)
+
+    app, bot = _make_chat_app(monkeypatch, bot=_SlowBot())
+    headers = {"X-Session-ID": "double-submit-1"}
+    responses = []
+
+    def submit():
+        responses.append(app.test_client().post("/api/chat", json={"message": "Hi"}, headers=headers))
+
+    first = threading.Thread(target=submit)
+    first.start()
+    started.wait(5)
+    second = threading.Thread(target=submit)
+    second.start()
+    deadline = time.monotonic() + 5
+    while gate.coalesced_count == coalesced_before and time.monotonic() < deadline:
+        time.sleep(0.005)
+    release.set()
+    first.join(5)
+    second.join(5)
+
+    assert [response.status_code for response in responses] == [200, 200]
+    assert {response.get_json()["message"] for response in responses} == {"reply:Hi"}
+    assert bot.training_calls == [("Hi", "reply:Hi")]
+    assert len(bot.flow_engine.conversation_history) == 4
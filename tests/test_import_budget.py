@@ -0,0 +1,42 @@
+"""Worker cold-start budget, measured with `python -X importtime` in a fresh interpreter."""
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# Cumulative import time of core.chatbot in microseconds. Measured ~160ms on a
+# dev container after deferring the Groq SDK and using libyaml (was ~460ms);
+# the budget leaves headroom for slower CI machines.
+CHATBOT_IMPORT_BUDGET_US = 350_000
+
+
+def _importtime(statement: str) -> tuple[dict[str, int], str]:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    cumulative = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        if cumulative_us.strip().isdigit():
+            cumulative[name.strip()] = int(cumulative_us)
+    return cumulative, result.stdout
+
+
+def test_chatbot_import_stays_within_budget_and_defers_optional_work():
+    cumulative, stdout = _importtime(
+        "import sys, core.chatbot, core.objection; "
+        "print(core.objection._PATHWAY_CONFIG is None, 'groq' in sys.modules, 'numpy' in sys.modules)"
+    )
+
+    assert stdout.split() == ["True", "False", "False"]
+    assert cumulative["core.chatbot"] < CHATBOT_IMPORT_BUDGET_US, (
+        f"core.chatbot import took {cumulative['core.chatbot'] / 1000:.0f}ms "
+        f"(budget {CHATBOT_IMPORT_BUDGET_US / 1000:.0f}ms)"
+    )
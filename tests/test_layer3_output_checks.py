@@ -1,6 +1,9 @@
 """Tests for LAYER 3 response guardrails."""
-from core.response_guardrails import apply_layer3_output_checks
-from core.utils import Stage, Strategy
+import pytest
+
+from core.loader import load_guardrail_rules
+from core.response_guardrails import GuardrailEngine, apply_layer3_output_checks
+from core.utils import Stage, Strategy, contains_nonnegated_keyword
 
 
 def test_layer3_blocks_pricing_in_logical_stage_without_direct_request():
@@ -164,3 +167,62 @@ def test_layer3_preserves_consequence_of_inaction_language_in_emotional_stage():
     assert result.was_blocked is False
     assert result.was_corrected is False
     assert "cost of staying the same" in result.content.lower()
+
+
+def test_layer3_reports_per_rule_timings():
+    result = apply_layer3_output_checks(
+        reply_text="Our packages start at £200 per month. What outcome matters most to your team right now?",
+        stage=Stage.LOGICAL,
+        user_message="We are still reviewing options.",
+        timed=True,
+    )
+
+    assert result.applied_rules == ["corrected_pricing_in_discovery"]
+    assert {"empty_output", "oversized_output", "scan", "pricing_in_discovery"} <= set(result.rule_timings_ms)
+    assert all(ms >= 0 for ms in result.rule_timings_ms.values())
+    assert apply_layer3_output_checks("Our packages start at £200 per month.", Stage.LOGICAL, "").rule_timings_ms == {}
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "We don't talk about price yet.",
+        "No, never any cost here.",
+        "There is not really a fee. But the cost is real.",
+        "It costs a$5 fee and per month billing.",
+        "Didnt mention budget, payment or the monthly plan",
+    ],
+)
+def test_engine_negation_matches_contains_nonnegated_keyword(text):
+    engine = GuardrailEngine(load_guardrail_rules())
+    keywords = load_guardrail_rules()["keyword_sets"]["pricing"]
+    scanned = engine.scan(text)
+
+    assert scanned.has("pricing") == contains_nonnegated_keyword(text.lower(), keywords)
+    for start, end in scanned.sentences:
+        assert scanned.has("pricing", (start, end)) == contains_nonnegated_keyword(text[start:end].lower(), keywords)
+
+
+def test_engine_compiles_custom_rule_sets():
+    engine = GuardrailEngine(
+        {
+            "keyword_sets": {"competitor": ["acme", "globex"]},
+            "rules": [
+                {"id": "competitors", "when": "competitor", "stages": ["pitch"], "action": "strip", "label": "no_competitors"},
+            ],
+        }
+    )
+
+    result = engine.check(
+        "Acme charges more for less. Our onboarding takes a single afternoon with your team.",
+        Stage.PITCH,
+        "Tell me more.",
+    )
+
+    assert result.was_corrected is True
+    assert result.applied_rules == ["no_competitors"]
+    assert result.content == "Our onboarding takes a single afternoon with your team."
+    assert engine.check("Acme is fine.", Stage.INTENT, "").applied_rules == []
+
+    with pytest.raises(ValueError):
+        GuardrailEngine({"rules": [{"id": "bad", "when": "competitor", "action": "strip"}]})
@@ -0,0 +1,124 @@
+"""Tests for the content-addressed LLM response cache."""
+import json
+
+from core.prospect_session import ProspectState
+from core.providers.base import LLMResponse
+from core.services.llm_cache import LLMResponseCache, cached_chat
+import core.prospect_evaluator as evaluator
+import core.quiz as quiz
+
+
+class _CountingProvider:
+    provider_name = "probe"
+
+    def __init__(self, content="{}", model="probe-model", error=None):
+        self.content = content
+        self.model = model
+        self.error = error
+        self.calls = 0
+
+    def get_model_name(self):
+        return self.model
+
+    def chat(self, messages, temperature=0.3, max_tokens=300):
+        self.calls += 1
+        return LLMResponse(content=self.content, error=self.error)
+
+
+def test_identical_prompts_hit_cache_after_whitespace_normalization():
+    provider = _CountingProvider(content="graded")
+
+    first = cached_chat(provider, [{"role": "system", "content": "Grade  this\nanswer"}], temperature=0.3, max_tokens=300)
+    second = cached_chat(provider, [{"role": "system", "content": "Grade this answer "}], temperature=0.3, max_tokens=300)
+
+    assert first.content == second.content == "graded"
+    assert provider.calls == 1
+
+
+def test_key_separates_model_and_temperature():
+    provider = _CountingProvider(content="graded")
+    messages = [{"role": "system", "content": "Grade"}]
+
+    cached_chat(provider, messages, temperature=0.3, max_tokens=300)
+    cached_chat(provider, messages, temperature=0.2, max_tokens=300)
+    provider.model = "other-model"
+    cached_chat(provider, messages, temperature=0.3, max_tokens=300)
+
+    assert provider.calls == 3
+
+
+def test_bypass_hot_temperature_and_errors_are_not_cached():
+    provider = _CountingProvider(content="graded")
+    messages = [{"role": "system", "content": "Grade"}]
+
+    cached_chat(provider, messages, temperature=0.3, max_tokens=300, use_cache=False)
+    cached_chat(provider, messages, temperature=0.9, max_tokens=300)
+    cached_chat(provider, messages, temperature=0.9, max_tokens=300)
+    assert provider.calls == 3
+
+    failing = _CountingProvider(content="", error="rate limited")
+    cached_chat(failing, messages, temperature=0.3, max_tokens=300)
+    cached_chat(failing, messages, temperature=0.3, max_tokens=300)
+    assert failing.calls == 2
+
+
+def test_lru_eviction_and_ttl_expiry(monkeypatch):
+    cache = LLMResponseCache(max_entries=2, ttl_seconds=10)
+    now = [1000.0]
+    monkeypatch.setattr("core.services.llm_cache.time.time", lambda: now[0])
+
+    cache.put("a", "A")
+    cache.put("b", "B")
+    assert cache.get("a") == "A"
+    cache.put("c", "C")  # evicts least-recently-used "b"
+
+    assert cache.get("b") is None
+    now[0] += 11
+    assert cache.get("a") is None
+
+    stats = cache.stats()
+    assert stats["evictions"] == 1
+    assert stats["expirations"] == 1
+    assert stats["hits"] == 1
+    assert stats["misses"] == 2
+
+
+def test_sqlite_tier_survives_a_fresh_memory_tier(tmp_path):
+    db_path = str(tmp_path / "llm_cache.sqlite3")
+    LLMResponseCache(sqlite_path=db_path).put("key", "stored reply")
+
+    fresh = LLMResponseCache(sqlite_path=db_path)
+
+    assert fresh.get("key") == "stored reply"
+    assert fresh.stats()["disk_hits"] == 1
+
+
+def test_quiz_and_prospect_evaluation_reuse_cached_scoring(monkeypatch):
+    provider = _CountingProvider(content=json.dumps({"score": 70, "alignment": "strong"}))
+
+    quiz.test_quiz_next_move("What's driving that?", provider, "logical", "consultative")
+    quiz.test_quiz_next_move("What's driving that?", provider, "logical", "consultative")
+    assert provider.calls == 1
+
+    quiz.test_quiz_next_move("What's driving that?", provider, "logical", "consultative", use_cache=False)
+    assert provider.calls == 2
+
+    monkeypatch.setattr(
+        evaluator,
+        "load_prospect_config",
+        lambda: {
+            "prospect_mode": {"scoring_enabled": True},
+            "evaluation": {"criteria": {"needs_discovery": {"weight": 1.0, "description": "Discovery"}}},
+        },
+    )
+    evaluation_provider = _CountingProvider(
+        content=json.dumps({"criteria_scores": {"needs_discovery": {"score": 80, "feedback": "ok"}}})
+    )
+    history = [{"role": "user", "content": "What made you look at this now?"}]
+    state = ProspectState(readiness=0.4, difficulty="easy", product_type="default")
+
+    first = evaluator.evaluate_prospect_session(evaluation_provider, history, state, "ctx")
+    second = evaluator.evaluate_prospect_session(evaluation_provider, history, state, "ctx")
+
+    assert first == second
+    assert evaluation_provider.calls == 1
@@ -1,6 +1,16 @@
 """Tests for objection pathway configuration and validation."""
+import random
+
 from backend.security import SessionSecurityManager
-from core.objection import analyse_objection_pathway, validate_pathway_config
+from core import objection
+from core.flow import SalesFlowEngine
+from core.objection import (
+    ObjectionTracker,
+    _count_objection_attempts,
+    _count_reframe_usages,
+    analyse_objection_pathway,
+    validate_pathway_config,
+)
 
 
 def test_pathway_config_validates_cleanly():
@@ -43,3 +53,75 @@ def test_background_cleanup_is_idempotent(monkeypatch):
     manager.start_background_cleanup()
 
     assert len(started) == 1
+
+
+_USER_LINES = [
+    "It is too expensive for me",
+    "I need to talk to my wife first",
+    "Sounds good",
+    "I'm worried it won't work",
+    "Let me think about it",
+]
+_BOT_LINES = [
+    "Fair enough. reframe_change_of_process - what changes if you wait?",
+    "Understood. reframe_identity_loop",
+    "What would make this feel safe?",
+    "reframe_island_mountain and reframe_change_of_process together.",
+]
+
+
+def test_tracker_matches_full_history_scans_as_turns_are_added():
+    rng = random.Random(4)
+    engine = SalesFlowEngine("consultative", "product")
+    reframes = ["change_of_process", "island_mountain", "identity_loop", "not_configured"]
+
+    for _ in range(25):
+        engine.add_turn(rng.choice(_USER_LINES), rng.choice(_BOT_LINES))
+        history = engine.conversation_history
+        tracker = engine.objections
+
+        assert tracker.reframe_usages(reframes, history) == _count_reframe_usages(reframes, history)
+        for obj_type in ("money", "partner", "fear", "think"):
+            assert tracker.objection_attempts(history, obj_type) == _count_objection_attempts(history, obj_type)
+
+
+def test_tracker_rereads_replaced_or_truncated_history():
+    engine = SalesFlowEngine("consultative", "product")
+    engine.add_turn("It is too expensive", "reframe_identity_loop")
+    engine.add_turn("Okay", "Sure")
+    assert engine.objections.objection_attempts(engine.conversation_history, "money") == 2
+
+    engine.conversation_history = engine.conversation_history[:2]  # rewind
+
+    assert engine.objections.objection_attempts(engine.conversation_history, "money") == 1
+    assert engine.objections.reframe_usages(["identity_loop"], engine.conversation_history) == {"identity_loop": 1}
+
+    engine.reset_to_initial()
+
+    assert engine.objections.objection_attempts(engine.conversation_history, "money") == 0
+    assert engine.objections.user_turns == 0
+
+
+def test_tracker_classifies_each_user_turn_once(monkeypatch):
+    calls = []
+    real = objection._get_objection_pathway_safe
+
+    def counting(user_message, history):
+        calls.append(user_message)
+        return real(user_message, history)
+
+    monkeypatch.setattr(objection, "_get_objection_pathway_safe", counting)
+    tracker = ObjectionTracker()
+    history = []
+
+    before = tracker.pathway("It is too expensive", history)
+    history += [{"role": "user", "content": "It is too expensive"}, {"role": "assistant", "content": "I hear you."}]
+    after = tracker.pathway("It is too expensive", history, turn=1)
+
+    assert after is before and before["type"] == "money"
+    assert tracker.last_objection_type == "money"
+    assert calls == ["It is too expensive"]
+
+    # The same words on the next turn are a new classification
+    tracker.pathway("It is too expensive", history)
+    assert len(calls) == 2
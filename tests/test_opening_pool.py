@@ -0,0 +1,126 @@
+"""Tests for the pre-generated prospect opening pool."""
+
+import time
+
+from core.services.opening_pool import (
+    PooledOpening,
+    ProspectOpeningPool,
+    configured_opening_keys,
+)
+
+KEY = ("fitness", "Nina", "hard")
+OTHER = ("fitness", "Nina", "easy")
+
+
+def _generator(calls):
+    def generate(key):
+        calls.append(key)
+        return PooledOpening(f"opening {len(calls)}", "stub", "stub-model", time.monotonic())
+
+    return generate
+
+
+def _wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def test_take_serves_filled_openings_then_misses():
+    calls = []
+    pool = ProspectOpeningPool(_generator(calls), size=2, keys=[KEY])
+    assert pool.fill(KEY) and pool.fill(KEY) and pool.fill(KEY)
+
+    assert [pool.take(KEY).content, pool.take(KEY).content] == ["opening 1", "opening 2"]
+    assert pool.take(KEY) is None
+    assert pool.stats()["hits"] == 2 and pool.stats()["misses"] == 1
+
+
+def test_expired_openings_are_not_served():
+    pool = ProspectOpeningPool(_generator([]), size=2, ttl_seconds=0.0, keys=[KEY])
+    pool.fill(KEY)
+    time.sleep(0.01)
+    assert pool.take(KEY) is None
+
+
+def test_started_pool_warms_and_refills_consumed_keys():
+    calls = []
+    pool = ProspectOpeningPool(_generator(calls), size=2, refill_delay=0.0, keys=[KEY])
+    pool.start([KEY])
+    assert _wait_for(lambda: pool.stats()["ready"] == 2)
+
+    assert pool.take(KEY) is not None
+    assert _wait_for(lambda: pool.stats()["ready"] == 2)
+    assert calls == [KEY, KEY, KEY]
+
+
+def test_started_pool_warms_a_key_on_its_first_take():
+    calls = []
+    pool = ProspectOpeningPool(_generator(calls), size=2, refill_delay=0.0, keys=[KEY, OTHER])
+    pool.start()
+    time.sleep(0.05)
+    assert calls == []
+
+    assert pool.take(KEY) is None
+    assert _wait_for(lambda: pool.stats()["ready"] == 2)
+    assert calls == [KEY, KEY]
+
+
+def test_boot_warm_up_is_opt_in(monkeypatch):
+    from backend import app as app_module
+
+    monkeypatch.delenv("PROSPECT_OPENING_WARM_ON_BOOT", raising=False)
+    assert app_module._opening_keys_to_warm_on_boot() == []
+
+    monkeypatch.setenv("PROSPECT_OPENING_WARM_ON_BOOT", "true")
+    assert app_module._opening_keys_to_warm_on_boot() == configured_opening_keys()
+
+
+def test_failed_generation_leaves_pool_empty():
+    pool = ProspectOpeningPool(lambda key: None, size=2, keys=[KEY])
+    assert pool.fill(KEY) is False
+    assert pool.take(KEY) is None
+
+
+def test_unknown_keys_are_misses_that_never_schedule_generation():
+    calls = []
+    pool = ProspectOpeningPool(_generator(calls), size=1, refill_delay=0.0, keys=[KEY])
+    pool.start([KEY, ("junk", "Alex", "easy")])
+    assert _wait_for(lambda: pool.stats()["ready"] == 1)
+
+    for product_type in ("junk", "../etc", "x" * 200):
+        assert pool.take((product_type, "Alex", "easy")) is None
+    assert pool.fill(("junk", "Alex", "easy")) is False
+    time.sleep(0.1)
+
+    assert calls == [KEY]
+    assert pool.stats()["misses"] == 3
+    assert set(pool._pools) == {KEY}
+
+
+def test_ttl_sweep_refreshes_only_recently_taken_keys():
+    calls = []
+    pool = ProspectOpeningPool(_generator(calls), size=1, ttl_seconds=0.2, refill_delay=0.0, keys=[KEY, OTHER])
+    pool.start([KEY, OTHER])
+    assert _wait_for(lambda: len(calls) == 2)
+
+    pool.take(KEY)
+    time.sleep(0.9)
+
+    assert calls.count(OTHER) == 1
+    assert calls.count(KEY) >= 2
+
+
+def test_default_pool_only_accepts_configured_keys():
+    pool = ProspectOpeningPool(_generator([]), size=1)
+    assert pool.fill(("default", "Alex", "medium")) is True
+    assert pool.fill(("not-a-product", "Alex", "medium")) is False
+
+
+def test_configured_keys_cover_every_persona_and_difficulty():
+    keys = configured_opening_keys()
+    assert ("default", "Alex", "medium") in keys
+    assert {difficulty for _, _, difficulty in keys} == {"easy", "medium", "hard"}
@@ -0,0 +1,82 @@
+"""Tests for next-turn prompt precomputation between chat turns."""
+import random
+
+import pytest
+
+from core.analysis import analyse_history, analyse_state, detect_ack_context
+from core.chatbot import SalesChatbot
+from core.content import generate_stage_prompt, precompute_prompt_context
+from core.utils import Stage
+
+
+def _prompt(*args, **kwargs):
+    # prompts embed randomly chosen examples; fix the choice so builds compare equal
+    random.seed(0)
+    return generate_stage_prompt(*args, **kwargs)
+
+
+HISTORY = [
+    {"role": "user", "content": "I want to buy a car for my family, the old one keeps breaking down"},
+    {"role": "assistant", "content": "That sounds stressful. What matters most in the next one?"},
+    {"role": "user", "content": "Honestly I'm frustrated and worried about reliability and cost"},
+    {"role": "assistant", "content": "Understood. How often does it let you down?"},
+]
+
+
+@pytest.mark.parametrize("history", [[], HISTORY[:2], HISTORY])
+@pytest.mark.parametrize("message", ["", "ok", "no", "What would that cost me per month?", "I'm just browsing really"])
+def test_precomputed_history_signals_match_inline_analysis(history, message):
+    signals = analyse_history(history)
+
+    state = analyse_state(history, message)
+    assert analyse_state(history, message, history_signals=signals) == state
+    assert detect_ack_context(message, history, state, signals) == detect_ack_context(message, history, state)
+
+
+@pytest.mark.parametrize("stage", [Stage.INTENT, Stage.LOGICAL, Stage.EMOTIONAL, Stage.PITCH])
+def test_stage_prompt_is_identical_with_precomputed_context(stage):
+    history = list(HISTORY)
+    context = precompute_prompt_context("consultative", "Cars.", history)
+    message = "Not sure, it mostly just annoys me"
+
+    expected = _prompt("consultative", stage, "Cars.", history, message, include_history=False)
+
+    assert _prompt(
+        "consultative", stage, "Cars.", history, message, include_history=False, prompt_context=context
+    ) == expected
+
+
+def test_stale_precomputed_context_is_ignored():
+    history = list(HISTORY)
+    context = precompute_prompt_context("consultative", "Cars.", history)
+    history.append({"role": "user", "content": "We need seven seats."})
+
+    assert not context.is_current(history)
+    assert not context.is_current(list(history[:4]))
+    assert not precompute_prompt_context("consultative", "Cars.", history).is_current(history, strategy="transactional")
+    assert _prompt(
+        "consultative", Stage.LOGICAL, "Cars.", history, "ok", prompt_context=context
+    ) == _prompt("consultative", Stage.LOGICAL, "Cars.", history, "ok")
+
+
+def test_chat_uses_context_precomputed_after_previous_reply(monkeypatch):
+    bot = SalesChatbot(provider_type="dummy", product_type="default")
+    bot.chat("Hi, we are looking at options for our team")
+
+    context = bot._prompt_precompute.result()
+    assert context.is_current(bot.flow_engine.conversation_history)
+
+    seen = []
+    original = bot.flow_engine.get_current_prompt
+    monkeypatch.setattr(
+        bot.flow_engine,
+        "get_current_prompt",
+        lambda *args, **kwargs: seen.append(kwargs.get("prompt_context")) or original(*args, **kwargs),
+    )
+    bot.chat("Mostly we lose time on manual reporting")
+    assert seen == [context]
+
+    bot._prompt_precompute.result()
+    bot.rewind(1)
+    bot.chat("Actually the main issue is onboarding")
+    assert seen[-1] is None
@@ -0,0 +1,96 @@
+"""Equivalence tests for the vectorised cohort scorer."""
+import json
+import random
+
+import pytest
+
+import core.prospect_batch_evaluator as batch
+import core.prospect_evaluator as evaluator
+from core.loader import load_prospect_config
+from core.prospect_session import ProspectState
+
+_SALES_LINES = [
+    "What made you start looking at this now?",
+    "I understand, that makes sense. How is the team handling it today?",
+    "Based on what you said, I'd recommend the plan that fits your budget.",
+    "ok",
+    "Tell me more about why that matters to you?",
+    "Let's break that down into one step at a time so you can see the case for it.",
+    "We have options. Which one sounds closest?",
+    "I hear you. Fair point about the price.",
+    "Thanks for sharing that, really appreciate it, what would a good outcome look like for you and your partner over the next quarter?",
+]
+_PROSPECT_LINES = [
+    "I'm worried it's too expensive for us.",
+    "Not sure, I need to think about it with my partner.",
+    "Sounds interesting.",
+    "The budget is tight and I have some doubt about the cost.",
+    "Okay, go on.",
+    "İstanbul office wants proof first.",
+]
+
+
+def _random_history(rng):
+    history = []
+    for _ in range(rng.randint(0, 7)):
+        history.append({"role": "assistant", "content": rng.choice(_PROSPECT_LINES)})
+        if rng.random() < 0.85:
+            history.append({"role": "user", "content": rng.choice(_SALES_LINES)})
+    return history
+
+
+@pytest.mark.parametrize("feedback_style", ["coaching", "strict"])
+def test_batch_matches_single_session_evaluator(monkeypatch, feedback_style):
+    config = json.loads(json.dumps(load_prospect_config()))
+    config.setdefault("prospect_mode", {})["feedback_style"] = feedback_style
+    monkeypatch.setattr(evaluator, "load_prospect_config", lambda: config)
+
+    rng = random.Random(7)
+    histories = [_random_history(rng) for _ in range(60)] + [[]]
+    states = [
+        ProspectState(readiness=0.5, has_committed=rng.random() < 0.3, has_walked=rng.random() < 0.3)
+        for _ in histories
+    ]
+    outcomes = [state.status for state in states]
+
+    expected = [
+        evaluator.evaluate_prospect_session(None, history, state, "ctx")
+        for history, state in zip(histories, states)
+    ]
+
+    assert batch.evaluate_transcripts(histories, outcomes, config=config) == expected
+
+
+def test_batch_scores_honour_custom_criteria_keys():
+    criteria = {
+        "needs_discovery": {"weight": 0.5, "description": "Discovery"},
+        "custom_metric": {"weight": 0.5, "description": "Custom"},
+    }
+    histories = [
+        [{"role": "assistant", "content": "Hi"}, {"role": "user", "content": "How can I help you today?"}],
+        [{"role": "assistant", "content": "Hi"}],
+    ]
+
+    assert batch.score_transcripts(histories, criteria) == [
+        evaluator._build_deterministic_criteria_scores(history, criteria) for history in histories
+    ]
+
+
+def test_batch_cli_writes_one_evaluation_per_session(tmp_path, capsys):
+    source = tmp_path / "cohort.jsonl"
+    source.write_text(
+        "\n".join(
+            json.dumps({"session_id": f"s{i}", "conversation_history": history, "outcome": "active"})
+            for i, history in enumerate(
+                [[{"role": "user", "content": "What matters most to you?"}], []]
+            )
+        ),
+        encoding="utf-8",
+    )
+    out = tmp_path / "scored.jsonl"
+
+    assert batch.main([str(source), "--out", str(out)]) == 0
+
+    rows = [json.loads(line) for line in out.read_text(encoding="utf-8").splitlines()]
+    assert [row["session_id"] for row in rows] == ["s0", "s1"]
+    assert "scored 2 sessions" in capsys.readouterr().err
@@ -15,7 +15,7 @@ class _StubProvider:
         self.chat_calls.append(
             {"messages": messages, "temperature": temperature, "max_tokens": max_tokens}
         )
-        return type("Resp", (), {"content": "hello"})()
+        return type("Resp", (), {"content": "hello", "error": None})()
 
     def get_model_name(self):
         return "stub-model"
@@ -93,3 +93,132 @@ def test_prospect_session_product_context_includes_persona_and_custom_data(monke
     assert "--- BEGIN CUSTOM PROSPECT DATA ---" in session.product_context
     assert "product_name: Acme Pro" in session.product_context
     assert "Additional notes: buyer research" in session.product_context
+
+
+def _long_roleplay(turns):
+    history = [{"role": "assistant", "content": "Hi, I'm Nina. Our reporting is a mess."}]
+    for i in range(turns):
+        history.append({"role": "user", "content": f"Question {i}: what matters most to your team about this? " * 3})
+        reply = "That sounds useful. I'm concerned about the price, though." if i == 1 else f"Answer {i} " * 20
+        history.append({"role": "assistant", "content": reply})
+    return history
+
+
+def test_context_window_keeps_recent_turns_verbatim_and_summarizes_older(monkeypatch):
+    # Long role-plays send a bounded prompt: newest turns verbatim, older ones folded into a summary.
+    from core import prospect_context
+
+    monkeypatch.setattr(prospect_context, "PROSPECT_CONTEXT_DEFAULT_BUDGET", 300)
+    window = prospect_context.ProspectContextWindow(
+        {"needs": ["workflow automation"], "pain_points": ["manual reporting"]},
+        ["concerned"],
+    )
+    for readiness in (0.3, 0.25, 0.4, 0.5):
+        window.record_readiness(readiness)
+    history = _long_roleplay(30)
+
+    messages = window.build("SYSTEM", history, "unknown-model")
+
+    assert messages[0]["role"] == "system"
+    assert messages[1]["role"] == "user"
+    assert messages[-1] == history[-1]
+    assert messages[1:] == history[window.folded:]
+    assert sum(prospect_context.estimate_tokens(m["content"]) for m in messages[1:]) <= 300
+    summary = messages[0]["content"]
+    assert summary.startswith("SYSTEM\n\nEARLIER IN THIS CONVERSATION")
+    assert "I'm concerned about the price, though." in summary
+    assert "manual reporting" in summary
+    assert "from 0.30 to 0.50 (low 0.25, high 0.50)" in summary
+
+
+def test_context_window_sends_full_history_under_budget_and_folds_incrementally(monkeypatch):
+    from core import prospect_context
+
+    window = prospect_context.ProspectContextWindow()
+    short = _long_roleplay(2)
+    assert window.build("SYSTEM", short)[1:] == short
+    assert window.folded == 0
+
+    monkeypatch.setattr(prospect_context, "PROSPECT_CONTEXT_DEFAULT_BUDGET", 300)
+    history = _long_roleplay(30)
+    window.build("SYSTEM", history)
+    folded, summary = window.folded, window.summary()
+
+    calls = []
+    monkeypatch.setattr(window, "_fold", lambda message: calls.append(message))
+    window.build("SYSTEM", history)
+    assert calls == []
+    assert window.summary() is summary
+
+    history += [{"role": "user", "content": "One more? " * 40}, {"role": "assistant", "content": "Ok."}]
+    window.build("SYSTEM", history)
+    assert window.folded > folded
+    assert calls == history[folded:window.folded]
+
+
+def test_prospect_session_sends_windowed_history(monkeypatch):
+    stub = _StubProvider()
+    monkeypatch.setattr(prospect_session, "create_provider", lambda *_args, **_kwargs: stub)
+    session = prospect_session.ProspectSession(
+        provider_type="stub", difficulty="hard", persona={"name": "Nina"}
+    )
+    session.max_turns = None
+    session.difficulty_profile = {
+        "behaviour": {**session.difficulty_profile["behaviour"], "patience_turns": 999}
+    }
+    monkeypatch.setattr(session, "_check_end_conditions", lambda: None)
+    session.conversation_history = _long_roleplay(60)
+
+    session.process_turn("Tell me more about what is holding you back?")
+
+    sent = stub.chat_calls[-1]["messages"]
+    assert len(sent) < len(session.conversation_history)
+    assert "EARLIER IN THIS CONVERSATION" in sent[0]["content"]
+    assert sent[-1] == {"role": "user", "content": "Tell me more about what is holding you back?"}
+
+
+def test_compiled_system_prompt_matches_template_and_is_shared(monkeypatch):
+    # The persona section is rendered once and shared; only per-turn slots change.
+    from core.loader import load_prospect_config
+    from core.utils import range_label
+
+    monkeypatch.setattr(prospect_session, "create_provider", lambda *_args, **_kwargs: _StubProvider())
+    persona = load_prospect_config()["personas"]["fitness"][0]
+    first = prospect_session.ProspectSession(product_type="fitness", difficulty="hard", persona=persona)
+    second = prospect_session.ProspectSession(product_type="fitness", difficulty="hard", persona=persona)
+    first.state.readiness, first.state.turn_count, first.state.objections_raised = 0.7, 4, 2
+
+    behaviour = first.difficulty_profile["behaviour"]
+    expected = load_prospect_config()["system_prompt_template"].format(
+        name=persona["name"],
+        background=persona.get("background", ""),
+        personality=persona.get("personality", ""),
+        needs_formatted="\n".join(f"  - {n}" for n in persona.get("needs", [])),
+        pain_points_formatted="\n".join(f"  - {p}" for p in persona.get("pain_points", [])),
+        budget=persona.get("budget", "mid-range"),
+        product_context="fitness",
+        product_knowledge=(
+            "PRODUCT INFORMATION (you may know some of this as a buyer doing research):\n"
+            f"{first.product_context}"
+        ),
+        readiness_description=range_label(
+            0.7, prospect_session.READINESS_THRESHOLDS, prospect_session.READINESS_LABELS
+        ),
+        objections_raised=2,
+        max_objections=behaviour["max_objections"],
+        turn_count=4,
+        behaviour_rules=first.behaviour_rules,
+    )
+
+    assert first._build_system_prompt() == expected
+    assert first._system_prompt is second._system_prompt
+    assert first.behaviour_rules is second.behaviour_rules
+    assert "Turn: 0" in second._build_system_prompt()
+
+
+def test_compiled_template_keeps_format_semantics():
+    from core.utils import CompiledTemplate
+
+    compiled = CompiledTemplate("{{x}} {a!r} {n:03d} {slot:>4}|", {"a": "hi", "n": 7}, ["slot"])
+    assert compiled.render(slot=5) == "{x} 'hi' 007    5|"
+    assert compiled.parts == ("{x} 'hi' 007 ", ("slot", ">4", None), "|")
@@ -1,4 +1,7 @@
 """Tests for prospect session API contract and behavior."""
+import re
+import time
+
 from backend.app import app
 from backend.messages import PROSPECT_SESSION_NOT_FOUND
 from core.providers.base import LLMResponse
@@ -92,6 +95,55 @@ def test_prospect_page_uses_separate_transactional_and_consultative_dropdowns():
     assert "Home Services & Renovation" not in html
 
 
+def test_index_page_is_rebuilt_when_a_referenced_static_file_changes(tmp_path, monkeypatch):
+    import shutil
+
+    from backend import app as app_module
+
+    static = tmp_path / "static"
+    shutil.copytree(app.static_folder, static)
+    monkeypatch.setattr(app, "static_folder", str(static))
+    monkeypatch.setattr(app_module, "_index_pages", app_module.PayloadCache())
+    monkeypatch.setattr(app_module, "_index_static_refs", {})
+    app.config["TESTING"] = True
+    client = app.test_client()
+
+    first = client.get("/prospect")
+    (static / "app.js").write_text((static / "app.js").read_text() + "\n// changed\n")
+    second = client.get("/prospect", headers={"If-None-Match": first.headers["ETag"]})
+
+    assert second.status_code == 200
+    assert second.headers["ETag"] != first.headers["ETag"]
+    old = re.search(r"app\.js\?v=([0-9a-f]{12})", first.get_data(as_text=True)).group(1)
+    new = re.search(r"app\.js\?v=([0-9a-f]{12})", second.get_data(as_text=True)).group(1)
+    assert old != new
+    assert client.get("/prospect", headers={"If-None-Match": second.headers["ETag"]}).status_code == 304
+
+
+def test_index_page_is_etag_cached_with_fingerprinted_static_urls():
+    app.config["TESTING"] = True
+    client = app.test_client()
+
+    first = client.get("/prospect")
+    revalidated = client.get("/prospect", headers={"If-None-Match": first.headers["ETag"]})
+    seller = client.get("/")
+
+    assert first.headers["Cache-Control"] == "no-cache"
+    assert revalidated.status_code == 304
+    assert seller.headers["ETag"] != first.headers["ETag"]
+
+    script = re.search(r'src="(/static/app\.js\?v=[0-9a-f]{12})"', first.get_data(as_text=True))
+    assert script
+    asset = client.get(script.group(1))
+    stale = client.get("/static/app.js?v=000000000000")
+
+    assert asset.status_code == 200
+    assert asset.headers["Cache-Control"] == "public, max-age=31536000, immutable"
+    assert "immutable" not in stale.headers.get("Cache-Control", "")
+    asset.close()
+    stale.close()
+
+
 def test_prospect_init_supports_high_ticket_sales_mentorship(monkeypatch):
     app.config["TESTING"] = True
     client = app.test_client()
@@ -128,3 +180,86 @@ def test_missing_prospect_session_returns_expired_contract():
         "error": PROSPECT_SESSION_NOT_FOUND,
         "code": "SESSION_EXPIRED",
     }
+
+
+def test_prospect_init_uses_pooled_opening_without_llm_call(monkeypatch):
+    from core.services import opening_pool
+
+    app.config["TESTING"] = True
+    client = app.test_client()
+    calls = []
+
+    class CountingProvider(StubProspectProvider):
+        def chat(self, messages, temperature=0.7, max_tokens=150):
+            calls.append(messages)
+            return super().chat(messages, temperature, max_tokens)
+
+    pool = opening_pool.ProspectOpeningPool(
+        lambda key: opening_pool.PooledOpening(f"Pooled hello from {key[1]}.", "stub", "stub-model", time.monotonic()),
+        keys=[("default", "Nina", "easy")],
+    )
+    monkeypatch.setattr(opening_pool, "_pool", pool)
+    monkeypatch.setattr(
+        "core.prospect_session.create_provider",
+        lambda *_args, **_kwargs: CountingProvider(),
+    )
+    persona = {"name": "Nina", "background": "Ops lead", "personality": "Pragmatic"}
+    monkeypatch.setattr("core.prospect_session.select_persona", lambda _product: persona)
+    pool.fill(("default", "Nina", "easy"))
+
+    first = client.post("/api/prospect/init", json={"difficulty": "easy", "product_type": "default"}).get_json()
+    second = client.post("/api/prospect/init", json={"difficulty": "easy", "product_type": "default"}).get_json()
+
+    assert first["message"] == "Pooled hello from Nina."
+    assert first["latency_ms"] == 0.0
+    assert first["persona"]["name"] == "Nina"
+    assert len(calls) == 1  # only the second init, on an empty pool, called the LLM
+    assert second["message"] == "Hi, I'm Alex. I'm looking into options today."
+
+
+def test_prospect_chat_returns_reply_without_waiting_for_hint(monkeypatch):
+    import threading
+
+    app.config["TESTING"] = True
+    client = app.test_client()
+    release_hint = threading.Event()
+    hint_started = threading.Event()
+
+    class SlowHintProvider(StubProspectProvider):
+        def chat(self, messages, temperature=0.7, max_tokens=150):
+            if "sales coach" in messages[0]["content"]:
+                hint_started.set()
+                release_hint.wait(timeout=5)
+                return LLMResponse(content="Ask what matters most to them.")
+            if "Start the conversation naturally" not in messages[-1]["content"]:
+                # The hint call is already in flight while the reply is generated
+                assert hint_started.wait(timeout=5)
+            return super().chat(messages, temperature, max_tokens)
+
+    monkeypatch.setattr(
+        "core.prospect_session.create_provider",
+        lambda *_args, **_kwargs: SlowHintProvider(),
+    )
+    init = client.post("/api/prospect/init", json={"difficulty": "easy", "product_type": "default"}).get_json()
+    headers = {"X-Session-ID": init["session_id"]}
+
+    chat = client.post(
+        "/api/prospect/chat",
+        json={"message": "What would make this worth it for you?", "show_hints": True},
+        headers=headers,
+    ).get_json()
+
+    assert chat["message"] == "Can you tell me a bit more about that?"
+    assert chat["coaching_pending"] is True
+    assert "coaching" not in chat
+    assert client.get("/api/prospect/hint", headers=headers).get_json() == {
+        "success": True,
+        "turn": chat["hint_turn"],
+        "pending": True,
+    }
+
+    release_hint.set()
+    hint = client.get("/api/prospect/hint?wait=5", headers=headers).get_json()
+    assert hint["pending"] is False
+    assert hint["turn"] == chat["hint_turn"]
+    assert hint["coaching"] == {"hint": "Ask what matters most to them."}
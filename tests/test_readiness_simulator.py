@@ -0,0 +1,108 @@
+"""Tests for the Monte Carlo readiness simulator and profile calibration."""
+import json
+
+import numpy as np
+import pytest
+
+from core import readiness_simulator as sim
+from core.loader import load_prospect_config
+from core.prospect_session import ProspectSession, end_condition, readiness_change, score_sales_message
+from core.utils import clamp
+
+
+def _scalar_run(behaviour, ratings, max_turns=None):
+    readiness = float(behaviour["initial_readiness"])
+    for turn, rating in enumerate(ratings, start=1):
+        readiness = clamp(readiness + readiness_change(int(rating), behaviour))
+        outcome = end_condition(readiness, turn, behaviour, max_turns)
+        if outcome:
+            return outcome, turn
+    return "active", 0
+
+
+@pytest.mark.parametrize("max_turns", [None, 8])
+def test_vectorised_trajectories_match_live_session_rules(max_turns):
+    probs = np.array([[0.15, 0.2, 0.3, 0.25, 0.1]])
+    ratings = sim.draw_ratings(probs, trajectories=400, horizon=20, seed=7)
+    names = {sim.ACTIVE: "active", sim.SOLD: "sold", sim.WALKED: "walked"}
+
+    for profile in load_prospect_config()["difficulty_profiles"].values():
+        behaviour = profile["behaviour"]
+        outcome, end_turn = sim.run_trajectories(behaviour, ratings, max_turns)
+        for i in range(ratings.shape[1]):
+            assert (names[int(outcome[i])], int(end_turn[i])) == _scalar_run(behaviour, ratings[:, i], max_turns)
+
+
+def test_session_scores_messages_with_the_shared_function():
+    session = ProspectSession(provider_type="dummy", difficulty="medium")
+    message = "Help me understand what matters most to you?"
+    session.conversation_history.append({"role": "user", "content": message})
+    session.state.turn_count = 1
+
+    assert session._score_sales_message(message) == score_sales_message(message, session.conversation_history, 1)
+
+
+def test_transcript_ratings_replay_each_salesperson_turn():
+    history = [
+        {"role": "assistant", "content": "Hi, I'm looking at options."},
+        {"role": "user", "content": "What are you hoping this will help you with?"},
+        {"role": "assistant", "content": "Saving time mostly."},
+        {"role": "user", "content": "Buy it now."},
+    ]
+
+    ratings = sim.transcript_ratings(history)
+
+    assert ratings == [
+        score_sales_message(history[1]["content"], history[:2], 1),
+        score_sales_message(history[3]["content"], history[:4], 2),
+    ]
+    assert ratings[0] > ratings[1]
+
+
+def test_rating_distribution_falls_back_to_pooled_for_sparse_turns():
+    ratings = [[5, 3]] * 40 + [[5, 3, 1]]
+
+    probs = sim.rating_distribution(ratings, horizon=4, min_samples=30)
+
+    assert probs.shape == (4, 5)
+    assert np.allclose(probs.sum(axis=1), 1.0)
+    assert probs[0, 4] == 1.0 and probs[1, 2] == 1.0
+    # Turn 3 has a single sample, so it uses the pooled distribution
+    assert probs[2, 0] == pytest.approx(1 / 83)
+
+    with pytest.raises(ValueError):
+        sim.rating_distribution([[]])
+
+
+def test_calibrate_recovers_target_outcome_rates():
+    probs = np.array([[0.1, 0.2, 0.3, 0.3, 0.1]])
+    behaviour = dict(load_prospect_config()["difficulty_profiles"]["medium"]["behaviour"])
+    truth = dict(behaviour, readiness_gain_per_good_turn=0.1, readiness_loss_per_bad_turn=0.05)
+    target = sim.simulate(truth, probs, trajectories=20_000, seed=3)
+
+    result = sim.calibrate(
+        behaviour,
+        probs,
+        {"sold_rate": target["sold_rate"], "walked_rate": target["walked_rate"]},
+        trajectories=20_000,
+        seed=3,
+    )
+
+    assert abs(result["achieved"]["sold_rate"] - target["sold_rate"]) < 0.02
+    assert abs(result["achieved"]["walked_rate"] - target["walked_rate"]) < 0.02
+    assert set(result["behaviour"]) == {"readiness_gain_per_good_turn", "readiness_loss_per_bad_turn"}
+
+    with pytest.raises(ValueError):
+        sim.calibrate(behaviour, probs, {"sold_rate": 0.5}, params=["charm"])
+
+
+def test_cli_reports_every_difficulty(tmp_path, capsys):
+    out = tmp_path / "report.json"
+
+    assert sim.main(["--ratings", "0.1,0.2,0.3,0.3,0.1", "--trajectories", "5000", "--out", str(out)]) == 0
+
+    report = json.loads(out.read_text())
+    assert set(report) == set(load_prospect_config()["difficulty_profiles"])
+    for result in report.values():
+        assert result["sold_rate"] + result["walked_rate"] + result["active_rate"] == pytest.approx(1.0, abs=1e-3)
+    assert "sold" in capsys.readouterr().err
@@ -0,0 +1,102 @@
+"""Tests for offline log replay and trajectory diffing."""
+import json
+import logging
+import shutil
+
+from core import replay_runner
+from core.chatbot import SalesChatbot
+from core.loader import CONFIG_DIR
+
+_MESSAGES = [
+    "Hi there, we run a small agency",
+    "It is fine mostly",
+    "We have about ten people",
+    "Yeah that sounds ok",
+]
+
+
+def _record_live_session(caplog, tmp_path, session_id="replay-session-1"):
+    bot = SalesChatbot(provider_type="dummy", product_type="b2b_saas", session_id=session_id)
+    greeting = {
+        "session_id": session_id,
+        "turn_index": 0,
+        "flow_type": bot.flow_engine.flow_type,
+        "current_stage": bot.flow_engine.current_stage,
+        "strategy": bot.flow_engine.flow_type,
+        "user_message": None,
+        "assistant_message": "Hey, what brings you in today?",
+    }
+    bot.flow_engine.conversation_history.append({"role": "assistant", "content": greeting["assistant_message"]})
+    with caplog.at_level(logging.INFO):
+        for message in _MESSAGES:
+            bot.chat(message)
+
+    log_path = tmp_path / "app.log"
+    lines = [f"2026-01-01 INFO conversation_turn {json.dumps(greeting)}"]
+    lines += [
+        f"2026-01-01 INFO {record.getMessage()}"
+        for record in caplog.records
+        if "conversation_turn" in record.getMessage() or "session_snapshot" in record.getMessage()
+    ]
+    lines.append("2026-01-01 INFO unrelated line")
+    log_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return log_path
+
+
+def test_replay_reproduces_recorded_trajectory_without_provider_calls(caplog, tmp_path, monkeypatch):
+    log_path = _record_live_session(caplog, tmp_path)
+    transcripts = replay_runner.collect_transcripts(replay_runner.iter_log_records([log_path]))
+
+    assert len(transcripts) == 1
+    assert transcripts[0].turns[0][0] == _MESSAGES[0]
+    assert transcripts[0].product_type == "b2b_saas"
+
+    def _no_provider_calls(*_args, **_kwargs):
+        raise AssertionError("replay must not call the provider")
+
+    monkeypatch.setattr("core.providers.llm.dummy.DummyProvider.chat", _no_provider_calls)
+    replayed = replay_runner.run_replay(transcripts)
+    recorded = {t.session_id: t.recorded for t in transcripts}
+    report = replay_runner.diff_trajectories(transcripts, recorded, replayed)
+
+    assert report["changed_sessions"] == 0
+    assert report["turns_compared"] == len(_MESSAGES)
+
+
+def test_jsonl_export_keeps_latest_record_per_turn(tmp_path):
+    path = tmp_path / "turns.jsonl"
+    rows = [
+        {"session_id": "s1", "turn_index": 1, "flow_type": "intent", "current_stage": "intent",
+         "strategy": "intent", "user_message": "first draft", "assistant_message": "a"},
+        {"session_id": "s1", "turn_index": 1, "flow_type": "intent", "current_stage": "intent",
+         "strategy": "intent", "user_message": "edited", "assistant_message": "b"},
+        {"event": "unrelated"},
+    ]
+    path.write_text("\n".join(json.dumps(row) for row in rows), encoding="utf-8")
+
+    transcripts = replay_runner.collect_transcripts(replay_runner.iter_log_records([path]))
+
+    assert [t.turns for t in transcripts] == [[("edited", "b")]]
+
+
+def test_config_variant_replays_in_worker_and_reports_divergence(caplog, tmp_path):
+    log_path = _record_live_session(caplog, tmp_path)
+    candidate_dir = tmp_path / "config_candidate"
+    shutil.copytree(CONFIG_DIR, candidate_dir)
+    signals = candidate_dir / "signals.yaml"
+    signals.write_text(
+        signals.read_text(encoding="utf-8").replace(
+            "high_intent:\n  - need to buy", "high_intent:\n  - need to buy\n  - small agency"
+        ),
+        encoding="utf-8",
+    )
+    report_path = tmp_path / "report.json"
+
+    assert replay_runner.main(
+        [str(log_path), "--config-b", str(candidate_dir), "--workers", "1", "--out", str(report_path)]
+    ) == 0
+
+    report = json.loads(report_path.read_text(encoding="utf-8"))
+    assert report["sessions"] == 1
+    assert report["changed_sessions"] == 1
+    assert report["examples"][0]["baseline"][0] == "intent/consultative"
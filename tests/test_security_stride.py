@@ -125,6 +125,22 @@ def test_security_headers_add_no_store_for_api_routes():
     assert "frame-ancestors 'none'" in response.headers["Content-Security-Policy"]
 
 
+def test_security_headers_keep_a_route_cache_policy_on_api_routes():
+    app = Flask(__name__)
+    app.after_request(SecurityHeadersMiddleware.apply)
+
+    @app.route("/api/config")
+    def config():
+        response = jsonify({"ok": True})
+        response.headers["Cache-Control"] = "no-cache"
+        return response
+
+    response = app.test_client().get("/api/config")
+
+    assert response.headers["Cache-Control"] == "no-cache"
+    assert "Pragma" not in response.headers
+
+
 def test_security_headers_use_the_baseline_csp_by_default():
     app = Flask(__name__)
     app.after_request(SecurityHeadersMiddleware.apply)
@@ -0,0 +1,79 @@
+"""Tests for the headless seller-versus-prospect simulator."""
+import json
+
+from backend.security import SessionSecurityManager
+from core import self_play
+from core.analytics.session_analytics import SessionAnalytics
+from core.chatbot import SalesChatbot
+
+
+def test_chat_records_per_layer_timings():
+    bot = SalesChatbot(provider_type="dummy", product_type="default")
+
+    bot.chat("Hi, we are looking at options for our team")
+
+    timings = bot.last_turn_timings
+    for layer in ("signals_ms", "layer1_ms", "layer2_ms", "llm_ms", "layer3_ms", "finalize_ms", "total_ms"):
+        assert timings[layer] >= 0
+    assert timings["total_ms"] >= timings["layer2_ms"]
+
+
+def test_fake_llm_is_deterministic_per_seed():
+    first = self_play.FakeLLM(self_play.SELLER_LINES, seed="a")
+    second = self_play.FakeLLM(self_play.SELLER_LINES, seed="a")
+
+    assert [first.chat([]).content for _ in range(6)] == [second.chat([]).content for _ in range(6)]
+
+    recorded = self_play.FakeLLM(["one", "two"], ordered=True)
+    assert [recorded.chat([]).content for _ in range(3)] == ["one", "two", "one"]
+
+
+def test_simulation_is_reproducible_across_worker_counts():
+    specs = self_play.build_specs(6, difficulties=("easy", "hard"), seed="t", max_turns=6)
+
+    serial, _ = self_play.run_simulation(specs, workers=1)
+    parallel, summary = self_play.run_simulation(specs, workers=4)
+
+    assert [(r.trajectory, r.outcome) for r in serial] == [(r.trajectory, r.outcome) for r in parallel]
+    assert summary["dialogues"] == 6 and summary["errors"] == 0
+    assert summary["turns"] == sum(r.turns for r in parallel)
+    assert set(summary["outcomes_by_cell"]) == {"default/easy", "default/hard"}
+    assert "layer3_ms" in summary["layer_ms"]
+    for result in parallel:
+        assert result.trajectory and len(result.timings) == len(result.trajectory)
+        assert isinstance(result.prospect_score, int)
+        assert isinstance(result.seller_score, int)
+
+
+def test_soak_rounds_release_sessions_from_managers_and_analytics():
+    SessionAnalytics.reset()
+    sessions = SessionSecurityManager(manager_name="self-play chat")
+    prospects = SessionSecurityManager(manager_name="self-play prospects")
+    sessions.add_expiry_hook(SessionAnalytics.release_session)
+
+    report = self_play.run_soak(
+        3,
+        lambda round_no: self_play.build_specs(4, seed=f"soak{round_no}", max_turns=4),
+        workers=2,
+        session_store=sessions,
+        prospect_store=prospects,
+    )
+
+    assert [entry["round"] for entry in report] == [1, 2, 3]
+    for entry in report:
+        assert entry["retained"]["chat_sessions"] == 0
+        assert entry["retained"]["prospect_sessions"] == 0
+        assert entry["retained"]["analytics_sessions"] == 0
+        assert entry["retained"]["traced_kib"] > 0
+
+
+def test_cli_replays_recorded_replies(tmp_path, capsys):
+    replies = tmp_path / "replies.json"
+    replies.write_text(json.dumps({"seller": ["What matters most to you?"], "prospect": ["Not sure yet."]}))
+    out = tmp_path / "report.json"
+
+    assert self_play.main(["--dialogues", "2", "--max-turns", "3", "--replies", str(replies), "--out", str(out)]) == 0
+
+    report = json.loads(out.read_text())
+    assert report["dialogues"] == 2 and report["errors"] == 0
+    assert "simulated 2 dialogues" in capsys.readouterr().err
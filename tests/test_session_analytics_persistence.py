@@ -2,10 +2,11 @@
 import logging
 
 from core.analytics.session_analytics import SessionAnalytics
+from core.trainer import score_session
 
 
 def _reset_analytics_cache():
-    SessionAnalytics._events.clear()
+    SessionAnalytics.reset()
 
 
 def test_session_analytics_stays_in_memory_and_logs(caplog):
@@ -56,3 +57,89 @@ def test_session_analytics_summary_reads_in_memory_events(caplog):
         "stage_transition": 1,
     }
     assert any("session_analytics" in record.message for record in caplog.records)
+
+
+def test_score_session_reads_running_aggregates(monkeypatch):
+    _reset_analytics_cache()
+    SessionAnalytics.record_session_start("gamma", product_type="default", initial_strategy="intent")
+    SessionAnalytics.record_stage_transition(
+        "gamma", from_stage="intent", to_stage="logical", user_turns_in_stage=2, user_turn_count=2
+    )
+    SessionAnalytics.record_stage_transition(
+        "gamma", from_stage="Stage.LOGICAL", to_stage="pitch", user_turns_in_stage=12, user_turn_count=14
+    )
+    SessionAnalytics.record_intent_classification("gamma", intent_level="high", user_turn=3)
+    SessionAnalytics.record_objection_classified("gamma", objection_type="price")
+
+    def _no_event_copies(_session_id):
+        raise AssertionError("score_session should not copy the event list")
+
+    monkeypatch.setattr(SessionAnalytics, "get_session_analytics", _no_event_copies)
+    score = score_session("gamma")
+
+    assert score["metrics"] == {"turns": 14, "stages_reached": ["logical", "pitch"], "signal_ratio": "1/2"}
+    assert score["breakdown"]["objection_handling"] > 0
+    assert score["breakdown"]["questioning_depth"] > 0
+    assert score_session("unknown") == {"total_score": 0, "breakdown": {}}
+
+
+def test_retention_caps_events_and_sessions_but_keeps_totals(monkeypatch):
+    _reset_analytics_cache()
+    monkeypatch.setattr(SessionAnalytics, "max_events_per_session", 3)
+    monkeypatch.setattr(SessionAnalytics, "max_sessions", 2)
+
+    for turn in range(5):
+        SessionAnalytics.record_intent_classification("one", intent_level="high", user_turn=turn)
+
+    assert [e["user_turn"] for e in SessionAnalytics.get_session_analytics("one")] == [2, 3, 4]
+    assert SessionAnalytics.get_session_aggregate("one")["intent_medium_high_count"] == 5
+
+    SessionAnalytics.record_session_start("two")
+    SessionAnalytics.record_session_start("three")
+
+    assert SessionAnalytics.get_session_analytics("one") == []
+    assert SessionAnalytics.get_session_aggregate("one") is None
+    assert len(SessionAnalytics.get_session_analytics("three")) == 1
+    assert SessionAnalytics.get_evaluation_summary() == {
+        "total_sessions": 3,
+        "total_events": 7,
+        "event_counts": {"intent_classification": 5, "session_start": 2},
+    }
+
+
+def test_evicted_and_expired_events_spill_to_columnar_table(monkeypatch, tmp_path):
+    from backend.security import SessionSecurityManager
+    from core.analytics.columnar import INT_MISSING, ColumnarTable
+    from core.analytics.session_analytics import EventRecord
+
+    _reset_analytics_cache()
+    monkeypatch.setenv("ANALYTICS_SPILL_DIR", str(tmp_path / "spill"))
+    monkeypatch.setattr(SessionAnalytics, "max_events_per_session", 2)
+    manager = SessionSecurityManager(idle_minutes=0, manager_name="test sessions")
+    manager.add_expiry_hook(SessionAnalytics.release_session)
+    manager.set("delta", object())
+
+    SessionAnalytics.record_session_start("delta", product_type="solar", ab_variant=None)
+    SessionAnalytics.record_intent_classification("delta", intent_level="low", user_turn=1)
+    SessionAnalytics.record_intent_classification("delta", intent_level="high", user_turn=2)
+    SessionAnalytics.flush_spill()
+
+    assert len(ColumnarTable(tmp_path / "spill")) == 1  # the ring buffer dropped session_start
+    assert SessionAnalytics.get_session_analytics("delta")[0] == {
+        "event_type": "intent_classification",
+        "type": "intent_classification",
+        "intent_level": "low",
+        "user_turn": 1,
+    }
+    assert not hasattr(EventRecord("x", {}), "__dict__")
+
+    assert manager._cleanup_expired() == 1
+
+    table = ColumnarTable(tmp_path / "spill")
+    assert SessionAnalytics.get_session_analytics("delta") == []
+    assert SessionAnalytics.get_session_aggregate("delta") is None
+    assert list(table.decode("event_type")) == ["session_start", "intent_classification", "intent_classification"]
+    assert list(table.decode("product_type")) == ["solar", None, None]
+    assert list(table.decode("session_id")) == ["delta"] * 3
+    assert list(table.column("user_turn")) == [INT_MISSING, 1, 2]
+    assert SessionAnalytics.get_evaluation_summary()["total_events"] == 3
@@ -1,8 +1,12 @@
 """Tests for session management API routes."""
+import threading
+import time
+
 from flask import Flask
 
 from backend.routes import session as session_routes
 from backend.security import SecurityConfig
+from core.services.provider_status import ProviderStatusMonitor
 
 
 class _DummyFlowEngine:
@@ -113,15 +117,25 @@ def test_health_returns_active_provider_and_performance(monkeypatch):
     bot = _DummyBot(session_id="abc12345")
     manager.set("abc12345", bot)
 
-    monkeypatch.setattr(
-        session_routes, "get_available_providers",
-        lambda: [{"name": "probe", "available": True, "model": "probe-model"}]
+    monitor = ProviderStatusMonitor(
+        {
+            "llm": lambda: [{"name": "probe", "available": True, "model": "probe-model"}],
+            "stt": lambda: [{"name": "deepgram", "available": False}],
+            "tts": lambda: [],
+        }
     )
+    monkeypatch.setattr(session_routes, "get_provider_status_monitor", lambda: monitor)
     monkeypatch.setattr(
         session_routes.PerformanceTracker,
         "get_provider_stats",
         staticmethod(lambda: {"probe": {"count": 1}}),
     )
+    monkeypatch.setattr(
+        session_routes.PerformanceTracker,
+        "get_provider_health",
+        staticmethod(lambda: {"probe": {"consecutive_failures": 0}}),
+    )
+    monkeypatch.setattr(session_routes.DeepgramSTTProvider, "_rate_limit_until", 0.0)
 
     response = app.test_client().get("/api/health", headers={"X-Session-ID": "abc12345"})
 
@@ -130,10 +144,46 @@ def test_health_returns_active_provider_and_performance(monkeypatch):
         "ok": True,
         "active": {"provider": "probe", "model": "probe-model"},
         "available_providers": [{"name": "probe", "available": True, "model": "probe-model"}],
+        "audio_providers": {"stt": [{"name": "deepgram", "available": False}], "tts": []},
+        "provider_health": {
+            "probe": {"consecutive_failures": 0},
+            "deepgram": {"cooldown_seconds": 0.0},
+        },
+        "status_age_seconds": 0.0,
         "performance_stats": {"probe": {"count": 1}},
     }
 
 
+def test_health_serves_cached_status_and_refreshes_in_background(monkeypatch):
+    app, _manager = _make_session_app(monkeypatch)
+    calls = []
+    refreshed = threading.Event()
+
+    def collect():
+        calls.append(1)
+        if len(calls) > 1:
+            refreshed.set()
+        return [{"name": "probe", "available": len(calls) == 1}]
+
+    monitor = ProviderStatusMonitor({"llm": collect}, ttl_seconds=60)
+    monkeypatch.setattr(session_routes, "get_provider_status_monitor", lambda: monitor)
+    client = app.test_client()
+
+    for _ in range(3):
+        assert client.get("/api/health").get_json()["available_providers"][0]["available"] is True
+    assert len(calls) == 1
+
+    monitor.ttl_seconds = 0
+    # Stale: the probe still answers from memory while the refresh runs
+    assert client.get("/api/health").get_json()["available_providers"][0]["available"] is True
+    assert refreshed.wait(timeout=2)
+    for _ in range(50):
+        if monitor.snapshot()["llm"][0]["available"] is False:
+            break
+        time.sleep(0.01)
+    assert monitor.snapshot()["llm"][0]["available"] is False
+
+
 def test_config_returns_limits_and_product_options(monkeypatch):
     app, _manager = _make_session_app(monkeypatch)
     monkeypatch.setattr(
@@ -161,6 +211,33 @@ def test_config_returns_limits_and_product_options(monkeypatch):
     }
 
 
+def test_config_is_serialized_once_per_config_version_and_revalidates(monkeypatch):
+    app, _manager = _make_session_app(monkeypatch)
+    config = {"products": {"default": {"strategy": "intent", "context": "Default product"}}}
+    monkeypatch.setattr("core.loader.load_product_config", lambda: config)
+    dumps = []
+    original_dumps = app.json.dumps
+    monkeypatch.setattr(app.json, "dumps", lambda obj, **kw: dumps.append(1) or original_dumps(obj, **kw))
+    client = app.test_client()
+
+    first = client.get("/api/config")
+    second = client.get("/api/config")
+    revalidated = client.get("/api/config", headers={"If-None-Match": first.headers["ETag"]})
+
+    assert len(dumps) == 1
+    assert first.data == second.data
+    assert first.headers["ETag"] == second.headers["ETag"]
+    assert first.headers["Cache-Control"] == "no-cache"
+    assert revalidated.status_code == 304
+    assert revalidated.data == b""
+
+    config = {"products": {"solar": {"strategy": "consultative", "context": "Solar package"}}}
+    changed = client.get("/api/config", headers={"If-None-Match": first.headers["ETag"]})
+
+    assert changed.status_code == 200
+    assert changed.get_json()["product_options"][0]["id"] == "solar"
+
+
 def test_stage_route_mutates_current_stage(monkeypatch):
     app, manager = _make_session_app(monkeypatch)
     bot = _DummyBot(session_id="a" * 8)
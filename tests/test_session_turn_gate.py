@@ -0,0 +1,131 @@
+"""Tests for per-session turn serialization and duplicate-submit coalescing."""
+import threading
+import time
+
+import pytest
+
+from backend.security import SessionTurnGate, TurnGateTimeout
+
+
+def test_identical_concurrent_submissions_share_one_result():
+    gate = SessionTurnGate(wait_timeout=5)
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+    results = []
+
+    def slow_turn():
+        calls.append("run")
+        started.set()
+        release.wait(5)
+        return {"message": "reply"}
+
+    def submit():
+        results.append(gate.run("sess-1", ("chat", "hello"), slow_turn))
+
+    first = threading.Thread(target=submit)
+    first.start()
+    started.wait(5)
+    second = threading.Thread(target=submit)
+    second.start()
+    while gate.coalesced_count == 0:
+        time.sleep(0.005)
+    release.set()
+    first.join(5)
+    second.join(5)
+
+    assert calls == ["run"]
+    assert sorted(coalesced for _result, coalesced in results) == [False, True]
+    assert all(result == {"message": "reply"} for result, _coalesced in results)
+    assert gate.active_sessions() == 0
+
+
+def test_different_submissions_run_in_arrival_order():
+    gate = SessionTurnGate(wait_timeout=5)
+    release = threading.Event()
+    order = []
+    threads = []
+
+    def make_turn(label):
+        def _turn():
+            if label == "a":
+                release.wait(5)
+            order.append(label)
+            return label
+
+        return _turn
+
+    for label in ("a", "b", "c"):
+        thread = threading.Thread(target=gate.run, args=("sess-1", label, make_turn(label)))
+        thread.start()
+        threads.append(thread)
+        time.sleep(0.05)
+
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert order == ["a", "b", "c"]
+
+
+def test_waiting_turn_times_out_and_queue_skips_it():
+    gate = SessionTurnGate(wait_timeout=0.1)
+    release = threading.Event()
+    errors = []
+
+    first = threading.Thread(target=gate.run, args=("sess-1", "a", lambda: release.wait(5)))
+    first.start()
+    time.sleep(0.02)
+
+    with pytest.raises(TurnGateTimeout):
+        gate.run("sess-1", "b", lambda: errors.append("should not run"))
+
+    release.set()
+    first.join(5)
+
+    assert errors == []
+    assert gate.run("sess-1", "c", lambda: "ok") == ("ok", False)
+    assert gate.timeout_count == 1
+
+
+def test_sessions_do_not_block_each_other():
+    gate = SessionTurnGate(wait_timeout=0.2)
+    release = threading.Event()
+    blocker = threading.Thread(target=gate.run, args=("sess-1", "a", lambda: release.wait(5)))
+    blocker.start()
+    time.sleep(0.02)
+
+    assert gate.run("sess-2", "a", lambda: "other") == ("other", False)
+
+    release.set()
+    blocker.join(5)
+
+
+def test_leader_exception_propagates_to_coalesced_waiters():
+    gate = SessionTurnGate(wait_timeout=5)
+    started = threading.Event()
+    release = threading.Event()
+    outcomes = []
+
+    def failing_turn():
+        started.set()
+        release.wait(5)
+        raise RuntimeError("provider down")
+
+    def submit():
+        try:
+            gate.run("sess-1", "same", failing_turn)
+        except RuntimeError as exc:
+            outcomes.append(str(exc))
+
+    threads = [threading.Thread(target=submit) for _ in range(2)]
+    threads[0].start()
+    started.wait(5)
+    threads[1].start()
+    while gate.coalesced_count == 0:
+        time.sleep(0.005)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert outcomes == ["provider down", "provider down"]
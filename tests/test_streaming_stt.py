@@ -0,0 +1,218 @@
+"""Tests for chunked and live (WebSocket) Deepgram transcription against local fake servers."""
+import io
+import json
+import socket
+import socketserver
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from core.providers import ws
+from core.providers.base import AudioStreamError
+from core.providers.stt.deepgram import DeepgramSTTProvider
+
+
+def _deepgram_body(text):
+    return {"results": {"channels": [{"alternatives": [{"transcript": text}]}]}}
+
+
+class _ChunkedListenHandler(BaseHTTPRequestHandler):
+    received = []
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        chunks = []
+        while True:
+            size = int(self.rfile.readline().strip(), 16)
+            if size == 0:
+                self.rfile.readline()
+                break
+            chunks.append(self.rfile.read(size))
+            self.rfile.readline()
+        type(self).received.append(
+            {
+                "path": self.path,
+                "chunks": chunks,
+                "transfer_encoding": self.headers.get("Transfer-Encoding"),
+                "content_length": self.headers.get("Content-Length"),
+                "content_type": self.headers.get("Content-Type"),
+            }
+        )
+        body = json.dumps(_deepgram_body(f"heard {sum(len(c) for c in chunks)} bytes")).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class _FakeLiveHandler(socketserver.StreamRequestHandler):
+    """Deepgram-like live endpoint: an interim result per audio frame, a final one on CloseStream."""
+
+    def handle(self):
+        request_lines = []
+        while True:
+            line = self.rfile.readline().decode("latin-1").strip()
+            if not line:
+                break
+            request_lines.append(line)
+        headers = dict(line.split(": ", 1) for line in request_lines[1:])
+        self.server.requests.append({"path": request_lines[0].split(" ")[1], "headers": headers})
+        self.wfile.write(
+            (
+                "HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+                f"Sec-WebSocket-Accept: {ws.accept_key(headers['Sec-WebSocket-Key'])}\r\n\r\n"
+            ).encode()
+        )
+
+        words = []
+        while True:
+            _fin, opcode, payload = ws.read_frame(self.rfile)
+            if opcode == ws.OP_BINARY:
+                words.append(payload.decode())
+                self._send({"type": "Results", "channel": {"alternatives": [{"transcript": " ".join(words)}]},
+                            "is_final": False, "speech_final": False})
+            elif opcode == ws.OP_TEXT and json.loads(payload)["type"] == "CloseStream":
+                self._send({"type": "Results", "channel": {"alternatives": [{"transcript": " ".join(words)}]},
+                            "is_final": True, "speech_final": True})
+                self._send({"type": "Metadata", "duration": 1.0})
+                self.wfile.write(ws.encode_frame(ws.OP_CLOSE, b"\x03\xe8", mask=False))
+                return
+            elif opcode == ws.OP_CLOSE:
+                return
+
+    def _send(self, message):
+        self.wfile.write(ws.encode_frame(ws.OP_TEXT, json.dumps(message).encode(), mask=False))
+
+
+class _DroppingLiveHandler(_FakeLiveHandler):
+    """Answers the first audio frame, then dies half way through the next result frame."""
+
+    def handle(self):
+        try:
+            super().handle()
+        except ConnectionError:
+            pass
+
+    def _send(self, message):
+        frame = ws.encode_frame(ws.OP_TEXT, json.dumps(message).encode(), mask=False)
+        if getattr(self, "sent", False):
+            self.wfile.write(frame[: len(frame) // 2])
+            self.wfile.flush()
+            self.connection.shutdown(socket.SHUT_RDWR)
+            raise ConnectionError("dropped")
+        self.sent = True
+        self.wfile.write(frame)
+
+
+@pytest.fixture
+def chunked_server(monkeypatch):
+    _ChunkedListenHandler.received = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _ChunkedListenHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setenv("DEEPGRAM_API_KEY", "test-key")
+    monkeypatch.setenv("DEEPGRAM_BASE_URL", f"http://127.0.0.1:{server.server_address[1]}")
+    yield _ChunkedListenHandler.received
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def live_server(monkeypatch):
+    server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), _FakeLiveHandler)
+    server.daemon_threads = True
+    server.requests = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setenv("DEEPGRAM_API_KEY", "test-key")
+    monkeypatch.setenv("DEEPGRAM_BASE_URL", f"http://127.0.0.1:{server.server_address[1]}")
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_frames_round_trip_masked_and_unmasked():
+    for size in (0, 5, 200, 70000):
+        payload = bytes(range(256)) * (size // 256) + bytes(size % 256)
+        for mask in (True, False):
+            assert ws.read_frame(io.BytesIO(ws.encode_frame(ws.OP_BINARY, payload, mask=mask))) == (
+                True,
+                ws.OP_BINARY,
+                payload,
+            )
+
+
+def test_transcribe_stream_forwards_chunks_with_chunked_encoding(chunked_server):
+    provider = DeepgramSTTProvider()
+    produced = []
+
+    def chunks():
+        for i in range(3):
+            produced.append(i)
+            yield bytes([i]) * 1000
+
+    result = provider.transcribe_stream(chunks(), filename="clip.wav")
+
+    assert result.error is None
+    assert result.text == "heard 3000 bytes"
+    request = chunked_server[0]
+    assert request["transfer_encoding"] == "chunked"
+    assert request["content_length"] is None
+    assert request["content_type"] == "audio/wav"
+    assert [len(chunk) for chunk in request["chunks"]] == [1000, 1000, 1000]
+    assert request["path"].startswith("/listen?model=")
+
+
+def test_stream_transcribe_yields_partials_then_final(live_server):
+    provider = DeepgramSTTProvider()
+
+    events = list(provider.stream_transcribe(iter([b"hello", b"there", b"friend"])))
+
+    assert [event.text for event in events] == ["hello", "hello there", "hello there friend", "hello there friend"]
+    assert [event.is_final for event in events] == [False, False, False, True]
+    assert events[-1].speech_final
+    request = live_server.requests[0]
+    assert "interim_results=true" in request["path"]
+    assert request["headers"]["Authorization"] == "Token test-key"
+
+
+def test_stream_transcribe_reports_refused_upgrade(monkeypatch):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _ChunkedListenHandler)  # answers GET with 501
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setenv("DEEPGRAM_API_KEY", "test-key")
+    monkeypatch.setenv("DEEPGRAM_BASE_URL", f"http://127.0.0.1:{server.server_address[1]}")
+    try:
+        with pytest.raises(AudioStreamError):
+            list(DeepgramSTTProvider().stream_transcribe(iter([b"x"])))
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_recv_tells_a_dropped_connection_from_a_clean_close():
+    client, peer = socket.socketpair()
+    frame = ws.encode_frame(ws.OP_TEXT, b"partial result", mask=False)
+
+    clean = ws.WebSocket(client, io.BytesIO(ws.encode_frame(ws.OP_CLOSE, b"\x03\xe8", mask=False)))
+    assert clean.recv() is None
+
+    torn = ws.WebSocket(client, io.BytesIO(frame + frame[:5]))
+    assert torn.recv() == "partial result"
+    with pytest.raises(ws.WebSocketError):
+        torn.recv()
+    assert torn.closed
+    peer.close()
+
+
+def test_stream_transcribe_raises_when_the_live_connection_drops(live_server):
+    live_server.RequestHandlerClass = _DroppingLiveHandler
+    events = DeepgramSTTProvider().stream_transcribe(iter([b"hello", b"there"]))
+
+    assert next(events).text == "hello"
+    with pytest.raises(AudioStreamError, match="live stream failed"):
+        list(events)
@@ -1,6 +1,8 @@
 """Tests for training coach scoring and feedback generation."""
 from types import SimpleNamespace
 
+import pytest
+
 from core import trainer
 from core.utils import Stage, Strategy
 
@@ -94,3 +96,83 @@ def test_generate_training_uses_fallback_provider_when_primary_fails(monkeypatch
     assert result["what_happened"] == "Asked a clear question"
     assert result["next_move"] == "Probe the blocker"
     assert result["watch_for"] == ["Over-probing", "Pitching too early"]
+
+
+def test_paraphrased_training_question_reuses_cached_answer():
+    provider = _DummyProvider(content="A trial close tests readiness without asking for the sale.")
+    flow_engine = _DummyFlowEngine()
+
+    first = trainer.answer_training_question(provider, flow_engine, "What is a trial close?", product_type="saas")
+    second = trainer.answer_training_question(provider, flow_engine, "what is a trial close exactly", product_type="saas")
+
+    assert first == {"answer": "A trial close tests readiness without asking for the sale."}
+    assert second == {"answer": "A trial close tests readiness without asking for the sale.", "cached": True}
+    assert len(provider.calls) == 1
+    assert "I need more clarity" not in provider.calls[0]["messages"][0]["content"]
+
+
+def test_training_answer_cache_keeps_buckets_and_distinct_questions_apart():
+    provider = _DummyProvider(content="Anchor on the outcome first.")
+    flow_engine = _DummyFlowEngine()
+
+    trainer.answer_training_question(provider, flow_engine, "What is anchoring?", product_type="saas")
+    trainer.answer_training_question(provider, flow_engine, "What is mirroring?", product_type="saas")
+    trainer.answer_training_question(provider, flow_engine, "What is anchoring?", product_type="cars")
+    trainer.answer_training_question(provider, flow_engine, "What is anchoring?", style="teacher", product_type="saas")
+    trainer.answer_training_question(provider, flow_engine, "What is anchoring?", product_type="saas", use_cache=False)
+
+    assert len(provider.calls) == 5
+
+
+def test_technique_answers_are_shared_but_conversation_answers_are_not():
+    provider = _DummyProvider(content="Ask what the delays cost your team.")
+    first_session = _DummyFlowEngine()
+    second_session = _DummyFlowEngine()
+    second_session.conversation_history = [
+        {"role": "user", "content": "We mostly care about price"},
+        {"role": "assistant", "content": "What budget did you have in mind?"},
+    ]
+
+    trainer.answer_training_question(provider, first_session, "What should I ask next?", product_type="saas")
+    provider.content = "Ask what a fair price would be."
+    other = trainer.answer_training_question(provider, second_session, "What should I ask next?", product_type="saas")
+    again = trainer.answer_training_question(provider, second_session, "What should I ask next?", product_type="saas")
+
+    assert other == again == {"answer": "Ask what a fair price would be."}
+    assert len(provider.calls) == 3
+    assert "We mostly care about price" in provider.calls[1]["messages"][0]["content"]
+    assert trainer.get_training_answer_cache().stats()["stores"] == 0
+
+    provider.content = "NEPQ leads with questions that surface the prospect's own problem."
+    trainer.answer_training_question(provider, first_session, "What does NEPQ stand for?", product_type="saas")
+    shared = trainer.answer_training_question(provider, second_session, "What does NEPQ stand for?", product_type="saas")
+
+    assert shared["cached"] is True
+    assert len(provider.calls) == 4
+
+
+@pytest.mark.parametrize(
+    ("question", "technique"),
+    [
+        ("What is a trial close?", True),
+        ("Can you explain NEPQ?", True),
+        ("How does mirroring work?", True),
+        ("What should I ask next?", False),
+        ("How does it work?", False),
+        ("What is the prospect worried about?", False),
+        ("Explain what they meant", False),
+    ],
+)
+def test_only_technique_questions_skip_the_transcript(question, technique):
+    assert trainer._is_technique_question(question) is technique
+
+
+def test_failed_training_answers_are_not_cached(monkeypatch):
+    monkeypatch.setattr(trainer, "list_fallback_providers", lambda current: [])
+    provider = _DummyProvider(content="", error=True)
+    flow_engine = _DummyFlowEngine()
+
+    trainer.answer_training_question(provider, flow_engine, "What is a trial close?")
+    trainer.answer_training_question(provider, flow_engine, "What is a trial close?")
+
+    assert trainer.get_training_answer_cache().stats()["stores"] == 0
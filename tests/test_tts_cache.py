@@ -0,0 +1,171 @@
+"""Tests for the content-addressed TTS audio cache and prewarm."""
+from core.providers.base import BaseTTSProvider, SynthesisResult
+from core.providers.tts import cache as cache_module
+from core.providers.tts.cache import CachedTTSProvider, TTSAudioCache, tts_cache_key
+from core.providers.tts.streaming import stream_sentences
+from core.services import tts_prewarm
+
+
+class _CountingTTS(BaseTTSProvider):
+    provider_name = "counting"
+    stream_content_type = "audio/mpeg"
+
+    def __init__(self, fail=False):
+        self.calls = []
+        self.fail = fail
+
+    def is_available(self):
+        return True
+
+    def get_model_name(self):
+        return "counting-v1"
+
+    def synthesize(self, text, voice="male_us", rate=0):
+        self.calls.append(("synthesize", text, voice, rate))
+        if self.fail:
+            return SynthesisResult(error="nope", provider=self.provider_name)
+        return SynthesisResult(audio_bytes=f"{voice}:{rate}:{text}".encode(), content_type="audio/mpeg")
+
+    def synthesize_stream(self, text, voice="male_us", rate=0):
+        self.calls.append(("stream", text, voice, rate))
+        for word in text.split():
+            yield word.encode() + b" "
+
+
+def test_cache_key_ignores_whitespace_but_not_voice_or_rate():
+    base = tts_cache_key("Hello  there", "male_us", 0, "edge", "edge-tts")
+
+    assert base == tts_cache_key(" Hello there ", "male_us", 0, "edge", "edge-tts")
+    assert base != tts_cache_key("Hello there", "female_us", 0, "edge", "edge-tts")
+    assert base != tts_cache_key("Hello there", "male_us", 10, "edge", "edge-tts")
+    assert base != tts_cache_key("Hello there", "male_us", 0, "edge", "other-model")
+
+
+def test_memory_tier_is_bounded_by_bytes():
+    cache = TTSAudioCache(max_memory_bytes=400)
+    for i in range(5):
+        cache.put(f"k{i}", bytes(100), "audio/mpeg")
+
+    stats = cache.stats()
+    assert stats["memory_bytes"] <= 400
+    assert stats["memory_evictions"] == 1
+    assert cache.get("k0") is None
+    assert bytes(cache.get("k4").data) == bytes(100)
+
+
+def test_disk_tier_survives_restart_and_serves_mapped_views(tmp_path):
+    TTSAudioCache(cache_dir=tmp_path).put("a" * 64, b"mp3-bytes", "audio/mpeg")
+
+    reopened = TTSAudioCache(cache_dir=tmp_path)
+    hit = reopened.get("a" * 64)
+
+    assert isinstance(hit.data, memoryview)
+    assert bytes(hit.data) == b"mp3-bytes"
+    assert hit.content_type == "audio/mpeg"
+    assert hit.path.suffix == ".mp3" and hit.path.exists()
+    assert reopened.stats()["disk_hits"] == 1
+
+
+def test_disk_tier_sees_clips_written_by_another_worker(tmp_path):
+    reader = TTSAudioCache(cache_dir=tmp_path)
+    TTSAudioCache(cache_dir=tmp_path).put("b" * 64, b"shared", "audio/mpeg")
+
+    assert bytes(reader.get("b" * 64).data) == b"shared"
+
+
+def test_disk_tier_evicts_oldest_clips_over_budget(tmp_path):
+    cache = TTSAudioCache(cache_dir=tmp_path, max_disk_bytes=250, max_memory_bytes=0)
+    for i in range(3):
+        cache.put(f"{i}" * 64, bytes(100), "audio/mpeg")
+
+    assert cache.stats()["disk_bytes"] <= 250
+    assert cache.get("0" * 64) is None
+    assert cache.get("2" * 64) is not None
+
+
+def test_cached_provider_synthesizes_once_per_text_voice_rate():
+    inner = _CountingTTS()
+    provider = CachedTTSProvider(inner, TTSAudioCache())
+
+    first = provider.synthesize("What brought you in today?")
+    second = provider.synthesize("What brought you in today?")
+    provider.synthesize("What brought you in today?", voice="female_us")
+
+    assert first.audio_bytes == second.audio_bytes
+    assert len(inner.calls) == 2
+
+
+def test_cached_provider_does_not_cache_failures():
+    inner = _CountingTTS(fail=True)
+    provider = CachedTTSProvider(inner, TTSAudioCache())
+
+    provider.synthesize("Hello")
+    provider.synthesize("Hello")
+
+    assert len(inner.calls) == 2
+
+
+def test_cached_stream_is_stored_only_when_fully_consumed():
+    inner = _CountingTTS()
+    provider = CachedTTSProvider(inner, TTSAudioCache())
+
+    abandoned = provider.synthesize_stream("one two three")
+    next(abandoned)
+    abandoned.close()
+    assert provider.lookup("one two three") is None
+
+    assert b"".join(provider.synthesize_stream("one two three")) == b"one two three "
+    assert b"".join(provider.synthesize_stream("one two three")) == b"one two three "
+    assert [call[0] for call in inner.calls] == ["stream", "stream"]
+
+
+def test_stream_sentences_serves_repeated_sentence_from_cache():
+    inner = _CountingTTS()
+    provider = CachedTTSProvider(inner, TTSAudioCache())
+    sentences = ["What brought you in today?", "What brought you in today?"]
+
+    assert b"".join(stream_sentences(provider, sentences, lookahead=0)) == b"What brought you in today? " * 2
+    assert b"".join(stream_sentences(provider, sentences)) == b"What brought you in today? " * 2
+    assert [call[0] for call in inner.calls] == ["stream"]
+
+    hit = provider.start_stream("What brought you in today?")
+    hit.close()
+    assert list(hit) == []
+
+
+def test_cache_hits_are_served_without_copying(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache_module, "STREAM_CHUNK_BYTES", 4)
+    inner = _CountingTTS()
+    key = CachedTTSProvider(inner, TTSAudioCache()).cache_key("Hi")
+    TTSAudioCache(cache_dir=tmp_path).put(key, b"0123456789", "audio/mpeg")
+    provider = CachedTTSProvider(inner, TTSAudioCache(cache_dir=tmp_path, max_memory_bytes=0))
+
+    result = provider.synthesize("Hi")
+    chunks = provider.start_stream("Hi")
+    first = next(chunks)
+
+    assert isinstance(result.audio_bytes, memoryview) and result.audio_bytes == b"0123456789"
+    assert isinstance(first, memoryview) and first.obj is result.audio_bytes.obj
+    assert [bytes(chunk) for chunk in chunks] == [b"4567", b"89"]
+    assert inner.calls == []
+
+
+def test_static_phrases_cover_fallbacks_terminal_lines_and_objection_questions():
+    phrases = tts_prewarm.static_phrases()
+
+    assert "What brought you in today?" in phrases
+    assert "This roleplay session has ended." in phrases
+    assert "What would the decisive version of you want to do next?" in phrases
+    assert len(phrases) == len(set(phrases))
+
+
+def test_prewarm_skips_phrases_already_cached():
+    inner = _CountingTTS()
+    provider = CachedTTSProvider(inner, TTSAudioCache())
+    phrases = ["First phrase here.", "Second phrase here."]
+
+    first = tts_prewarm.prewarm(provider, phrases, voices=["male_us", "female_us"])
+    second = tts_prewarm.prewarm(provider, phrases, voices=["male_us", "female_us"])
+
+    assert first == {"synthesized": 4, "already_cached": 0, "failed": 0}
+    assert second == {"synthesized": 0, "already_cached": 4, "failed": 0}
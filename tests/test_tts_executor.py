@@ -0,0 +1,107 @@
+"""Tests for the shared async TTS executor and Edge streaming on top of it."""
+import asyncio
+import sys
+import threading
+import types
+
+import pytest
+
+from core.providers.tts import edge as edge_module
+from core.providers.tts.edge import EdgeTTSProvider
+from core.providers.tts.executor import AsyncTTSExecutor
+
+
+def test_executor_bounds_concurrency_and_reports_latency():
+    executor = AsyncTTSExecutor(max_concurrency=2)
+    active = {"now": 0, "peak": 0}
+
+    async def job(value):
+        active["now"] += 1
+        active["peak"] = max(active["peak"], active["now"])
+        await asyncio.sleep(0.02)
+        active["now"] -= 1
+        return value
+
+    futures = executor.submit_batch([job(i) for i in range(6)])
+
+    assert [future.result(timeout=2) for future in futures] == list(range(6))
+    assert active["peak"] == 2
+    stats = executor.stats()
+    assert stats["completed"] == 6
+    assert stats["queued"] == 0 and stats["running"] == 0
+    assert stats["run_ms_p50"] >= 15
+    assert stats["wait_ms_p95"] > 0
+
+
+def test_executor_times_out_slow_requests():
+    executor = AsyncTTSExecutor(max_concurrency=1)
+
+    with pytest.raises(TimeoutError):
+        executor.run(asyncio.sleep(1), timeout=0.02)
+
+    assert executor.stats()["timed_out"] == 1
+
+
+def test_closing_a_stream_cancels_the_generator():
+    executor = AsyncTTSExecutor(max_concurrency=1)
+    closed = threading.Event()
+
+    async def endless():
+        try:
+            while True:
+                yield b"x"
+                await asyncio.sleep(0.001)
+        finally:
+            closed.set()
+
+    handle = executor.stream(endless())
+    assert next(handle) == b"x"
+    handle.close()
+
+    assert closed.wait(timeout=2)
+    assert list(handle) == []
+
+
+def test_cancelled_while_queued_never_runs():
+    executor = AsyncTTSExecutor(max_concurrency=1)
+    started = []
+
+    async def job(name, delay):
+        started.append(name)
+        await asyncio.sleep(delay)
+
+    blocker = executor.submit(job("blocker", 0.05))
+    waiting = executor.submit(job("waiting", 0))
+    waiting.cancel()
+    blocker.result(timeout=2)
+
+    assert started == ["blocker"]
+    assert executor.stats()["cancelled"] == 1
+
+
+class _FakeCommunicate:
+    def __init__(self, text, voice, rate):
+        self.text = text
+
+    async def stream(self):
+        yield {"type": "WordBoundary"}
+        for word in self.text.split():
+            await asyncio.sleep(0)
+            yield {"type": "audio", "data": word.encode()}
+
+
+def test_edge_providers_share_one_executor_thread(monkeypatch):
+    monkeypatch.setitem(sys.modules, "edge_tts", types.SimpleNamespace(Communicate=_FakeCommunicate))
+    executor = AsyncTTSExecutor(max_concurrency=4)
+    monkeypatch.setattr(edge_module, "get_tts_executor", lambda: executor)
+    threads_before = threading.active_count()
+    providers = [EdgeTTSProvider() for _ in range(5)]
+
+    results = [provider.synthesize("one two") for provider in providers]
+    streamed = b"".join(providers[0].synthesize_stream("three four five"))
+
+    assert [result.audio_bytes for result in results] == [b"onetwo"] * 5
+    assert streamed == b"threefourfive"
+    # Five providers, six requests: one loop thread in total
+    assert threading.active_count() - threads_before == 1
+    assert executor.stats()["completed"] == 6
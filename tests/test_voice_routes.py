@@ -0,0 +1,339 @@
+"""Tests for voice routes and sentence-pipelined TTS streaming."""
+import base64
+import io
+import json
+import threading
+import time
+
+from flask import Flask, has_request_context, jsonify
+
+from backend.routes import voice as voice_routes
+from core.providers.base import AudioStreamError, BaseTTSProvider, SynthesisResult, TranscriptEvent, TranscriptionResult
+from core.providers.tts.streaming import split_sentences, stream_sentences
+
+
+class _FakeTTS(BaseTTSProvider):
+    provider_name = "fake"
+    stream_content_type = "audio/mpeg"
+
+    def __init__(self, fail_on=None, gate=None):
+        self.started = []
+        self.fail_on = fail_on
+        self.gate = gate
+
+    def is_available(self):
+        return True
+
+    def get_model_name(self):
+        return "fake-tts"
+
+    def synthesize(self, text, voice="male_us", rate=0):
+        return SynthesisResult(audio_bytes=text.encode(), content_type="audio/mpeg", provider="fake")
+
+    def synthesize_stream(self, text, voice="male_us", rate=0):
+        self.started.append(text)
+        if self.gate is not None and text != self.gate[0]:
+            self.gate[1].wait(timeout=2)
+        if self.fail_on and self.fail_on in text:
+            raise RuntimeError("boom")
+        for word in text.split():
+            yield f"{word}|".encode()
+
+
+class _FakeSTT:
+    def __init__(self, text="I run a small agency", error=None):
+        self.text = text
+        self.error = error
+        self.calls = []
+
+    def is_available(self):
+        return True
+
+    def transcribe(self, audio_bytes, filename="audio.webm"):
+        self.calls.append((audio_bytes, filename))
+        return TranscriptionResult(text=self.text, error=self.error, provider="fake")
+
+    def transcribe_stream(self, chunks, filename="audio.webm"):
+        received = [len(chunk) for chunk in chunks]
+        self.calls.append(("stream", received, filename))
+        return TranscriptionResult(text=self.text, error=self.error, provider="fake")
+
+    def stream_transcribe(self, chunks, filename="audio.webm"):
+        heard = []
+        for chunk in chunks:
+            heard.append(str(len(chunk)))
+            yield TranscriptEvent(text=" ".join(heard))
+        yield TranscriptEvent(text=" ".join(heard), is_final=True, speech_final=True)
+
+
+class _DummyResponse:
+    def __init__(self, content):
+        self.content = content
+        self.latency_ms = 10.0
+        self.provider = "probe"
+        self.model = "probe-model"
+
+
+class _DummyBot:
+    def __init__(self, reply="Thanks for sharing that with me. What matters most to you right now?"):
+        self.reply = reply
+        self.messages = []
+
+    def chat(self, message):
+        self.messages.append(message)
+        return _DummyResponse(self.reply)
+
+
+def _make_voice_app(monkeypatch, bot=None, tts=None, stt=None):
+    app = Flask(__name__)
+    app.config["TESTING"] = True
+    bot = bot or _DummyBot()
+    tts = tts or _FakeTTS()
+    stt = stt or _FakeSTT()
+
+    def validate_message(text):
+        text = (text or "").strip()
+        if not text:
+            return None, (jsonify({"error": "Message required"}), 400)
+        return text, None
+
+    monkeypatch.setattr(voice_routes.bp, "app", app, raising=False)
+    monkeypatch.setattr(voice_routes.bp, "require_session", lambda: (bot, None), raising=False)
+    monkeypatch.setattr(voice_routes.bp, "validate_message", validate_message, raising=False)
+    monkeypatch.setattr(
+        voice_routes.bp, "bot_state", lambda _bot: {"stage": "INTENT", "strategy": "INTENT"}, raising=False
+    )
+    monkeypatch.setattr(voice_routes, "_tts_provider", lambda: tts)
+    monkeypatch.setattr(voice_routes, "_stt_provider", lambda: stt)
+    app.register_blueprint(voice_routes.bp)
+    return app, bot, tts, stt
+
+
+def _records(response):
+    return [json.loads(line) for line in response.get_data(as_text=True).splitlines() if line]
+
+
+def test_split_sentences_merges_short_fragments():
+    text = "Sure. That makes sense! What does your current setup look like today? Ok."
+
+    assert split_sentences(text) == ["Sure. That makes sense! What does your current setup look like today? Ok."]
+    assert split_sentences("First sentence is long enough. Second one is also long enough.") == [
+        "First sentence is long enough.",
+        "Second one is also long enough.",
+    ]
+    assert split_sentences("") == []
+
+
+def test_stream_sentences_prefetches_next_sentence_while_first_streams():
+    sentences = ["First sentence is long enough.", "Second one is also long enough."]
+    release = threading.Event()
+    tts = _FakeTTS(gate=(sentences[0], release))
+
+    audio = stream_sentences(tts, sentences, lookahead=1)
+    first = next(audio)
+
+    # Sentence 2 starts synthesizing before sentence 1 has been fully consumed
+    deadline = time.monotonic() + 2
+    while len(tts.started) < 2 and time.monotonic() < deadline:
+        time.sleep(0.005)
+    assert first == b"First|"
+    assert tts.started == sentences
+    release.set()
+    assert b"".join([first, *audio]) == b"First|sentence|is|long|enough.|Second|one|is|also|long|enough.|"
+
+
+def test_tts_stream_returns_audio_chunks(monkeypatch):
+    app, _bot, _tts, _stt = _make_voice_app(monkeypatch)
+
+    response = app.test_client().post("/api/tts/stream", json={"text": "Hello there, how are you doing today?"})
+
+    assert response.status_code == 200
+    assert response.mimetype == "audio/mpeg"
+    assert response.headers["Cache-Control"] == "no-store"
+    assert response.get_data() == b"Hello|there,|how|are|you|doing|today?|"
+
+
+def test_tts_stream_maps_first_chunk_failure_to_502(monkeypatch):
+    app, _bot, _tts, _stt = _make_voice_app(monkeypatch, tts=_FakeTTS(fail_on="Hello"))
+
+    response = app.test_client().post("/api/tts/stream", json={"text": "Hello there, how are you doing today?"})
+
+    assert response.status_code == 502
+    assert response.get_json()["code"] == "TTS_FAILED"
+
+
+def test_tts_stream_rejects_empty_text(monkeypatch):
+    app, _bot, _tts, _stt = _make_voice_app(monkeypatch)
+
+    response = app.test_client().post("/api/tts/stream", json={"text": "  "})
+
+    assert response.status_code == 400
+
+
+def test_voice_chat_text_streams_reply_then_audio(monkeypatch):
+    app, bot, _tts, _stt = _make_voice_app(monkeypatch)
+
+    response = app.test_client().post("/api/voice/chat", json={"message": "hello"}, headers={"X-Session-ID": "s1"})
+
+    assert response.status_code == 200
+    assert response.mimetype == "application/x-ndjson"
+    records = _records(response)
+    assert records[0]["type"] == "reply"
+    assert records[0]["message"] == bot.reply
+    assert "transcript" not in records[0]
+    audio = b"".join(base64.b64decode(r["data"]) for r in records if r["type"] == "audio")
+    assert audio == "".join(f"{word}|" for word in bot.reply.split()).encode()
+    assert [r["seq"] for r in records if r["type"] == "audio"] == list(range(len(bot.reply.split())))
+    assert records[-1]["type"] == "done"
+    assert records[-1]["first_audio_ms"] is not None
+    assert bot.messages == ["hello"]
+
+
+def test_voice_chat_transcribes_uploaded_audio(monkeypatch):
+    app, bot, _tts, stt = _make_voice_app(monkeypatch)
+
+    response = app.test_client().post(
+        "/api/voice/chat",
+        data={"audio": (io.BytesIO(b"RIFF...."), "clip.webm"), "voice": "female_us"},
+        content_type="multipart/form-data",
+        headers={"X-Session-ID": "s1"},
+    )
+
+    records = _records(response)
+    assert records[0]["transcript"] == "I run a small agency"
+    assert bot.messages == ["I run a small agency"]
+    assert stt.calls == [(b"RIFF....", "clip.webm")]
+
+
+def test_voice_chat_reports_stt_failure(monkeypatch):
+    app, bot, _tts, _stt = _make_voice_app(monkeypatch, stt=_FakeSTT(text="", error="bad audio"))
+
+    response = app.test_client().post(
+        "/api/voice/chat",
+        data={"audio": (io.BytesIO(b"RIFF...."), "clip.webm")},
+        content_type="multipart/form-data",
+        headers={"X-Session-ID": "s1"},
+    )
+
+    assert response.status_code == 422
+    assert response.get_json()["code"] == "STT_FAILED"
+    assert bot.messages == []
+
+
+def test_voice_chat_keeps_text_reply_when_tts_fails(monkeypatch):
+    app, bot, _tts, _stt = _make_voice_app(monkeypatch, tts=_FakeTTS(fail_on="matters"))
+
+    response = app.test_client().post("/api/voice/chat", json={"message": "hello"}, headers={"X-Session-ID": "s1"})
+
+    records = _records(response)
+    assert records[0]["message"] == bot.reply
+    assert [r["type"] for r in records][-2:] == ["error", "done"]
+    assert records[-2]["code"] == "TTS_FAILED"
+
+
+def test_tts_stream_serves_cached_clip_from_disk(monkeypatch, tmp_path):
+    from core.providers.tts.cache import CachedTTSProvider, TTSAudioCache
+
+    inner = _FakeTTS()
+    provider = CachedTTSProvider(inner, TTSAudioCache(cache_dir=tmp_path))
+    app, _bot, _tts, _stt = _make_voice_app(monkeypatch, tts=provider)
+    client = app.test_client()
+
+    first = client.post("/api/tts/stream", json={"text": "What brought you in today?"})
+    assert first.get_data() == b"What|brought|you|in|today?|"
+    second = client.post("/api/tts/stream", json={"text": "What brought you in today?"})
+
+    assert second.status_code == 200
+    assert second.headers["Content-Length"] == str(len(b"What|brought|you|in|today?|"))  # send_file, not a stream
+    assert second.get_data() == b"What|brought|you|in|today?|"
+    assert inner.started == ["What brought you in today?"]
+
+
+def test_tts_stream_writes_cached_memory_clips_as_bytes(monkeypatch):
+    from core.providers.tts.cache import CachedTTSProvider, TTSAudioCache
+
+    inner = _FakeTTS()
+    provider = CachedTTSProvider(inner, TTSAudioCache())
+    app, _bot, _tts, _stt = _make_voice_app(monkeypatch, tts=provider)
+    client = app.test_client()
+
+    assert client.post("/api/tts/stream", json={"text": "What brought you in today?"}).get_data()
+    second = client.post("/api/tts/stream", json={"text": "What brought you in today?"}, buffered=False)
+
+    chunks = list(second.response)
+    assert chunks and all(type(chunk) is bytes for chunk in chunks)
+    assert b"".join(chunks) == b"What|brought|you|in|today?|"
+    assert inner.started == ["What brought you in today?"]
+
+
+def test_voice_chat_streams_raw_audio_body_to_stt(monkeypatch):
+    app, bot, _tts, stt = _make_voice_app(monkeypatch)
+    body = b"a" * (voice_routes.AUDIO_READ_CHUNK_BYTES * 2 + 10)
+
+    response = app.test_client().post(
+        "/api/voice/chat?voice=female_us", data=body, content_type="audio/wav", headers={"X-Session-ID": "s1"}
+    )
+
+    records = _records(response)
+    assert records[0]["transcript"] == "I run a small agency"
+    assert bot.messages == ["I run a small agency"]
+    # Read in bounded chunks, never as one blob
+    assert stt.calls == [("stream", [voice_routes.AUDIO_READ_CHUNK_BYTES] * 2 + [10], "audio.wav")]
+
+
+def test_voice_transcribe_returns_json_result(monkeypatch):
+    app, _bot, _tts, _stt = _make_voice_app(monkeypatch)
+
+    response = app.test_client().post(
+        "/api/voice/transcribe", data=b"abc", content_type="audio/webm", headers={"X-Session-ID": "s1"}
+    )
+
+    assert response.status_code == 200
+    assert response.get_json()["text"] == "I run a small agency"
+
+
+def test_voice_transcribe_streams_partials(monkeypatch):
+    app, _bot, _tts, _stt = _make_voice_app(monkeypatch)
+    body = b"a" * (voice_routes.AUDIO_READ_CHUNK_BYTES + 5)
+
+    response = app.test_client().post(
+        "/api/voice/transcribe?partials=1", data=body, content_type="audio/webm", headers={"X-Session-ID": "s1"}
+    )
+
+    records = _records(response)
+    size = str(voice_routes.AUDIO_READ_CHUNK_BYTES)
+    assert [r["text"] for r in records if r["type"] == "transcript"] == [size, f"{size} 5", f"{size} 5"]
+    assert records[-1] == {**records[-1], "type": "done", "text": f"{size} 5"}
+
+
+def test_voice_transcribe_reads_the_body_inside_the_request_and_reports_stt_failures(monkeypatch):
+    app, _bot, _tts, stt = _make_voice_app(monkeypatch)
+    contexts = []
+
+    def failing_stream(chunks, filename="audio.webm"):
+        for _chunk in chunks:
+            contexts.append(has_request_context())
+            yield TranscriptEvent(text="half")
+        raise AudioStreamError("connection dropped")
+
+    stt.stream_transcribe = failing_stream
+    response = app.test_client().post(
+        "/api/voice/transcribe?partials=1", data=b"abc", content_type="audio/webm", headers={"X-Session-ID": "s1"}
+    )
+
+    records = _records(response)
+    assert contexts == [True]
+    assert [r["type"] for r in records] == ["transcript", "error"]
+    assert records[-1]["code"] == "STT_FAILED"
+
+
+def test_voice_transcribe_rejects_oversized_and_non_audio_bodies(monkeypatch):
+    app, _bot, _tts, _stt = _make_voice_app(monkeypatch)
+    monkeypatch.setattr(voice_routes, "MAX_AUDIO_SIZE_BYTES", 4)
+    client = app.test_client()
+
+    too_big = client.post("/api/voice/transcribe", data=b"abcdef", content_type="audio/webm", headers={"X-Session-ID": "s1"})
+    not_audio = client.post("/api/voice/transcribe", json={"text": "hi"}, headers={"X-Session-ID": "s1"})
+
+    assert too_big.status_code == 413
+    assert not_audio.status_code == 415